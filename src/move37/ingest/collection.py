@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Tuple
 
 from move37.utils.date_utils import get_date_range, get_yesterday_range
 from move37.utils.opml.opml_parser import parse_opml
@@ -41,21 +41,93 @@ def format_results(results: List[Dict], target_date: str) -> Dict:
     }
 
 
-def collect_all(
-    target_date: str | None = None,
-    opml_path: str | Path | None = None,
-    max_sources: int | None = None,
-) -> Dict:
-    """Collect data for blogs and YouTube channels from OPML sources."""
+def _resolve_target_window(target_date: str | None) -> Tuple[datetime, datetime, str]:
     if target_date:
         start_time, end_time = get_date_range(target_date)
-        normalized_target_date = target_date
-    else:
-        start_time, end_time = get_yesterday_range()
-        normalized_target_date = start_time.date().isoformat()
+        return start_time, end_time, target_date
+    start_time, end_time = get_yesterday_range()
+    return start_time, end_time, start_time.date().isoformat()
+
+
+def _collect_source(
+    source: Dict,
+    index: int,
+    total_sources: int,
+    start_time: datetime,
+    end_time: datetime,
+) -> Dict:
+    source_type = _normalize_source_type(source.get("sourceType", "Unknown"))
+    source_title = source.get("xmlTitle", "Unknown")
+    source_url = source.get("xmlUrl", "")
+    source_started = datetime.now(timezone.utc)
+
+    LOGGER.info(
+        "开始采集 source %d/%d: title=%s, type=%s, url=%s",
+        index,
+        total_sources,
+        source_title,
+        source_type,
+        source_url,
+    )
+
+    result = {
+        "source_type": source_type,
+        "source_title": source_title,
+        "success": True,
+        "items": [],
+    }
+
+    try:
+        if source_type == "Blogs":
+            result["items"] = collect_rss(
+                feed_url=source_url,
+                start_time=start_time,
+                end_time=end_time,
+                source_title=source_title,
+            )
+        elif source_type == "YouTube Channels":
+            result["items"] = collect_youtube(
+                channel_url=source_url,
+                start_time=start_time,
+                end_time=end_time,
+                source_title=source_title,
+            )
+        else:
+            result["success"] = False
+            result["error"] = f"Unsupported source type: {source_type}"
+            LOGGER.info("跳过不支持的sourceType: %s (%s)", source_type, source_title)
+    except Exception as exc:  # noqa: BLE001
+        result["success"] = False
+        result["error"] = str(exc)
+        LOGGER.error("采集失败: %s (%s): %s", source_title, source_url, exc)
+    finally:
+        duration_seconds = (datetime.now(timezone.utc) - source_started).total_seconds()
+        LOGGER.info(
+            "结束采集 source %d/%d: title=%s, success=%s, items=%d, duration=%.2fs",
+            index,
+            total_sources,
+            source_title,
+            result.get("success", False),
+            len(result.get("items", [])),
+            duration_seconds,
+        )
+    return result
+
 
+def iter_collect(
+    target_date: str | None = None,
+    opml_path: str | Path | None = None,
+    max_sources: int | None = None,
+) -> Tuple[Dict, Iterator[Dict]]:
+    """Collect sources lazily for the streaming pipeline.
+
+    Returns `(header, sources)`: `header` holds `collection_date` and
+    `target_date`, and `sources` yields one source result at a time, in OPML
+    order, as soon as it has been fetched. OPML and `max_sources` errors are
+    raised here, before anything is fetched.
+    """
+    start_time, end_time, normalized_target_date = _resolve_target_window(target_date)
     sources = parse_opml(opml_path or DEFAULT_OPML_PATH)
-    collected_results: List[Dict] = []
 
     if max_sources is not None:
         if max_sources <= 0:
@@ -64,63 +136,24 @@ def collect_all(
         LOGGER.info("启用 max_sources=%d，本次仅处理前 %d 个 source。", max_sources, len(sources))
     total_sources = len(sources)
 
-    for index, source in enumerate(sources, start=1):
-        source_type = _normalize_source_type(source.get("sourceType", "Unknown"))
-        source_title = source.get("xmlTitle", "Unknown")
-        source_url = source.get("xmlUrl", "")
-        source_started = datetime.now(timezone.utc)
-
-        LOGGER.info(
-            "开始采集 source %d/%d: title=%s, type=%s, url=%s",
-            index,
-            total_sources,
-            source_title,
-            source_type,
-            source_url,
-        )
-
-        result = {
-            "source_type": source_type,
-            "source_title": source_title,
-            "success": True,
-            "items": [],
-        }
-
-        try:
-            if source_type == "Blogs":
-                result["items"] = collect_rss(
-                    feed_url=source_url,
-                    start_time=start_time,
-                    end_time=end_time,
-                    source_title=source_title,
-                )
-            elif source_type == "YouTube Channels":
-                result["items"] = collect_youtube(
-                    channel_url=source_url,
-                    start_time=start_time,
-                    end_time=end_time,
-                    source_title=source_title,
-                )
-            else:
-                result["success"] = False
-                result["error"] = f"Unsupported source type: {source_type}"
-                LOGGER.info("跳过不支持的sourceType: %s (%s)", source_type, source_title)
-        except Exception as exc:  # noqa: BLE001
-            result["success"] = False
-            result["error"] = str(exc)
-            LOGGER.error("采集失败: %s (%s): %s", source_title, source_url, exc)
-        finally:
-            duration_seconds = (datetime.now(timezone.utc) - source_started).total_seconds()
-            LOGGER.info(
-                "结束采集 source %d/%d: title=%s, success=%s, items=%d, duration=%.2fs",
-                index,
-                total_sources,
-                source_title,
-                result.get("success", False),
-                len(result.get("items", [])),
-                duration_seconds,
-            )
+    header = {
+        "collection_date": datetime.now(timezone.utc).date().isoformat(),
+        "target_date": normalized_target_date,
+    }
+    results = (
+        _collect_source(source, index, total_sources, start_time, end_time)
+        for index, source in enumerate(sources, start=1)
+    )
+    return header, results
 
-        collected_results.append(result)
 
-    return format_results(collected_results, target_date=normalized_target_date)
+def collect_all(
+    target_date: str | None = None,
+    opml_path: str | Path | None = None,
+    max_sources: int | None = None,
+) -> Dict:
+    """Collect data for blogs and YouTube channels from OPML sources."""
+    header, sources = iter_collect(
+        target_date=target_date, opml_path=opml_path, max_sources=max_sources
+    )
+    return format_results(list(sources), target_date=header["target_date"])
@@ -9,7 +9,7 @@ import sys
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 if __package__ in {None, ""}:
     SRC_ROOT = Path(__file__).resolve().parents[1]
@@ -18,8 +18,30 @@ if __package__ in {None, ""}:
 
 from move37.ingest.collection import collect_all
 from move37.notify.notifier import notify_feishu
+from move37.pipeline import (
+    DEFAULT_SUMMARIZE_WORKERS,
+    PipelineStageError,
+    check_streaming_supported,
+    run_streaming,
+)
+from move37.summarize.key_pool import key_pool_states, reset_key_pool_stats
+from move37.summarize.rate_limiter import rate_limiter_states, reset_rate_limiter_stats
+from move37.summarize.streaming import reset_streaming_stats, streaming_stats
+from move37.summarize.structured_output import parse_stats, reset_parse_stats
 from move37.summarize.summarizer import summarize_all
-from move37.write_docx.writer import write_to_feishu_docx
+from move37.utils.checkpoint import (
+    DEFAULT_RUNS_DIR,
+    STAGES,
+    RunCheckpoint,
+    latest_run_id,
+)
+from move37.utils.retry import DEFAULT_RETRY_BUDGET, reset_retry_budget, retry_budget_state
+from move37.write_docx.writer import (
+    DocxWriteSession,
+    ImportWriteSession,
+    open_feishu_docx_session,
+    write_to_feishu_docx,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -60,92 +82,355 @@ def _extract_wiki_url(write_result: Dict[str, Any]) -> str:
     return ""
 
 
-def _run_once(target_date: str | None = None, max_sources: int | None = None) -> Dict[str, Any]:
-    started_at = time.time()
-    steps: List[Dict[str, Any]] = []
-    errors: List[str] = []
+def _stage_reused(checkpoint: RunCheckpoint, stage: str, from_stage: str | None) -> bool:
+    """Whether `stage` can be loaded from the run directory instead of re-run."""
+    if from_stage is not None and STAGES.index(stage) >= STAGES.index(from_stage):
+        return False
+    return checkpoint.is_done(stage)
+
+
+def _reused_step(stage: str) -> Dict[str, Any]:
+    LOGGER.info("Reuse checkpointed stage: %s", stage)
+    return {"step": stage, "success": True, "duration_seconds": 0.0, "resumed": True}
+
+
+def _summarize_stats(checkpoint: RunCheckpoint) -> Dict[str, Any]:
+    return {
+        "rate_limiters": rate_limiter_states(),
+        "key_pools": key_pool_states(),
+        "parse_stats": parse_stats(),
+        "streaming": streaming_stats(),
+        "checkpointed_items": len(checkpoint),
+    }
 
-    collection_result = None
-    summary_result = None
 
-    # Step 1: collection
+def _failed_step(
+    stage: str, started: float, exc: BaseException, errors: List[str]
+) -> Dict[str, Any]:
+    error = f"{stage} failed: {type(exc).__name__}: {exc}"
+    errors.append(error)
+    return {
+        "step": stage,
+        "success": False,
+        "duration_seconds": round(time.time() - started, 2),
+        "error": error,
+    }
+
+
+def _run_collection_step(
+    checkpoint: RunCheckpoint,
+    from_stage: str | None,
+    target_date: str | None,
+    max_sources: int | None,
+    steps: List[Dict[str, Any]],
+    errors: List[str],
+) -> Dict[str, Any] | None:
     step_started = time.time()
     try:
+        if _stage_reused(checkpoint, "collection", from_stage):
+            collection_result = checkpoint.load("collection")
+            _validate_pipeline_result("collection_result", collection_result)
+            steps.append(_reused_step("collection"))
+            return collection_result
         collection_result = collect_all(target_date=target_date, max_sources=max_sources)
         _validate_pipeline_result("collection_result", collection_result)
-        steps.append(
-            {
-                "step": "collection",
-                "success": True,
-                "duration_seconds": round(time.time() - step_started, 2),
-            }
-        )
+        checkpoint.save("collection", collection_result)
     except Exception as exc:  # noqa: BLE001
-        error = f"collection failed: {type(exc).__name__}: {exc}"
-        errors.append(error)
-        steps.append(
-            {
-                "step": "collection",
-                "success": False,
-                "duration_seconds": round(time.time() - step_started, 2),
-                "error": error,
-            }
-        )
-        return {
-            "success": False,
-            "steps": steps,
-            "errors": errors,
-            "duration_seconds": round(time.time() - started_at, 2),
+        steps.append(_failed_step("collection", step_started, exc, errors))
+        return None
+    steps.append(
+        {
+            "step": "collection",
+            "success": True,
+            "duration_seconds": round(time.time() - step_started, 2),
         }
+    )
+    return collection_result
 
-    # Step 2: summarize
+
+def _run_summarize_step(
+    checkpoint: RunCheckpoint,
+    from_stage: str | None,
+    collection_result: Dict[str, Any],
+    steps: List[Dict[str, Any]],
+    errors: List[str],
+) -> Dict[str, Any] | None:
     step_started = time.time()
     try:
-        summary_result = summarize_all(collection_result)
+        if _stage_reused(checkpoint, "summarize", from_stage):
+            summary_result = checkpoint.load("summarize")
+            _validate_pipeline_result("summary_result", summary_result)
+            steps.append(_reused_step("summarize"))
+            return summary_result
+        summary_result = summarize_all(collection_result, checkpoint=checkpoint)
         _validate_pipeline_result("summary_result", summary_result)
-        steps.append(
-            {
-                "step": "summarize",
-                "success": True,
-                "duration_seconds": round(time.time() - step_started, 2),
-            }
-        )
+        checkpoint.save("summarize", summary_result)
     except Exception as exc:  # noqa: BLE001
-        error = f"summarize failed: {type(exc).__name__}: {exc}"
-        errors.append(error)
         steps.append(
-            {
-                "step": "summarize",
-                "success": False,
-                "duration_seconds": round(time.time() - step_started, 2),
-                "error": error,
-            }
+            {**_failed_step("summarize", step_started, exc, errors), **_summarize_stats(checkpoint)}
         )
+        return None
+    steps.append(
+        {
+            "step": "summarize",
+            "success": True,
+            "duration_seconds": round(time.time() - step_started, 2),
+            **_summarize_stats(checkpoint),
+            "hedging": summary_result.get("hedging"),
+        }
+    )
+    return summary_result
+
+
+def _run_streaming_steps(
+    checkpoint: RunCheckpoint,
+    from_stage: str | None,
+    target_date: str | None,
+    max_sources: int | None,
+    workers: int,
+    steps: List[Dict[str, Any]],
+    errors: List[str],
+    docx_writer: _IncrementalDocxWriter | None = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]] | None:
+    """Collection and summarize overlapped through `run_streaming`.
+
+    Appends the same `collection` and `summarize` step entries as the staged
+    path; their durations are measured from the start of the streaming run.
+    """
+    step_started = time.time()
+    stored_collection = None
+    if _stage_reused(checkpoint, "collection", from_stage):
+        stored_collection = checkpoint.load("collection")
+    try:
+        collection_result, summary_result, timings = run_streaming(
+            target_date=target_date,
+            max_sources=max_sources,
+            collection_result=stored_collection,
+            checkpoint=checkpoint,
+            summarize_workers=workers,
+            on_source=docx_writer,
+        )
+    except PipelineStageError as exc:
+        partial = docx_writer.partial_document() if docx_writer is not None else None
+        if exc.stage == "collection":
+            failed = _failed_step("collection", step_started, exc.error, errors)
+        else:
+            steps.append(_collection_step(stored_collection, exc.timings))
+            failed = {
+                **_failed_step("summarize", step_started, exc.error, errors),
+                **_summarize_stats(checkpoint),
+            }
+        if partial is not None:
+            failed["partial_document"] = partial
+            _flag_partial_document(checkpoint, partial, errors)
+        steps.append(failed)
+        return None
+
+    if stored_collection is None:
+        checkpoint.save("collection", collection_result)
+    steps.append(_collection_step(stored_collection, timings))
+    checkpoint.save("summarize", summary_result)
+    steps.append(
+        {
+            "step": "summarize",
+            "success": True,
+            "duration_seconds": timings["summarize"],
+            **_summarize_stats(checkpoint),
+            "hedging": summary_result.get("hedging"),
+        }
+    )
+    return collection_result, summary_result
+
+
+def _flag_partial_document(
+    checkpoint: RunCheckpoint, partial: Dict[str, Any], errors: List[str]
+) -> None:
+    """Record a streamed doc left unfinished by a failed stage.
+
+    A resumed run writes a fresh doc, so the partial one is kept in the run
+    state and listed in every later report of the run until someone deletes it.
+    """
+    documents = list(checkpoint.state.get("partial_documents") or [])
+    documents.append(partial)
+    checkpoint.note("partial_documents", documents)
+    errors.append(
+        f"partial doc left in wiki: document_id={partial['document_id']}, "
+        f"url={partial.get('wiki_url') or 'unknown'}"
+    )
+
+
+def _collection_step(
+    stored_collection: Dict[str, Any] | None, timings: Dict[str, float]
+) -> Dict[str, Any]:
+    if stored_collection is not None:
+        return _reused_step("collection")
+    return {
+        "step": "collection",
+        "success": True,
+        "duration_seconds": timings.get("collection", 0.0),
+    }
+
+
+class _IncrementalDocxWriter:
+    """Append each source to the Feishu doc as the streaming pipeline emits it.
+
+    The doc is created with the first summarized source. A write error stops
+    further appends and is re-raised from `close`, so the summarize stage
+    never fails because of the writer. If a stage fails after the doc was
+    created, `partial_document` reports it so the run can flag it.
+    """
+
+    def __init__(self) -> None:
+        self.session: DocxWriteSession | ImportWriteSession | None = None
+        self.error: Exception | None = None
+
+    def __call__(self, header: Dict[str, Any], source: Dict[str, Any]) -> None:
+        if self.error is not None:
+            return
+        try:
+            if self.session is None:
+                self.session = open_feishu_docx_session(header)
+            self.session.append_source(source)
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.warning("Incremental docx write failed, will report at write_docx: %s", exc)
+            self.error = exc
+
+    def partial_document(self) -> Dict[str, Any] | None:
+        """Ids of the doc created so far, or None if nothing was created in the wiki."""
+        document_id = str(getattr(self.session, "document_id", "") or "")
+        if not document_id:
+            return None
         return {
-            "success": False,
+            "document_id": document_id,
+            "node_token": str(getattr(self.session, "node_token", "") or ""),
+            "wiki_url": str(getattr(self.session, "wiki_url", "") or ""),
+        }
+
+    def close(self, summary_result: Dict[str, Any]) -> Dict[str, Any]:
+        if self.error is not None:
+            raise self.error
+        if self.session is None:
+            return write_to_feishu_docx(summary_result)
+        return self.session.close()
+
+
+def _run_once(
+    target_date: str | None = None,
+    max_sources: int | None = None,
+    retry_budget: int = DEFAULT_RETRY_BUDGET,
+    run_id: str | None = None,
+    from_stage: str | None = None,
+    runs_dir: str | Path = DEFAULT_RUNS_DIR,
+    stream: bool = False,
+    stream_workers: int = DEFAULT_SUMMARIZE_WORKERS,
+) -> Dict[str, Any]:
+    """Run collection -> summarize -> write_docx -> notify once.
+
+    Every stage result, and every summarized item, is checkpointed under
+    `<runs_dir>/<run_id>/`. Passing the `run_id` of an earlier run resumes it:
+    completed stages are loaded from disk and summarize only processes the
+    items that did not finish. `from_stage` re-runs that stage and everything
+    after it while still reusing the earlier stages.
+
+    With `stream`, collection and summarize run as a producer/consumer
+    pipeline (see `move37.pipeline.run_streaming`) instead of one after the
+    other, and each summarized source is appended to the Feishu doc right
+    away; the write_docx step then only flushes the last batch.
+    """
+    started_at = time.time()
+    steps: List[Dict[str, Any]] = []
+    errors: List[str] = []
+    # One retry budget shared by collection, summarize, docx writing and notify.
+    reset_retry_budget(retry_budget)
+    # The summarize stats are module-global; scheduled runs share one process.
+    # Limiters and key pools keep their buckets and quarantines, only counters reset.
+    reset_parse_stats()
+    reset_streaming_stats()
+    reset_rate_limiter_stats()
+    reset_key_pool_stats()
+    checkpoint = RunCheckpoint(
+        run_id=run_id,
+        runs_dir=runs_dir,
+        params={"target_date": target_date, "max_sources": max_sources},
+    )
+    target_date = checkpoint.params.get("target_date", target_date)
+    max_sources = checkpoint.params.get("max_sources", max_sources)
+    LOGGER.info("Run id=%s, artifacts=%s", checkpoint.run_id, checkpoint.run_dir)
+    for partial in checkpoint.state.get("partial_documents") or []:
+        LOGGER.warning("This run left a partial doc in the wiki: %s", partial)
+
+    def _report(success: bool) -> Dict[str, Any]:
+        report = {
+            "success": success,
+            "run_id": checkpoint.run_id,
+            "run_dir": str(checkpoint.run_dir),
             "steps": steps,
             "errors": errors,
             "duration_seconds": round(time.time() - started_at, 2),
+            "retry_budget": retry_budget_state(),
         }
+        partial_documents = checkpoint.state.get("partial_documents")
+        if partial_documents:
+            report["partial_documents"] = partial_documents
+        return report
+
+    docx_writer: _IncrementalDocxWriter | None = None
+    if stream and not _stage_reused(checkpoint, "summarize", from_stage):
+        if not _stage_reused(checkpoint, "write_docx", from_stage):
+            docx_writer = _IncrementalDocxWriter()
+        streamed = _run_streaming_steps(
+            checkpoint,
+            from_stage,
+            target_date,
+            max_sources,
+            stream_workers,
+            steps,
+            errors,
+            docx_writer,
+        )
+        if streamed is None:
+            return _report(False)
+        collection_result, summary_result = streamed
+    else:
+        collection_result = _run_collection_step(
+            checkpoint, from_stage, target_date, max_sources, steps, errors
+        )
+        if collection_result is None:
+            return _report(False)
+        summary_result = _run_summarize_step(
+            checkpoint, from_stage, collection_result, steps, errors
+        )
+        if summary_result is None:
+            return _report(False)
 
     notify_payload = dict(summary_result)
 
     # Step 3: write docx (run before notify to include wiki url)
     step_started = time.time()
     try:
-        write_result = write_to_feishu_docx(summary_result)
+        if _stage_reused(checkpoint, "write_docx", from_stage):
+            write_result = checkpoint.load("write_docx")
+            steps.append(_reused_step("write_docx"))
+        else:
+            if docx_writer is not None:
+                write_result = docx_writer.close(summary_result)
+            else:
+                write_result = write_to_feishu_docx(summary_result)
+            write_success = bool(write_result.get("success", True))
+            if write_success:
+                checkpoint.save("write_docx", write_result)
+            steps.append(
+                {
+                    "step": "write_docx",
+                    "success": write_success,
+                    "duration_seconds": round(time.time() - step_started, 2),
+                    "document_id": write_result.get("document_id"),
+                    "wiki_url": _extract_wiki_url(write_result) or None,
+                }
+            )
         wiki_url = _extract_wiki_url(write_result)
         if wiki_url:
             notify_payload["wiki_url"] = wiki_url
-        steps.append(
-            {
-                "step": "write_docx",
-                "success": bool(write_result.get("success", True)),
-                "duration_seconds": round(time.time() - step_started, 2),
-                "document_id": write_result.get("document_id"),
-                "wiki_url": wiki_url if wiki_url else None,
-            }
-        )
     except Exception as exc:  # noqa: BLE001
         error = f"write_docx failed: {type(exc).__name__}: {exc}"
         errors.append(error)
@@ -160,25 +445,27 @@ def _run_once(target_date: str | None = None, max_sources: int | None = None) ->
 
     # Step 4: notify (fail-open)
     step_started = time.time()
-    notify_result = notify_feishu(notify_payload)
-    notify_success = bool(notify_result.get("success"))
-    if not notify_success:
-        errors.append(f"notify failed: {notify_result.get('message')}")
-    steps.append(
-        {
-            "step": "notify",
-            "success": notify_success,
-            "duration_seconds": round(time.time() - step_started, 2),
-            "message": str(notify_result.get("message") or ""),
-        }
-    )
+    if _stage_reused(checkpoint, "notify", from_stage):
+        steps.append(_reused_step("notify"))
+    else:
+        notify_result = notify_feishu(notify_payload)
+        notify_success = bool(notify_result.get("success"))
+        if notify_success:
+            checkpoint.save("notify", notify_result)
+        else:
+            errors.append(f"notify failed: {notify_result.get('message')}")
+        steps.append(
+            {
+                "step": "notify",
+                "success": notify_success,
+                "duration_seconds": round(time.time() - step_started, 2),
+                "message": str(notify_result.get("message") or ""),
+            }
+        )
 
-    return {
-        "success": not any(step.get("success") is False for step in steps[:2]) and len(errors) == 0,
-        "steps": steps,
-        "errors": errors,
-        "duration_seconds": round(time.time() - started_at, 2),
-    }
+    return _report(
+        not any(step.get("success") is False for step in steps[:2]) and len(errors) == 0
+    )
 
 
 def _seconds_until_next(schedule_time: str) -> int:
@@ -194,6 +481,10 @@ def _run_scheduled(
     schedule_time: str,
     target_date: str | None = None,
     max_sources: int | None = None,
+    retry_budget: int = DEFAULT_RETRY_BUDGET,
+    runs_dir: str | Path = DEFAULT_RUNS_DIR,
+    stream: bool = False,
+    stream_workers: int = DEFAULT_SUMMARIZE_WORKERS,
 ) -> int:
     LOGGER.info("Scheduled mode started, run time=%s", schedule_time)
     try:
@@ -201,7 +492,14 @@ def _run_scheduled(
             wait_seconds = _seconds_until_next(schedule_time)
             LOGGER.info("Next run in %s seconds", wait_seconds)
             time.sleep(wait_seconds)
-            report = _run_once(target_date=target_date, max_sources=max_sources)
+            report = _run_once(
+                target_date=target_date,
+                max_sources=max_sources,
+                retry_budget=retry_budget,
+                runs_dir=runs_dir,
+                stream=stream,
+                stream_workers=stream_workers,
+            )
             LOGGER.info("Scheduled run finished: %s", json.dumps(report, ensure_ascii=False))
     except KeyboardInterrupt:
         LOGGER.info("Scheduled mode stopped by user.")
@@ -229,6 +527,43 @@ def main() -> int:
         default=None,
         help="Optional max number of OPML sources to process (for debugging).",
     )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        default=None,
+        metavar="RUN_ID",
+        help="Resume a previous run from its checkpoints (implies --direct).",
+    )
+    parser.add_argument(
+        "--from-stage",
+        choices=STAGES,
+        default=None,
+        help="Re-run from this stage, reusing earlier stage results of --resume "
+        "(default: the latest run).",
+    )
+    parser.add_argument(
+        "--runs-dir",
+        type=str,
+        default=DEFAULT_RUNS_DIR,
+        help=f"Per-run artifact directory root (default: {DEFAULT_RUNS_DIR}).",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Overlap collection and summarize through bounded queues.",
+    )
+    parser.add_argument(
+        "--stream-workers",
+        type=int,
+        default=DEFAULT_SUMMARIZE_WORKERS,
+        help=f"Sources summarized at once with --stream (default: {DEFAULT_SUMMARIZE_WORKERS}).",
+    )
+    parser.add_argument(
+        "--retry-budget",
+        type=int,
+        default=DEFAULT_RETRY_BUDGET,
+        help=f"Max retries across the whole run (default: {DEFAULT_RETRY_BUDGET}).",
+    )
     args = parser.parse_args()
 
     logging.basicConfig(
@@ -236,8 +571,28 @@ def main() -> int:
         format="%(asctime)s %(levelname)s %(name)s - %(message)s",
     )
 
-    if args.direct:
-        report = _run_once(target_date=args.target_date, max_sources=args.max_sources)
+    if args.stream:
+        try:
+            check_streaming_supported()
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    run_id = args.resume
+    if args.from_stage and not run_id:
+        run_id = latest_run_id(args.runs_dir)
+        if run_id is None:
+            parser.error(f"--from-stage needs a previous run under {args.runs_dir}")
+    if args.direct or run_id:
+        report = _run_once(
+            target_date=args.target_date,
+            max_sources=args.max_sources,
+            retry_budget=args.retry_budget,
+            run_id=run_id,
+            from_stage=args.from_stage,
+            runs_dir=args.runs_dir,
+            stream=args.stream,
+            stream_workers=args.stream_workers,
+        )
         print(json.dumps(report, ensure_ascii=False, indent=2))
         return 0 if report.get("success") else 1
 
@@ -245,6 +600,10 @@ def main() -> int:
         schedule_time=args.schedule_time,
         target_date=args.target_date,
         max_sources=args.max_sources,
+        retry_budget=args.retry_budget,
+        runs_dir=args.runs_dir,
+        stream=args.stream,
+        stream_workers=args.stream_workers,
     )
 
 
@@ -45,6 +45,8 @@ def build_message(summary_result: Dict[str, Any], statistics: Dict[str, Any]) ->
     total_time_minutes = _to_int(statistics.get("total_time_minutes"))
     total_time_seconds = _to_int(statistics.get("total_time_seconds"))
     total_tokens = _to_int(statistics.get("total_tokens"))
+    prompt_tokens = _to_int(statistics.get("prompt_tokens"))
+    cached_tokens = _to_int(statistics.get("cached_tokens"))
     models_used = sorted(
         {
             str(item.get("model_used") or "").strip()
@@ -69,6 +71,11 @@ def build_message(summary_result: Dict[str, Any], statistics: Dict[str, Any]) ->
         f"- 程序执行耗时：{total_time_minutes}分{total_time_seconds}秒",
         f"- 消耗Token：{total_tokens}个",
     ]
+    if prompt_tokens:
+        cached_ratio = cached_tokens / prompt_tokens * 100
+        lines.append(
+            f"- 输入Token：{prompt_tokens}个，其中按缓存价计费{cached_tokens}个（{cached_ratio:.1f}%）"
+        )
     if models_used:
         lines.append(f"- 使用模型：{', '.join(models_used)}")
     if wiki_url:
@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict, Optional
 
-from move37.utils.feishu import FeishuClient
+from move37.utils.feishu import get_feishu_client
 from move37.utils.feishu import FeishuClientError, FeishuMessageError
 
 from .config import load_feishu_config
@@ -24,6 +24,8 @@ def _empty_statistics() -> Dict[str, Any]:
         "total_time_minutes": 0,
         "total_time_seconds": 0,
         "total_tokens": 0,
+        "prompt_tokens": 0,
+        "cached_tokens": 0,
         "total_time_raw_seconds": 0.0,
     }
 
@@ -74,7 +76,7 @@ def notify_feishu(
             "response": None,
         }
 
-    client = FeishuClient(
+    client = get_feishu_client(
         app_id=loaded_config["app_id"],
         app_secret=loaded_config["app_secret"],
         timeout=loaded_config["timeout"],
@@ -55,7 +55,10 @@ def _parse_tokens(value: Any) -> int:
 
 
 def calculate_statistics(summary_result: Dict[str, Any]) -> Dict[str, Any]:
-    """Calculate total items, status counts, elapsed time and token usage."""
+    """Calculate total items, status counts, elapsed time and token usage.
+
+    `cached_tokens` counts input tokens the providers billed at prompt-cache rates.
+    """
     if not isinstance(summary_result, dict):
         raise DataParseError("`summary_result` must be a dictionary.")
 
@@ -70,6 +73,8 @@ def calculate_statistics(summary_result: Dict[str, Any]) -> Dict[str, Any]:
     failure_count = 0
     total_seconds = 0.0
     total_tokens = 0
+    prompt_tokens = 0
+    cached_tokens = 0
 
     for source in results:
         if not isinstance(source, dict):
@@ -97,6 +102,10 @@ def calculate_statistics(summary_result: Dict[str, Any]) -> Dict[str, Any]:
 
             total_seconds += _parse_processing_seconds(item.get("processing_time"))
             total_tokens += _parse_tokens(item.get("tokens_consumed"))
+            token_usage = item.get("token_usage")
+            if isinstance(token_usage, dict):
+                prompt_tokens += _parse_tokens(token_usage.get("prompt_tokens"))
+                cached_tokens += _parse_tokens(token_usage.get("cached_tokens"))
 
     whole_seconds = int(total_seconds)
     total_time_minutes = whole_seconds // 60
@@ -109,5 +118,7 @@ def calculate_statistics(summary_result: Dict[str, Any]) -> Dict[str, Any]:
         "total_time_minutes": total_time_minutes,
         "total_time_seconds": total_time_seconds,
         "total_tokens": total_tokens,
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": cached_tokens,
         "total_time_raw_seconds": round(total_seconds, 2),
     }
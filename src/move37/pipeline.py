@@ -0,0 +1,251 @@
+"""Streaming collection -> summarize pipeline connected by bounded queues."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from move37.ingest.collection import iter_collect
+from move37.summarize.config import ConfigurationError, load_config
+from move37.summarize.summarizer import summarize_all
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SUMMARIZE_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 4
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+_HEADER_FIELDS = ("collection_date", "target_date", "results")
+
+
+class PipelineStageError(RuntimeError):
+    """A streaming stage failed; `stage` names it and `timings` holds finished stages."""
+
+    def __init__(self, stage: str, error: BaseException, timings: Dict[str, float]) -> None:
+        super().__init__(f"{type(error).__name__}: {error}")
+        self.stage = stage
+        self.error = error
+        self.timings = timings
+
+
+# Per-source summarize reports: fields that count events and add up across
+# sources. List fields (dedup clusters, dropped items) concatenate; all other
+# fields are gauges (the hedge p90 delay, provider names) and keep the latest.
+_COUNTER_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "hedging": ("requests", "hedged", "primary_wins", "secondary_wins", "tokens_wasted"),
+    "triage": ("scored", "summarized", "briefed", "tokens_consumed"),
+    "relevance": ("scored", "dropped", "seconds"),
+    "dedup": ("items_skipped",),
+}
+
+
+def merge_stats(report: str, total: Any, extra: Any) -> Any:
+    """Combine one per-source summarize report (`hedging`, `triage`, ...) into the total."""
+    if not isinstance(total, dict) or not isinstance(extra, dict):
+        return extra
+    counters = _COUNTER_FIELDS.get(report, ())
+    merged = dict(total)
+    for key, value in extra.items():
+        previous = merged.get(key)
+        if key in counters and isinstance(previous, (int, float)):
+            merged[key] = previous + value
+        elif isinstance(previous, list) and isinstance(value, list):
+            merged[key] = previous + value
+        else:
+            merged[key] = value
+    return merged
+
+
+def check_streaming_supported(config: Dict[str, Any] | None = None) -> None:
+    """Raise ValueError when the summarize config needs the whole day at once.
+
+    Streaming summarizes one source per call, so cross-source dedup would
+    never see two blogs reporting the same announcement. A config that does
+    not load is left for the summarize stage to report.
+    """
+    try:
+        loaded_config = load_config(config)
+    except ConfigurationError:
+        return
+    if (loaded_config.get("dedup") or {}).get("enabled"):
+        raise ValueError(
+            "Streaming mode cannot deduplicate across sources; "
+            "set LLM_DEDUP_ENABLED=false or run without --stream."
+        )
+
+
+def run_streaming(
+    target_date: str | None = None,
+    max_sources: int | None = None,
+    collection_result: Dict[str, Any] | None = None,
+    checkpoint: Any = None,
+    summarize_workers: int = DEFAULT_SUMMARIZE_WORKERS,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    on_source: Callable[[Dict[str, Any], Dict[str, Any]], None] | None = None,
+    summarize: Callable[..., Dict[str, Any]] = summarize_all,
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, float]]:
+    """Collect and summarize with the two stages overlapped.
+
+    A collector thread pushes each non-empty source onto a bounded queue as
+    soon as it is fetched; `summarize_workers` threads summarize one source
+    at a time and push the result onto a second bounded queue. Full queues
+    block the stage upstream, so a slow LLM throttles collection instead of
+    buffering the whole day in memory. The calling thread re-orders finished
+    sources and hands them to `on_source(header, source)` in collection order,
+    where `header` holds `collection_date` and `target_date`.
+
+    With `collection_result`, sources are replayed from it instead of
+    fetched (used when resuming a run whose collection already finished).
+
+    Returns `(collection_result, summary_result, timings)`; both results are
+    equal to what `collect_all` and `summarize_all` produce with the stage
+    barrier, except that triage and batch see one source at a time. Hedging
+    keeps one latency history across sources. Raises ValueError up front
+    when dedup is enabled (see `check_streaming_supported`) and
+    `PipelineStageError` naming the failed stage.
+    """
+    if summarize is summarize_all:
+        check_streaming_supported()
+    started_at = time.time()
+    workers = max(1, int(summarize_workers))
+    source_queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, queue_size))
+    result_queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, queue_size))
+    stop = threading.Event()
+    failures: Dict[str, BaseException] = {}
+    timings: Dict[str, float] = {}
+    collected: List[Dict[str, Any]] = []
+    header: Dict[str, Any] = {}
+
+    def _put(target: "queue.Queue[Any]", entry: Any) -> bool:
+        while not stop.is_set():
+            try:
+                target.put(entry, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            sources: Iterable[Dict[str, Any]]
+            if collection_result is not None:
+                header.update(
+                    collection_date=collection_result.get("collection_date"),
+                    target_date=collection_result.get("target_date"),
+                )
+                sources = collection_result.get("results") or []
+            else:
+                collected_header, sources = iter_collect(
+                    target_date=target_date, max_sources=max_sources
+                )
+                header.update(collected_header)
+            sequence = 0
+            for source in sources:
+                collected.append(source)
+                if not source.get("items"):
+                    continue
+                if not _put(source_queue, (sequence, source)):
+                    return
+                sequence += 1
+            timings["collection"] = round(time.time() - started_at, 2)
+            LOGGER.info("Streaming collection finished, sources=%s", sequence)
+        except BaseException as exc:  # noqa: BLE001
+            failures.setdefault("collection", exc)
+            stop.set()
+        finally:
+            for _ in range(workers):
+                _put(source_queue, _DONE)
+
+    def _summarize_worker() -> None:
+        while not stop.is_set():
+            try:
+                entry = source_queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if entry is _DONE:
+                break
+            sequence, source = entry
+            try:
+                chunk = summarize(
+                    {
+                        "collection_date": header.get("collection_date"),
+                        "target_date": header.get("target_date"),
+                        "results": [source],
+                    },
+                    checkpoint=checkpoint,
+                )
+            except BaseException as exc:  # noqa: BLE001
+                failures.setdefault("summarize", exc)
+                stop.set()
+                break
+            if not _put(result_queue, (sequence, chunk)):
+                break
+        _put(result_queue, _DONE)
+
+    threads = [threading.Thread(target=_produce, name="pipeline-collect", daemon=True)]
+    threads += [
+        threading.Thread(target=_summarize_worker, name=f"pipeline-summarize-{index}", daemon=True)
+        for index in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    results: List[Dict[str, Any]] = []
+    stats: Dict[str, Any] = {}
+    pending: Dict[int, Dict[str, Any]] = {}
+    next_sequence = 0
+    finished_workers = 0
+    try:
+        while finished_workers < workers and not stop.is_set():
+            try:
+                entry = result_queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if entry is _DONE:
+                finished_workers += 1
+                continue
+            sequence, chunk = entry
+            pending[sequence] = chunk
+            while next_sequence in pending:
+                chunk = pending.pop(next_sequence)
+                next_sequence += 1
+                for key, value in chunk.items():
+                    if key not in _HEADER_FIELDS:
+                        stats[key] = merge_stats(key, stats.get(key), value)
+                for source in chunk.get("results") or []:
+                    results.append(source)
+                    if on_source is not None:
+                        on_source(header, source)
+    except BaseException as exc:  # noqa: BLE001
+        failures.setdefault("summarize", exc)
+        stop.set()
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    for stage in ("collection", "summarize"):
+        error = failures.get(stage)
+        if error is None:
+            continue
+        if not isinstance(error, Exception):
+            raise error
+        raise PipelineStageError(stage, error, timings) from error
+
+    timings["summarize"] = round(time.time() - started_at, 2)
+    collection = {
+        "collection_date": header.get("collection_date"),
+        "target_date": header.get("target_date"),
+        "results": [source for source in collected if source.get("items")],
+    }
+    summary_result = {
+        "collection_date": collection["collection_date"],
+        "target_date": collection["target_date"],
+        "results": results,
+        **stats,
+    }
+    return collection, summary_result, timings
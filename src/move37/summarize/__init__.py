@@ -14,15 +14,24 @@ if load_dotenv is not None:
 
 LOGGER = logging.getLogger(__name__)
 
+from .async_llm_client import AsyncLLMClient
 from .config import ConfigurationError, load_config
 from .content_fetcher import extract_youtube_video_id, is_youtube_url
-from .summarizer import summarize_all, summarize_single_url
+from .summarizer import (
+    asummarize_single_url,
+    summarize_all,
+    summarize_all_async,
+    summarize_single_url,
+)
 
 __all__ = [
+    "AsyncLLMClient",
     "ConfigurationError",
+    "asummarize_single_url",
     "extract_youtube_video_id",
     "is_youtube_url",
     "load_config",
     "summarize_all",
+    "summarize_all_async",
     "summarize_single_url",
 ]
@@ -0,0 +1,358 @@
+"""Asyncio LLM client with long-lived provider clients."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Any, AsyncIterable, Callable, Dict, Tuple
+
+from .llm_client import (
+    _RESPONSE_SCHEMA,
+    CHUNK_PROMPT_TEMPLATE,
+    LLMClient,
+    bind_gemini_api_key,
+    configure_gemini,
+)
+from .streaming import IncrementalSummaryParser
+from .structured_output import SUMMARY_RESPONSE_SCHEMA
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncLLMClient(LLMClient):
+    """Async variant of `LLMClient` sharing its prompt, parsing and retry rules.
+
+    The OpenAI-compatible `AsyncOpenAI` client and Gemini `GenerativeModel`
+    instances are created once and reused for every request, so many summaries
+    can be in flight on one event loop without per-call client setup.
+    """
+
+    def __init__(self, *args: Any, max_connections: int | None = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.max_connections = int(max_connections) if max_connections else None
+        self._request_slots: asyncio.Semaphore | None = None
+        # One pooled client/model per API key (and model name for Gemini).
+        self._openai_clients: Dict[str, Any] = {}
+        self._gemini_models: Dict[Tuple[str, str], Any] = {}
+        self._async_fallback_lock: asyncio.Lock | None = None
+
+    async def agenerate_summary(
+        self,
+        url: str,
+        prompt_template: str,
+        content: str | None = None,
+        chunk_size: int | None = None,
+    ) -> Dict[str, Any]:
+        """Async counterpart of `LLMClient.generate_summary`.
+
+        Chunks of oversized content are summarized concurrently, up to
+        `max_connections` requests at a time.
+        """
+        content, tokens_saved = self._compact_content(url, content)
+        if content and self._needs_chunking(url, prompt_template, content, chunk_size):
+            result = await self._agenerate_summary_with_chunking(
+                url=url,
+                prompt_template=prompt_template,
+                content=content,
+                chunk_size=chunk_size,
+            )
+        else:
+            result = await self._agenerate_summary_once(
+                url=url, prompt_template=prompt_template, content=content
+            )
+        return self._attach_compaction_savings(result, tokens_saved)
+
+    async def aclose(self) -> None:
+        """Close pooled provider connections."""
+        for client in self._openai_clients.values():
+            await client.close()
+        self._openai_clients.clear()
+        self._gemini_models.clear()
+
+    async def _agenerate_summary_once(
+        self,
+        url: str,
+        prompt_template: str,
+        content: str | None = None,
+    ) -> Dict[str, Any]:
+        prompt, estimated_tokens = self._prepare_prompt(url, prompt_template, content)
+        return await self._arequest_with_retries(
+            url,
+            prompt,
+            estimated_tokens,
+            lambda raw_text, usage: self._build_success_result(
+                url, raw_text, usage, estimated_tokens
+            ),
+        )
+
+    async def _arequest_with_retries(
+        self,
+        url: str,
+        prompt: str,
+        estimated_tokens: int,
+        build_result: Callable[[str, Dict[str, int]], Dict[str, Any]],
+        response_schema: Dict[str, Any] | None = None,
+    ) -> Dict[str, Any]:
+        """Async counterpart of `LLMClient._request_with_retries`."""
+        last_error = "Unknown LLM error"
+        delay: float | None = None
+
+        for attempt in range(self.max_retries):
+            try:
+                self._log_attempt(url, attempt)
+                async with self._request_slot():
+                    reserved = self._reserve_tokens(estimated_tokens)
+                    if self.rate_limiter is not None:
+                        await self.rate_limiter.aacquire(reserved)
+                    api_key, key_token = self._checkout_api_key()
+                    schema_token = _RESPONSE_SCHEMA.set(
+                        response_schema or SUMMARY_RESPONSE_SCHEMA
+                    )
+                    try:
+                        raw_text, usage = await self._arequest_summary(prompt)
+                    except Exception as exc:  # noqa: BLE001
+                        self._return_api_key(api_key, key_token, error=exc)
+                        self._release_rate_limit(reserved, error=exc)
+                        raise
+                    finally:
+                        _RESPONSE_SCHEMA.reset(schema_token)
+                    self._return_api_key(api_key, key_token, usage=usage)
+                    self._release_rate_limit(reserved, usage=usage)
+                return build_result(raw_text, usage)
+            except Exception as exc:  # noqa: BLE001
+                last_error = f"{type(exc).__name__}: {exc}"
+                self._disable_structured_output_if_rejected(exc)
+                delay = self._retry_delay(url, attempt, last_error, exc, delay)
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
+
+        return self._build_failure_result(estimated_tokens, last_error)
+
+    def _request_slot(self) -> Any:
+        """Hold one of `max_connections` request slots for the duration of a call.
+
+        The per-pool semaphore in `summarize_all_async` admits one item per
+        permit, but a chunked item fans out one request per chunk; this keeps
+        the client's in-flight requests within the pool limit either way.
+        """
+        if self.max_connections is None:
+            return contextlib.nullcontext()
+        if self._request_slots is None:
+            self._request_slots = asyncio.Semaphore(self.max_connections)
+        return self._request_slots
+
+    async def _agenerate_summary_with_chunking(
+        self,
+        url: str,
+        prompt_template: str,
+        content: str,
+        chunk_size: int | None = None,
+    ) -> Dict[str, Any]:
+        chunks = self._plan_content_chunks(url, content, chunk_size)
+        chunk_results = await asyncio.gather(
+            *(
+                self._agenerate_summary_once(
+                    url=url,
+                    prompt_template=CHUNK_PROMPT_TEMPLATE,
+                    content=chunk,
+                )
+                for chunk in chunks
+            )
+        )
+        merged_content, token_usage, failed_chunks = self._merge_chunk_results(
+            url, list(chunk_results)
+        )
+        if merged_content is None:
+            return self._build_chunk_failure_result(token_usage)
+
+        if self._merged_needs_reduction(url, prompt_template, merged_content, content):
+            final_result = await self._agenerate_summary_with_chunking(
+                url=url,
+                prompt_template=prompt_template,
+                content=merged_content,
+            )
+        else:
+            final_result = await self._agenerate_summary_once(
+                url=url,
+                prompt_template=prompt_template,
+                content=merged_content,
+            )
+        return self._finalize_chunked_result(final_result, token_usage, failed_chunks, len(chunks))
+
+    async def _arequest_summary(self, prompt: str) -> Tuple[str, Dict[str, int]]:
+        if self.provider == "gemini":
+            return await self._acall_gemini(prompt)
+        return await self._acall_openai_compatible(prompt)
+
+    def _get_openai_client(self) -> Any:
+        api_key = self._current_api_key()
+        if api_key in self._openai_clients:
+            return self._openai_clients[api_key]
+        try:
+            from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+        except ImportError as exc:  # pragma: no cover
+            raise RuntimeError(
+                "openai package is required. Install with `pip install openai`."
+            ) from exc
+
+        client_kwargs: Dict[str, Any] = {
+            "api_key": api_key,
+            "base_url": self.base_url,
+            "timeout": self.timeout,
+            # Retries are handled by `_agenerate_summary_once`.
+            "max_retries": 0,
+        }
+        if self.max_connections:
+            import httpx
+
+            client_kwargs["http_client"] = DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                )
+            )
+        self._openai_clients[api_key] = AsyncOpenAI(**client_kwargs)
+        return self._openai_clients[api_key]
+
+    async def _aconsume_stream(
+        self,
+        prompt: str,
+        events: AsyncIterable[Tuple[str, Dict[str, int] | None]],
+    ) -> Tuple[str, Dict[str, int]]:
+        """Async counterpart of `LLMClient._consume_stream`."""
+        parser = IncrementalSummaryParser()
+        started_at = time.monotonic()
+        first_token_at: float | None = None
+        usage: Dict[str, int] | None = None
+        stopped_early = False
+        async for delta, chunk_usage in events:
+            if chunk_usage:
+                usage = chunk_usage
+            if not delta:
+                continue
+            if first_token_at is None:
+                first_token_at = time.monotonic() - started_at
+            if parser.feed(delta):
+                stopped_early = True
+                break
+        return self._finish_stream(prompt, parser, first_token_at, usage, stopped_early)
+
+    @staticmethod
+    async def _aopenai_stream_events(
+        stream: Any,
+    ) -> AsyncIterable[Tuple[str, Dict[str, int] | None]]:
+        async for chunk in stream:
+            usage = getattr(chunk, "usage", None)
+            choices = getattr(chunk, "choices", None) or []
+            delta = getattr(choices[0].delta, "content", None) if choices else None
+            yield str(delta or ""), LLMClient._openai_usage(usage) if usage else None
+
+    @staticmethod
+    async def _agemini_stream_events(
+        response: Any,
+    ) -> AsyncIterable[Tuple[str, Dict[str, int] | None]]:
+        async for chunk in response:
+            usage = getattr(chunk, "usage_metadata", None)
+            yield LLMClient._gemini_text(chunk), LLMClient._gemini_usage(usage) if usage else None
+
+    async def _acall_openai_compatible(self, prompt: str) -> Tuple[str, Dict[str, int]]:
+        client = self._get_openai_client()
+        if self._should_stream():
+            stream = await client.chat.completions.create(
+                **self._openai_request_kwargs(prompt), **self._openai_stream_kwargs()
+            )
+            try:
+                return await self._aconsume_stream(prompt, self._aopenai_stream_events(stream))
+            finally:
+                await stream.close()
+        completion = await client.chat.completions.create(**self._openai_request_kwargs(prompt))
+        return self._parse_openai_completion(completion)
+
+    @staticmethod
+    def _load_genai() -> Any:
+        try:
+            import google.generativeai as genai
+        except ImportError as exc:  # pragma: no cover
+            raise RuntimeError(
+                "google-generativeai package is required. "
+                "Install with `pip install google-generativeai`."
+            ) from exc
+        return genai
+
+    def _get_gemini_model(self, genai: Any, model_name: str) -> Any:
+        api_key = self._current_api_key()
+        model = self._gemini_models.get((api_key, model_name))
+        if model is None:
+            model = bind_gemini_api_key(
+                genai.GenerativeModel(model_name), api_key, async_client=True
+            )
+            self._gemini_models[(api_key, model_name)] = model
+        return model
+
+    async def _agemini_generate(self, genai: Any, model_name: str, prompt: str) -> Any:
+        model = self._get_gemini_model(genai, model_name)
+        return await model.generate_content_async(
+            prompt, stream=self._should_stream(), **self._gemini_request_kwargs()
+        )
+
+    async def _acall_gemini(self, prompt: str) -> Tuple[str, Dict[str, int]]:
+        genai = self._load_genai()
+        configure_gemini(genai, self.api_key)
+        current_model = self._effective_model()
+        try:
+            response = await self._agemini_generate(genai, current_model, prompt)
+        except Exception as exc:  # noqa: BLE001
+            if not self._is_gemini_model_not_found(exc):
+                raise
+            response = await self._agenerate_with_gemini_fallback(genai, current_model, prompt, exc)
+        if self._should_stream():
+            return await self._aconsume_stream(prompt, self._agemini_stream_events(response))
+        return self._parse_gemini_response(response)
+
+    async def _agenerate_with_gemini_fallback(
+        self,
+        genai: Any,
+        current_model: str,
+        prompt: str,
+        exc: Exception,
+    ) -> Any:
+        if self._async_fallback_lock is None:
+            self._async_fallback_lock = asyncio.Lock()
+
+        async with self._async_fallback_lock:
+            resolved_model = self._effective_model()
+            if resolved_model != current_model:
+                return await self._agemini_generate(genai, resolved_model, prompt)
+
+            LOGGER.warning(
+                "Configured Gemini model unavailable: %s. Trying fallback models. error=%s",
+                current_model,
+                exc,
+            )
+            # Model listing is a blocking SDK call.
+            fallback_models = await asyncio.to_thread(
+                self._gemini_fallback_candidates, genai, current_model
+            )
+
+            last_fallback_error = f"{type(exc).__name__}: {exc}"
+            for fallback_model in fallback_models:
+                try:
+                    response = await self._agemini_generate(genai, fallback_model, prompt)
+                except Exception as fallback_exc:  # noqa: BLE001
+                    last_fallback_error = f"{type(fallback_exc).__name__}: {fallback_exc}"
+                    if self._is_gemini_model_not_found(fallback_exc):
+                        continue
+                    raise
+                self._switch_runtime_model(current_model, fallback_model)
+                return response
+
+            available_models = await asyncio.to_thread(self._list_gemini_generate_models, genai)
+            model_hint = ", ".join(available_models[:8]) if available_models else "unknown"
+            raise RuntimeError(
+                "Gemini model is unavailable and fallback failed. "
+                f"configured={current_model}, available_sample=[{model_hint}], "
+                f"last_error={last_fallback_error}"
+            ) from exc
@@ -0,0 +1,178 @@
+"""Offline summarization through the OpenAI-compatible Batch API."""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from .llm_client import LLMClient
+
+LOGGER = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+DEFAULT_BATCH_CONFIG: Dict[str, Any] = {
+    "enabled": False,
+    "poll_interval": 30.0,
+    "deadline": 3600.0,
+    "sync_reserve": 600.0,
+    "completion_window": "24h",
+}
+
+# (custom_id, url, prompt_template, content)
+BatchRequest = Tuple[str, str, str, str | None]
+
+
+class BatchSummarizer:
+    """Submit many prompts as one batch job and map results back by custom_id.
+
+    Polling stops `sync_reserve` seconds before `deadline`; requests without a
+    successful batch result by then are returned as stragglers so the caller
+    can finish them with regular synchronous calls.
+    """
+
+    def __init__(
+        self,
+        client: LLMClient,
+        poll_interval: float = DEFAULT_BATCH_CONFIG["poll_interval"],
+        deadline: float = DEFAULT_BATCH_CONFIG["deadline"],
+        sync_reserve: float = DEFAULT_BATCH_CONFIG["sync_reserve"],
+        completion_window: str = DEFAULT_BATCH_CONFIG["completion_window"],
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if client.provider == "gemini":
+            raise ValueError("Batch mode requires an OpenAI-compatible provider.")
+        self.client = client
+        self.poll_interval = float(poll_interval)
+        self.deadline = float(deadline)
+        self.sync_reserve = float(sync_reserve)
+        self.completion_window = completion_window
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens_saved: Dict[str, int] = {}
+
+    def _openai(self) -> Any:
+        try:
+            from openai import OpenAI
+        except ImportError as exc:  # pragma: no cover
+            raise RuntimeError(
+                "openai package is required. Install with `pip install openai`."
+            ) from exc
+        return OpenAI(
+            api_key=self.client.api_key,
+            base_url=self.client.base_url,
+            timeout=self.client.timeout,
+        )
+
+    def build_input(self, requests: List[BatchRequest]) -> Tuple[str, Dict[str, int], List[str]]:
+        """Render the batch JSONL.
+
+        Returns (jsonl, estimated prompt tokens per custom_id, custom_ids that
+        must run synchronously because their content needs chunking).
+        """
+        lines: List[str] = []
+        estimates: Dict[str, int] = {}
+        sync_only: List[str] = []
+        for custom_id, url, prompt_template, content in requests:
+            compacted, tokens_saved = self.client._compact_content(url, content)
+            if compacted and self.client._needs_chunking(url, prompt_template, compacted, None):
+                sync_only.append(custom_id)
+                continue
+            prompt, estimated = self.client._prepare_prompt(url, prompt_template, compacted)
+            estimates[custom_id] = estimated
+            self._tokens_saved[custom_id] = tokens_saved
+            lines.append(
+                json.dumps(
+                    {
+                        "custom_id": custom_id,
+                        "method": "POST",
+                        "url": BATCH_ENDPOINT,
+                        "body": self.client._openai_request_kwargs(prompt),
+                    },
+                    ensure_ascii=False,
+                )
+            )
+        return "\n".join(lines), estimates, sync_only
+
+    def run(self, requests: List[BatchRequest]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """Run one batch job; returns (results by custom_id, straggler custom_ids)."""
+        started_at = self._clock()
+        urls = {custom_id: url for custom_id, url, _, _ in requests}
+        jsonl, estimates, stragglers = self.build_input(requests)
+        if not estimates:
+            return {}, stragglers
+
+        api = self._openai()
+        input_file = api.files.create(
+            file=("move37-summaries.jsonl", jsonl.encode("utf-8")), purpose="batch"
+        )
+        batch = api.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window,
+        )
+        LOGGER.info("Submitted batch=%s with %s requests", batch.id, len(estimates))
+
+        stop_at = started_at + max(0.0, self.deadline - self.sync_reserve)
+        while batch.status not in _TERMINAL_STATUSES and self._clock() < stop_at:
+            self._sleep(min(self.poll_interval, max(0.0, stop_at - self._clock())))
+            batch = api.batches.retrieve(batch.id)
+            LOGGER.info("Batch=%s status=%s", batch.id, batch.status)
+
+        if batch.status not in _TERMINAL_STATUSES:
+            LOGGER.warning("Batch=%s not finished before deadline; cancelling", batch.id)
+            try:
+                batch = api.batches.cancel(batch.id)
+            except Exception as exc:  # noqa: BLE001
+                LOGGER.warning("Batch cancel failed, batch=%s, error=%s", batch.id, exc)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        output_file_id = getattr(batch, "output_file_id", None)
+        if output_file_id:
+            output = api.files.content(output_file_id).text
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                custom_id, result = self._parse_output_line(line, urls, estimates)
+                if result is not None:
+                    results[custom_id] = result
+
+        stragglers.extend(custom_id for custom_id in estimates if custom_id not in results)
+        LOGGER.info(
+            "Batch=%s finished with status=%s, results=%s, stragglers=%s",
+            batch.id,
+            batch.status,
+            len(results),
+            len(stragglers),
+        )
+        return results, stragglers
+
+    def _parse_output_line(
+        self,
+        line: str,
+        urls: Dict[str, str],
+        estimates: Dict[str, int],
+    ) -> Tuple[str, Dict[str, Any] | None]:
+        record = json.loads(line)
+        custom_id = str(record.get("custom_id", ""))
+        response = record.get("response") or {}
+        if custom_id not in estimates or record.get("error") or response.get("status_code") != 200:
+            return custom_id, None
+
+        body = response.get("body") or {}
+        try:
+            raw_text = str(body["choices"][0]["message"].get("content") or "").strip()
+            token_usage = self.client._openai_usage(body.get("usage") or {})
+            result = self.client._build_success_result(
+                urls[custom_id], raw_text, token_usage, estimates[custom_id]
+            )
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.warning("Invalid batch result, custom_id=%s, error=%s", custom_id, exc)
+            return custom_id, None
+        return custom_id, self.client._attach_compaction_savings(
+            result, self._tokens_saved.get(custom_id, 0)
+        )
@@ -0,0 +1,271 @@
+"""Persistent SQLite summary cache and its maintenance CLI."""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = ".cache/move37/summaries.sqlite3"
+
+# Result fields persisted for a cached summary.
+CACHED_FIELDS = (
+    "brief",
+    "summary",
+    "model_used",
+    "tokens_consumed",
+    "tokens_estimated",
+    "token_usage",
+)
+
+_TRACKING_PARAM_PREFIXES = ("utm_",)
+_TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src", "spm"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    url TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_hit_at REAL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (url, content_hash, provider, model, prompt_hash)
+)
+"""
+
+CacheKey = Tuple[str, str, str, str, str]
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so trivially different links share one cache entry.
+
+    Lower-cases scheme and host, drops the fragment, tracking parameters and
+    a trailing slash, and sorts the remaining query parameters.
+    """
+    parts = urlsplit(str(url or "").strip())
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in _TRACKING_PARAMS
+        and not key.lower().startswith(_TRACKING_PARAM_PREFIXES)
+    ]
+    path = parts.path.rstrip("/") if parts.path not in ("", "/") else ""
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), "")
+    )
+
+
+def hash_text(text: str | None) -> str:
+    """Return a stable SHA-256 hex digest of text (empty text hashes too)."""
+    return hashlib.sha256(str(text or "").encode("utf-8")).hexdigest()
+
+
+def build_cache_key(
+    url: str,
+    content: str | None,
+    provider: str,
+    model: str,
+    prompt_template: str,
+    options: Dict[str, Any] | None = None,
+) -> CacheKey:
+    """Build the cache key; any change in content, model, prompt or options misses.
+
+    `options` are the client settings that shape a summary besides the model
+    (see `LLMClient.cache_options`); they are hashed with the prompt template
+    into the `prompt_hash` column.
+    """
+    prompt_hash = hash_text(prompt_template)
+    if options:
+        fingerprint = json.dumps(options, sort_keys=True, ensure_ascii=False, default=str)
+        prompt_hash = hash_text(f"{prompt_hash}\n{fingerprint}")
+    return (
+        canonicalize_url(url),
+        hash_text(content),
+        str(provider).strip().lower(),
+        str(model).strip(),
+        prompt_hash,
+    )
+
+
+class SummaryCache:
+    """Thread-safe SQLite store of successful summaries."""
+
+    def __init__(self, path: str | Path = DEFAULT_CACHE_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Return the cached result for key, or None on a miss."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT result FROM summaries WHERE url=? AND content_hash=? "
+                "AND provider=? AND model=? AND prompt_hash=?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE summaries SET hits=hits+1, last_hit_at=? WHERE url=? "
+                "AND content_hash=? AND provider=? AND model=? AND prompt_hash=?",
+                (time.time(), *key),
+            )
+        try:
+            return json.loads(row["result"])
+        except json.JSONDecodeError:
+            LOGGER.warning("Ignore corrupt cache entry, url=%s", key[0])
+            return None
+
+    def put(self, key: CacheKey, result: Dict[str, Any]) -> None:
+        """Store a successful summary result; failed results are ignored."""
+        if not result.get("success"):
+            return
+        payload = json.dumps(
+            {field: result.get(field) for field in CACHED_FIELDS}, ensure_ascii=False
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries "
+                "(url, content_hash, provider, model, prompt_hash, result, created_at, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                (*key, payload, time.time()),
+            )
+
+    def _filters(
+        self,
+        url: str | None,
+        model: str | None,
+        older_than_days: float | None,
+    ) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if url:
+            clauses.append("url=?")
+            params.append(canonicalize_url(url))
+        if model:
+            clauses.append("model=?")
+            params.append(model)
+        if older_than_days is not None:
+            clauses.append("created_at<?")
+            params.append(time.time() - older_than_days * 86400)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def entries(
+        self,
+        url: str | None = None,
+        model: str | None = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """List cache entries, newest first."""
+        where, params = self._filters(url, model, None)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, content_hash, provider, model, prompt_hash, result, "
+                f"created_at, last_hit_at, hits FROM summaries{where} "
+                "ORDER BY created_at DESC LIMIT ?",
+                (*params, int(limit)),
+            ).fetchall()
+        entries: List[Dict[str, Any]] = []
+        for row in rows:
+            entry = dict(row)
+            result = json.loads(entry.pop("result") or "{}")
+            entry["brief"] = result.get("brief", "")
+            entries.append(entry)
+        return entries
+
+    def evict(
+        self,
+        url: str | None = None,
+        model: str | None = None,
+        older_than_days: float | None = None,
+    ) -> int:
+        """Delete matching entries (all entries without filters); returns count."""
+        where, params = self._filters(url, model, older_than_days)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(f"DELETE FROM summaries{where}", params)
+        return int(cursor.rowcount)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry and hit counts for the whole cache."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS entries, COALESCE(SUM(hits), 0) AS hits, "
+                "MIN(created_at) AS oldest, MAX(created_at) AS newest FROM summaries"
+            ).fetchone()
+        return {"path": str(self.path), **dict(row)}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect and evict cached summaries.")
+    parser.add_argument(
+        "--path",
+        type=str,
+        default=DEFAULT_CACHE_PATH,
+        help=f"Cache database path (default: {DEFAULT_CACHE_PATH}).",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("stats", help="Show entry and hit counts.")
+
+    list_parser = subparsers.add_parser("list", help="List cached entries, newest first.")
+    list_parser.add_argument("--url", type=str, default=None)
+    list_parser.add_argument("--model", type=str, default=None)
+    list_parser.add_argument("--limit", type=int, default=50)
+
+    evict_parser = subparsers.add_parser("evict", help="Delete matching entries.")
+    evict_parser.add_argument("--url", type=str, default=None)
+    evict_parser.add_argument("--model", type=str, default=None)
+    evict_parser.add_argument("--older-than-days", type=float, default=None)
+    evict_parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Required to evict every entry when no filter is given.",
+    )
+    args = parser.parse_args(argv)
+
+    cache = SummaryCache(args.path)
+    try:
+        if args.command == "stats":
+            output: Any = cache.stats()
+        elif args.command == "list":
+            output = cache.entries(url=args.url, model=args.model, limit=args.limit)
+        else:
+            has_filter = args.url or args.model or args.older_than_days is not None
+            if not has_filter and not args.all:
+                parser.error("evict needs --url, --model, --older-than-days or --all.")
+            output = {
+                "evicted": cache.evict(
+                    url=args.url, model=args.model, older_than_days=args.older_than_days
+                )
+            }
+    finally:
+        cache.close()
+
+    print(json.dumps(output, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
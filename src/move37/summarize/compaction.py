@@ -0,0 +1,337 @@
+"""Prompt content compaction to cut input tokens before prompt rendering."""
+
+from __future__ import annotations
+
+import html
+import logging
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Tuple
+
+from .token_budget import estimate_tokens
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_COMPACTION_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "strip_markup": True,
+    "dedup_paragraphs": True,
+    "drop_link_lists": True,
+    "elide_code_blocks": False,
+    "max_tokens": 3000,
+}
+
+_HTML_TAG_RE = re.compile(r"</?[a-zA-Z][a-zA-Z0-9]*(?:\s[^>]*)?/?>")
+_MD_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_MD_LINK_RE = re.compile(r"\[([^\]]+)\]\([^)]*\)")
+_BARE_URL_LINE_RE = re.compile(r"^\s*(?:[-*•]\s*)?<?https?://\S+>?\s*$")
+_CODE_FENCE_RE = re.compile(r"```[^\n]*\n.*?(?:```|\Z)", re.DOTALL)
+_HEADING_RE = re.compile(r"^#{1,6}\s+\S")
+_INLINE_WS_RE = re.compile(r"[ \t\r\f\v\u00a0\u3000]+")
+
+# Tags whose whole subtree is page chrome rather than article content.
+_SKIP_TAGS = {
+    "aside",
+    "footer",
+    "form",
+    "header",
+    "iframe",
+    "nav",
+    "noscript",
+    "script",
+    "style",
+    "svg",
+}
+_BLOCK_TAGS = {
+    "article",
+    "blockquote",
+    "br",
+    "dd",
+    "div",
+    "dl",
+    "dt",
+    "figcaption",
+    "figure",
+    "hr",
+    "li",
+    "main",
+    "ol",
+    "p",
+    "section",
+    "table",
+    "tr",
+    "ul",
+}
+_HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+_VOID_TAGS = {"br", "hr", "img", "input", "meta", "link", "source", "wbr"}
+
+# A line is navigation/link-list residue when this share of it is link text.
+_LINK_LINE_RATIO = 0.8
+# Consecutive link lines needed before they are dropped as a link list.
+_LINK_LIST_MIN_RUN = 3
+
+
+class _TextExtractor(HTMLParser):
+    """Convert HTML into plain lines, tracking link-text share per line."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.lines: List[Tuple[str, bool]] = []
+        self._parts: List[str] = []
+        self._link_chars = 0
+        self._skip_depth = 0
+        self._link_depth = 0
+        self._pre_depth = 0
+
+    def _flush(self) -> None:
+        if self._pre_depth:
+            return
+        text = "".join(self._parts)
+        text = _INLINE_WS_RE.sub(" ", text).strip()
+        if text:
+            is_link_line = self._link_chars >= len(text) * _LINK_LINE_RATIO
+            self.lines.append((text, is_link_line))
+        self._parts = []
+        self._link_chars = 0
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, str | None]]) -> None:
+        if tag in _SKIP_TAGS:
+            if tag not in _VOID_TAGS:
+                self._skip_depth += 1
+            return
+        if self._skip_depth:
+            return
+        if tag == "pre":
+            self._flush()
+            self._pre_depth += 1
+            self._parts.append("```\n")
+        elif tag in _HEADING_TAGS:
+            self._flush()
+            self._parts.append("#" * int(tag[1]) + " ")
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+        elif tag == "a":
+            self._link_depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if self._skip_depth:
+            return
+        if tag == "pre" and self._pre_depth:
+            self._pre_depth -= 1
+            code = "".join(self._parts).rstrip("\n")
+            self._parts = []
+            self.lines.append((f"{code}\n```", False))
+        elif tag in _HEADING_TAGS or tag in _BLOCK_TAGS:
+            self._flush()
+        elif tag == "a":
+            self._link_depth = max(0, self._link_depth - 1)
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth:
+            return
+        self._parts.append(data)
+        if self._link_depth and not self._pre_depth:
+            self._link_chars += len(data.strip())
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+
+def _strip_markup(content: str) -> List[Tuple[str, bool]]:
+    if _HTML_TAG_RE.search(content):
+        extractor = _TextExtractor()
+        extractor.feed(content)
+        extractor.close()
+        return extractor.lines
+
+    lines: List[Tuple[str, bool]] = []
+    for block in _split_blocks(html.unescape(content)):
+        if block.startswith("```"):
+            lines.append((block, False))
+            continue
+        block = _MD_IMAGE_RE.sub("", block)
+        link_chars = sum(len(match.group(1)) for match in _MD_LINK_RE.finditer(block))
+        text = _INLINE_WS_RE.sub(" ", _MD_LINK_RE.sub(r"\1", block)).strip()
+        if not text:
+            continue
+        is_link_line = bool(_BARE_URL_LINE_RE.match(text)) or (
+            link_chars >= len(text) * _LINK_LINE_RATIO
+        )
+        lines.append((text, is_link_line))
+    return lines
+
+
+def extract_text(content: str | None) -> str:
+    """Return the readable text of feed HTML/Markdown, one paragraph per line.
+
+    Markup, page chrome and link lists are removed; nothing is capped. Used
+    where items are compared or scored rather than prompted (dedup, triage,
+    relevance).
+    """
+    text = str(content or "")
+    if not text.strip():
+        return ""
+    return "\n".join(line for line, _ in _drop_link_lists(_strip_markup(text)))
+
+
+def _split_blocks(content: str) -> List[str]:
+    """Split plain text into lines while keeping fenced code blocks whole."""
+    blocks: List[str] = []
+    position = 0
+    for match in _CODE_FENCE_RE.finditer(content):
+        blocks.extend(content[position : match.start()].splitlines())
+        blocks.append(match.group(0).strip())
+        position = match.end()
+    blocks.extend(content[position:].splitlines())
+    return blocks
+
+
+def _drop_link_lists(lines: List[Tuple[str, bool]]) -> List[Tuple[str, bool]]:
+    kept: List[Tuple[str, bool]] = []
+    run: List[Tuple[str, bool]] = []
+    for line in lines + [("", False)]:
+        if line[1]:
+            run.append(line)
+            continue
+        if len(run) < _LINK_LIST_MIN_RUN:
+            kept.extend(run)
+        run = []
+        if line[0]:
+            kept.append(line)
+    return kept
+
+
+def _dedup_paragraphs(paragraphs: List[str]) -> List[str]:
+    seen = set()
+    deduped: List[str] = []
+    for paragraph in paragraphs:
+        key = _INLINE_WS_RE.sub(" ", paragraph).strip().lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        deduped.append(paragraph)
+    return deduped
+
+
+def _elide_code_block(paragraph: str) -> str:
+    line_count = max(0, paragraph.count("\n") - 1)
+    return f"[代码块已省略，共{line_count}行]"
+
+
+def _cap_to_budget(
+    paragraphs: List[str],
+    max_tokens: int,
+    provider: str,
+    model: str,
+) -> List[str]:
+    """Keep the lead paragraphs plus section heads within `max_tokens`."""
+    costs = [estimate_tokens(paragraph, provider, model) for paragraph in paragraphs]
+    heading_indexes = [i for i, paragraph in enumerate(paragraphs) if _HEADING_RE.match(paragraph)]
+
+    # Reserve room for every later section head before filling the lead.
+    heads_cost = sum(costs[i] for i in heading_indexes)
+    lead_budget = max(max_tokens // 2, max_tokens - heads_cost)
+
+    kept_indexes: List[int] = []
+    used = 0
+    lead_end = 0
+    for index, cost in enumerate(costs):
+        if used + cost > lead_budget:
+            break
+        kept_indexes.append(index)
+        used += cost
+        lead_end = index + 1
+
+    for index in heading_indexes:
+        if index < lead_end:
+            continue
+        if used + costs[index] > max_tokens:
+            break
+        kept_indexes.append(index)
+        used += costs[index]
+        # Keep the section's first paragraph when it still fits.
+        follower = index + 1
+        if (
+            follower < len(paragraphs)
+            and follower not in heading_indexes
+            and used + costs[follower] <= max_tokens
+        ):
+            kept_indexes.append(follower)
+            used += costs[follower]
+
+    if not kept_indexes and paragraphs:
+        # A single oversized lead paragraph: slice it proportionally.
+        ratio = max_tokens / max(1, costs[0])
+        return [paragraphs[0][: max(1, int(len(paragraphs[0]) * ratio))] + "……"]
+
+    capped: List[str] = []
+    previous = -1
+    for index in sorted(set(kept_indexes)):
+        if previous >= 0 and index != previous + 1:
+            capped.append("……")
+        capped.append(paragraphs[index])
+        previous = index
+    if previous != len(paragraphs) - 1:
+        capped.append("……")
+    return capped
+
+
+def compact_content(
+    content: str | None,
+    provider: str,
+    model: str,
+    options: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
+    """Compact extracted article text before it is rendered into a prompt.
+
+    Returns a dictionary with the compacted `content`, `original_tokens`,
+    `compacted_tokens` and `tokens_saved`.
+    """
+    settings = dict(DEFAULT_COMPACTION_CONFIG)
+    settings.update(options or {})
+    text = str(content or "")
+    original_tokens = estimate_tokens(text, provider, model)
+
+    if not text.strip() or not settings.get("enabled", True):
+        return {
+            "content": text,
+            "original_tokens": original_tokens,
+            "compacted_tokens": original_tokens,
+            "tokens_saved": 0,
+        }
+
+    if settings.get("strip_markup", True):
+        lines = _strip_markup(text)
+    else:
+        lines = [(line.strip(), False) for line in _split_blocks(text) if line.strip()]
+
+    if settings.get("drop_link_lists", True):
+        lines = _drop_link_lists(lines)
+
+    paragraphs = [line for line, _ in lines]
+    if settings.get("dedup_paragraphs", True):
+        paragraphs = _dedup_paragraphs(paragraphs)
+    if settings.get("elide_code_blocks", False):
+        paragraphs = [
+            _elide_code_block(paragraph) if paragraph.startswith("```") else paragraph
+            for paragraph in paragraphs
+        ]
+
+    max_tokens = int(settings.get("max_tokens") or 0)
+    if max_tokens > 0:
+        total = sum(estimate_tokens(paragraph, provider, model) for paragraph in paragraphs)
+        if total > max_tokens:
+            paragraphs = _cap_to_budget(paragraphs, max_tokens, provider, model)
+
+    compacted = "\n\n".join(paragraphs)
+    compacted_tokens = estimate_tokens(compacted, provider, model)
+    return {
+        "content": compacted,
+        "original_tokens": original_tokens,
+        "compacted_tokens": compacted_tokens,
+        "tokens_saved": max(0, original_tokens - compacted_tokens),
+    }
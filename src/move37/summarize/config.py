@@ -32,7 +32,49 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "max_tokens": 2000,
     "timeout": 60,
     "max_retries": 3,
+    "context_window": None,
     "prompt_template": DEFAULT_PROMPT_TEMPLATE,
+    "structured_output": True,
+    "streaming": False,
+    "compaction_enabled": True,
+    "compaction_dedup": True,
+    "compaction_drop_link_lists": True,
+    "compaction_elide_code": False,
+    "compaction_max_tokens": 3000,
+    "concurrency": 1,
+    "gemini_concurrency": None,
+    "rate_limit_rpm": 0,
+    "rate_limit_tpm": 0,
+    "hedge_provider": None,
+    "hedge_delay": 10.0,
+    "hedge_max_ratio": 0.2,
+    "hedge_max_wasted_tokens": 0,
+    "batch_enabled": False,
+    "batch_poll_interval": 30.0,
+    "batch_deadline": 3600.0,
+    "batch_sync_reserve": 600.0,
+    "dedup_enabled": False,
+    "dedup_threshold": 0.8,
+    "relevance_enabled": False,
+    "relevance_model_path": ".cache/move37/relevance.npz",
+    "relevance_history_path": ".cache/move37/relevance_history.jsonl",
+    "relevance_drop_threshold": 0.2,
+    "triage_enabled": False,
+    "triage_provider": None,
+    "triage_model": None,
+    "triage_threshold": 6.0,
+    "triage_batch_size": 20,
+    "triage_lead_chars": 600,
+    "triage_topic": "AI, large language models, machine learning and their engineering practice",
+    "packing_enabled": False,
+    "packing_max_items": 8,
+    "packing_short_tokens": 400,
+    "packing_item_output_tokens": 400,
+    "cache_enabled": True,
+    "cache_path": ".cache/move37/summaries.sqlite3",
+    "gemini_model_cache_enabled": True,
+    "gemini_model_cache_path": ".cache/move37/gemini_models.json",
+    "gemini_model_cache_ttl": 86400.0,
 }
 
 
@@ -110,6 +152,31 @@ def _to_int(value: Any, default: int, field_name: str) -> int:
         ) from exc
 
 
+def _to_bool(value: Any, default: bool, field_name: str) -> bool:
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    normalized = str(value).strip().lower()
+    if normalized in {"1", "true", "yes", "on"}:
+        return True
+    if normalized in {"0", "false", "no", "off"}:
+        return False
+    raise ConfigurationError(f"Invalid `{field_name}` value: {value!r}. Expected boolean.")
+
+
+def _override_or_env(
+    overrides: Dict[str, Any],
+    env_values: Dict[str, str],
+    field_name: str,
+    env_key: str,
+) -> Any:
+    value = overrides.get(field_name)
+    if value is None:
+        value = _pick_value(env_values, env_key)
+    return value
+
+
 def load_config(
     config: Optional[Dict[str, Any]] = None,
     env_path: Optional[str | Path] = None,
@@ -132,14 +199,24 @@ def load_config(
     provider_prefix = f"LLM_{provider.upper()}_"
     provider_defaults = PROVIDER_CONFIGS[provider]
 
+    api_keys_raw = overrides.get("api_keys")
+    if api_keys_raw is None:
+        api_keys_raw = _pick_value(env_values, f"{provider_prefix}API_KEYS")
+    if isinstance(api_keys_raw, str):
+        api_keys_raw = api_keys_raw.split(",")
+    pooled_keys = [str(key).strip() for key in (api_keys_raw or []) if str(key).strip()]
+
     api_key = overrides.get("api_key") or _pick_value(env_values, f"{provider_prefix}API_KEY")
     if isinstance(api_key, str):
         api_key = api_key.strip()
+    if not api_key and pooled_keys:
+        api_key = pooled_keys[0]
     if not api_key:
         raise ConfigurationError(
             f"Missing API key for provider `{provider}`. "
-            f"Please set `{provider_prefix}API_KEY` in .env."
+            f"Please set `{provider_prefix}API_KEY` (or `{provider_prefix}API_KEYS`) in .env."
         )
+    api_keys = list(dict.fromkeys([str(api_key), *pooled_keys]))
 
     model = str(
         overrides.get("model")
@@ -186,6 +263,15 @@ def load_config(
     if max_retries <= 0:
         raise ConfigurationError("`max_retries` must be greater than 0.")
 
+    context_window_raw = overrides.get("context_window")
+    if context_window_raw is None:
+        context_window_raw = _pick_value(env_values, "LLM_CONTEXT_WINDOW")
+    context_window: Optional[int] = None
+    if context_window_raw not in (None, ""):
+        context_window = _to_int(context_window_raw, 0, "context_window")
+        if context_window <= max_tokens:
+            raise ConfigurationError("`context_window` must be greater than `max_tokens`.")
+
     prompt_template = str(
         overrides.get("prompt_template")
         or _pick_value(env_values, "LLM_PROMPT_TEMPLATE")
@@ -194,14 +280,351 @@ def load_config(
     if "{url}" not in prompt_template:
         raise ConfigurationError("`prompt_template` must include `{url}` placeholder.")
 
+    structured_output = _to_bool(
+        _override_or_env(overrides, env_values, "structured_output", "LLM_STRUCTURED_OUTPUT"),
+        bool(DEFAULT_CONFIG["structured_output"]),
+        "structured_output",
+    )
+    streaming = _to_bool(
+        _override_or_env(overrides, env_values, "streaming", "LLM_STREAMING"),
+        bool(DEFAULT_CONFIG["streaming"]),
+        "streaming",
+    )
+
+    compaction_enabled = _to_bool(
+        _override_or_env(overrides, env_values, "compaction_enabled", "LLM_COMPACTION_ENABLED"),
+        bool(DEFAULT_CONFIG["compaction_enabled"]),
+        "compaction_enabled",
+    )
+    compaction_max_tokens = _to_int(
+        _override_or_env(
+            overrides, env_values, "compaction_max_tokens", "LLM_COMPACTION_MAX_TOKENS"
+        ),
+        int(DEFAULT_CONFIG["compaction_max_tokens"]),
+        "compaction_max_tokens",
+    )
+    if compaction_max_tokens < 0:
+        raise ConfigurationError("`compaction_max_tokens` must be 0 (no cap) or greater.")
+    compaction = {
+        "enabled": compaction_enabled,
+        "dedup_paragraphs": _to_bool(
+            _override_or_env(overrides, env_values, "compaction_dedup", "LLM_COMPACTION_DEDUP"),
+            bool(DEFAULT_CONFIG["compaction_dedup"]),
+            "compaction_dedup",
+        ),
+        "drop_link_lists": _to_bool(
+            _override_or_env(
+                overrides,
+                env_values,
+                "compaction_drop_link_lists",
+                "LLM_COMPACTION_DROP_LINK_LISTS",
+            ),
+            bool(DEFAULT_CONFIG["compaction_drop_link_lists"]),
+            "compaction_drop_link_lists",
+        ),
+        "elide_code_blocks": _to_bool(
+            _override_or_env(
+                overrides, env_values, "compaction_elide_code", "LLM_COMPACTION_ELIDE_CODE"
+            ),
+            bool(DEFAULT_CONFIG["compaction_elide_code"]),
+            "compaction_elide_code",
+        ),
+        "max_tokens": compaction_max_tokens,
+    }
+
+    concurrency = _to_int(
+        _override_or_env(overrides, env_values, "concurrency", "LLM_CONCURRENCY"),
+        int(DEFAULT_CONFIG["concurrency"]),
+        "concurrency",
+    )
+    if concurrency <= 0:
+        raise ConfigurationError("`concurrency` must be greater than 0.")
+    gemini_concurrency = _to_int(
+        _override_or_env(overrides, env_values, "gemini_concurrency", "LLM_GEMINI_CONCURRENCY"),
+        concurrency,
+        "gemini_concurrency",
+    )
+    if gemini_concurrency <= 0:
+        raise ConfigurationError("`gemini_concurrency` must be greater than 0.")
+
+    rate_limit_rpm = _to_int(
+        _override_or_env(overrides, env_values, "rate_limit_rpm", f"{provider_prefix}RPM"),
+        int(DEFAULT_CONFIG["rate_limit_rpm"]),
+        "rate_limit_rpm",
+    )
+    rate_limit_tpm = _to_int(
+        _override_or_env(overrides, env_values, "rate_limit_tpm", f"{provider_prefix}TPM"),
+        int(DEFAULT_CONFIG["rate_limit_tpm"]),
+        "rate_limit_tpm",
+    )
+    if rate_limit_rpm < 0 or rate_limit_tpm < 0:
+        raise ConfigurationError(
+            "`rate_limit_rpm` / `rate_limit_tpm` must be 0 (no limit) or greater."
+        )
+    rate_limit = {"rpm": rate_limit_rpm, "tpm": rate_limit_tpm, "max_concurrency": concurrency}
+
+    hedge_provider = str(
+        _override_or_env(overrides, env_values, "hedge_provider", "LLM_HEDGE_PROVIDER") or ""
+    ).strip().lower() or None
+    if hedge_provider is not None:
+        if hedge_provider not in PROVIDER_CONFIGS:
+            supported = ", ".join(sorted(PROVIDER_CONFIGS))
+            raise ConfigurationError(
+                f"Unsupported hedge provider `{hedge_provider}`. Supported: {supported}"
+            )
+        if hedge_provider == provider:
+            raise ConfigurationError("`hedge_provider` must differ from `provider`.")
+    hedge_delay = _to_float(
+        _override_or_env(overrides, env_values, "hedge_delay", "LLM_HEDGE_DELAY"),
+        float(DEFAULT_CONFIG["hedge_delay"]),
+        "hedge_delay",
+    )
+    hedge_max_ratio = _to_float(
+        _override_or_env(overrides, env_values, "hedge_max_ratio", "LLM_HEDGE_MAX_RATIO"),
+        float(DEFAULT_CONFIG["hedge_max_ratio"]),
+        "hedge_max_ratio",
+    )
+    hedge_max_wasted_tokens = _to_int(
+        _override_or_env(
+            overrides, env_values, "hedge_max_wasted_tokens", "LLM_HEDGE_MAX_WASTED_TOKENS"
+        ),
+        int(DEFAULT_CONFIG["hedge_max_wasted_tokens"]),
+        "hedge_max_wasted_tokens",
+    )
+    if hedge_delay <= 0:
+        raise ConfigurationError("`hedge_delay` must be greater than 0.")
+    if not (0 <= hedge_max_ratio <= 1):
+        raise ConfigurationError("`hedge_max_ratio` must be between 0 and 1.")
+    if hedge_max_wasted_tokens < 0:
+        raise ConfigurationError("`hedge_max_wasted_tokens` must be 0 (no cap) or greater.")
+    hedging = {
+        "provider": hedge_provider,
+        "delay": hedge_delay,
+        "max_ratio": hedge_max_ratio,
+        "max_wasted_tokens": hedge_max_wasted_tokens,
+    }
+
+    batch = {
+        "enabled": _to_bool(
+            _override_or_env(overrides, env_values, "batch_enabled", "LLM_BATCH_ENABLED"),
+            bool(DEFAULT_CONFIG["batch_enabled"]),
+            "batch_enabled",
+        ),
+        "poll_interval": _to_float(
+            _override_or_env(
+                overrides, env_values, "batch_poll_interval", "LLM_BATCH_POLL_INTERVAL"
+            ),
+            float(DEFAULT_CONFIG["batch_poll_interval"]),
+            "batch_poll_interval",
+        ),
+        "deadline": _to_float(
+            _override_or_env(overrides, env_values, "batch_deadline", "LLM_BATCH_DEADLINE"),
+            float(DEFAULT_CONFIG["batch_deadline"]),
+            "batch_deadline",
+        ),
+        "sync_reserve": _to_float(
+            _override_or_env(
+                overrides, env_values, "batch_sync_reserve", "LLM_BATCH_SYNC_RESERVE"
+            ),
+            float(DEFAULT_CONFIG["batch_sync_reserve"]),
+            "batch_sync_reserve",
+        ),
+    }
+    if batch["enabled"] and provider == "gemini":
+        raise ConfigurationError("`batch_enabled` requires an OpenAI-compatible provider.")
+    if batch["poll_interval"] <= 0 or batch["deadline"] <= 0:
+        raise ConfigurationError("`batch_poll_interval` and `batch_deadline` must be > 0.")
+    if not (0 <= batch["sync_reserve"] < batch["deadline"]):
+        raise ConfigurationError("`batch_sync_reserve` must be between 0 and `batch_deadline`.")
+
+    dedup = {
+        "enabled": _to_bool(
+            _override_or_env(overrides, env_values, "dedup_enabled", "LLM_DEDUP_ENABLED"),
+            bool(DEFAULT_CONFIG["dedup_enabled"]),
+            "dedup_enabled",
+        ),
+        "threshold": _to_float(
+            _override_or_env(overrides, env_values, "dedup_threshold", "LLM_DEDUP_THRESHOLD"),
+            float(DEFAULT_CONFIG["dedup_threshold"]),
+            "dedup_threshold",
+        ),
+    }
+    if not (0 < dedup["threshold"] <= 1):
+        raise ConfigurationError("`dedup_threshold` must be in (0, 1].")
+
+    relevance = {
+        "enabled": _to_bool(
+            _override_or_env(overrides, env_values, "relevance_enabled", "LLM_RELEVANCE_ENABLED"),
+            bool(DEFAULT_CONFIG["relevance_enabled"]),
+            "relevance_enabled",
+        ),
+        "model_path": str(
+            _override_or_env(
+                overrides, env_values, "relevance_model_path", "LLM_RELEVANCE_MODEL_PATH"
+            )
+            or DEFAULT_CONFIG["relevance_model_path"]
+        ).strip(),
+        "history_path": str(
+            _override_or_env(
+                overrides, env_values, "relevance_history_path", "LLM_RELEVANCE_HISTORY_PATH"
+            )
+            or DEFAULT_CONFIG["relevance_history_path"]
+        ).strip(),
+        "drop_threshold": _to_float(
+            _override_or_env(
+                overrides, env_values, "relevance_drop_threshold", "LLM_RELEVANCE_DROP_THRESHOLD"
+            ),
+            float(DEFAULT_CONFIG["relevance_drop_threshold"]),
+            "relevance_drop_threshold",
+        ),
+    }
+    if not (0 <= relevance["drop_threshold"] < 1):
+        raise ConfigurationError("`relevance_drop_threshold` must be in [0, 1).")
+
+    triage_provider = str(
+        _override_or_env(overrides, env_values, "triage_provider", "LLM_TRIAGE_PROVIDER")
+        or provider
+    ).strip().lower()
+    if triage_provider not in PROVIDER_CONFIGS:
+        supported = ", ".join(sorted(PROVIDER_CONFIGS))
+        raise ConfigurationError(
+            f"Unsupported triage provider `{triage_provider}`. Supported: {supported}"
+        )
+    triage = {
+        "enabled": _to_bool(
+            _override_or_env(overrides, env_values, "triage_enabled", "LLM_TRIAGE_ENABLED"),
+            bool(DEFAULT_CONFIG["triage_enabled"]),
+            "triage_enabled",
+        ),
+        "provider": triage_provider,
+        "model": str(
+            _override_or_env(overrides, env_values, "triage_model", "LLM_TRIAGE_MODEL") or ""
+        ).strip()
+        or None,
+        "threshold": _to_float(
+            _override_or_env(overrides, env_values, "triage_threshold", "LLM_TRIAGE_THRESHOLD"),
+            float(DEFAULT_CONFIG["triage_threshold"]),
+            "triage_threshold",
+        ),
+        "batch_size": _to_int(
+            _override_or_env(
+                overrides, env_values, "triage_batch_size", "LLM_TRIAGE_BATCH_SIZE"
+            ),
+            int(DEFAULT_CONFIG["triage_batch_size"]),
+            "triage_batch_size",
+        ),
+        "lead_chars": _to_int(
+            _override_or_env(
+                overrides, env_values, "triage_lead_chars", "LLM_TRIAGE_LEAD_CHARS"
+            ),
+            int(DEFAULT_CONFIG["triage_lead_chars"]),
+            "triage_lead_chars",
+        ),
+        "topic": str(
+            _override_or_env(overrides, env_values, "triage_topic", "LLM_TRIAGE_TOPIC")
+            or DEFAULT_CONFIG["triage_topic"]
+        ).strip(),
+    }
+    if not (0 <= triage["threshold"] <= 10):
+        raise ConfigurationError("`triage_threshold` must be between 0 and 10.")
+    if triage["batch_size"] <= 0 or triage["lead_chars"] <= 0:
+        raise ConfigurationError("`triage_batch_size` and `triage_lead_chars` must be > 0.")
+
+    packing = {
+        "enabled": _to_bool(
+            _override_or_env(overrides, env_values, "packing_enabled", "LLM_PACKING_ENABLED"),
+            bool(DEFAULT_CONFIG["packing_enabled"]),
+            "packing_enabled",
+        ),
+        "max_items": _to_int(
+            _override_or_env(overrides, env_values, "packing_max_items", "LLM_PACKING_MAX_ITEMS"),
+            int(DEFAULT_CONFIG["packing_max_items"]),
+            "packing_max_items",
+        ),
+        "short_item_tokens": _to_int(
+            _override_or_env(
+                overrides, env_values, "packing_short_tokens", "LLM_PACKING_SHORT_TOKENS"
+            ),
+            int(DEFAULT_CONFIG["packing_short_tokens"]),
+            "packing_short_tokens",
+        ),
+        "item_output_tokens": _to_int(
+            _override_or_env(
+                overrides,
+                env_values,
+                "packing_item_output_tokens",
+                "LLM_PACKING_ITEM_OUTPUT_TOKENS",
+            ),
+            int(DEFAULT_CONFIG["packing_item_output_tokens"]),
+            "packing_item_output_tokens",
+        ),
+    }
+    if min(packing["max_items"], packing["short_item_tokens"], packing["item_output_tokens"]) <= 0:
+        raise ConfigurationError("Packing limits must be greater than 0.")
+
+    cache_enabled = _to_bool(
+        _override_or_env(overrides, env_values, "cache_enabled", "LLM_CACHE_ENABLED"),
+        bool(DEFAULT_CONFIG["cache_enabled"]),
+        "cache_enabled",
+    )
+    cache_path = str(
+        _override_or_env(overrides, env_values, "cache_path", "LLM_CACHE_PATH")
+        or DEFAULT_CONFIG["cache_path"]
+    ).strip()
+
+    gemini_model_cache = {
+        "enabled": _to_bool(
+            _override_or_env(
+                overrides,
+                env_values,
+                "gemini_model_cache_enabled",
+                "LLM_GEMINI_MODEL_CACHE_ENABLED",
+            ),
+            bool(DEFAULT_CONFIG["gemini_model_cache_enabled"]),
+            "gemini_model_cache_enabled",
+        ),
+        "path": str(
+            _override_or_env(
+                overrides, env_values, "gemini_model_cache_path", "LLM_GEMINI_MODEL_CACHE_PATH"
+            )
+            or DEFAULT_CONFIG["gemini_model_cache_path"]
+        ).strip(),
+        "ttl": _to_float(
+            _override_or_env(
+                overrides, env_values, "gemini_model_cache_ttl", "LLM_GEMINI_MODEL_CACHE_TTL"
+            ),
+            float(DEFAULT_CONFIG["gemini_model_cache_ttl"]),
+            "gemini_model_cache_ttl",
+        ),
+    }
+    if gemini_model_cache["ttl"] <= 0:
+        raise ConfigurationError("`gemini_model_cache_ttl` must be greater than 0.")
+
     return {
         "provider": provider,
         "api_key": str(api_key),
+        "api_keys": api_keys,
         "model": model,
         "base_url": base_url,
         "temperature": temperature,
         "max_tokens": max_tokens,
         "timeout": timeout,
         "max_retries": max_retries,
+        "context_window": context_window,
         "prompt_template": prompt_template,
+        "structured_output": structured_output,
+        "streaming": streaming,
+        "compaction": compaction,
+        "concurrency": concurrency,
+        "gemini_concurrency": gemini_concurrency,
+        "rate_limit": rate_limit,
+        "hedging": hedging,
+        "batch": batch,
+        "dedup": dedup,
+        "relevance": relevance,
+        "triage": triage,
+        "packing": packing,
+        "cache_enabled": cache_enabled,
+        "cache_path": cache_path,
+        "gemini_model_cache": gemini_model_cache,
     }
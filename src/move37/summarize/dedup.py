@@ -0,0 +1,159 @@
+"""Near-duplicate detection with NumPy MinHash signatures and LSH banding."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Sequence
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_DEDUP_CONFIG: Dict[str, Any] = {
+    "enabled": False,
+    "threshold": 0.8,
+    "num_perm": 64,
+    "bands": 16,
+    "shingle_size": 5,
+    "max_chars": 2000,
+    "min_chars": 200,
+}
+
+# Rolling-hash base for character shingles (odd, so multiplication is invertible).
+_SHINGLE_BASE = 0x100000001B3
+
+
+def _numpy() -> Any:
+    try:
+        import numpy as np
+    except ImportError as exc:  # pragma: no cover
+        raise RuntimeError("numpy package is required. Install with `pip install numpy`.") from exc
+    return np
+
+
+def normalize_text(text: str, max_chars: int = DEFAULT_DEDUP_CONFIG["max_chars"]) -> str:
+    """Lowercase and collapse whitespace; only the first `max_chars` characters count."""
+    # Cut before splitting so long articles are not normalized in full.
+    return " ".join(str(text or "")[: max_chars * 2].lower().split())[:max_chars]
+
+
+def _mix64(np: Any, values: Any) -> Any:
+    """SplitMix64 finalizer: spread polynomial shingle hashes over all 64 bits."""
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def minhash_signatures(
+    texts: Sequence[str],
+    num_perm: int = DEFAULT_DEDUP_CONFIG["num_perm"],
+    shingle_size: int = DEFAULT_DEDUP_CONFIG["shingle_size"],
+    max_chars: int = DEFAULT_DEDUP_CONFIG["max_chars"],
+) -> Any:
+    """Return a (len(texts), num_perm) uint32 MinHash matrix over character shingles.
+
+    Uses one-permutation hashing: each shingle is hashed once, its top bits pick
+    one of `num_perm` bins and the bin keeps the minimum of the low 32 bits.
+    Empty bins borrow the next non-empty bin (rotation densification). Everything
+    runs on the concatenated code points of all texts at once. Texts shorter
+    than `shingle_size` get a row of the maximum value, which never matches.
+    """
+    np = _numpy()
+    if num_perm <= 0 or num_perm & (num_perm - 1):
+        raise ValueError("`num_perm` must be a power of two.")
+    empty_value = np.iinfo(np.uint32).max
+    normalized = [normalize_text(text, max_chars) for text in texts]
+    lengths = np.array([len(text) for text in normalized], dtype=np.int64)
+    signatures = np.full((len(normalized), num_perm), empty_value, dtype=np.uint32)
+    if not normalized or int(lengths.sum()) < shingle_size:
+        return signatures
+
+    code_points = np.frombuffer("".join(normalized).encode("utf-32-le"), dtype=np.uint32)
+    code_points = code_points.astype(np.uint64)
+    window_count = code_points.size - shingle_size + 1
+
+    # Polynomial hash of each k-character window; uint64 arithmetic wraps mod 2**64.
+    shingles = np.zeros(window_count, dtype=np.uint64)
+    for offset in range(shingle_size):
+        power = np.uint64(pow(_SHINGLE_BASE, shingle_size - 1 - offset, 1 << 64))
+        shingles += code_points[offset : offset + window_count] * power
+
+    # Keep windows that lie entirely inside one text.
+    ends = np.cumsum(lengths)
+    doc_of_window = np.repeat(np.arange(len(normalized), dtype=np.uint64), lengths)
+    doc_of_window = doc_of_window[:window_count]
+    valid = np.arange(window_count) + shingle_size <= ends[doc_of_window.astype(np.int64)]
+    hashes = _mix64(np, shingles[valid])
+    if hashes.size == 0:
+        return signatures
+
+    # Sort (text, bin, value) packed into one uint64; the first entry per cell is its min.
+    bin_bits = num_perm.bit_length() - 1
+    cells = doc_of_window[valid] * np.uint64(num_perm)
+    if bin_bits:
+        cells += hashes >> np.uint64(64 - bin_bits)
+    packed = np.sort((cells << np.uint64(32)) | (hashes & np.uint64(0xFFFFFFFF)))
+    cell_of_entry = packed >> np.uint64(32)
+    first = np.flatnonzero(np.r_[True, cell_of_entry[1:] != cell_of_entry[:-1]])
+    signatures.ravel()[cell_of_entry[first].astype(np.int64)] = (
+        packed[first] & np.uint64(0xFFFFFFFF)
+    ).astype(np.uint32)
+
+    has_shingles = np.any(signatures != empty_value, axis=1)
+    for step in range(1, num_perm):
+        missing = (signatures == empty_value) & has_shingles[:, None]
+        if not missing.any():
+            break
+        donor = np.roll(signatures, -step, axis=1)
+        signatures[missing] = np.where(donor != empty_value, donor, empty_value)[missing]
+    return signatures
+
+
+def find_duplicate_clusters(
+    texts: Sequence[str],
+    threshold: float = DEFAULT_DEDUP_CONFIG["threshold"],
+    num_perm: int = DEFAULT_DEDUP_CONFIG["num_perm"],
+    bands: int = DEFAULT_DEDUP_CONFIG["bands"],
+    shingle_size: int = DEFAULT_DEDUP_CONFIG["shingle_size"],
+    max_chars: int = DEFAULT_DEDUP_CONFIG["max_chars"],
+) -> List[List[int]]:
+    """Group texts whose estimated Jaccard similarity is at least `threshold`.
+
+    Signatures are split into `bands` LSH bands; texts sharing a band bucket are
+    verified against the bucket's first member. Returns clusters of two or
+    more indices, each sorted, in order of their first index.
+    """
+    np = _numpy()
+    if bands <= 0 or num_perm % bands:
+        raise ValueError("`num_perm` must be a positive multiple of `bands`.")
+    signatures = minhash_signatures(texts, num_perm, shingle_size, max_chars)
+    count = signatures.shape[0]
+    parent = list(range(count))
+
+    def _root(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    empty = np.all(signatures == np.iinfo(np.uint32).max, axis=1)
+    rows = num_perm // bands
+    for band in range(bands):
+        keys = np.ascontiguousarray(signatures[:, band * rows : (band + 1) * rows])
+        keys = keys.view(np.dtype((np.void, rows * 4))).ravel()
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        for bucket in np.flatnonzero(counts > 1):
+            members = np.flatnonzero((inverse.ravel() == bucket) & ~empty)
+            if members.size < 2:
+                continue
+            similarity = (signatures[members] == signatures[members[0]]).mean(axis=1)
+            for member in members[1:][similarity[1:] >= threshold]:
+                parent[_root(int(member))] = _root(int(members[0]))
+
+    clusters: Dict[int, List[int]] = {}
+    for index in range(count):
+        clusters.setdefault(_root(index), []).append(index)
+    return sorted(
+        (members for members in clusters.values() if len(members) > 1),
+        key=lambda members: members[0],
+    )
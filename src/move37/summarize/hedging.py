@@ -0,0 +1,276 @@
+"""Hedged requests across two LLM providers to cut tail latency."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Deque, Dict, Tuple
+
+from .llm_client import LLMClient
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_HEDGING_CONFIG: Dict[str, Any] = {
+    "delay": 10.0,
+    "max_ratio": 0.2,
+    "max_wasted_tokens": 0,
+}
+
+# Successful primary latencies kept for the p90 estimate.
+_LATENCY_WINDOW = 50
+# Samples needed before the observed p90 replaces the configured delay.
+_MIN_LATENCY_SAMPLES = 5
+
+
+class LatencyWindow:
+    """Recent successful primary latencies, for the p90 hedge delay."""
+
+    def __init__(self, size: int = _LATENCY_WINDOW) -> None:
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def p90(self, default: float) -> float:
+        """Observed p90, or `default` until enough samples exist."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < _MIN_LATENCY_SAMPLES:
+            return default
+        return samples[min(len(samples) - 1, math.ceil(len(samples) * 0.9) - 1)]
+
+
+_WINDOWS_LOCK = threading.Lock()
+_LATENCY_WINDOWS: Dict[Tuple[str, str], LatencyWindow] = {}
+
+
+def shared_latency_window(provider: str, model: str) -> LatencyWindow:
+    """Process-wide window for one primary provider/model.
+
+    Hedged clients built for separate `summarize_all` calls (per-source runs
+    in the streaming pipeline, scheduled runs) keep one latency history.
+    """
+    with _WINDOWS_LOCK:
+        return _LATENCY_WINDOWS.setdefault((provider, model), LatencyWindow())
+
+
+class HedgedLLMClient:
+    """Send a request to `primary`, and to `secondary` when primary is slow.
+
+    The hedge fires once the primary has been running longer than its p90
+    latency (or `delay` seconds until enough samples exist). The first
+    successful JSON result wins. Hedges are capped to `max_ratio` of requests
+    and stop once `max_wasted_tokens` (0 = no cap) have been spent on losers.
+    """
+
+    def __init__(
+        self,
+        primary: LLMClient,
+        secondary: LLMClient,
+        delay: float = DEFAULT_HEDGING_CONFIG["delay"],
+        max_ratio: float = DEFAULT_HEDGING_CONFIG["max_ratio"],
+        max_wasted_tokens: int = DEFAULT_HEDGING_CONFIG["max_wasted_tokens"],
+        max_workers: int = 4,
+        latencies: LatencyWindow | None = None,
+    ) -> None:
+        self.primary = primary
+        self.secondary = secondary
+        self.delay = float(delay)
+        self.max_ratio = float(max_ratio)
+        self.max_wasted_tokens = int(max_wasted_tokens)
+        self._latencies = latencies if latencies is not None else LatencyWindow()
+        self._lock = threading.Lock()
+        # Two requests per item can be in flight at once.
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(2, int(max_workers) * 2), thread_name_prefix="summarize-hedge"
+        )
+        self._stats: Dict[str, int] = {
+            "requests": 0,
+            "hedged": 0,
+            "primary_wins": 0,
+            "secondary_wins": 0,
+            "tokens_wasted": 0,
+        }
+
+    @property
+    def provider(self) -> str:
+        return self.primary.provider
+
+    @property
+    def model(self) -> str:
+        return self.primary.model
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait on the primary before hedging: observed p90 or `delay`."""
+        return self._latencies.p90(self.delay)
+
+    def _may_hedge(self) -> bool:
+        with self._lock:
+            if self.max_wasted_tokens and self._stats["tokens_wasted"] >= self.max_wasted_tokens:
+                return False
+            return self._stats["hedged"] < self.max_ratio * self._stats["requests"]
+
+    def _start_request(self) -> None:
+        with self._lock:
+            self._stats["requests"] += 1
+
+    def _record_hedge(self, url: str, delay: float) -> None:
+        with self._lock:
+            self._stats["hedged"] += 1
+        LOGGER.info(
+            "Hedging URL=%s to provider=%s after %.1fs without a primary answer",
+            url,
+            self.secondary.provider,
+            delay,
+        )
+
+    def _record_latency(self, seconds: float) -> None:
+        self._latencies.add(seconds)
+
+    def _record_waste(self, future: Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        tokens = int((future.result() or {}).get("tokens_consumed", 0) or 0)
+        if tokens:
+            with self._lock:
+                self._stats["tokens_wasted"] += tokens
+
+    def _finish(
+        self,
+        result: Dict[str, Any],
+        winner: LLMClient,
+        hedged: bool,
+    ) -> Dict[str, Any]:
+        if hedged:
+            key = "primary_wins" if winner is self.primary else "secondary_wins"
+            with self._lock:
+                self._stats[key] += 1
+        result["hedged"] = hedged
+        result["hedge_winner"] = winner.provider
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hedging counters for run reports."""
+        hedge_delay = round(self.hedge_delay(), 2)
+        with self._lock:
+            return {
+                "primary": self.primary.provider,
+                "secondary": self.secondary.provider,
+                "hedge_delay": hedge_delay,
+                **self._stats,
+            }
+
+    def generate_summary(
+        self,
+        url: str,
+        prompt_template: str,
+        content: str | None = None,
+        chunk_size: int | None = None,
+    ) -> Dict[str, Any]:
+        """Generate a summary, hedging to the secondary provider when slow."""
+        self._start_request()
+        kwargs = {
+            "url": url,
+            "prompt_template": prompt_template,
+            "content": content,
+            "chunk_size": chunk_size,
+        }
+        started_at = time.time()
+        delay = self.hedge_delay()
+        primary_future = self._executor.submit(self.primary.generate_summary, **kwargs)
+        done, _ = wait([primary_future], timeout=delay)
+        if done:
+            result = primary_future.result()
+            if result.get("success"):
+                self._record_latency(time.time() - started_at)
+                return self._finish(result, self.primary, hedged=False)
+        if not self._may_hedge():
+            return self._finish(primary_future.result(), self.primary, hedged=False)
+
+        self._record_hedge(url, delay)
+        clients: Dict[Future, LLMClient] = {
+            primary_future: self.primary,
+            self._executor.submit(self.secondary.generate_summary, **kwargs): self.secondary,
+        }
+        pending = set(clients)
+        last_result: Dict[str, Any] = {}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if not result.get("success"):
+                    last_result = result
+                    continue
+                if clients[future] is self.primary:
+                    self._record_latency(time.time() - started_at)
+                for loser in pending:
+                    # Threads cannot be cancelled; count the loser's tokens as waste.
+                    loser.add_done_callback(self._record_waste)
+                return self._finish(result, clients[future], hedged=True)
+        return self._finish(last_result, self.primary, hedged=True)
+
+    async def agenerate_summary(
+        self,
+        url: str,
+        prompt_template: str,
+        content: str | None = None,
+        chunk_size: int | None = None,
+    ) -> Dict[str, Any]:
+        """Async counterpart of `generate_summary`; the losing request is cancelled."""
+        self._start_request()
+        kwargs = {
+            "url": url,
+            "prompt_template": prompt_template,
+            "content": content,
+            "chunk_size": chunk_size,
+        }
+        started_at = time.time()
+        delay = self.hedge_delay()
+        primary_task = asyncio.ensure_future(self.primary.agenerate_summary(**kwargs))
+        done, _ = await asyncio.wait({primary_task}, timeout=delay)
+        if done:
+            result = primary_task.result()
+            if result.get("success"):
+                self._record_latency(time.time() - started_at)
+                return self._finish(result, self.primary, hedged=False)
+        if not self._may_hedge():
+            return self._finish(await primary_task, self.primary, hedged=False)
+
+        self._record_hedge(url, delay)
+        secondary_task = asyncio.ensure_future(self.secondary.agenerate_summary(**kwargs))
+        clients: Dict[asyncio.Future, LLMClient] = {
+            primary_task: self.primary,
+            secondary_task: self.secondary,
+        }
+        pending = set(clients)
+        last_result: Dict[str, Any] = {}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                if not result.get("success"):
+                    last_result = result
+                    continue
+                if clients[task] is self.primary:
+                    self._record_latency(time.time() - started_at)
+                for loser in pending:
+                    loser.cancel()
+                return self._finish(result, clients[task], hedged=True)
+        return self._finish(last_result, self.primary, hedged=True)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    async def aclose(self) -> None:
+        self.close()
+        for client in (self.primary, self.secondary):
+            aclose = getattr(client, "aclose", None)
+            if aclose is not None:
+                await aclose()
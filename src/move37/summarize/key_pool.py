@@ -0,0 +1,207 @@
+"""Per-provider API key pools with least-loaded selection and quarantine."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Sequence, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+# Quarantine after a 429 without `Retry-After`, and after an auth failure.
+DEFAULT_RATE_LIMIT_QUARANTINE = 60.0
+DEFAULT_AUTH_QUARANTINE = 3600.0
+# Window for per-key token accounting.
+_USAGE_WINDOW_SECONDS = 60.0
+
+_REGISTRY_LOCK = threading.Lock()
+_KEY_POOLS: Dict[str, "ApiKeyPool"] = {}
+
+
+def mask_api_key(api_key: str) -> str:
+    """Return a log-safe representation of an API key."""
+    return f"...{api_key[-4:]}" if len(api_key) > 8 else "***"
+
+
+def is_auth_error(exc: BaseException | None) -> bool:
+    """Detect invalid/revoked key errors across provider SDKs."""
+    if exc is None:
+        return False
+    status = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    if status in (401, 403):
+        return True
+    name = type(exc).__name__
+    if name in {
+        "AuthenticationError",
+        "PermissionDenied",
+        "PermissionDeniedError",
+        "Unauthenticated",
+    }:
+        return True
+    return "API key not valid" in str(exc) or "API_KEY_INVALID" in str(exc)
+
+
+class _KeyState:
+    def __init__(self, api_key: str) -> None:
+        self.api_key = api_key
+        self.in_flight = 0
+        self.requests = 0
+        self.rate_limited = 0
+        self.auth_errors = 0
+        self.quarantined_until = 0.0
+        self.usage: Deque[Tuple[float, int]] = deque()
+
+    def recent_tokens(self, now: float) -> int:
+        while self.usage and now - self.usage[0][0] > _USAGE_WINDOW_SECONDS:
+            self.usage.popleft()
+        return sum(tokens for _, tokens in self.usage)
+
+
+class ApiKeyPool:
+    """Rotate requests across several API keys of one provider.
+
+    `acquire` returns the least-loaded key (fewest in-flight requests, then
+    fewest tokens in the last minute). Keys hitting a 429 or an auth error are
+    quarantined; when every key is quarantined the one released first is used.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        api_keys: Sequence[str],
+        rate_limit_quarantine: float = DEFAULT_RATE_LIMIT_QUARANTINE,
+        auth_quarantine: float = DEFAULT_AUTH_QUARANTINE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        keys = list(dict.fromkeys(key.strip() for key in api_keys if key and key.strip()))
+        if not keys:
+            raise ValueError(f"Key pool for `{provider}` needs at least one API key.")
+        self.provider = provider
+        self.rate_limit_quarantine = float(rate_limit_quarantine)
+        self.auth_quarantine = float(auth_quarantine)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._states = [_KeyState(key) for key in keys]
+
+    @property
+    def api_keys(self) -> List[str]:
+        return [state.api_key for state in self._states]
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def acquire(self) -> str:
+        """Check out the least-loaded healthy key."""
+        with self._lock:
+            now = self._clock()
+            healthy = [state for state in self._states if state.quarantined_until <= now]
+            if healthy:
+                state = min(
+                    healthy,
+                    key=lambda item: (item.in_flight, item.recent_tokens(now), item.requests),
+                )
+            else:
+                state = min(self._states, key=lambda item: item.quarantined_until)
+                LOGGER.warning(
+                    "All %s API keys are quarantined; using %s early",
+                    self.provider,
+                    mask_api_key(state.api_key),
+                )
+            state.in_flight += 1
+            state.requests += 1
+            return state.api_key
+
+    def release(
+        self,
+        api_key: str,
+        tokens: int = 0,
+        rate_limited: bool = False,
+        auth_failed: bool = False,
+        retry_after: float | None = None,
+    ) -> None:
+        """Return a key, record its token usage and quarantine it on 429/auth errors."""
+        with self._lock:
+            state = next((item for item in self._states if item.api_key == api_key), None)
+            if state is None:
+                return
+            now = self._clock()
+            state.in_flight = max(0, state.in_flight - 1)
+            if tokens:
+                state.usage.append((now, int(tokens)))
+
+            quarantine = 0.0
+            if auth_failed:
+                state.auth_errors += 1
+                quarantine = self.auth_quarantine
+            elif rate_limited:
+                state.rate_limited += 1
+                quarantine = retry_after if retry_after is not None else self.rate_limit_quarantine
+            if quarantine:
+                state.quarantined_until = max(state.quarantined_until, now + quarantine)
+                LOGGER.warning(
+                    "Quarantined %s API key %s for %.0fs (%s)",
+                    self.provider,
+                    mask_api_key(api_key),
+                    quarantine,
+                    "auth error" if auth_failed else "rate limited",
+                )
+
+    def reset_stats(self) -> None:
+        """Zero the per-key counters; in-flight requests and quarantines are kept."""
+        with self._lock:
+            for state in self._states:
+                state.requests = 0
+                state.rate_limited = 0
+                state.auth_errors = 0
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Return per-key counters with masked keys for run reports."""
+        with self._lock:
+            now = self._clock()
+            return [
+                {
+                    "key": mask_api_key(state.api_key),
+                    "in_flight": state.in_flight,
+                    "requests": state.requests,
+                    "tokens_last_minute": state.recent_tokens(now),
+                    "rate_limited": state.rate_limited,
+                    "auth_errors": state.auth_errors,
+                    "quarantined_for": round(max(0.0, state.quarantined_until - now), 1),
+                }
+                for state in self._states
+            ]
+
+
+def get_key_pool(provider: str, api_keys: Sequence[str]) -> ApiKeyPool:
+    """Return the process-wide key pool of a provider, rebuilt if its keys change."""
+    key = str(provider).strip().lower()
+    with _REGISTRY_LOCK:
+        pool = _KEY_POOLS.get(key)
+        wanted = list(dict.fromkeys(item.strip() for item in api_keys if item and item.strip()))
+        if pool is None or pool.api_keys != wanted:
+            pool = ApiKeyPool(key, wanted)
+            _KEY_POOLS[key] = pool
+        return pool
+
+
+def key_pool_states() -> Dict[str, List[Dict[str, Any]]]:
+    """Return a snapshot of every provider key pool."""
+    with _REGISTRY_LOCK:
+        pools = dict(_KEY_POOLS)
+    return {name: pool.snapshot() for name, pool in pools.items()}
+
+
+def reset_key_pool_stats() -> None:
+    """Zero the counters of every key pool so the next report covers one run."""
+    with _REGISTRY_LOCK:
+        pools = list(_KEY_POOLS.values())
+    for pool in pools:
+        pool.reset_stats()
+
+
+def reset_key_pools() -> None:
+    """Drop all key pools (used between runs and in tests)."""
+    with _REGISTRY_LOCK:
+        _KEY_POOLS.clear()
@@ -2,20 +2,146 @@
 
 from __future__ import annotations
 
-import json
 import logging
-import re
+import threading
 import time
-from typing import Any, Dict, Tuple
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from move37.utils.retry import (
+    NON_RETRYABLE,
+    RETRYABLE,
+    RetryPolicy,
+    classify_error,
+    is_rate_limit_error,
+    retry_after_seconds,
+)
+
+from .compaction import compact_content
+from .key_pool import ApiKeyPool, get_key_pool, is_auth_error
+from .model_cache import GeminiModelCache, get_model_cache
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .streaming import IncrementalSummaryParser, record_stream, split_stream_metrics
+from .structured_output import (
+    SUMMARY_RESPONSE_SCHEMA,
+    gemini_response_schema,
+    is_structured_output_unsupported,
+    load_json_payload,
+    openai_response_format,
+    record_parse_outcome,
+)
+from .token_budget import (
+    MIN_CHUNK_TOKENS,
+    estimate_prompt_tokens,
+    estimate_tokens,
+    get_context_window,
+    plan_chunks,
+    prompt_token_budget,
+)
 
 LOGGER = logging.getLogger(__name__)
 
 SUPPORTED_PROVIDERS = {"openai", "deepseek", "gemini", "glm"}
 
+# `genai.configure` mutates process-wide SDK state; serialize it across clients.
+_GEMINI_CONFIGURE_LOCK = threading.Lock()
+_gemini_configured_key: str | None = None
+_GEMINI_KEY_CLIENTS: Dict[Tuple[str, bool], Any] = {}
+
+# API key checked out for the request running in the current thread/task.
+_ACTIVE_API_KEY: ContextVar[str | None] = ContextVar("move37_llm_api_key", default=None)
+# JSON schema requested from the provider for the request in flight.
+_RESPONSE_SCHEMA: ContextVar[Dict[str, Any]] = ContextVar(
+    "move37_llm_response_schema", default=SUMMARY_RESPONSE_SCHEMA
+)
+
+# OpenAI-compatible providers known to accept `stream_options.include_usage`.
+_STREAM_USAGE_PROVIDERS = {"openai", "deepseek"}
+
+SYSTEM_PROMPT = (
+    "You are a Chinese summarization assistant. "
+    "Always return strict JSON with keys `brief` and `summary`."
+)
+
+CHUNK_PROMPT_TEMPLATE = """
+你将收到一个 YouTube 字幕片段内容。请基于片段生成中文 JSON：
+{
+  "brief": "片段简介（50字以内）",
+  "summary": "片段要点（300字以内）"
+}
+
+URL: {url}
+片段内容:
+{content}
+""".strip()
+
+TOKEN_USAGE_FIELDS = (
+    "estimated_prompt_tokens",
+    "prompt_tokens",
+    "cached_tokens",
+    "completion_tokens",
+    "total_tokens",
+)
+
+# Invariant instructions go first and item data last, so providers with automatic
+# prefix caching (OpenAI, DeepSeek, GLM, Gemini 2.5) can reuse the shared prefix.
+CONTENT_NOTE = "文末附有可直接使用的内容材料，请优先基于这些材料总结，不要回答“无法访问链接”。"
+_PROMPT_PLACEHOLDERS = ("{url}", "{content}")
+
+
+def empty_token_usage() -> Dict[str, int]:
+    """Return a zeroed token usage record."""
+    return {field: 0 for field in TOKEN_USAGE_FIELDS}
+
+
+def merge_token_usage(target: Dict[str, int], usage: Dict[str, Any] | None) -> Dict[str, int]:
+    """Add counters from `usage` into `target` and return `target`."""
+    for key, value in (usage or {}).items():
+        target[key] = int(target.get(key, 0) or 0) + int(value or 0)
+    return target
+
+
+def configure_gemini(genai: Any, api_key: str) -> None:
+    """Configure the Gemini SDK once per API key, safely across threads."""
+    global _gemini_configured_key
+    with _GEMINI_CONFIGURE_LOCK:
+        if _gemini_configured_key == api_key:
+            return
+        genai.configure(api_key=api_key)
+        _gemini_configured_key = api_key
+
+
+def bind_gemini_api_key(model: Any, api_key: str, async_client: bool = False) -> Any:
+    """Point a GenerativeModel at its own service client for a pooled API key.
+
+    `GenerativeModel` otherwise uses the client built from the process-global
+    `genai.configure` key, which cannot differ per concurrent request. The
+    per-model `_client` / `_async_client` slots are SDK-private: requirements
+    pin google-generativeai to the releases that have them, and a model
+    without the slot keeps the configured key (with a warning) instead.
+    """
+    if api_key == _gemini_configured_key:
+        return model
+    attribute = "_async_client" if async_client else "_client"
+    if not hasattr(model, attribute):
+        LOGGER.warning(
+            "google-generativeai GenerativeModel has no `%s`; "
+            "Gemini requests use the configured API key instead of the pooled one.",
+            attribute,
+        )
+        return model
+    with _GEMINI_CONFIGURE_LOCK:
+        client = _GEMINI_KEY_CLIENTS.get((api_key, async_client))
+        if client is None:
+            from google.ai import generativelanguage as glm
 
-def exponential_backoff(attempt: int, base_delay: float = 1.0) -> float:
-    """Calculate exponential backoff delay in seconds."""
-    return base_delay * (2**attempt)
+            client_class = (
+                glm.GenerativeServiceAsyncClient if async_client else glm.GenerativeServiceClient
+            )
+            client = client_class(client_options={"api_key": api_key})
+            _GEMINI_KEY_CLIENTS[(api_key, async_client)] = client
+    setattr(model, attribute, client)
+    return model
 
 
 class LLMClient:
@@ -31,6 +157,13 @@ class LLMClient:
         max_tokens: int = 2000,
         timeout: int = 60,
         max_retries: int = 3,
+        context_window: int | None = None,
+        compaction: Dict[str, Any] | None = None,
+        rate_limit: Dict[str, Any] | None = None,
+        api_keys: Sequence[str] | None = None,
+        structured_output: bool = True,
+        streaming: bool = False,
+        model_cache: Dict[str, Any] | None = None,
     ) -> None:
         self.provider = provider.strip().lower()
         if self.provider not in SUPPORTED_PROVIDERS:
@@ -38,13 +171,49 @@ class LLMClient:
             raise ValueError(f"Unsupported provider `{self.provider}`. Supported: {supported}")
 
         self.api_key = api_key.strip()
+        self.api_keys: List[str] = list(
+            dict.fromkeys(key.strip() for key in [self.api_key, *(api_keys or [])] if key.strip())
+        )
+        self.key_pool: ApiKeyPool | None = None
+        if len(self.api_keys) > 1:
+            self.key_pool = get_key_pool(self.provider, self.api_keys)
         self.model = model.strip()
         self.base_url = base_url.strip() if isinstance(base_url, str) and base_url.strip() else None
         self.temperature = float(temperature)
         self.max_tokens = int(max_tokens)
         self.timeout = int(timeout)
         self.max_retries = max(1, int(max_retries))
+        self.retry_policy = RetryPolicy(
+            max_attempts=self.max_retries,
+            base_delay=1.0,
+            max_delay=60.0,
+            classify=self._classify_error,
+        )
+        self.context_window = int(context_window or get_context_window(self.provider, self.model))
+        self.compaction = dict(compaction) if compaction is not None else None
+        self.structured_output = bool(structured_output)
+        self.streaming = bool(streaming)
+        self.rate_limiter: RateLimiter | None = None
+        if rate_limit is not None:
+            # Quotas are per key; the provider limiter covers the whole pool.
+            self.rate_limiter = get_rate_limiter(
+                self.provider,
+                rpm=int(rate_limit.get("rpm") or 0) * len(self.api_keys),
+                tpm=int(rate_limit.get("tpm") or 0) * len(self.api_keys),
+                max_concurrency=int(rate_limit.get("max_concurrency") or 1),
+            )
         self._runtime_model: str | None = None
+        # Guards `_runtime_model`; the fallback lock makes model fallback single-flight.
+        self._model_lock = threading.Lock()
+        self._fallback_lock = threading.Lock()
+        self.model_cache: GeminiModelCache | None = None
+        if self.provider == "gemini":
+            self.model_cache = get_model_cache(model_cache)
+        if self.model_cache is not None:
+            resolved = self.model_cache.get_resolved(self.api_key, self.model)
+            if resolved and resolved != self.model:
+                LOGGER.info("Using cached Gemini fallback model %s for %s", resolved, self.model)
+                self._runtime_model = resolved
 
     def generate_summary(
         self,
@@ -53,15 +222,93 @@ class LLMClient:
         content: str | None = None,
         chunk_size: int | None = None,
     ) -> Dict[str, Any]:
-        """Generate summary for a URL/content using the selected provider."""
-        if content and chunk_size and len(content) > chunk_size:
-            return self._generate_summary_with_chunking(
+        """Generate summary for a URL/content using the selected provider.
+
+        Content is compacted first (when enabled), then split into chunks when it
+        exceeds `chunk_size` characters or when the rendered prompt would not fit
+        the model's prompt token budget.
+        """
+        content, tokens_saved = self._compact_content(url, content)
+        if content and self._needs_chunking(url, prompt_template, content, chunk_size):
+            result = self._generate_summary_with_chunking(
                 url=url,
                 prompt_template=prompt_template,
                 content=content,
                 chunk_size=chunk_size,
             )
-        return self._generate_summary_once(url=url, prompt_template=prompt_template, content=content)
+        else:
+            result = self._generate_summary_once(
+                url=url, prompt_template=prompt_template, content=content
+            )
+        return self._attach_compaction_savings(result, tokens_saved)
+
+    def cache_options(self) -> Dict[str, Any]:
+        """Settings besides provider, model and prompt that change the summary produced."""
+        return {
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "context_window": self.context_window,
+            "compaction": self.compaction,
+            "structured_output": self.structured_output,
+            "streaming": self.streaming,
+        }
+
+    def _compact_content(self, url: str, content: str | None) -> Tuple[str | None, int]:
+        if not content or self.compaction is None:
+            return content, 0
+        compacted = compact_content(
+            content,
+            provider=self.provider,
+            model=self._effective_model(),
+            options=self.compaction,
+        )
+        tokens_saved = int(compacted["tokens_saved"])
+        if tokens_saved:
+            LOGGER.info(
+                "Compacted content for URL=%s, tokens %s -> %s (saved %s)",
+                url,
+                compacted["original_tokens"],
+                compacted["compacted_tokens"],
+                tokens_saved,
+            )
+        return compacted["content"], tokens_saved
+
+    @staticmethod
+    def _attach_compaction_savings(result: Dict[str, Any], tokens_saved: int) -> Dict[str, Any]:
+        result.setdefault("token_usage", empty_token_usage())
+        result["token_usage"]["compaction_tokens_saved"] = tokens_saved
+        result["tokens_saved"] = tokens_saved
+        return result
+
+    def _needs_chunking(
+        self,
+        url: str,
+        prompt_template: str,
+        content: str,
+        chunk_size: int | None,
+    ) -> bool:
+        if chunk_size and len(content) > chunk_size:
+            return True
+        prompt = self._render_prompt(url=url, prompt_template=prompt_template, content=content)
+        return self.estimate_prompt_tokens(prompt) > self.prompt_token_budget()
+
+    def estimate_tokens(self, text: str | None) -> int:
+        """Estimate tokens of text for this client's provider/model."""
+        return estimate_tokens(text, self.provider, self._effective_model())
+
+    def estimate_prompt_tokens(self, prompt: str) -> int:
+        """Estimate input tokens of a rendered prompt, including the system prompt."""
+        system_prompt = None if self.provider == "gemini" else SYSTEM_PROMPT
+        return estimate_prompt_tokens(
+            prompt,
+            self.provider,
+            self._effective_model(),
+            system_prompt=system_prompt,
+        )
+
+    def prompt_token_budget(self) -> int:
+        """Return the input token budget after reserving `max_tokens` for output."""
+        return prompt_token_budget(self.context_window, self.max_tokens)
 
     def _generate_summary_once(
         self,
@@ -69,61 +316,236 @@ class LLMClient:
         prompt_template: str,
         content: str | None = None,
     ) -> Dict[str, Any]:
-        prompt = self._render_prompt(url=url, prompt_template=prompt_template, content=content)
+        prompt, estimated_tokens = self._prepare_prompt(url, prompt_template, content)
+        return self._request_with_retries(
+            url,
+            prompt,
+            estimated_tokens,
+            lambda raw_text, usage: self._build_success_result(
+                url, raw_text, usage, estimated_tokens
+            ),
+        )
+
+    def _request_with_retries(
+        self,
+        url: str,
+        prompt: str,
+        estimated_tokens: int,
+        build_result: Callable[[str, Dict[str, int]], Dict[str, Any]],
+        response_schema: Dict[str, Any] | None = None,
+    ) -> Dict[str, Any]:
+        """Send a rendered prompt with rate limiting, key rotation and retries.
+
+        `build_result` turns the raw reply into a result; raising from it
+        (e.g. on unparsable output) counts as a failed attempt.
+        `response_schema` overrides the structured output schema of the reply.
+        """
         last_error = "Unknown LLM error"
+        delay: float | None = None
 
         for attempt in range(self.max_retries):
             try:
-                LOGGER.info(
-                    "Calling provider=%s model=%s for URL=%s (attempt %s/%s)",
-                    self.provider,
-                    self._effective_model(),
-                    url,
-                    attempt + 1,
-                    self.max_retries,
-                )
-                raw_text, token_count = self._request_summary(prompt)
-                parsed = self._parse_summary_payload(raw_text)
-                brief = self._truncate(parsed["brief"], 100, "brief", url)
-                summary = self._truncate(parsed["summary"], 1000, "summary", url)
-                return {
-                    "brief": brief,
-                    "summary": summary,
-                    "model_used": self._effective_model(),
-                    "tokens_consumed": int(token_count),
-                    "success": True,
-                    "error": None,
-                }
+                self._log_attempt(url, attempt)
+                reserved = self._reserve_tokens(estimated_tokens)
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire(reserved)
+                api_key, key_token = self._checkout_api_key()
+                schema_token = _RESPONSE_SCHEMA.set(response_schema or SUMMARY_RESPONSE_SCHEMA)
+                try:
+                    raw_text, usage = self._request_summary(prompt)
+                except Exception as exc:  # noqa: BLE001
+                    self._return_api_key(api_key, key_token, error=exc)
+                    self._release_rate_limit(reserved, error=exc)
+                    raise
+                finally:
+                    _RESPONSE_SCHEMA.reset(schema_token)
+                self._return_api_key(api_key, key_token, usage=usage)
+                self._release_rate_limit(reserved, usage=usage)
+                return build_result(raw_text, usage)
             except Exception as exc:  # noqa: BLE001
                 last_error = f"{type(exc).__name__}: {exc}"
-                is_last_attempt = attempt == self.max_retries - 1
-                if is_last_attempt:
-                    LOGGER.error(
-                        "LLM request failed after %s attempts, URL=%s, error=%s",
-                        self.max_retries,
-                        url,
-                        last_error,
-                    )
+                self._disable_structured_output_if_rejected(exc)
+                delay = self._retry_delay(url, attempt, last_error, exc, delay)
+                if delay is None:
                     break
-
-                delay = exponential_backoff(attempt)
-                LOGGER.warning(
-                    "LLM request failed (attempt %s/%s), URL=%s, retry in %.1fs, error=%s",
-                    attempt + 1,
-                    self.max_retries,
-                    url,
-                    delay,
-                    last_error,
-                )
                 time.sleep(delay)
 
+        return self._build_failure_result(estimated_tokens, last_error)
+
+    def _prepare_prompt(
+        self,
+        url: str,
+        prompt_template: str,
+        content: str | None,
+    ) -> Tuple[str, int]:
+        prompt = self._render_prompt(url=url, prompt_template=prompt_template, content=content)
+        estimated_tokens = self.estimate_prompt_tokens(prompt)
+        budget = self.prompt_token_budget()
+        if estimated_tokens > budget:
+            LOGGER.warning(
+                "Estimated prompt tokens exceed budget, URL=%s, estimated=%s, budget=%s",
+                url,
+                estimated_tokens,
+                budget,
+            )
+        return prompt, estimated_tokens
+
+    def _log_attempt(self, url: str, attempt: int) -> None:
+        LOGGER.info(
+            "Calling provider=%s model=%s for URL=%s (attempt %s/%s)",
+            self.provider,
+            self._effective_model(),
+            url,
+            attempt + 1,
+            self.max_retries,
+        )
+
+    def _reserve_tokens(self, estimated_tokens: int) -> int:
+        """Tokens charged against TPM up front: prompt estimate plus output allowance."""
+        return int(estimated_tokens) + self.max_tokens
+
+    def _checkout_api_key(self) -> Tuple[str, Token | None]:
+        """Pick the key for the next request and expose it to the provider call."""
+        if self.key_pool is None:
+            return self.api_key, None
+        api_key = self.key_pool.acquire()
+        return api_key, _ACTIVE_API_KEY.set(api_key)
+
+    def _return_api_key(
+        self,
+        api_key: str,
+        key_token: Token | None,
+        usage: Dict[str, int] | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        if key_token is not None:
+            _ACTIVE_API_KEY.reset(key_token)
+        if self.key_pool is None:
+            return
+        self.key_pool.release(
+            api_key,
+            tokens=int((usage or {}).get("total_tokens") or 0),
+            rate_limited=is_rate_limit_error(error),
+            auth_failed=is_auth_error(error),
+            retry_after=retry_after_seconds(error),
+        )
+
+    def _current_api_key(self) -> str:
+        return _ACTIVE_API_KEY.get() or self.api_key
+
+    def _release_rate_limit(
+        self,
+        reserved: int,
+        usage: Dict[str, int] | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        if self.rate_limiter is None:
+            return
+        self.rate_limiter.release(
+            reserved,
+            used_tokens=int((usage or {}).get("total_tokens") or 0) or None,
+            succeeded=error is None,
+            rate_limited=is_rate_limit_error(error),
+            retry_after=retry_after_seconds(error),
+        )
+
+    def _disable_structured_output_if_rejected(self, exc: Exception) -> None:
+        """Fall back to prompt-only JSON when the endpoint rejects JSON mode fields."""
+        if self.structured_output and is_structured_output_unsupported(exc):
+            self.structured_output = False
+            LOGGER.warning(
+                "Provider=%s model=%s rejected structured output; using prompt-only JSON",
+                self.provider,
+                self._effective_model(),
+            )
+
+    def _classify_error(self, exc: BaseException | None) -> str:
+        """Shared classification, plus two cases this client can recover from.
+
+        A rejected JSON mode has just been switched off, and an auth error can
+        succeed on another key of the pool.
+        """
+        category = classify_error(exc)
+        if category != NON_RETRYABLE:
+            return category
+        if is_structured_output_unsupported(exc):
+            return RETRYABLE
+        if is_auth_error(exc) and self.key_pool is not None:
+            return RETRYABLE
+        return category
+
+    def _retry_delay(
+        self,
+        url: str,
+        attempt: int,
+        last_error: str,
+        error: Exception | None = None,
+        previous_delay: float | None = None,
+    ) -> float | None:
+        """Return the backoff before the next attempt, or None to give up.
+
+        Delegates to `retry_policy`: non-retryable errors and an exhausted run
+        budget stop immediately; rate-limit errors wait at least `Retry-After`.
+        """
+        delay = self.retry_policy.next_delay(error, attempt, previous_delay)
+        if delay is None:
+            LOGGER.error(
+                "LLM request failed after %s/%s attempts, URL=%s, error=%s",
+                attempt + 1,
+                self.max_retries,
+                url,
+                last_error,
+            )
+            return None
+        LOGGER.warning(
+            "LLM request failed (attempt %s/%s), URL=%s, retry in %.1fs, error=%s",
+            attempt + 1,
+            self.max_retries,
+            url,
+            delay,
+            last_error,
+        )
+        return delay
+
+    def _build_success_result(
+        self,
+        url: str,
+        raw_text: str,
+        usage: Dict[str, int],
+        estimated_tokens: int,
+    ) -> Dict[str, Any]:
+        parsed = self._parse_summary_payload(raw_text)
+        brief = self._truncate(parsed["brief"], 100, "brief", url)
+        summary = self._truncate(parsed["summary"], 1000, "summary", url)
+        usage, stream_metrics = split_stream_metrics(usage)
+        token_usage = merge_token_usage(empty_token_usage(), usage)
+        token_usage["estimated_prompt_tokens"] = estimated_tokens
+        result = {
+            "brief": brief,
+            "summary": summary,
+            "model_used": self._effective_model(),
+            "tokens_consumed": int(token_usage["total_tokens"]),
+            "tokens_estimated": estimated_tokens,
+            "token_usage": token_usage,
+            "success": True,
+            "error": None,
+        }
+        if stream_metrics is not None:
+            result["streaming"] = stream_metrics
+        return result
+
+    def _build_failure_result(self, estimated_tokens: int, error: str) -> Dict[str, Any]:
+        token_usage = empty_token_usage()
+        token_usage["estimated_prompt_tokens"] = estimated_tokens
         return {
             "brief": "",
             "summary": "",
             "model_used": self._effective_model(),
             "tokens_consumed": 0,
+            "tokens_estimated": estimated_tokens,
+            "token_usage": token_usage,
             "success": False,
-            "error": last_error,
+            "error": error,
         }
 
     def _generate_summary_with_chunking(
@@ -131,68 +553,130 @@ class LLMClient:
         url: str,
         prompt_template: str,
         content: str,
-        chunk_size: int,
+        chunk_size: int | None = None,
     ) -> Dict[str, Any]:
-        chunks = [content[i : i + chunk_size] for i in range(0, len(content), chunk_size)]
-        LOGGER.info("Chunking content for URL=%s into %s chunks", url, len(chunks))
+        chunks = self._plan_content_chunks(url, content, chunk_size)
+        chunk_results = [
+            self._generate_summary_once(
+                url=url,
+                prompt_template=CHUNK_PROMPT_TEMPLATE,
+                content=chunk,
+            )
+            for chunk in chunks
+        ]
+        merged_content, token_usage, failed_chunks = self._merge_chunk_results(url, chunk_results)
+        if merged_content is None:
+            return self._build_chunk_failure_result(token_usage)
 
-        chunk_prompt_template = """
-你将收到一个 YouTube 字幕片段内容。请基于片段生成中文 JSON：
-{
-  "brief": "片段简介（50字以内）",
-  "summary": "片段要点（300字以内）"
-}
+        if self._merged_needs_reduction(url, prompt_template, merged_content, content):
+            # Chunk summaries still exceed the budget: reduce them another round.
+            final_result = self._generate_summary_with_chunking(
+                url=url,
+                prompt_template=prompt_template,
+                content=merged_content,
+            )
+        else:
+            final_result = self._generate_summary_once(
+                url=url,
+                prompt_template=prompt_template,
+                content=merged_content,
+            )
+        return self._finalize_chunked_result(final_result, token_usage, failed_chunks, len(chunks))
 
-URL: {url}
-片段内容:
-{content}
-""".strip()
+    def _plan_content_chunks(self, url: str, content: str, chunk_size: int | None) -> list[str]:
+        template_tokens = self.estimate_prompt_tokens(
+            self._render_prompt(url=url, prompt_template=CHUNK_PROMPT_TEMPLATE, content="")
+        )
+        chunk_token_budget = self.prompt_token_budget() - template_tokens
+        if chunk_token_budget < MIN_CHUNK_TOKENS:
+            raise ValueError(
+                "Prompt token budget is too small for chunking: "
+                f"context_window={self.context_window}, max_tokens={self.max_tokens}"
+            )
+        chunks = plan_chunks(
+            content,
+            max_chunk_tokens=chunk_token_budget,
+            provider=self.provider,
+            model=self._effective_model(),
+            max_chunk_chars=chunk_size,
+        )
+        LOGGER.info(
+            "Chunking content for URL=%s into %s chunks (chunk token budget=%s)",
+            url,
+            len(chunks),
+            chunk_token_budget,
+        )
+        return chunks
 
+    @staticmethod
+    def _merge_chunk_results(
+        url: str,
+        chunk_results: list[Dict[str, Any]],
+    ) -> Tuple[str | None, Dict[str, int], int]:
+        """Join successful chunk summaries; returns (merged or None, usage, failed count)."""
         chunk_summaries: list[str] = []
-        total_tokens = 0
+        token_usage = empty_token_usage()
         failed_chunks = 0
 
-        for index, chunk in enumerate(chunks, start=1):
-            chunk_result = self._generate_summary_once(
-                url=url,
-                prompt_template=chunk_prompt_template,
-                content=chunk,
-            )
+        for index, chunk_result in enumerate(chunk_results, start=1):
+            merge_token_usage(token_usage, chunk_result.get("token_usage"))
             if not chunk_result.get("success"):
                 failed_chunks += 1
                 LOGGER.warning(
                     "Chunk summarize failed for URL=%s chunk=%s/%s error=%s",
                     url,
                     index,
-                    len(chunks),
+                    len(chunk_results),
                     chunk_result.get("error"),
                 )
                 continue
 
-            total_tokens += int(chunk_result.get("tokens_consumed", 0) or 0)
             chunk_summary = str(chunk_result.get("summary", "")).strip()
             if chunk_summary:
                 chunk_summaries.append(f"[片段{index}] {chunk_summary}")
 
         if not chunk_summaries:
-            return {
-                "brief": "",
-                "summary": "",
-                "model_used": self._effective_model(),
-                "tokens_consumed": total_tokens,
-                "success": False,
-                "error": "All content chunks failed to summarize.",
-            }
+            return None, token_usage, failed_chunks
+        return "\n\n".join(chunk_summaries), token_usage, failed_chunks
+
+    def _build_chunk_failure_result(self, token_usage: Dict[str, int]) -> Dict[str, Any]:
+        return {
+            "brief": "",
+            "summary": "",
+            "model_used": self._effective_model(),
+            "tokens_consumed": token_usage["total_tokens"],
+            "tokens_estimated": token_usage["estimated_prompt_tokens"],
+            "token_usage": token_usage,
+            "success": False,
+            "error": "All content chunks failed to summarize.",
+        }
 
-        merged_content = "\n\n".join(chunk_summaries)
-        final_result = self._generate_summary_once(
-            url=url,
-            prompt_template=prompt_template,
-            content=merged_content,
+    def _merged_needs_reduction(
+        self,
+        url: str,
+        prompt_template: str,
+        merged_content: str,
+        content: str,
+    ) -> bool:
+        merged_prompt = self._render_prompt(
+            url=url, prompt_template=prompt_template, content=merged_content
         )
-        final_result["tokens_consumed"] = int(final_result.get("tokens_consumed", 0) or 0) + total_tokens
+        over_budget = self.estimate_prompt_tokens(merged_prompt) > self.prompt_token_budget()
+        return over_budget and len(merged_content) < len(content)
+
+    @staticmethod
+    def _finalize_chunked_result(
+        final_result: Dict[str, Any],
+        token_usage: Dict[str, int],
+        failed_chunks: int,
+        total_chunks: int,
+    ) -> Dict[str, Any]:
+        merge_token_usage(token_usage, final_result.get("token_usage"))
+        final_result["token_usage"] = token_usage
+        final_result["tokens_consumed"] = token_usage["total_tokens"]
+        final_result["tokens_estimated"] = token_usage["estimated_prompt_tokens"]
         if failed_chunks > 0:
-            warning = f"{failed_chunks}/{len(chunks)} chunks failed during chunk summarization."
+            warning = f"{failed_chunks}/{total_chunks} chunks failed during chunk summarization."
             if final_result.get("success"):
                 final_result["error"] = warning
             else:
@@ -200,30 +684,114 @@ URL: {url}
                 final_result["error"] = f"{warning} final_error={existing_error}".strip()
         return final_result
 
+    @staticmethod
+    def _split_prompt_template(prompt_template: str) -> Tuple[str, str]:
+        """Split a template into (invariant instructions, item section).
+
+        The item section starts at the first line holding a placeholder.
+        """
+        lines = prompt_template.splitlines()
+        for index, line in enumerate(lines):
+            if any(placeholder in line for placeholder in _PROMPT_PLACEHOLDERS):
+                return "\n".join(lines[:index]).rstrip(), "\n".join(lines[index:])
+        return prompt_template.rstrip(), ""
+
     @staticmethod
     def _render_prompt(url: str, prompt_template: str, content: str | None = None) -> str:
         # Use explicit token replacement instead of str.format().
         # Prompt templates may include JSON braces which would break format parsing.
-        prompt = prompt_template.replace("{url}", url)
-        if "{content}" in prompt:
-            prompt = prompt.replace("{content}", content or "")
-            return prompt
-
-        if content:
-            return (
-                f"{prompt}\n\n"
-                "下面是你可直接使用的内容材料，请优先基于这些材料总结，"
-                "不要回答“无法访问链接”：\n"
-                f"{content}"
-            )
-        return prompt
+        instructions, item_section = LLMClient._split_prompt_template(prompt_template)
+        item_section = item_section.replace("{url}", url)
+        if "{content}" in item_section:
+            item_section = item_section.replace("{content}", content or "")
+        elif content:
+            instructions = f"{instructions}\n\n{CONTENT_NOTE}".lstrip()
+            item_section = f"{item_section}\n\n内容材料：\n{content}".lstrip()
+        return "\n\n".join(part for part in (instructions, item_section) if part)
 
-    def _request_summary(self, prompt: str) -> Tuple[str, int]:
+    def _request_summary(self, prompt: str) -> Tuple[str, Dict[str, int]]:
         if self.provider == "gemini":
             return self._call_gemini(prompt)
         return self._call_openai_compatible(prompt)
 
-    def _call_openai_compatible(self, prompt: str) -> Tuple[str, int]:
+    def _should_stream(self) -> bool:
+        # Only single summaries have the brief/summary shape the stream parser tracks.
+        return self.streaming and _RESPONSE_SCHEMA.get() is SUMMARY_RESPONSE_SCHEMA
+
+    def _openai_stream_kwargs(self) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {"stream": True}
+        if self.provider in _STREAM_USAGE_PROVIDERS:
+            kwargs["stream_options"] = {"include_usage": True}
+        return kwargs
+
+    def _consume_stream(
+        self,
+        prompt: str,
+        events: Iterable[Tuple[str, Dict[str, int] | None]],
+    ) -> Tuple[str, Dict[str, int]]:
+        """Read (text delta, usage) events until the summary JSON is complete."""
+        parser = IncrementalSummaryParser()
+        started_at = time.monotonic()
+        first_token_at: float | None = None
+        usage: Dict[str, int] | None = None
+        stopped_early = False
+        for delta, chunk_usage in events:
+            if chunk_usage:
+                usage = chunk_usage
+            if not delta:
+                continue
+            if first_token_at is None:
+                first_token_at = time.monotonic() - started_at
+            if parser.feed(delta):
+                stopped_early = True
+                break
+        return self._finish_stream(prompt, parser, first_token_at, usage, stopped_early)
+
+    def _finish_stream(
+        self,
+        prompt: str,
+        parser: IncrementalSummaryParser,
+        time_to_first_token: float | None,
+        usage: Dict[str, int] | None,
+        stopped_early: bool,
+    ) -> Tuple[str, Dict[str, int]]:
+        if not usage or not usage.get("completion_tokens"):
+            # Usage arrives with the last chunk, which an early stop never reads.
+            prompt_tokens = self.estimate_prompt_tokens(prompt)
+            completion_tokens = self.estimate_tokens(parser.text)
+            usage = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            }
+        # Only an over-limit stop cuts real output; a closed object has little left.
+        tokens_saved = (
+            max(0, self.max_tokens - int(usage["completion_tokens"])) if parser.over_limit else 0
+        )
+        record_stream(self.provider, time_to_first_token, stopped_early, tokens_saved)
+        text = parser.payload_text() if stopped_early else parser.text
+        return text.strip(), {
+            **usage,
+            "output_tokens_saved": tokens_saved,
+            "time_to_first_token_ms": int((time_to_first_token or 0.0) * 1000),
+            "stream_stopped_early": int(stopped_early),
+        }
+
+    @staticmethod
+    def _openai_stream_events(stream: Any) -> Iterable[Tuple[str, Dict[str, int] | None]]:
+        for chunk in stream:
+            usage = getattr(chunk, "usage", None)
+            choices = getattr(chunk, "choices", None) or []
+            delta = getattr(choices[0].delta, "content", None) if choices else None
+            yield str(delta or ""), LLMClient._openai_usage(usage) if usage else None
+
+    @staticmethod
+    def _gemini_stream_events(response: Any) -> Iterable[Tuple[str, Dict[str, int] | None]]:
+        for chunk in response:
+            usage = getattr(chunk, "usage_metadata", None)
+            yield LLMClient._gemini_text(chunk), LLMClient._gemini_usage(usage) if usage else None
+
+    def _call_openai_compatible(self, prompt: str) -> Tuple[str, Dict[str, int]]:
         try:
             from openai import OpenAI
         except ImportError as exc:  # pragma: no cover
@@ -232,26 +800,40 @@ URL: {url}
             ) from exc
 
         client = OpenAI(
-            api_key=self.api_key,
+            api_key=self._current_api_key(),
             base_url=self.base_url,
             timeout=self.timeout,
         )
-        completion = client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a Chinese summarization assistant. "
-                        "Always return strict JSON with keys `brief` and `summary`."
-                    ),
-                },
+        if self._should_stream():
+            stream = client.chat.completions.create(
+                **self._openai_request_kwargs(prompt), **self._openai_stream_kwargs()
+            )
+            try:
+                return self._consume_stream(prompt, self._openai_stream_events(stream))
+            finally:
+                # Closing the HTTP stream is what stops generation server-side.
+                stream.close()
+        completion = client.chat.completions.create(**self._openai_request_kwargs(prompt))
+        return self._parse_openai_completion(completion)
+
+    def _openai_request_kwargs(self, prompt: str) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": prompt},
             ],
-            temperature=self.temperature,
-            max_tokens=self.max_tokens,
-        )
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+        }
+        if self.structured_output:
+            kwargs["response_format"] = openai_response_format(
+                self.provider, _RESPONSE_SCHEMA.get()
+            )
+        return kwargs
 
+    @staticmethod
+    def _parse_openai_completion(completion: Any) -> Tuple[str, Dict[str, int]]:
         message = completion.choices[0].message
         content = message.content or ""
         if isinstance(content, list):
@@ -262,17 +844,35 @@ URL: {url}
                 else:
                     text_chunks.append(str(part))
             content = "".join(text_chunks)
+        return str(content).strip(), LLMClient._openai_usage(getattr(completion, "usage", None))
 
-        usage = getattr(completion, "usage", None)
-        total_tokens = getattr(usage, "total_tokens", None)
-        if total_tokens is None:
-            prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
-            completion_tokens = getattr(usage, "completion_tokens", 0) or 0
-            total_tokens = int(prompt_tokens) + int(completion_tokens)
+    @staticmethod
+    def _openai_usage(usage: Any) -> Dict[str, int]:
+        """Normalize OpenAI-compatible usage (SDK object or batch JSON dict)."""
 
-        return str(content).strip(), int(total_tokens or 0)
+        def _field(source: Any, name: str) -> Any:
+            if isinstance(source, dict):
+                return source.get(name)
+            return getattr(source, name, None)
 
-    def _call_gemini(self, prompt: str) -> Tuple[str, int]:
+        prompt_tokens = int(_field(usage, "prompt_tokens") or 0)
+        completion_tokens = int(_field(usage, "completion_tokens") or 0)
+        total_tokens = _field(usage, "total_tokens")
+        if total_tokens is None:
+            total_tokens = prompt_tokens + completion_tokens
+        # OpenAI/GLM report `prompt_tokens_details.cached_tokens`; DeepSeek reports
+        # `prompt_cache_hit_tokens`.
+        cached_tokens = _field(_field(usage, "prompt_tokens_details"), "cached_tokens")
+        if cached_tokens is None:
+            cached_tokens = _field(usage, "prompt_cache_hit_tokens")
+        return {
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": int(cached_tokens or 0),
+            "completion_tokens": completion_tokens,
+            "total_tokens": int(total_tokens or 0),
+        }
+
+    def _call_gemini(self, prompt: str) -> Tuple[str, Dict[str, int]]:
         try:
             import google.generativeai as genai
         except ImportError as exc:  # pragma: no cover
@@ -281,13 +881,71 @@ URL: {url}
                 "Install with `pip install google-generativeai`."
             ) from exc
 
-        genai.configure(api_key=self.api_key)
+        configure_gemini(genai, self.api_key)
         current_model = self._effective_model()
         try:
             response = self._gemini_generate(genai, current_model, prompt)
         except Exception as exc:  # noqa: BLE001
             if not self._is_gemini_model_not_found(exc):
                 raise
+            response = self._generate_with_gemini_fallback(genai, current_model, prompt, exc)
+
+        if self._should_stream():
+            # Abandoning the response iterator cancels the underlying gRPC stream.
+            return self._consume_stream(prompt, self._gemini_stream_events(response))
+        return self._parse_gemini_response(response)
+
+    @staticmethod
+    def _parse_gemini_response(response: Any) -> Tuple[str, Dict[str, int]]:
+        text = LLMClient._gemini_text(response).strip()
+        if not text:
+            raise ValueError("Gemini returned empty content.")
+        return text, LLMClient._gemini_usage(getattr(response, "usage_metadata", None))
+
+    @staticmethod
+    def _gemini_text(response: Any) -> str:
+        try:
+            text = getattr(response, "text", None)
+        except ValueError:
+            # `.text` raises when a (stream) chunk carries no text part.
+            text = None
+        if text:
+            return str(text)
+        text_parts = []
+        for candidate in getattr(response, "candidates", []) or []:
+            content = getattr(candidate, "content", None)
+            for part in getattr(content, "parts", []) or []:
+                part_text = getattr(part, "text", None)
+                if part_text:
+                    text_parts.append(part_text)
+        return "".join(text_parts)
+
+    @staticmethod
+    def _gemini_usage(usage: Any) -> Dict[str, int]:
+        prompt_tokens = int(getattr(usage, "prompt_token_count", 0) or 0)
+        candidates_tokens = int(getattr(usage, "candidates_token_count", 0) or 0)
+        token_count = getattr(usage, "total_token_count", None)
+        if token_count is None:
+            token_count = prompt_tokens + candidates_tokens
+        return {
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": int(getattr(usage, "cached_content_token_count", 0) or 0),
+            "completion_tokens": candidates_tokens,
+            "total_tokens": int(token_count or 0),
+        }
+
+    def _generate_with_gemini_fallback(
+        self,
+        genai: Any,
+        current_model: str,
+        prompt: str,
+        exc: Exception,
+    ) -> Any:
+        with self._fallback_lock:
+            resolved_model = self._effective_model()
+            if resolved_model != current_model:
+                # Another worker already switched models while this call waited.
+                return self._gemini_generate(genai, resolved_model, prompt)
 
             LOGGER.warning(
                 "Configured Gemini model unavailable: %s. Trying fallback models. error=%s",
@@ -300,64 +958,56 @@ URL: {url}
             for fallback_model in fallback_models:
                 try:
                     response = self._gemini_generate(genai, fallback_model, prompt)
-                    self._runtime_model = fallback_model
-                    LOGGER.warning(
-                        "Switched Gemini model from %s to %s",
-                        current_model,
-                        fallback_model,
-                    )
-                    break
                 except Exception as fallback_exc:  # noqa: BLE001
                     last_fallback_error = f"{type(fallback_exc).__name__}: {fallback_exc}"
                     if self._is_gemini_model_not_found(fallback_exc):
                         continue
                     raise
-            else:
-                available_models = self._list_gemini_generate_models(genai)
-                model_hint = ", ".join(available_models[:8]) if available_models else "unknown"
-                raise RuntimeError(
-                    "Gemini model is unavailable and fallback failed. "
-                    f"configured={current_model}, available_sample=[{model_hint}], "
-                    f"last_error={last_fallback_error}"
-                ) from exc
-
-        text = getattr(response, "text", None)
-        if not text:
-            text_parts = []
-            for candidate in getattr(response, "candidates", []) or []:
-                content = getattr(candidate, "content", None)
-                for part in getattr(content, "parts", []) or []:
-                    part_text = getattr(part, "text", None)
-                    if part_text:
-                        text_parts.append(part_text)
-            text = "".join(text_parts).strip()
-
-        if not text:
-            raise ValueError("Gemini returned empty content.")
+                self._switch_runtime_model(current_model, fallback_model)
+                return response
 
-        usage = getattr(response, "usage_metadata", None)
-        token_count = getattr(usage, "total_token_count", None)
-        if token_count is None:
-            prompt_tokens = getattr(usage, "prompt_token_count", 0) or 0
-            candidates_tokens = getattr(usage, "candidates_token_count", 0) or 0
-            token_count = int(prompt_tokens) + int(candidates_tokens)
+            available_models = self._list_gemini_generate_models(genai)
+            model_hint = ", ".join(available_models[:8]) if available_models else "unknown"
+            raise RuntimeError(
+                "Gemini model is unavailable and fallback failed. "
+                f"configured={current_model}, available_sample=[{model_hint}], "
+                f"last_error={last_fallback_error}"
+            ) from exc
 
-        return str(text).strip(), int(token_count or 0)
+    def _switch_runtime_model(self, current_model: str, fallback_model: str) -> None:
+        with self._model_lock:
+            self._runtime_model = fallback_model
+        LOGGER.warning(
+            "Switched Gemini model from %s to %s",
+            current_model,
+            fallback_model,
+        )
+        if self.model_cache is not None:
+            self.model_cache.set_resolved(self.api_key, self.model, fallback_model)
 
     def _effective_model(self) -> str:
-        return self._runtime_model or self.model
+        with self._model_lock:
+            return self._runtime_model or self.model
 
     def _gemini_generate(self, genai: Any, model_name: str, prompt: str) -> Any:
-        model = genai.GenerativeModel(model_name)
+        model = bind_gemini_api_key(genai.GenerativeModel(model_name), self._current_api_key())
         return model.generate_content(
-            prompt,
-            generation_config={
-                "temperature": self.temperature,
-                "max_output_tokens": self.max_tokens,
-            },
-            request_options={"timeout": self.timeout},
+            prompt, stream=self._should_stream(), **self._gemini_request_kwargs()
         )
 
+    def _gemini_request_kwargs(self) -> Dict[str, Any]:
+        generation_config: Dict[str, Any] = {
+            "temperature": self.temperature,
+            "max_output_tokens": self.max_tokens,
+        }
+        if self.structured_output:
+            generation_config["response_mime_type"] = "application/json"
+            generation_config["response_schema"] = gemini_response_schema(_RESPONSE_SCHEMA.get())
+        return {
+            "generation_config": generation_config,
+            "request_options": {"timeout": self.timeout},
+        }
+
     @staticmethod
     def _normalize_gemini_model_name(model_name: str) -> str:
         model_name = str(model_name).strip()
@@ -375,6 +1025,10 @@ URL: {url}
         )
 
     def _list_gemini_generate_models(self, genai: Any) -> list[str]:
+        if self.model_cache is not None:
+            cached = self.model_cache.get_models(self.api_key)
+            if cached is not None:
+                return cached
         try:
             models = []
             for item in genai.list_models():
@@ -392,6 +1046,8 @@ URL: {url}
                     continue
                 seen.add(model)
                 deduped.append(model)
+            if deduped and self.model_cache is not None:
+                self.model_cache.set_models(self.api_key, deduped)
             return deduped
         except Exception as exc:  # noqa: BLE001
             LOGGER.warning("Failed to list Gemini models: %s", exc)
@@ -435,39 +1091,20 @@ URL: {url}
         return candidates
 
     def _parse_summary_payload(self, response_text: str) -> Dict[str, str]:
-        payload = self._extract_json_object(response_text)
+        """Parse `brief`/`summary`, repairing malformed JSON locally before failing."""
+        try:
+            payload, repaired = load_json_payload(response_text)
+        except ValueError:
+            record_parse_outcome(self.provider, "failed")
+            raise
         brief = str(payload.get("brief", "")).strip()
         summary = str(payload.get("summary", "")).strip()
         if not brief or not summary:
+            record_parse_outcome(self.provider, "failed")
             raise ValueError("LLM response must include non-empty `brief` and `summary`.")
+        record_parse_outcome(self.provider, "repaired" if repaired else "parsed")
         return {"brief": brief, "summary": summary}
 
-    @staticmethod
-    def _extract_json_object(text: str) -> Dict[str, Any]:
-        stripped = text.strip()
-        if not stripped:
-            raise ValueError("Empty response from LLM.")
-
-        candidates = [stripped]
-        if "```" in stripped:
-            no_fence = re.sub(r"^```(?:json)?\s*", "", stripped, flags=re.IGNORECASE)
-            no_fence = re.sub(r"\s*```$", "", no_fence).strip()
-            candidates.append(no_fence)
-
-        brace_match = re.search(r"\{[\s\S]*\}", stripped)
-        if brace_match:
-            candidates.append(brace_match.group(0))
-
-        for candidate in candidates:
-            try:
-                data = json.loads(candidate)
-                if isinstance(data, dict):
-                    return data
-            except json.JSONDecodeError:
-                continue
-
-        raise ValueError("Could not parse JSON from model response.")
-
     @staticmethod
     def _truncate(value: str, max_length: int, field_name: str, url: str) -> str:
         if len(value) <= max_length:
@@ -0,0 +1,122 @@
+"""On-disk cache of Gemini model availability shared across clients and runs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MODEL_CACHE_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "path": ".cache/move37/gemini_models.json",
+    "ttl": 86400.0,
+}
+
+_REGISTRY_LOCK = threading.Lock()
+_MODEL_CACHES: Dict[str, "GeminiModelCache"] = {}
+
+
+def _key_id(api_key: str) -> str:
+    # Availability differs per project/key; never store the key itself.
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class GeminiModelCache:
+    """JSON file holding the model list and resolved fallback model per API key.
+
+    Entries older than `ttl` seconds are ignored, so a configured model that
+    becomes available again is retried once its fallback entry expires.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl: float = DEFAULT_MODEL_CACHE_CONFIG["ttl"],
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl = float(ttl)
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            LOGGER.warning("Ignoring unreadable Gemini model cache %s: %s", self.path, exc)
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save(self, data: Dict[str, Any]) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so concurrent runs never read a partial file.
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(data, handle, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            LOGGER.warning("Failed to write Gemini model cache %s: %s", self.path, exc)
+
+    def _fresh(self, entry: Any) -> bool:
+        if not isinstance(entry, dict):
+            return False
+        return self._clock() - float(entry.get("updated_at", 0) or 0) <= self.ttl
+
+    def _update(self, api_key: str, field: str, name: str | None, value: Any) -> None:
+        with self._lock:
+            data = self._load()
+            section = data.setdefault(_key_id(api_key), {})
+            entry = {"value": value, "updated_at": self._clock()}
+            if name is None:
+                section[field] = entry
+            else:
+                section.setdefault(field, {})[name] = entry
+            self._save(data)
+
+    def get_models(self, api_key: str) -> List[str] | None:
+        """Return the cached generateContent model list, or None when missing/stale."""
+        with self._lock:
+            entry = self._load().get(_key_id(api_key), {}).get("models")
+        if not self._fresh(entry):
+            return None
+        return [str(model) for model in entry.get("value") or []]
+
+    def set_models(self, api_key: str, models: List[str]) -> None:
+        self._update(api_key, "models", None, list(models))
+
+    def get_resolved(self, api_key: str, configured_model: str) -> str | None:
+        """Return the working model previously resolved for `configured_model`."""
+        with self._lock:
+            entry = self._load().get(_key_id(api_key), {}).get("resolved", {}).get(configured_model)
+        if not self._fresh(entry):
+            return None
+        return str(entry.get("value") or "") or None
+
+    def set_resolved(self, api_key: str, configured_model: str, resolved_model: str) -> None:
+        self._update(api_key, "resolved", configured_model, resolved_model)
+
+
+def get_model_cache(config: Dict[str, Any] | None) -> GeminiModelCache | None:
+    """Return the process-wide cache for `config["path"]`, or None when disabled."""
+    if not config or not config.get("enabled"):
+        return None
+    path = str(Path(config.get("path") or DEFAULT_MODEL_CACHE_CONFIG["path"]).expanduser())
+    ttl = float(config.get("ttl") or DEFAULT_MODEL_CACHE_CONFIG["ttl"])
+    with _REGISTRY_LOCK:
+        cache = _MODEL_CACHES.get(path)
+        if cache is None:
+            cache = GeminiModelCache(path, ttl=ttl)
+            _MODEL_CACHES[path] = cache
+        cache.ttl = ttl
+        return cache
@@ -0,0 +1,215 @@
+"""Pack several short articles into one LLM call."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Tuple
+
+from .llm_client import LLMClient, empty_token_usage
+from .structured_output import load_json_payload, record_parse_outcome
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PACKING_CONFIG: Dict[str, Any] = {
+    "enabled": False,
+    "max_items": 8,
+    "short_item_tokens": 400,
+    "item_output_tokens": 400,
+}
+
+PACK_PROMPT_TEMPLATE = """
+You are an AI analyst.
+Read and analyze each of the articles listed at the end, then return your result in Chinese.
+
+Requirements for every article:
+1. brief: within 100 Chinese characters.
+2. summary: within 1000 Chinese characters.
+3. Return strict JSON only, with exactly one object per article in input order:
+{
+  "items": [
+    {"id": 1, "url": "article url", "brief": "brief text", "summary": "detailed summary text"}
+  ]
+}
+
+Articles ({count}):
+{articles}
+""".strip()
+
+PACK_RESPONSE_SCHEMA: Dict[str, Any] = {
+    "name": "packed_summaries",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "items": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "integer"},
+                        "url": {"type": "string"},
+                        "brief": {"type": "string"},
+                        "summary": {"type": "string"},
+                    },
+                    "required": ["id", "url", "brief", "summary"],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["items"],
+        "additionalProperties": False,
+    },
+}
+
+# A packed entry: {"id": int, "url": str, "title": str, "content": str | None}, where
+# `content` is already compacted.
+PackEntry = Dict[str, Any]
+
+
+def _render_article(entry: PackEntry) -> str:
+    lines = [f"[{entry['id']}] URL: {entry['url']}"]
+    if entry.get("title"):
+        lines.append(f"Title: {entry['title']}")
+    if entry.get("content"):
+        lines.append(str(entry["content"]))
+    return "\n".join(lines)
+
+
+def render_pack_prompt(entries: List[PackEntry]) -> str:
+    """Render the packed prompt (explicit replacement keeps JSON braces intact)."""
+    articles = "\n\n".join(_render_article(entry) for entry in entries)
+    return PACK_PROMPT_TEMPLATE.replace("{count}", str(len(entries))).replace(
+        "{articles}", articles
+    )
+
+
+def plan_packs(
+    entries: List[PackEntry],
+    client: LLMClient,
+    max_items: int = DEFAULT_PACKING_CONFIG["max_items"],
+    short_item_tokens: int = DEFAULT_PACKING_CONFIG["short_item_tokens"],
+    item_output_tokens: int = DEFAULT_PACKING_CONFIG["item_output_tokens"],
+) -> Tuple[List[List[PackEntry]], List[PackEntry]]:
+    """Group short entries into packs; returns (packs, entries to run alone).
+
+    A pack holds at most `max_items` entries, as many as `max_tokens` can answer
+    at `item_output_tokens` each, and must fit the prompt token budget.
+    """
+    pack_limit = min(int(max_items), client.max_tokens // max(1, int(item_output_tokens)))
+    if pack_limit < 2:
+        return [], list(entries)
+
+    budget = client.prompt_token_budget()
+    packs: List[List[PackEntry]] = []
+    singles: List[PackEntry] = []
+    current: List[PackEntry] = []
+    for entry in entries:
+        if client.estimate_tokens(entry.get("content")) > short_item_tokens:
+            singles.append(entry)
+            continue
+        candidate = current + [entry]
+        if current and (
+            len(candidate) > pack_limit
+            or client.estimate_prompt_tokens(render_pack_prompt(candidate)) > budget
+        ):
+            packs.append(current)
+            candidate = [entry]
+        current = candidate
+    if current:
+        packs.append(current)
+
+    # A pack of one saves nothing; run it as a regular call.
+    singles.extend(pack[0] for pack in packs if len(pack) == 1)
+    return [pack for pack in packs if len(pack) > 1], singles
+
+
+def _extract_json_array(provider: str, text: str) -> List[Any]:
+    try:
+        data, repaired = load_json_payload(text, expected=list)
+    except ValueError:
+        record_parse_outcome(provider, "failed")
+        raise
+    if isinstance(data, dict):
+        data = data.get("items")
+    if not isinstance(data, list):
+        record_parse_outcome(provider, "failed")
+        raise ValueError("Packed model response has no `items` array.")
+    record_parse_outcome(provider, "repaired" if repaired else "parsed")
+    return data
+
+
+def _match_entry(record: Any, by_id: Dict[int, PackEntry], by_url: Dict[str, PackEntry]) -> Any:
+    if not isinstance(record, dict):
+        return None
+    try:
+        entry = by_id.get(int(record.get("id")))
+    except (TypeError, ValueError):
+        entry = None
+    if entry is None:
+        entry = by_url.get(str(record.get("url") or "").strip().rstrip("/"))
+    return entry
+
+
+def _split_usage(usage: Dict[str, int], share: float) -> Dict[str, int]:
+    token_usage = empty_token_usage()
+    for key, value in usage.items():
+        token_usage[key] = int(round(int(value or 0) * share))
+    return token_usage
+
+
+def summarize_pack(client: LLMClient, entries: List[PackEntry]) -> Dict[int, Dict[str, Any]]:
+    """Summarize a pack in one call; returns results by entry id.
+
+    Entries missing from the reply or with an invalid brief/summary are left
+    out so the caller can retry them individually. Token usage is split across
+    entries in proportion to their rendered size.
+    """
+    prompt = render_pack_prompt(entries)
+    estimated_tokens = client.estimate_prompt_tokens(prompt)
+    weights = {
+        entry["id"]: max(1, client.estimate_tokens(_render_article(entry))) for entry in entries
+    }
+    total_weight = sum(weights.values())
+    label = f"pack of {len(entries)} ({entries[0]['url']} ...)"
+
+    def _build(raw_text: str, usage: Dict[str, int]) -> Dict[str, Any]:
+        records = _extract_json_array(client.provider, raw_text)
+        by_id = {entry["id"]: entry for entry in entries}
+        by_url = {str(entry["url"]).strip().rstrip("/"): entry for entry in entries}
+        results: Dict[int, Dict[str, Any]] = {}
+        for record in records:
+            entry = _match_entry(record, by_id, by_url)
+            if entry is None or entry["id"] in results:
+                continue
+            brief = str(record.get("brief", "")).strip()
+            summary = str(record.get("summary", "")).strip()
+            if not brief or not summary:
+                continue
+            share = weights[entry["id"]] / total_weight
+            token_usage = _split_usage(usage, share)
+            token_usage["estimated_prompt_tokens"] = int(round(estimated_tokens * share))
+            results[entry["id"]] = {
+                "brief": client._truncate(brief, 100, "brief", entry["url"]),
+                "summary": client._truncate(summary, 1000, "summary", entry["url"]),
+                "model_used": client._effective_model(),
+                "tokens_consumed": int(token_usage["total_tokens"]),
+                "tokens_estimated": token_usage["estimated_prompt_tokens"],
+                "token_usage": token_usage,
+                "success": True,
+                "error": None,
+            }
+        if not results:
+            raise ValueError("Packed response contained no valid item.")
+        return {"success": True, "items": results}
+
+    outcome = client._request_with_retries(
+        label, prompt, estimated_tokens, _build, response_schema=PACK_RESPONSE_SCHEMA
+    )
+    if not outcome.get("success"):
+        LOGGER.warning("Packed call failed, %s, error=%s", label, outcome.get("error"))
+        return {}
+
+    results = outcome["items"]
+    missing = [entry["url"] for entry in entries if entry["id"] not in results]
+    if missing:
+        LOGGER.warning("Packed reply missing/invalid for %s item(s): %s", len(missing), missing)
+    return results
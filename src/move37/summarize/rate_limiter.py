@@ -0,0 +1,226 @@
+"""Per-provider RPM/TPM rate limiting with AIMD concurrency control."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict
+
+# Re-exported: error helpers now live in the shared retry module.
+from move37.utils.retry import is_rate_limit_error, retry_after_seconds  # noqa: F401
+
+LOGGER = logging.getLogger(__name__)
+
+# Pause applied after a 429 that carries no `Retry-After` hint.
+DEFAULT_RATE_LIMIT_PAUSE = 2.0
+# Poll interval while every concurrency slot is taken.
+_SLOT_POLL_SECONDS = 0.05
+
+_REGISTRY_LOCK = threading.Lock()
+_RATE_LIMITERS: Dict[str, "RateLimiter"] = {}
+
+
+class RateLimiter:
+    """Token-bucket limiter for requests/min and tokens/min of one provider.
+
+    Token costs are reserved up front from estimated prompt tokens plus the
+    output allowance, and reconciled with real usage on release. Concurrency
+    follows AIMD: +1 slot after a full window of successes, halved on a 429.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rpm: int = 0,
+        tpm: int = 0,
+        max_concurrency: int = 1,
+        min_concurrency: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.min_concurrency = max(1, int(min_concurrency))
+        self.rpm = max(0, int(rpm or 0))
+        self.tpm = max(0, int(tpm or 0))
+        self.max_concurrency = max(self.min_concurrency, int(max_concurrency or 1))
+        self._request_bucket = float(self.rpm)
+        self._token_bucket = float(self.tpm)
+        self._refilled_at = clock()
+        self.concurrency_limit = float(self.max_concurrency)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._successes = 0
+        self._stats: Dict[str, float] = {
+            "requests": 0,
+            "rate_limited": 0,
+            "waited_seconds": 0.0,
+            "reserved_tokens": 0,
+        }
+
+    def configure(self, rpm: int = 0, tpm: int = 0, max_concurrency: int = 1) -> None:
+        """Update limits; 0 disables the RPM or TPM bucket."""
+        with self._lock:
+            self.rpm = max(0, int(rpm or 0))
+            self.tpm = max(0, int(tpm or 0))
+            self.max_concurrency = max(self.min_concurrency, int(max_concurrency or 1))
+            self.concurrency_limit = min(self.concurrency_limit, self.max_concurrency)
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._refilled_at)
+        self._refilled_at = now
+        if self.rpm:
+            self._request_bucket = min(self.rpm, self._request_bucket + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._token_bucket = min(self.tpm, self._token_bucket + elapsed * self.tpm / 60)
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Take a slot and budget, returning 0; otherwise return seconds to wait."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self._in_flight >= int(self.concurrency_limit):
+                return _SLOT_POLL_SECONDS
+            if self.rpm and self._request_bucket < 1:
+                return (1 - self._request_bucket) * 60 / self.rpm
+            # An oversized request waits for a full bucket instead of forever.
+            cost = min(int(tokens), self.tpm) if self.tpm else 0
+            if self.tpm and self._token_bucket < cost:
+                return (cost - self._token_bucket) * 60 / self.tpm
+
+            if self.rpm:
+                self._request_bucket -= 1
+            if self.tpm:
+                self._token_bucket -= cost
+            self._in_flight += 1
+            self._stats["requests"] += 1
+            self._stats["reserved_tokens"] += int(tokens)
+            return 0.0
+
+    def acquire(self, tokens: int) -> None:
+        """Block until a request of `tokens` estimated tokens may be sent."""
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                return
+            self._record_wait(wait)
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int) -> None:
+        """Async counterpart of `acquire`."""
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                return
+            self._record_wait(wait)
+            await asyncio.sleep(wait)
+
+    def _record_wait(self, wait: float) -> None:
+        with self._lock:
+            self._stats["waited_seconds"] += wait
+
+    def release(
+        self,
+        reserved_tokens: int,
+        used_tokens: int | None = None,
+        succeeded: bool = True,
+        rate_limited: bool = False,
+        retry_after: float | None = None,
+    ) -> None:
+        """Return the slot, reconcile token usage and adapt concurrency."""
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            if self.tpm and used_tokens:
+                # Refund over-reservation; overspend is carried as bucket debt.
+                charged = min(int(reserved_tokens), self.tpm)
+                self._token_bucket = min(
+                    self.tpm, self._token_bucket + charged - int(used_tokens)
+                )
+
+            if rate_limited:
+                self._stats["rate_limited"] += 1
+                self._successes = 0
+                self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit / 2)
+                pause = retry_after if retry_after is not None else DEFAULT_RATE_LIMIT_PAUSE
+                self._paused_until = max(self._paused_until, self._clock() + pause)
+                LOGGER.warning(
+                    "Rate limited by provider=%s, concurrency -> %s, pause %.1fs",
+                    self.name,
+                    int(self.concurrency_limit),
+                    pause,
+                )
+            elif succeeded:
+                self._successes += 1
+                if (
+                    self._successes >= int(self.concurrency_limit)
+                    and self.concurrency_limit < self.max_concurrency
+                ):
+                    self.concurrency_limit += 1
+                    self._successes = 0
+
+    def reset_stats(self) -> None:
+        """Zero the report counters; buckets and the concurrency limit are kept."""
+        with self._lock:
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return limiter state for run reports."""
+        with self._lock:
+            self._refill(self._clock())
+            return {
+                "rpm": self.rpm,
+                "tpm": self.tpm,
+                "max_concurrency": self.max_concurrency,
+                "concurrency_limit": int(self.concurrency_limit),
+                "in_flight": self._in_flight,
+                "available_requests": round(self._request_bucket, 2) if self.rpm else None,
+                "available_tokens": int(self._token_bucket) if self.tpm else None,
+                "requests": int(self._stats["requests"]),
+                "rate_limited": int(self._stats["rate_limited"]),
+                "waited_seconds": round(self._stats["waited_seconds"], 2),
+                "reserved_tokens": int(self._stats["reserved_tokens"]),
+            }
+
+
+def get_rate_limiter(
+    provider: str,
+    rpm: int = 0,
+    tpm: int = 0,
+    max_concurrency: int = 1,
+) -> RateLimiter:
+    """Return the process-wide limiter of a provider, updating its limits."""
+    key = str(provider).strip().lower()
+    with _REGISTRY_LOCK:
+        limiter = _RATE_LIMITERS.get(key)
+        if limiter is None:
+            limiter = RateLimiter(key, rpm=rpm, tpm=tpm, max_concurrency=max_concurrency)
+            _RATE_LIMITERS[key] = limiter
+        else:
+            limiter.configure(rpm=rpm, tpm=tpm, max_concurrency=max_concurrency)
+        return limiter
+
+
+def rate_limiter_states() -> Dict[str, Dict[str, Any]]:
+    """Return a snapshot of every provider limiter."""
+    with _REGISTRY_LOCK:
+        limiters = dict(_RATE_LIMITERS)
+    return {name: limiter.snapshot() for name, limiter in limiters.items()}
+
+
+def reset_rate_limiter_stats() -> None:
+    """Zero the counters of every limiter so the next report covers one run."""
+    with _REGISTRY_LOCK:
+        limiters = list(_RATE_LIMITERS.values())
+    for limiter in limiters:
+        limiter.reset_stats()
+
+
+def reset_rate_limiters() -> None:
+    """Drop all provider limiters (used between runs and in tests)."""
+    with _REGISTRY_LOCK:
+        _RATE_LIMITERS.clear()
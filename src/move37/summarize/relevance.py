@@ -0,0 +1,333 @@
+"""Local TF-IDF + logistic regression relevance filter trained on past runs."""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from .compaction import extract_text
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_RELEVANCE_CONFIG: Dict[str, Any] = {
+    "enabled": False,
+    "model_path": ".cache/move37/relevance.npz",
+    "history_path": ".cache/move37/relevance_history.jsonl",
+    "drop_threshold": 0.2,
+    "lead_chars": 600,
+}
+
+# Hashed feature space; collisions are rare at this size and cost little accuracy.
+DEFAULT_FEATURE_BITS = 18
+
+# Odd base so it is invertible mod 2**64 (needed to cut word hashes out of prefix sums).
+_HASH_BASE = 0x100000001B3
+_WORD_SALT = 0x9E3779B97F4A7C15
+_CJK_SALT = 0xC2B2AE3D27D4EB4F
+
+_POWER_TABLES: Dict[str, Tuple[Any, Any]] = {}
+
+# summary_mode values that say nothing about whether a reader kept the item.
+_UNLABELED_MODES = {"filtered"}
+
+
+def _numpy() -> Any:
+    try:
+        import numpy as np
+    except ImportError as exc:  # pragma: no cover
+        raise RuntimeError("numpy package is required. Install with `pip install numpy`.") from exc
+    return np
+
+
+def _mix64(np: Any, values: Any) -> Any:
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def _power_tables(np: Any, size: int) -> Tuple[Any, Any]:
+    """Return base**i and base**-i (mod 2**64) for i < size, cached across calls."""
+    cached = _POWER_TABLES.get("powers")
+    if cached is None or cached[0].size < size:
+        size = max(size, 1 << 16)
+        base = np.full(size - 1, _HASH_BASE, dtype=np.uint64)
+        inverse = np.full(size - 1, pow(_HASH_BASE, -1, 1 << 64), dtype=np.uint64)
+        one = np.ones(1, dtype=np.uint64)
+        cached = (
+            np.concatenate([one, np.cumprod(base)]),
+            np.concatenate([one, np.cumprod(inverse)]),
+        )
+        _POWER_TABLES["powers"] = cached
+    return cached
+
+
+def hashed_tokens(
+    texts: Sequence[str],
+    feature_bits: int = DEFAULT_FEATURE_BITS,
+) -> Tuple[Any, Any]:
+    """Return (row, feature) arrays for every token of every text.
+
+    Tokens are lowercase ASCII words (letters, digits, `+`, `#`) and CJK
+    character bigrams (a lone CJK character is its own token). All texts are
+    tokenized and hashed at once on their concatenated code points.
+    """
+    np = _numpy()
+    empty = np.zeros(0, dtype=np.int64)
+    if not texts:
+        return empty, empty
+    strings = [str(text or "") for text in texts]
+    # A newline after each text keeps tokens from spanning two texts.
+    text_ends = np.cumsum(np.array([len(text) + 1 for text in strings], dtype=np.int64))
+    codes = np.frombuffer(("\n".join(strings) + "\n").encode("utf-32-le"), dtype=np.uint32)
+
+    # Unsigned wrap-around turns each range check into one comparison.
+    folded = codes | np.uint32(32)
+    is_letter = (folded - np.uint32(97)) < np.uint32(26)
+    is_word = is_letter | ((codes - np.uint32(48)) < np.uint32(10))
+    is_word |= (codes == 43) | (codes == 35)
+    is_cjk = (codes - np.uint32(0x4E00)) < np.uint32(0x5200)
+    lowered = np.where(is_letter, folded, codes).astype(np.uint64)
+
+    edges = np.diff(is_word.view(np.int8), prepend=np.int8(0), append=np.int8(0))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+
+    # Polynomial word hash: (prefix[end] - prefix[start - 1]) * base**-start, mod 2**64.
+    powers, inverse_powers = _power_tables(np, codes.size)
+    prefix = np.cumsum(lowered * powers[: codes.size], dtype=np.uint64)
+    before = np.where(starts > 0, prefix[starts - 1], np.uint64(0))
+    word_hashes = ((prefix[ends] - before) * inverse_powers[starts]) ^ np.uint64(_WORD_SALT)
+
+    next_cjk = np.r_[is_cjk[1:], False]
+    prev_cjk = np.r_[False, is_cjk[:-1]]
+    pairs = np.flatnonzero(is_cjk & next_cjk)
+    lone = np.flatnonzero(is_cjk & ~prev_cjk & ~next_cjk)
+    cjk_hashes = np.concatenate(
+        [lowered[pairs] * np.uint64(_HASH_BASE) + lowered[pairs + 1], lowered[lone]]
+    ) ^ np.uint64(_CJK_SALT)
+
+    hashes = _mix64(np, np.concatenate([word_hashes, cjk_hashes]))
+    features = (hashes >> np.uint64(64 - feature_bits)).astype(np.int64)
+    positions = np.concatenate([starts, pairs, lone])
+    rows = np.searchsorted(text_ends, positions, side="right")
+    return rows, features
+
+
+def item_text(
+    item: Dict[str, Any],
+    lead_chars: int = DEFAULT_RELEVANCE_CONFIG["lead_chars"],
+) -> str:
+    """Title plus the first `lead_chars` characters of extracted text: what the filter sees.
+
+    Feed markup is stripped first so the model never trains or scores on tags,
+    image URLs or widget boilerplate.
+    """
+    title = str(item.get("title") or "").strip()
+    lead = extract_text(item.get("content"))[:lead_chars]
+    return f"{title}\n{lead}".strip()
+
+
+def label_item(item: Dict[str, Any]) -> int | None:
+    """Return 1 for a kept item, 0 for a dropped one, None when unknown.
+
+    An explicit boolean `relevant` wins; otherwise items the triage stage
+    only briefed count as dropped and fully summarized ones as kept.
+    """
+    if isinstance(item.get("relevant"), bool):
+        return int(item["relevant"])
+    mode = item.get("summary_mode")
+    if mode in _UNLABELED_MODES or item.get("duplicate_of"):
+        return None
+    if mode == "triaged":
+        return 0
+    if item.get("success") and str(item.get("summary") or "").strip():
+        return 1
+    return None
+
+
+def _iter_items(summary_result: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    for source in summary_result.get("results") or []:
+        if not isinstance(source, dict):
+            continue
+        for item in source.get("items") or []:
+            if isinstance(item, dict):
+                yield item
+
+
+def training_examples(
+    summary_results: Iterable[Dict[str, Any]],
+    lead_chars: int = DEFAULT_RELEVANCE_CONFIG["lead_chars"],
+) -> Tuple[List[str], List[int]]:
+    """Collect (texts, labels) from `summary_result` dicts, skipping unlabeled items."""
+    texts: List[str] = []
+    labels: List[int] = []
+    for summary_result in summary_results:
+        for item in _iter_items(summary_result):
+            label = label_item(item)
+            if label is not None:
+                texts.append(item_text(item, lead_chars))
+                labels.append(label)
+    return texts, labels
+
+
+def append_history(
+    summary_result: Dict[str, Any],
+    path: str | Path,
+    lead_chars: int = DEFAULT_RELEVANCE_CONFIG["lead_chars"],
+) -> int:
+    """Append labeled items of one run to a JSONL history file; returns the count."""
+    texts, labels = training_examples([summary_result], lead_chars)
+    if not texts:
+        return 0
+    history_path = Path(path)
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    with history_path.open("a", encoding="utf-8") as handle:
+        for text, label in zip(texts, labels):
+            handle.write(json.dumps({"text": text, "label": label}, ensure_ascii=False) + "\n")
+    return len(texts)
+
+
+def load_history(path: str | Path) -> Tuple[List[str], List[int]]:
+    """Read (texts, labels) written by `append_history`; bad lines are skipped."""
+    texts: List[str] = []
+    labels: List[int] = []
+    with Path(path).open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+                label = int(record["label"])
+            except (ValueError, KeyError, TypeError):
+                continue
+            texts.append(str(record.get("text") or ""))
+            labels.append(1 if label else 0)
+    return texts, labels
+
+
+class RelevanceModel:
+    """Hashed TF-IDF features with an L2-regularized logistic regression head.
+
+    Documents are kept as flat (row, feature, value) arrays, so scoring a
+    whole collection is a handful of `np.bincount` calls over all tokens.
+    """
+
+    def __init__(self, idf: Any, weights: Any, bias: float) -> None:
+        self.idf = idf
+        self.weights = weights
+        self.bias = float(bias)
+
+    @property
+    def feature_bits(self) -> int:
+        return int(self.idf.size).bit_length() - 1
+
+    def _features(self, texts: Sequence[str]) -> Tuple[Any, Any, Any]:
+        """Return L2-normalized sublinear TF-IDF as (rows, features, values)."""
+        np = _numpy()
+        rows, features = hashed_tokens(texts, self.feature_bits)
+        # Merge repeated (row, feature) pairs into counts; unseen features have idf 0.
+        keys, counts = np.unique((rows << self.feature_bits) | features, return_counts=True)
+        rows = keys >> self.feature_bits
+        features = keys & (self.idf.size - 1)
+        values = (1.0 + np.log(counts)) * self.idf[features]
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=len(texts)))
+        values = values / np.maximum(norms[rows], 1e-12)
+        return rows, features, values
+
+    def decision_function(self, texts: Sequence[str]) -> Any:
+        np = _numpy()
+        rows, features, values = self._features(texts)
+        margins = np.bincount(rows, weights=values * self.weights[features], minlength=len(texts))
+        return margins + self.bias
+
+    def predict_proba(self, texts: Sequence[str]) -> Any:
+        """Probability that each text is relevant, as a float array."""
+        np = _numpy()
+        return 1.0 / (1.0 + np.exp(-self.decision_function(texts)))
+
+    @classmethod
+    def fit(
+        cls,
+        texts: Sequence[str],
+        labels: Sequence[int],
+        min_df: int = 2,
+        l2: float = 1e-3,
+        epochs: int = 300,
+        learning_rate: float = 0.5,
+        feature_bits: int = DEFAULT_FEATURE_BITS,
+    ) -> "RelevanceModel":
+        """Train on labeled texts; both classes must be present.
+
+        Features seen in fewer than `min_df` texts get idf 0 and are ignored.
+        Uses full-batch gradient descent with Adam steps on the sparse
+        features; positives and negatives are weighted to equal total mass.
+        """
+        np = _numpy()
+        y = np.asarray(labels, dtype=np.float64)
+        if len(texts) != y.size or y.size == 0:
+            raise ValueError("`texts` and `labels` must be non-empty and of equal length.")
+        if y.min() == y.max():
+            raise ValueError("Training data needs both relevant and irrelevant examples.")
+
+        size = 1 << feature_bits
+        rows, features = hashed_tokens(texts, feature_bits)
+        present = np.unique((rows << feature_bits) | features) & (size - 1)
+        df = np.bincount(present, minlength=size).astype(np.float64)
+        idf = np.where(df >= max(1, min_df), np.log((1.0 + y.size) / (1.0 + df)) + 1.0, 0.0)
+        if not idf.any():
+            raise ValueError("No token reaches `min_df`; add more training data.")
+        model = cls(idf, np.zeros(size), 0.0)
+
+        # Train on the features that survived `min_df` only, renumbered densely.
+        rows, features, values = model._features(texts)
+        used = np.flatnonzero(idf)
+        dense_index = np.full(size, -1, dtype=np.int64)
+        dense_index[used] = np.arange(used.size)
+        keep = dense_index[features] >= 0
+        rows, features, values = rows[keep], dense_index[features[keep]], values[keep]
+
+        positives = float(y.sum())
+        sample_weight = np.where(y == 1, 0.5 / positives, 0.5 / (y.size - positives))
+        params = np.zeros(used.size + 1)
+        first_moment = np.zeros_like(params)
+        second_moment = np.zeros_like(params)
+        for step in range(1, epochs + 1):
+            margins = np.bincount(rows, weights=values * params[features], minlength=y.size)
+            error = (1.0 / (1.0 + np.exp(-(margins + params[-1]))) - y) * sample_weight
+            gradient = np.empty_like(params)
+            gradient[:-1] = np.bincount(
+                features, weights=values * error[rows], minlength=used.size
+            ) + l2 * params[:-1]
+            gradient[-1] = error.sum()
+            first_moment = 0.9 * first_moment + 0.1 * gradient
+            second_moment = 0.999 * second_moment + 0.001 * gradient * gradient
+            corrected = first_moment / (1 - 0.9**step)
+            scale = np.sqrt(second_moment / (1 - 0.999**step)) + 1e-8
+            params -= learning_rate / math.sqrt(step) * corrected / scale
+
+        model.weights[used] = params[:-1]
+        model.bias = float(params[-1])
+        return model
+
+    def save(self, path: str | Path) -> None:
+        """Write the model to an `.npz` file (write-then-rename)."""
+        np = _numpy()
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, suffix=".npz")
+        with os.fdopen(fd, "wb") as handle:
+            np.savez_compressed(
+                handle, idf=self.idf, weights=self.weights, bias=np.array([self.bias])
+            )
+        os.replace(tmp_path, target)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "RelevanceModel":
+        np = _numpy()
+        with np.load(Path(path), allow_pickle=False) as data:
+            return cls(data["idf"], data["weights"], float(data["bias"][0]))
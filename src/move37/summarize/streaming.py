@@ -0,0 +1,173 @@
+"""Incremental parsing of streamed summary JSON and streaming statistics."""
+
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Dict, Tuple
+
+# Character limits applied by `LLMClient._truncate`.
+SUMMARY_FIELD_LIMITS: Dict[str, int] = {"brief": 100, "summary": 1000}
+# Usage keys that carry per-request stream metrics rather than token counters.
+STREAM_METRIC_KEYS = ("time_to_first_token_ms", "stream_stopped_early")
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+_STATS_LOCK = threading.Lock()
+_STREAM_STATS: Dict[str, Dict[str, float]] = {}
+
+
+class IncrementalSummaryParser:
+    """Track top-level string fields of a JSON object while it streams in.
+
+    `feed` returns True once every tracked field is either closed or longer
+    than its limit, i.e. when further output would only be thrown away.
+    """
+
+    def __init__(self, limits: Dict[str, int] | None = None) -> None:
+        self.limits = dict(limits or SUMMARY_FIELD_LIMITS)
+        self.fields: Dict[str, str] = {}
+        self.closed: set[str] = set()
+        self.text = ""
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._unicode = ""
+        self._buffer: list[str] = []
+        self._string_field: str | None = None
+        self._string_is_key = False
+        self._last_key: str | None = None
+        self._expect_value = False
+
+    @property
+    def over_limit(self) -> bool:
+        return any(len(self.fields.get(name, "")) > limit for name, limit in self.limits.items())
+
+    @property
+    def done(self) -> bool:
+        return all(
+            name in self.closed or len(self.fields.get(name, "")) > limit
+            for name, limit in self.limits.items()
+        )
+
+    def feed(self, delta: str) -> bool:
+        """Consume a text delta; return True when generation can stop."""
+        self.text += delta
+        for char in delta:
+            if self._in_string:
+                self._feed_string_char(char)
+            else:
+                self._feed_structural_char(char)
+            if self.done:
+                return True
+        return False
+
+    def _feed_structural_char(self, char: str) -> None:
+        if char == '"':
+            self._in_string = True
+            self._buffer = []
+            self._string_is_key = not self._expect_value
+            self._string_field = None
+            if self._expect_value and self._depth == 1 and self._last_key in self.limits:
+                self._string_field = self._last_key
+            self._expect_value = False
+        elif char == ":":
+            self._expect_value = True
+        elif char == ",":
+            self._expect_value = False
+        elif char in "{[":
+            self._depth += 1
+            self._expect_value = False
+        elif char in "}]":
+            self._depth = max(0, self._depth - 1)
+
+    def _feed_string_char(self, char: str) -> None:
+        if self._unicode:
+            self._unicode += char
+            if len(self._unicode) == 5:
+                try:
+                    self._append(chr(int(self._unicode[1:], 16)))
+                except ValueError:
+                    pass
+                self._unicode = ""
+            return
+        if self._escape:
+            self._escape = False
+            if char == "u":
+                self._unicode = "u"
+            else:
+                self._append(_ESCAPES.get(char, char))
+            return
+        if char == "\\":
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+            if self._string_is_key:
+                self._last_key = "".join(self._buffer)
+            elif self._string_field is not None:
+                self.closed.add(self._string_field)
+        else:
+            self._append(char)
+
+    def _append(self, char: str) -> None:
+        self._buffer.append(char)
+        if self._string_field is not None:
+            self.fields[self._string_field] = "".join(self._buffer)
+
+    def payload_text(self) -> str:
+        """Render the fields seen so far as a JSON object."""
+        return json.dumps(
+            {name: self.fields.get(name, "") for name in self.limits}, ensure_ascii=False
+        )
+
+
+def split_stream_metrics(usage: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any] | None]:
+    """Separate stream metrics from token counters; returns (usage, metrics or None)."""
+    if not any(key in usage for key in STREAM_METRIC_KEYS):
+        return usage, None
+    counters = {key: value for key, value in usage.items() if key not in STREAM_METRIC_KEYS}
+    metrics = {
+        "time_to_first_token": round(int(usage.get("time_to_first_token_ms") or 0) / 1000, 3),
+        "stopped_early": bool(usage.get("stream_stopped_early")),
+    }
+    return counters, metrics
+
+
+def record_stream(
+    provider: str,
+    time_to_first_token: float | None,
+    stopped_early: bool,
+    output_tokens_saved: int,
+) -> None:
+    """Add one streamed request to the provider's counters."""
+    with _STATS_LOCK:
+        stats = _STREAM_STATS.setdefault(
+            provider,
+            {"requests": 0, "stopped_early": 0, "output_tokens_saved": 0, "ttft_total": 0.0},
+        )
+        stats["requests"] += 1
+        stats["stopped_early"] += int(stopped_early)
+        stats["output_tokens_saved"] += int(output_tokens_saved)
+        stats["ttft_total"] += float(time_to_first_token or 0.0)
+
+
+def streaming_stats() -> Dict[str, Dict[str, Any]]:
+    """Return streamed request counters and mean time-to-first-token per provider."""
+    with _STATS_LOCK:
+        snapshot = {provider: dict(stats) for provider, stats in _STREAM_STATS.items()}
+    report: Dict[str, Dict[str, Any]] = {}
+    for provider, stats in snapshot.items():
+        requests = int(stats["requests"])
+        report[provider] = {
+            "requests": requests,
+            "stopped_early": int(stats["stopped_early"]),
+            "output_tokens_saved": int(stats["output_tokens_saved"]),
+            "avg_time_to_first_token": round(stats["ttft_total"] / requests, 3) if requests else 0.0,
+        }
+    return report
+
+
+def reset_streaming_stats() -> None:
+    """Drop all streaming counters (used between runs and in tests)."""
+    with _STATS_LOCK:
+        _STREAM_STATS.clear()
@@ -0,0 +1,217 @@
+"""Provider JSON modes, local JSON repair and parse-failure accounting."""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+from typing import Any, Dict, List, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+SUMMARY_RESPONSE_SCHEMA: Dict[str, Any] = {
+    "name": "summary",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "brief": {"type": "string"},
+            "summary": {"type": "string"},
+        },
+        "required": ["brief", "summary"],
+        "additionalProperties": False,
+    },
+}
+
+# Providers whose OpenAI-compatible endpoint accepts `json_schema`; others get `json_object`.
+_JSON_SCHEMA_PROVIDERS = {"openai"}
+# Characters that may follow the closing quote of a JSON string.
+_STRING_TERMINATORS = ",:}]"
+_MAX_REPAIR_ROUNDS = 3
+
+_STATS_LOCK = threading.Lock()
+_PARSE_STATS: Dict[str, Dict[str, int]] = {}
+
+
+def openai_response_format(provider: str, response_schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the `response_format` request field for an OpenAI-compatible provider."""
+    if provider in _JSON_SCHEMA_PROVIDERS:
+        return {
+            "type": "json_schema",
+            "json_schema": {**response_schema, "strict": True},
+        }
+    return {"type": "json_object"}
+
+
+def gemini_response_schema(response_schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a JSON schema to Gemini's OpenAPI subset (no `additionalProperties`)."""
+
+    def _convert(node: Any) -> Any:
+        if isinstance(node, dict):
+            return {
+                key: _convert(value)
+                for key, value in node.items()
+                if key != "additionalProperties"
+            }
+        if isinstance(node, list):
+            return [_convert(value) for value in node]
+        return node
+
+    return _convert(response_schema["schema"])
+
+
+def is_structured_output_unsupported(exc: BaseException) -> bool:
+    """Detect a provider rejecting `response_format` / `response_schema` fields."""
+    status = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    text = str(exc).lower()
+    mentions_field = any(
+        field in text for field in ("response_format", "response_schema", "response_mime_type")
+    )
+    return mentions_field and (status in (400, 422, None) or "invalid" in text)
+
+
+def repair_json(text: str) -> str:
+    """Best-effort fix of common LLM JSON defects without another model call.
+
+    Handles code fences and surrounding prose, raw newlines and unescaped quotes
+    inside strings, trailing commas and output truncated mid-object.
+    """
+    stripped = re.sub(r"```(?:json)?", "", text, flags=re.IGNORECASE).strip()
+    starts = [index for index in (stripped.find("{"), stripped.find("[")) if index >= 0]
+    if not starts:
+        return stripped
+    stripped = stripped[min(starts) :]
+
+    out: List[str] = []
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+    for index, char in enumerate(stripped):
+        if in_string:
+            if escaped:
+                escaped = False
+                out.append(char)
+            elif char == "\\":
+                escaped = True
+                out.append(char)
+            elif char == '"':
+                rest = stripped[index + 1 :].lstrip()
+                if not rest or rest[0] in _STRING_TERMINATORS:
+                    in_string = False
+                    out.append(char)
+                else:
+                    out.append('\\"')
+            elif char == "\n":
+                out.append("\\n")
+            elif char == "\t":
+                out.append("\\t")
+            elif char != "\r":
+                out.append(char)
+            continue
+
+        if char == '"':
+            in_string = True
+            out.append(char)
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+            out.append(char)
+        elif char in "}]":
+            _strip_trailing_comma(out)
+            if stack:
+                stack.pop()
+            out.append(char)
+            if not stack:
+                break
+        else:
+            out.append(char)
+
+    if in_string:
+        out.append('"')
+    _strip_trailing_comma(out)
+    while out and out[-1].strip() == ":":
+        out.pop()
+    return "".join(out) + "".join(reversed(stack))
+
+
+def _strip_trailing_comma(out: List[str]) -> None:
+    while out and not out[-1].strip():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+
+def _drop_last_member(text: str) -> str:
+    """Cut a repaired document back to its last complete member."""
+    body = text.rstrip("}] \n")
+    cut = body.rfind(",")
+    if cut <= 0:
+        return text
+    return repair_json(body[:cut])
+
+
+def load_json_payload(text: str, expected: type = dict) -> Tuple[Any, bool]:
+    """Parse model output as JSON of `expected` type; returns (data, repaired).
+
+    Direct, fence-stripped and bracket-extracted candidates are tried first;
+    only when all fail is `repair_json` applied.
+    """
+    stripped = text.strip()
+    if not stripped:
+        raise ValueError("Empty response from LLM.")
+
+    candidates = [stripped]
+    if "```" in stripped:
+        no_fence = re.sub(r"^```(?:json)?\s*", "", stripped, flags=re.IGNORECASE)
+        candidates.append(re.sub(r"\s*```$", "", no_fence).strip())
+    pattern = r"\{[\s\S]*\}" if expected is dict else r"[\[{][\s\S]*[\]}]"
+    match = re.search(pattern, stripped)
+    if match:
+        candidates.append(match.group(0))
+
+    for candidate in candidates:
+        try:
+            data = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, (expected, dict)):
+            return data, False
+
+    repaired = repair_json(stripped)
+    for _ in range(_MAX_REPAIR_ROUNDS):
+        try:
+            data = json.loads(repaired)
+        except json.JSONDecodeError:
+            shorter = _drop_last_member(repaired)
+            if shorter == repaired:
+                break
+            repaired = shorter
+            continue
+        if isinstance(data, (expected, dict)):
+            return data, True
+        break
+    raise ValueError("Could not parse JSON from model response.")
+
+
+def record_parse_outcome(provider: str, outcome: str) -> None:
+    """Count a parse outcome (`parsed`, `repaired` or `failed`) for a provider."""
+    with _STATS_LOCK:
+        stats = _PARSE_STATS.setdefault(provider, {"parsed": 0, "repaired": 0, "failed": 0})
+        stats[outcome] += 1
+    if outcome == "repaired":
+        LOGGER.info("Repaired malformed JSON from provider=%s", provider)
+
+
+def parse_stats() -> Dict[str, Dict[str, Any]]:
+    """Return parse counters and failure rate per provider for run reports."""
+    with _STATS_LOCK:
+        stats = {provider: dict(counts) for provider, counts in _PARSE_STATS.items()}
+    for counts in stats.values():
+        total = counts["parsed"] + counts["repaired"] + counts["failed"]
+        counts["failure_rate"] = round(counts["failed"] / total, 4) if total else 0.0
+    return stats
+
+
+def reset_parse_stats() -> None:
+    """Drop all parse counters (used between runs and in tests)."""
+    with _STATS_LOCK:
+        _PARSE_STATS.clear()
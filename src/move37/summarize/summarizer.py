@@ -2,42 +2,158 @@
 
 from __future__ import annotations
 
+import asyncio
 import copy
 import logging
+import threading
 import time
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
+from .async_llm_client import AsyncLLMClient
+from .batch import BatchSummarizer
+from .cache import SummaryCache, build_cache_key
+from .compaction import extract_text
 from .config import ConfigurationError, load_config
 from .content_fetcher import extract_youtube_video_id, is_youtube_url
+from .dedup import DEFAULT_DEDUP_CONFIG, find_duplicate_clusters
+from .hedging import HedgedLLMClient, shared_latency_window
 from .llm_client import LLMClient
+from .packing import plan_packs, summarize_pack
+from .relevance import RelevanceModel, append_history, item_text
+from .triage import triage_entries
+
+if TYPE_CHECKING:
+    from move37.utils.checkpoint import RunCheckpoint
 
 LOGGER = logging.getLogger(__name__)
 
+# Client result fields copied onto items only when the client sets them.
+_OPTIONAL_RESPONSE_FIELDS = ("hedged", "hedge_winner", "streaming")
+
+
+def _llm_client_kwargs(loaded_config: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "provider": loaded_config["provider"],
+        "api_key": loaded_config["api_key"],
+        "api_keys": loaded_config.get("api_keys"),
+        "model": loaded_config["model"],
+        "base_url": loaded_config["base_url"],
+        "temperature": loaded_config["temperature"],
+        "max_tokens": loaded_config["max_tokens"],
+        "timeout": loaded_config["timeout"],
+        "max_retries": loaded_config["max_retries"],
+        "context_window": loaded_config.get("context_window"),
+        "compaction": loaded_config.get("compaction"),
+        "rate_limit": loaded_config.get("rate_limit"),
+        "structured_output": loaded_config.get("structured_output", True),
+        "streaming": loaded_config.get("streaming", False),
+        "model_cache": loaded_config.get("gemini_model_cache"),
+    }
+
 
 def _create_llm_client(loaded_config: Dict[str, Any]) -> LLMClient:
-    return LLMClient(
-        provider=loaded_config["provider"],
-        api_key=loaded_config["api_key"],
-        model=loaded_config["model"],
-        base_url=loaded_config["base_url"],
-        temperature=loaded_config["temperature"],
-        max_tokens=loaded_config["max_tokens"],
-        timeout=loaded_config["timeout"],
-        max_retries=loaded_config["max_retries"],
+    return LLMClient(**_llm_client_kwargs(loaded_config))
+
+
+def _create_async_llm_client(loaded_config: Dict[str, Any]) -> AsyncLLMClient:
+    return AsyncLLMClient(
+        **_llm_client_kwargs(loaded_config),
+        max_connections=loaded_config.get("concurrency"),
     )
 
 
-def _create_gemini_youtube_client(base_config: Dict[str, Any]) -> LLMClient:
-    gemini_config = load_config(
+# Run-level features that belong to the primary client only. A helper client's
+# config must not pick them up from `.env`: e.g. `LLM_HEDGE_PROVIDER` equals the
+# hedge secondary's own provider, and `LLM_BATCH_ENABLED` rejects Gemini.
+_PRIMARY_ONLY_OVERRIDES: Dict[str, Any] = {
+    "hedge_provider": "",
+    "batch_enabled": False,
+    "dedup_enabled": False,
+    "relevance_enabled": False,
+    "triage_enabled": False,
+    "packing_enabled": False,
+    "cache_enabled": False,
+}
+
+
+def _load_helper_config(base_config: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Load the config of a helper client (hedge secondary, YouTube Gemini, triage).
+
+    Request settings default to the already loaded `base_config`; `overrides`
+    (at least `provider`) win, and primary-only features are switched off.
+    """
+    return load_config(
         {
-            "provider": "gemini",
             "temperature": base_config["temperature"],
             "max_tokens": base_config["max_tokens"],
             "timeout": base_config["timeout"],
             "max_retries": base_config["max_retries"],
+            "compaction_enabled": base_config["compaction"]["enabled"],
+            "concurrency": base_config["concurrency"],
+            **_PRIMARY_ONLY_OVERRIDES,
+            **overrides,
         }
     )
-    return _create_llm_client(gemini_config)
+
+
+def _create_gemini_youtube_client(
+    base_config: Dict[str, Any],
+    client_factory: Callable[[Dict[str, Any]], LLMClient] = _create_llm_client,
+) -> LLMClient:
+    gemini_config = _load_helper_config(
+        base_config, {"provider": "gemini", "concurrency": base_config["gemini_concurrency"]}
+    )
+    return client_factory(gemini_config)
+
+
+def _create_hedged_client(
+    primary: LLMClient,
+    base_config: Dict[str, Any],
+    client_factory: Callable[[Dict[str, Any]], LLMClient] = _create_llm_client,
+) -> LLMClient | HedgedLLMClient:
+    """Wrap `primary` with a hedge to `hedging.provider` when one is configured."""
+    hedging = base_config.get("hedging") or {}
+    if not hedging.get("provider"):
+        return primary
+    try:
+        secondary_config = _load_helper_config(base_config, {"provider": hedging["provider"]})
+    except ConfigurationError as exc:
+        LOGGER.warning("Hedging disabled, secondary provider not configured: %s", exc)
+        return primary
+    return HedgedLLMClient(
+        primary,
+        client_factory(secondary_config),
+        delay=hedging["delay"],
+        max_ratio=hedging["max_ratio"],
+        max_wasted_tokens=hedging["max_wasted_tokens"],
+        max_workers=base_config["concurrency"],
+        latencies=shared_latency_window(primary.provider, primary.model),
+    )
+
+
+def _create_triage_client(
+    base_config: Dict[str, Any],
+    client_factory: Callable[[Dict[str, Any]], LLMClient] = _create_llm_client,
+) -> LLMClient | None:
+    """Build the cheap scoring client for `triage`, or None when it is not configured."""
+    triage = base_config["triage"]
+    try:
+        triage_config = _load_helper_config(
+            base_config,
+            {
+                "provider": triage["provider"],
+                "model": triage["model"],
+                "temperature": 0,
+                "compaction_enabled": False,
+                "streaming": False,
+            },
+        )
+    except ConfigurationError as exc:
+        LOGGER.warning("Triage disabled, provider not configured: %s", exc)
+        return None
+    return client_factory(triage_config)
 
 
 def summarize_single_url(
@@ -60,37 +176,91 @@ def summarize_single_url(
             chunk_size=chunk_size,
         )
     except Exception as exc:  # noqa: BLE001
-        duration = f"{time.time() - started_at:.1f}s"
-        LOGGER.error("Unexpected summarize error, url=%s, error=%s", url, exc)
-        return {
-            "processing_time": duration,
-            "model_used": llm_client.model,
-            "tokens_consumed": 0,
-            "brief": "",
-            "summary": "",
-            "success": False,
-            "error": str(exc),
-        }
+        return _build_error_summary(url, llm_client, exc, started_at)
+    return _build_summary(url, title, llm_client, response, started_at)
+
 
+async def asummarize_single_url(
+    url: str,
+    title: str,
+    llm_client: AsyncLLMClient,
+    prompt_template: str,
+    content: str | None = None,
+    chunk_size: int | None = None,
+) -> Dict[str, Any]:
+    """Async counterpart of `summarize_single_url` for `AsyncLLMClient`."""
+    started_at = time.time()
+    LOGGER.info("Start summarizing title=%s url=%s", title, url)
+
+    try:
+        response = await llm_client.agenerate_summary(
+            url=url,
+            prompt_template=prompt_template,
+            content=content,
+            chunk_size=chunk_size,
+        )
+    except Exception as exc:  # noqa: BLE001
+        return _build_error_summary(url, llm_client, exc, started_at)
+    return _build_summary(url, title, llm_client, response, started_at)
+
+
+def _build_error_summary(
+    url: str,
+    llm_client: LLMClient,
+    exc: Exception,
+    started_at: float,
+) -> Dict[str, Any]:
+    duration = f"{time.time() - started_at:.1f}s"
+    LOGGER.error("Unexpected summarize error, url=%s, error=%s", url, exc)
+    return {
+        "processing_time": duration,
+        "model_used": llm_client.model,
+        "tokens_consumed": 0,
+        "tokens_estimated": 0,
+        "token_usage": {},
+        "tokens_saved": 0,
+        "brief": "",
+        "summary": "",
+        "success": False,
+        "error": str(exc),
+    }
+
+
+def _build_summary(
+    url: str,
+    title: str,
+    llm_client: LLMClient,
+    response: Dict[str, Any],
+    started_at: float,
+) -> Dict[str, Any]:
     duration = f"{time.time() - started_at:.1f}s"
     result = {
         "processing_time": duration,
         "model_used": response.get("model_used", llm_client.model),
         "tokens_consumed": int(response.get("tokens_consumed", 0) or 0),
+        "tokens_estimated": int(response.get("tokens_estimated", 0) or 0),
+        "token_usage": dict(response.get("token_usage") or {}),
+        "tokens_saved": int(response.get("tokens_saved", 0) or 0),
         "brief": str(response.get("brief", "")),
         "summary": str(response.get("summary", "")),
         "success": bool(response.get("success", False)),
         "error": response.get("error"),
     }
+    for field in _OPTIONAL_RESPONSE_FIELDS:
+        if field in response:
+            result[field] = response[field]
 
     if result["success"]:
         brief_preview = result["brief"][:50]
         LOGGER.info(
-            "Summary completed, url=%s, title=%s, time=%s, tokens=%s, brief=%s",
+            "Summary completed, url=%s, title=%s, time=%s, tokens=%s "
+            "(estimated prompt=%s, saved by compaction=%s), brief=%s",
             url,
             title,
             result["processing_time"],
             result["tokens_consumed"],
+            result["tokens_estimated"],
+            result["tokens_saved"],
             brief_preview,
         )
     else:
@@ -105,35 +275,444 @@ def summarize_single_url(
     return result
 
 
-def summarize_all(
-    collection_result: Dict[str, Any],
-    config: Optional[Dict[str, Any]] = None,
-) -> Dict[str, Any]:
-    """Generate summaries for all URL items in collection_result."""
-    if not isinstance(collection_result, dict):
-        raise ValueError("`collection_result` must be a dictionary.")
+def _next_progress(job: Dict[str, Any], progress: Dict[str, Any]) -> None:
+    with progress["lock"]:
+        progress["started"] += 1
+        position = progress["started"]
+    LOGGER.info("Processing progress %s/%s: %s", position, progress["total"], job["url"])
 
-    loaded_config = load_config(config)
-    llm_client = _create_llm_client(loaded_config)
-    gemini_client: LLMClient | None = None
-    prompt_template = loaded_config["prompt_template"]
 
-    output = copy.deepcopy(collection_result)
-    sources = output.get("results")
-    if not isinstance(sources, list):
-        LOGGER.warning("No `results` list found. Return original structure.")
-        return output
+def _apply_job_summary(job: Dict[str, Any], summary: Dict[str, Any]) -> None:
+    if job["extra_fields"]:
+        summary.update(job["extra_fields"])
+    job["item"].update(summary)
+
+
+def _open_summary_cache(loaded_config: Dict[str, Any]) -> SummaryCache | None:
+    if not loaded_config.get("cache_enabled"):
+        return None
+    try:
+        return SummaryCache(loaded_config["cache_path"])
+    except Exception as exc:  # noqa: BLE001
+        LOGGER.warning(
+            "Summary cache unavailable, path=%s, error=%s", loaded_config.get("cache_path"), exc
+        )
+        return None
+
+
+def _attach_summary_cache(
+    jobs: List[Dict[str, Any]],
+    cache: SummaryCache | None,
+    checkpoint: RunCheckpoint | None = None,
+) -> None:
+    for job in jobs:
+        job["cache"] = cache
+        job["checkpoint"] = checkpoint
+        # One key per client that may answer: the primary first, then a hedge
+        # secondary, so a summary is stored under the client that wrote it.
+        job["cache_keys"] = [
+            (
+                (client.provider, client.model),
+                build_cache_key(
+                    url=job["url"],
+                    content=job["content"],
+                    provider=client.provider,
+                    model=client.model,
+                    prompt_template=job["prompt_template"],
+                    options=_cache_options(client),
+                ),
+            )
+            for client in _answering_clients(job["client"])
+        ]
+        job["cache_key"] = job["cache_keys"][0][1]
+
+
+def _answering_clients(client: Any) -> List[Any]:
+    if isinstance(client, HedgedLLMClient):
+        return [client.primary, client.secondary]
+    return [client]
+
+
+def _cache_options(client: Any) -> Dict[str, Any]:
+    cache_options = getattr(client, "cache_options", None)
+    return cache_options() if callable(cache_options) else {}
+
+
+def _summary_cache_key(job: Dict[str, Any], summary: Dict[str, Any]) -> Any:
+    """Key of the client that produced `summary` (the hedge winner when hedged)."""
+    winner = summary.get("hedge_winner")
+    if not winner:
+        return job["cache_key"]
+    model_used = summary.get("model_used")
+    for (provider, model), key in job["cache_keys"]:
+        if provider == winner and model == model_used:
+            return key
+    for (provider, _), key in job["cache_keys"]:
+        if provider == winner:
+            return key
+    return job["cache_key"]
+
+
+def _lookup_checkpointed_summary(job: Dict[str, Any]) -> Dict[str, Any] | None:
+    checkpoint: RunCheckpoint | None = job.get("checkpoint")
+    if checkpoint is None:
+        return None
+    summary = None
+    for _, key in job["cache_keys"]:
+        summary = checkpoint.get(key)
+        if summary is not None:
+            break
+    if summary is None:
+        return None
+    LOGGER.info("Resume from checkpoint, url=%s, title=%s", job["url"], job["title"])
+    # The tokens were spent by the earlier attempt; don't count them twice.
+    summary.update(
+        {"tokens_consumed": 0, "tokens_estimated": 0, "token_usage": {}, "tokens_saved": 0}
+    )
+    summary["resumed"] = True
+    return summary
+
+
+def _lookup_cached_summary(job: Dict[str, Any]) -> Dict[str, Any] | None:
+    checkpointed = _lookup_checkpointed_summary(job)
+    if checkpointed is not None:
+        return checkpointed
+    cache: SummaryCache | None = job.get("cache")
+    if cache is None:
+        return None
+    cached = None
+    try:
+        for _, key in job["cache_keys"]:
+            cached = cache.get(key)
+            if cached is not None:
+                break
+    except Exception as exc:  # noqa: BLE001
+        LOGGER.warning("Summary cache lookup failed, url=%s, error=%s", job["url"], exc)
+        return None
+    if cached is None:
+        return None
+
+    LOGGER.info("Summary cache hit, url=%s, title=%s", job["url"], job["title"])
+    return {
+        "processing_time": "0.0s",
+        "model_used": cached.get("model_used") or job["client"].model,
+        "tokens_consumed": 0,
+        "tokens_estimated": 0,
+        "token_usage": {},
+        "tokens_saved": 0,
+        "brief": str(cached.get("brief", "")),
+        "summary": str(cached.get("summary", "")),
+        "success": True,
+        "error": None,
+        "cache_hit": True,
+    }
+
+
+def _store_summary(job: Dict[str, Any], summary: Dict[str, Any]) -> None:
+    summary["cache_hit"] = False
+    if not summary.get("success"):
+        return
+    checkpoint: RunCheckpoint | None = job.get("checkpoint")
+    cache: SummaryCache | None = job.get("cache")
+    if checkpoint is None and cache is None:
+        return
+    key = _summary_cache_key(job, summary)
+    if checkpoint is not None:
+        try:
+            checkpoint.put(key, summary)
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.warning("Checkpoint write failed, url=%s, error=%s", job["url"], exc)
+    if cache is None:
+        return
+    try:
+        cache.put(key, summary)
+    except Exception as exc:  # noqa: BLE001
+        LOGGER.warning("Summary cache write failed, url=%s, error=%s", job["url"], exc)
+
+
+def _execute_summary_job(job: Dict[str, Any], progress: Dict[str, Any]) -> None:
+    _next_progress(job, progress)
+    cached = _lookup_cached_summary(job)
+    if cached is not None:
+        _apply_job_summary(job, cached)
+        return
+
+    summary = summarize_single_url(
+        url=job["url"],
+        title=job["title"],
+        llm_client=job["client"],
+        prompt_template=job["prompt_template"],
+        content=job["content"],
+    )
+    _store_summary(job, summary)
+    _apply_job_summary(job, summary)
+
+
+def _run_batch_jobs(
+    jobs: List[Dict[str, Any]],
+    batch_config: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """Summarize default-pool jobs with one Batch API job.
+
+    Returns the jobs still to run synchronously: other pools, batch stragglers
+    and every batch job when the batch could not be submitted.
+    """
+    remaining: List[Dict[str, Any]] = []
+    batch_jobs: Dict[str, Dict[str, Any]] = {}
+    for job in jobs:
+        if job["pool"] != "default":
+            remaining.append(job)
+            continue
+        cached = _lookup_cached_summary(job)
+        if cached is not None:
+            _apply_job_summary(job, cached)
+            continue
+        batch_jobs[str(len(batch_jobs))] = job
+    if not batch_jobs:
+        return remaining
+
+    # Hedging does not apply to batch requests; use the primary client.
+    first_client = next(iter(batch_jobs.values()))["client"]
+    client = getattr(first_client, "primary", first_client)
+    started_at = time.time()
+    try:
+        summarizer = BatchSummarizer(
+            client,
+            poll_interval=batch_config["poll_interval"],
+            deadline=batch_config["deadline"],
+            sync_reserve=batch_config["sync_reserve"],
+        )
+        results, stragglers = summarizer.run(
+            [
+                (custom_id, job["url"], job["prompt_template"], job["content"])
+                for custom_id, job in batch_jobs.items()
+            ]
+        )
+    except Exception as exc:  # noqa: BLE001
+        LOGGER.error("Batch summarization failed, falling back to sync calls: %s", exc)
+        return remaining + list(batch_jobs.values())
+
+    for custom_id, response in results.items():
+        job = batch_jobs[custom_id]
+        summary = _build_summary(job["url"], job["title"], client, response, started_at)
+        summary["summary_mode"] = "batch"
+        _store_summary(job, summary)
+        _apply_job_summary(job, summary)
+    if stragglers:
+        LOGGER.info("Finishing %s batch stragglers with sync calls", len(stragglers))
+    return remaining + [batch_jobs[custom_id] for custom_id in stragglers]
+
+
+def _run_packed_jobs(
+    jobs: List[Dict[str, Any]],
+    packing_config: Dict[str, Any],
+    concurrency: int,
+) -> List[Dict[str, Any]]:
+    """Summarize short default-pool items several per call.
+
+    Returns the jobs still to run individually: other pools, long items and
+    packed items whose reply was missing or invalid.
+    """
+    remaining: List[Dict[str, Any]] = []
+    candidates: Dict[int, Dict[str, Any]] = {}
+    for job in jobs:
+        if job["pool"] != "default":
+            remaining.append(job)
+            continue
+        cached = _lookup_cached_summary(job)
+        if cached is not None:
+            _apply_job_summary(job, cached)
+            continue
+        candidates[len(candidates) + 1] = job
+    if not candidates:
+        return remaining
+
+    first_client = next(iter(candidates.values()))["client"]
+    client = getattr(first_client, "primary", first_client)
+    entries: List[Dict[str, Any]] = []
+    for entry_id, job in candidates.items():
+        # Compact first, as the single and batch paths do, so packing measures
+        # and prompts the same text they would.
+        content, tokens_saved = client._compact_content(job["url"], job["content"])
+        entries.append(
+            {
+                "id": entry_id,
+                "url": job["url"],
+                "title": job["title"],
+                "content": content,
+                "tokens_saved": tokens_saved,
+            }
+        )
+    packs, singles = plan_packs(
+        entries,
+        client,
+        max_items=packing_config["max_items"],
+        short_item_tokens=packing_config["short_item_tokens"],
+        item_output_tokens=packing_config["item_output_tokens"],
+    )
+    if not packs:
+        return remaining + list(candidates.values())
+
+    LOGGER.info(
+        "Packing %s short items into %s calls",
+        sum(len(pack) for pack in packs),
+        len(packs),
+    )
+    started_at = time.time()
+    with ThreadPoolExecutor(
+        max_workers=max(1, concurrency), thread_name_prefix="summarize-pack"
+    ) as executor:
+        pack_results = list(executor.map(lambda pack: summarize_pack(client, pack), packs))
+
+    for pack, results in zip(packs, pack_results):
+        for entry in pack:
+            job = candidates[entry["id"]]
+            response = results.get(entry["id"])
+            if response is None:
+                singles.append(entry)
+                continue
+            response = client._attach_compaction_savings(response, entry["tokens_saved"])
+            summary = _build_summary(job["url"], job["title"], client, response, started_at)
+            summary["summary_mode"] = "packed"
+            _store_summary(job, summary)
+            _apply_job_summary(job, summary)
+
+    return remaining + [candidates[entry["id"]] for entry in singles]
 
-    total_items = sum(
-        len(source.get("items", []))
-        for source in sources
-        if isinstance(source, dict)
-        and source.get("success", True)
-        and isinstance(source.get("items"), list)
+
+def _run_triage_jobs(
+    jobs: List[Dict[str, Any]],
+    triage_config: Dict[str, Any],
+    client: LLMClient,
+    concurrency: int,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Score default-pool items with `client` and brief the low scorers.
+
+    Items scoring at least `threshold` keep going to the full summary path with
+    `triage_score` attached; the rest get the one-line triage brief only.
+    Items the triage reply skipped are summarized in full. Returns
+    (jobs still to run, triage report).
+    """
+    remaining: List[Dict[str, Any]] = []
+    candidates: Dict[int, Dict[str, Any]] = {}
+    for job in jobs:
+        if job["pool"] != "default":
+            remaining.append(job)
+            continue
+        cached = _lookup_cached_summary(job)
+        if cached is not None:
+            _apply_job_summary(job, cached)
+            continue
+        candidates[len(candidates) + 1] = job
+    report: Dict[str, Any] = {"scored": 0, "summarized": 0, "briefed": 0, "tokens_consumed": 0}
+    if not candidates:
+        return remaining, report
+
+    # The lead is cut from extracted text so the cheap model reads prose, not markup.
+    entries = [
+        {"id": entry_id, "url": job["url"], "title": job["title"], "content": job["text"]}
+        for entry_id, job in candidates.items()
+    ]
+    batch_size = max(1, int(triage_config["batch_size"]))
+    batches = [entries[start : start + batch_size] for start in range(0, len(entries), batch_size)]
+    started_at = time.time()
+    with ThreadPoolExecutor(
+        max_workers=max(1, concurrency), thread_name_prefix="summarize-triage"
+    ) as executor:
+        batch_results = list(
+            executor.map(
+                lambda batch: triage_entries(
+                    client, batch, triage_config["topic"], triage_config["lead_chars"]
+                ),
+                batches,
+            )
+        )
+    duration = f"{time.time() - started_at:.1f}s"
+
+    results = {entry_id: result for batch in batch_results for entry_id, result in batch.items()}
+    threshold = float(triage_config["threshold"])
+    for entry_id, job in candidates.items():
+        result = results.get(entry_id)
+        if result is None:
+            remaining.append(job)
+            continue
+        report["scored"] += 1
+        report["tokens_consumed"] += int(result["token_usage"].get("total_tokens", 0) or 0)
+        if result["score"] >= threshold:
+            job["extra_fields"]["triage_score"] = result["score"]
+            report["summarized"] += 1
+            remaining.append(job)
+            continue
+        report["briefed"] += 1
+        _apply_job_summary(
+            job,
+            {
+                "processing_time": duration,
+                "model_used": result["model_used"],
+                "tokens_consumed": int(result["token_usage"].get("total_tokens", 0) or 0),
+                "tokens_estimated": int(result["token_usage"]["estimated_prompt_tokens"]),
+                "token_usage": result["token_usage"],
+                "tokens_saved": 0,
+                "brief": result["brief"],
+                "summary": "",
+                "success": True,
+                "error": None,
+                "cache_hit": False,
+                "summary_mode": "triaged",
+                "triage_score": result["score"],
+            },
+        )
+    LOGGER.info(
+        "Triage scored %s/%s items: %s to full summary, %s briefed only",
+        report["scored"],
+        len(candidates),
+        report["summarized"],
+        report["briefed"],
     )
+    return remaining, report
+
+
+def _run_summary_jobs(jobs: List[Dict[str, Any]], pool_sizes: Dict[str, int]) -> None:
+    """Run summary jobs, concurrently per provider pool when pools allow it."""
+    progress: Dict[str, Any] = {"lock": threading.Lock(), "started": 0, "total": len(jobs)}
+    if all(pool_sizes.get(job["pool"], 1) <= 1 for job in jobs):
+        for job in jobs:
+            _execute_summary_job(job, progress)
+        return
+
+    executors = {
+        pool: ThreadPoolExecutor(max_workers=max(1, size), thread_name_prefix=f"summarize-{pool}")
+        for pool, size in pool_sizes.items()
+    }
+    LOGGER.info("Running %s summary jobs with worker pools: %s", len(jobs), pool_sizes)
+    try:
+        futures = [
+            executors[job["pool"]].submit(_execute_summary_job, job, progress) for job in jobs
+        ]
+        for future in futures:
+            future.result()
+    finally:
+        for executor in executors.values():
+            executor.shutdown(wait=True)
+
 
+def _plan_summary_jobs(
+    output: Dict[str, Any],
+    loaded_config: Dict[str, Any],
+    llm_client: LLMClient,
+    gemini_client_factory: Callable[[Dict[str, Any]], LLMClient],
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Route every item to a client/pool; returns (jobs, processed item count).
+
+    Items that cannot be summarized (missing URL, missing Gemini config) are
+    filled in directly and produce no job.
+    """
+    gemini_client: LLMClient | None = None
+    prompt_template = loaded_config["prompt_template"]
+    jobs: List[Dict[str, Any]] = []
     processed_items = 0
-    for source in sources:
+
+    for source in output["results"]:
         if not isinstance(source, dict):
             LOGGER.warning("Skip invalid source entry: %r", source)
             continue
@@ -160,7 +739,6 @@ def summarize_all(
             url = str(item.get("url") or "").strip()
             title = str(item.get("title") or "").strip()
 
-            LOGGER.info("Processing progress %s/%s: %s", processed_items, total_items, url)
             if not url:
                 item.update(
                     {
@@ -176,13 +754,21 @@ def summarize_all(
                 LOGGER.error("Missing URL in item, title=%s", title)
                 continue
 
-            extra_summary_fields: Dict[str, Any] = {}
-            active_client = llm_client
-            active_prompt_template = prompt_template
+            job: Dict[str, Any] = {
+                "item": item,
+                "url": url,
+                "title": title,
+                "client": llm_client,
+                "prompt_template": prompt_template,
+                "content": str(item.get("content") or "").strip() or None,
+                "text": extract_text(item.get("content")),
+                "extra_fields": {},
+                "pool": "default",
+            }
             if is_youtube_url(url):
                 if gemini_client is None:
                     try:
-                        gemini_client = _create_gemini_youtube_client(loaded_config)
+                        gemini_client = gemini_client_factory(loaded_config)
                     except ConfigurationError as gemini_cfg_error:
                         item.update(
                             {
@@ -201,21 +787,404 @@ def summarize_all(
                         )
                         continue
 
-                active_client = gemini_client
-                extra_summary_fields = {
-                    "summary_basis": "gemini_url",
-                    "youtube_video_id": str(extract_youtube_video_id(url) or ""),
-                }
-
-            summary = summarize_single_url(
-                url=url,
-                title=title,
-                llm_client=active_client,
-                prompt_template=active_prompt_template,
+                # YouTube is summarized from the URL by Gemini, without feed text.
+                job.update(
+                    {
+                        "client": gemini_client,
+                        "content": None,
+                        "text": "",
+                        "pool": "gemini_youtube",
+                        "extra_fields": {
+                            "summary_basis": "gemini_url",
+                            "youtube_video_id": str(extract_youtube_video_id(url) or ""),
+                        },
+                    }
+                )
+            jobs.append(job)
+
+    return jobs, processed_items
+
+
+def _run_relevance_filter(
+    jobs: List[Dict[str, Any]],
+    relevance_config: Dict[str, Any],
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any] | None]:
+    """Score default-pool items with the local relevance model before any LLM call.
+
+    Items below `drop_threshold` are marked `summary_mode=filtered` (and later
+    removed from `results`); the rest run most-relevant first. Returns (jobs to run, report), with a None
+    report when no trained model is available yet.
+    """
+    model_path = Path(relevance_config["model_path"]).expanduser()
+    if not model_path.exists():
+        LOGGER.info("No relevance model at %s yet; collecting history only", model_path)
+        return jobs, None
+    try:
+        model = RelevanceModel.load(model_path)
+    except Exception as exc:  # noqa: BLE001
+        LOGGER.warning("Relevance model unavailable, path=%s, error=%s", model_path, exc)
+        return jobs, None
+
+    candidates = [job for job in jobs if job["pool"] == "default"]
+    if not candidates:
+        return jobs, None
+    started_at = time.perf_counter()
+    scores = model.predict_proba(
+        [item_text({"title": job["title"], "content": job["text"]}) for job in candidates]
+    )
+    elapsed = time.perf_counter() - started_at
+
+    drop_threshold = float(relevance_config["drop_threshold"])
+    kept: List[Tuple[float, Dict[str, Any]]] = []
+    dropped = 0
+    for job, score in zip(candidates, scores.tolist()):
+        job["extra_fields"]["relevance_score"] = round(score, 4)
+        if score >= drop_threshold:
+            kept.append((score, job))
+            continue
+        dropped += 1
+        _apply_job_summary(
+            job,
+            {
+                "processing_time": "0.0s",
+                "model_used": "relevance",
+                "tokens_consumed": 0,
+                "tokens_estimated": 0,
+                "token_usage": {},
+                "tokens_saved": 0,
+                "brief": "",
+                "summary": "",
+                "success": True,
+                "error": None,
+                "summary_mode": "filtered",
+            },
+        )
+    LOGGER.info(
+        "Relevance filter scored %s items in %.1fms, dropped %s below %.2f",
+        len(candidates),
+        elapsed * 1000,
+        dropped,
+        drop_threshold,
+    )
+    kept.sort(key=lambda entry: -entry[0])
+    others = [job for job in jobs if job["pool"] != "default"]
+    report = {"scored": len(candidates), "dropped": dropped, "seconds": round(elapsed, 4)}
+    return [job for _, job in kept] + others, report
+
+
+def _remove_filtered_items(output: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Take relevance-dropped items out of `results`; returns them for the report.
+
+    Sources left without items are removed too, so writers and the notifier
+    never see a dropped article.
+    """
+    dropped: List[Dict[str, Any]] = []
+    kept_sources: List[Any] = []
+    for source in output["results"]:
+        items = source.get("items") if isinstance(source, dict) else None
+        if not isinstance(items, list):
+            kept_sources.append(source)
+            continue
+        kept_items = []
+        for item in items:
+            if isinstance(item, dict) and item.get("summary_mode") == "filtered":
+                dropped.append(
+                    {
+                        "source_title": source.get("source_title"),
+                        "title": item.get("title"),
+                        "url": item.get("url"),
+                        "relevance_score": item.get("relevance_score"),
+                    }
+                )
+            else:
+                kept_items.append(item)
+        if kept_items or not items:
+            source["items"] = kept_items
+            kept_sources.append(source)
+    output["results"] = kept_sources
+    return dropped
+
+
+def _record_relevance_history(output: Dict[str, Any], relevance_config: Dict[str, Any]) -> None:
+    history_path = Path(relevance_config["history_path"]).expanduser()
+    try:
+        count = append_history(output, history_path)
+    except Exception as exc:  # noqa: BLE001
+        LOGGER.warning("Relevance history write failed, path=%s, error=%s", history_path, exc)
+        return
+    LOGGER.info("Recorded %s labeled items to relevance history %s", count, history_path)
+
+
+def _dedup_jobs(
+    jobs: List[Dict[str, Any]],
+    dedup_config: Dict[str, Any],
+) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+    """Drop near-duplicate default-pool jobs; returns (jobs to run, (duplicate, representative)).
+
+    Only jobs with at least `min_chars` of extracted text take part, so shared
+    feed markup (subscribe widgets, share bars) cannot make unrelated posts
+    look alike. The longest text of each cluster is summarized and the others
+    reuse its summary.
+    """
+    min_chars = int(dedup_config.get("min_chars") or DEFAULT_DEDUP_CONFIG["min_chars"])
+    candidates = [
+        job
+        for job in jobs
+        if job["pool"] == "default" and len(job["text"]) >= min_chars
+    ]
+    if len(candidates) < 2:
+        return jobs, []
+
+    started_at = time.perf_counter()
+    clusters = find_duplicate_clusters(
+        [job["text"] for job in candidates],
+        threshold=float(dedup_config.get("threshold") or DEFAULT_DEDUP_CONFIG["threshold"]),
+    )
+    duplicates: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+    for cluster in clusters:
+        members = [candidates[index] for index in cluster]
+        representative = max(members, key=lambda job: len(job["text"]))
+        duplicates.extend((job, representative) for job in members if job is not representative)
+    LOGGER.info(
+        "Dedup checked %s items in %.3fs: %s clusters, %s duplicates skipped",
+        len(candidates),
+        time.perf_counter() - started_at,
+        len(clusters),
+        len(duplicates),
+    )
+    skipped = {id(job) for job, _ in duplicates}
+    return [job for job in jobs if id(job) not in skipped], duplicates
+
+
+def _apply_duplicate_summaries(
+    duplicates: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """Copy representative summaries onto duplicates; returns the dedup report."""
+    groups: Dict[int, Dict[str, Any]] = {}
+    for job, representative in duplicates:
+        source = representative["item"]
+        job["item"].update(
+            {
+                "processing_time": "0.0s",
+                "model_used": source.get("model_used"),
+                "tokens_consumed": 0,
+                "tokens_estimated": 0,
+                "token_usage": {},
+                "tokens_saved": 0,
+                "brief": source.get("brief", ""),
+                "summary": source.get("summary", ""),
+                "success": bool(source.get("success")),
+                "error": source.get("error"),
+                "duplicate_of": representative["url"],
+            }
+        )
+        group = groups.setdefault(
+            id(representative), {"representative": representative["url"], "duplicates": []}
+        )
+        group["duplicates"].append(job["url"])
+        source.setdefault("duplicates", []).append(job["url"])
+    return {"clusters": list(groups.values()), "items_skipped": len(duplicates)}
+
+
+def _pool_sizes(loaded_config: Dict[str, Any]) -> Dict[str, int]:
+    return {
+        "default": loaded_config["concurrency"],
+        "gemini_youtube": loaded_config["gemini_concurrency"],
+    }
+
+
+def summarize_all(
+    collection_result: Dict[str, Any],
+    config: Optional[Dict[str, Any]] = None,
+    checkpoint: RunCheckpoint | None = None,
+) -> Dict[str, Any]:
+    """Generate summaries for all URL items in collection_result.
+
+    Items are routed to the default provider pool or the Gemini YouTube pool;
+    each pool runs up to `concurrency` / `gemini_concurrency` requests at once.
+    With `batch.enabled`, default-pool items are first sent as one Batch API
+    job and only stragglers use synchronous calls; otherwise `packing.enabled`
+    summarizes short items several per call. With `dedup.enabled`, near-duplicate
+    articles are summarized once and linked via `duplicate_of`. With
+    `triage.enabled`, a cheap model scores every item first and those below
+    `triage.threshold` only get its one-line brief. With `relevance.enabled`,
+    a local model trained on past runs drops off-topic items before any LLM
+    call (they are listed in `relevance.dropped_items`, not in `results`) and
+    labeled items are appended to its history. With a `checkpoint`,
+    every finished item is persisted to the run directory and items already
+    there are reused instead of being summarized again. Items are
+    updated in place, so output order always matches the input.
+    """
+    if not isinstance(collection_result, dict):
+        raise ValueError("`collection_result` must be a dictionary.")
+
+    loaded_config = load_config(config)
+    llm_client = _create_hedged_client(_create_llm_client(loaded_config), loaded_config)
+
+    output = copy.deepcopy(collection_result)
+    if not isinstance(output.get("results"), list):
+        LOGGER.warning("No `results` list found. Return original structure.")
+        return output
+
+    jobs, processed_items = _plan_summary_jobs(
+        output, loaded_config, llm_client, _create_gemini_youtube_client
+    )
+    relevance_config = loaded_config.get("relevance") or {}
+    relevance_report: Dict[str, Any] | None = None
+    if relevance_config.get("enabled"):
+        jobs, relevance_report = _run_relevance_filter(jobs, relevance_config)
+    dedup_config = loaded_config.get("dedup") or {}
+    duplicates: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+    if dedup_config.get("enabled"):
+        jobs, duplicates = _dedup_jobs(jobs, dedup_config)
+    cache = _open_summary_cache(loaded_config)
+    _attach_summary_cache(jobs, cache, checkpoint)
+    triage_config = loaded_config.get("triage") or {}
+    triage_report: Dict[str, Any] | None = None
+    try:
+        if triage_config.get("enabled"):
+            triage_client = _create_triage_client(loaded_config)
+            if triage_client is not None:
+                jobs, triage_report = _run_triage_jobs(
+                    jobs, triage_config, triage_client, loaded_config["concurrency"]
+                )
+        batch_config = loaded_config.get("batch") or {}
+        packing_config = loaded_config.get("packing") or {}
+        if batch_config.get("enabled"):
+            jobs = _run_batch_jobs(jobs, batch_config)
+        elif packing_config.get("enabled"):
+            jobs = _run_packed_jobs(jobs, packing_config, loaded_config["concurrency"])
+        _run_summary_jobs(jobs, pool_sizes=_pool_sizes(loaded_config))
+    finally:
+        if cache is not None:
+            cache.close()
+        if isinstance(llm_client, HedgedLLMClient):
+            llm_client.close()
+
+    if isinstance(llm_client, HedgedLLMClient):
+        output["hedging"] = llm_client.stats()
+    if relevance_report is not None:
+        relevance_report["dropped_items"] = _remove_filtered_items(output)
+        output["relevance"] = relevance_report
+    if triage_report is not None:
+        output["triage"] = triage_report
+    if dedup_config.get("enabled"):
+        output["dedup"] = _apply_duplicate_summaries(duplicates)
+    if relevance_config.get("enabled"):
+        _record_relevance_history(output, relevance_config)
+
+    LOGGER.info("Summarization completed. processed=%s", processed_items)
+    return output
+
+
+async def summarize_all_async(
+    collection_result: Dict[str, Any],
+    config: Optional[Dict[str, Any]] = None,
+    checkpoint: RunCheckpoint | None = None,
+) -> Dict[str, Any]:
+    """Async counterpart of `summarize_all` built on `AsyncLLMClient`.
+
+    Each provider pool is bounded by a semaphore of `concurrency` /
+    `gemini_concurrency` in-flight requests on the running event loop.
+    Triage, `batch.enabled` and `packing.enabled` take the same sync code
+    paths as `summarize_all`, run in a worker thread so the loop stays free.
+    """
+    if not isinstance(collection_result, dict):
+        raise ValueError("`collection_result` must be a dictionary.")
+
+    loaded_config = load_config(config)
+    llm_client = _create_hedged_client(
+        _create_async_llm_client(loaded_config), loaded_config, _create_async_llm_client
+    )
+
+    output = copy.deepcopy(collection_result)
+    if not isinstance(output.get("results"), list):
+        LOGGER.warning("No `results` list found. Return original structure.")
+        return output
+
+    created_clients: List[Any] = [llm_client]
+
+    def _gemini_factory(base_config: Dict[str, Any]) -> LLMClient:
+        client = _create_gemini_youtube_client(base_config, _create_async_llm_client)
+        created_clients.append(client)
+        return client
+
+    jobs, processed_items = _plan_summary_jobs(output, loaded_config, llm_client, _gemini_factory)
+    relevance_config = loaded_config.get("relevance") or {}
+    relevance_report: Dict[str, Any] | None = None
+    if relevance_config.get("enabled"):
+        jobs, relevance_report = _run_relevance_filter(jobs, relevance_config)
+    dedup_config = loaded_config.get("dedup") or {}
+    duplicates: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+    if dedup_config.get("enabled"):
+        jobs, duplicates = _dedup_jobs(jobs, dedup_config)
+    cache = _open_summary_cache(loaded_config)
+    _attach_summary_cache(jobs, cache, checkpoint)
+    triage_config = loaded_config.get("triage") or {}
+    triage_report: Dict[str, Any] | None = None
+    semaphores = {
+        pool: asyncio.Semaphore(max(1, size)) for pool, size in _pool_sizes(loaded_config).items()
+    }
+    progress: Dict[str, Any] = {"lock": threading.Lock(), "started": 0, "total": 0}
+
+    async def _run(job: Dict[str, Any]) -> None:
+        cached = _lookup_cached_summary(job)
+        if cached is not None:
+            _next_progress(job, progress)
+            _apply_job_summary(job, cached)
+            return
+        async with semaphores[job["pool"]]:
+            _next_progress(job, progress)
+            summary = await asummarize_single_url(
+                url=job["url"],
+                title=job["title"],
+                llm_client=job["client"],
+                prompt_template=job["prompt_template"],
+                content=job["content"],
             )
-            if extra_summary_fields:
-                summary.update(extra_summary_fields)
-            item.update(summary)
+        _store_summary(job, summary)
+        _apply_job_summary(job, summary)
+
+    try:
+        if triage_config.get("enabled"):
+            # Triage is a handful of batched calls; run them with the sync client off-loop.
+            triage_client = _create_triage_client(loaded_config)
+            if triage_client is not None:
+                jobs, triage_report = await asyncio.to_thread(
+                    _run_triage_jobs,
+                    jobs,
+                    triage_config,
+                    triage_client,
+                    loaded_config["concurrency"],
+                )
+        batch_config = loaded_config.get("batch") or {}
+        packing_config = loaded_config.get("packing") or {}
+        # Batch polling and packed calls use the sync client paths, also off-loop.
+        if batch_config.get("enabled"):
+            jobs = await asyncio.to_thread(_run_batch_jobs, jobs, batch_config)
+        elif packing_config.get("enabled"):
+            jobs = await asyncio.to_thread(
+                _run_packed_jobs, jobs, packing_config, loaded_config["concurrency"]
+            )
+        progress["total"] = len(jobs)
+        await asyncio.gather(*(_run(job) for job in jobs))
+    finally:
+        for client in created_clients:
+            await client.aclose()
+        if cache is not None:
+            cache.close()
+
+    if isinstance(llm_client, HedgedLLMClient):
+        output["hedging"] = llm_client.stats()
+    if relevance_report is not None:
+        relevance_report["dropped_items"] = _remove_filtered_items(output)
+        output["relevance"] = relevance_report
+    if triage_report is not None:
+        output["triage"] = triage_report
+    if dedup_config.get("enabled"):
+        output["dedup"] = _apply_duplicate_summaries(duplicates)
+    if relevance_config.get("enabled"):
+        _record_relevance_history(output, relevance_config)
 
     LOGGER.info("Summarization completed. processed=%s", processed_items)
     return output
@@ -0,0 +1,231 @@
+"""Local token estimation, chunk planning and prompt budgeting."""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+from typing import Any, Dict, List, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+# CJK ideographs, kana, hangul and full-width punctuation.
+_CJK_RE = re.compile(
+    r"[\u3000-\u303f\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff"
+    r"\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]"
+)
+_PARAGRAPH_SPLIT_RE = re.compile(r"\n\s*\n")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[。！？!?；;.])\s*")
+
+# Approximate tokens per CJK character / per other character.
+PROVIDER_TOKEN_RATIOS: Dict[str, Dict[str, float]] = {
+    "openai": {"cjk": 1.2, "other": 0.25},
+    "deepseek": {"cjk": 0.6, "other": 0.3},
+    "gemini": {"cjk": 0.8, "other": 0.25},
+    "glm": {"cjk": 0.7, "other": 0.3},
+}
+
+# Model prefix overrides, matched by longest prefix.
+MODEL_TOKEN_RATIOS: Dict[str, Dict[str, float]] = {
+    "gpt-4o": {"cjk": 0.8, "other": 0.25},
+    "gpt-4.1": {"cjk": 0.8, "other": 0.25},
+    "gpt-5": {"cjk": 0.8, "other": 0.25},
+    "o1": {"cjk": 0.8, "other": 0.25},
+    "o3": {"cjk": 0.8, "other": 0.25},
+    "o4": {"cjk": 0.8, "other": 0.25},
+}
+
+PROVIDER_CONTEXT_WINDOWS: Dict[str, int] = {
+    "openai": 16385,
+    "deepseek": 65536,
+    "gemini": 1048576,
+    "glm": 128000,
+}
+
+# Model prefix overrides, matched by longest prefix.
+MODEL_CONTEXT_WINDOWS: Dict[str, int] = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4": 8192,
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "gpt-4.1": 1047576,
+    "gpt-5": 400000,
+    "o1": 200000,
+    "o3": 200000,
+    "o4": 200000,
+    "deepseek-chat": 65536,
+    "deepseek-reasoner": 65536,
+    "gemini-1.5-pro": 2097152,
+    "gemini-1.5-flash": 1048576,
+    "gemini-2.0-flash": 1048576,
+    "gemini-2.5": 1048576,
+    "gemini-flash": 1048576,
+    "glm-4": 128000,
+    "glm-4.5": 131072,
+}
+
+# Per-message framing overhead of chat completion APIs.
+MESSAGE_OVERHEAD_TOKENS = 4
+# Fraction of the context window kept free to absorb estimation error.
+DEFAULT_SAFETY_MARGIN = 0.1
+# Smallest usable per-chunk content budget.
+MIN_CHUNK_TOKENS = 256
+
+
+def _match_prefix(table: Dict[str, Any], model: str) -> Any:
+    normalized = str(model or "").strip().lower()
+    if normalized.startswith("models/"):
+        normalized = normalized.split("/", 1)[1]
+    best_key = ""
+    for key in table:
+        if normalized.startswith(key) and len(key) > len(best_key):
+            best_key = key
+    return table.get(best_key) if best_key else None
+
+
+def get_context_window(provider: str, model: str) -> int:
+    """Return the context window (in tokens) for a provider/model pair."""
+    matched = _match_prefix(MODEL_CONTEXT_WINDOWS, model)
+    if matched:
+        return int(matched)
+    return int(PROVIDER_CONTEXT_WINDOWS.get(str(provider).strip().lower(), 8192))
+
+
+def _get_token_ratios(provider: str, model: str) -> Dict[str, float]:
+    matched = _match_prefix(MODEL_TOKEN_RATIOS, model)
+    if matched:
+        return matched
+    return PROVIDER_TOKEN_RATIOS.get(
+        str(provider).strip().lower(), PROVIDER_TOKEN_RATIOS["openai"]
+    )
+
+
+def _get_tiktoken_encoding(model: str) -> Any | None:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return None
+
+
+def estimate_tokens(text: str | None, provider: str, model: str) -> int:
+    """Estimate the token count of text for a provider/model.
+
+    Uses `tiktoken` for OpenAI models when installed, otherwise a per-provider
+    character-class heuristic that weights CJK and other characters separately.
+    """
+    if not text:
+        return 0
+
+    if str(provider).strip().lower() == "openai":
+        encoding = _get_tiktoken_encoding(model)
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+
+    ratios = _get_token_ratios(provider, model)
+    cjk_count = len(_CJK_RE.findall(text))
+    other_count = len(text) - cjk_count
+    return int(math.ceil(cjk_count * ratios["cjk"] + other_count * ratios["other"]))
+
+
+def estimate_prompt_tokens(
+    prompt: str,
+    provider: str,
+    model: str,
+    system_prompt: str | None = None,
+) -> int:
+    """Estimate input tokens of a rendered prompt including message framing."""
+    total = estimate_tokens(prompt, provider, model) + MESSAGE_OVERHEAD_TOKENS
+    if system_prompt:
+        total += estimate_tokens(system_prompt, provider, model) + MESSAGE_OVERHEAD_TOKENS
+    return total
+
+
+def prompt_token_budget(
+    context_window: int,
+    max_tokens: int,
+    safety_margin: float = DEFAULT_SAFETY_MARGIN,
+) -> int:
+    """Return the input token budget left after reserving output and margin."""
+    usable = int(context_window * (1 - safety_margin))
+    return max(0, usable - int(max_tokens))
+
+
+def _split_oversized(piece: str, max_tokens: int, provider: str, model: str) -> List[str]:
+    sentences = [part for part in _SENTENCE_SPLIT_RE.split(piece) if part]
+    if len(sentences) <= 1:
+        # No sentence boundary: slice by an estimated character count.
+        tokens = max(1, estimate_tokens(piece, provider, model))
+        chars_per_slice = max(1, int(len(piece) * max_tokens / tokens))
+        return [piece[i : i + chars_per_slice] for i in range(0, len(piece), chars_per_slice)]
+
+    parts: List[str] = []
+    for sentence in sentences:
+        if estimate_tokens(sentence, provider, model) > max_tokens:
+            parts.extend(_split_oversized(sentence, max_tokens, provider, model))
+        else:
+            parts.append(sentence)
+    return parts
+
+
+def plan_chunks(
+    content: str,
+    max_chunk_tokens: int,
+    provider: str,
+    model: str,
+    max_chunk_chars: int | None = None,
+) -> List[str]:
+    """Split content into chunks that each fit `max_chunk_tokens`.
+
+    Paragraph boundaries are preferred, then sentence boundaries, then raw
+    character slices. `max_chunk_chars` optionally caps each chunk's length.
+    """
+    if max_chunk_tokens <= 0:
+        raise ValueError("`max_chunk_tokens` must be greater than 0.")
+    if not content:
+        return []
+
+    # Each piece carries the separator used to join it to its predecessor.
+    pieces: List[Tuple[str, str]] = []
+    for paragraph in _PARAGRAPH_SPLIT_RE.split(content):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        too_long = max_chunk_chars is not None and len(paragraph) > max_chunk_chars
+        if not too_long and estimate_tokens(paragraph, provider, model) <= max_chunk_tokens:
+            pieces.append((paragraph, "\n\n"))
+            continue
+
+        separator = "\n\n"
+        for part in _split_oversized(paragraph, max_chunk_tokens, provider, model):
+            if max_chunk_chars is not None and len(part) > max_chunk_chars:
+                for i in range(0, len(part), max_chunk_chars):
+                    pieces.append((part[i : i + max_chunk_chars], separator))
+                    separator = ""
+            else:
+                pieces.append((part, separator))
+            separator = " "
+
+    chunks: List[str] = []
+    current = ""
+    current_tokens = 0
+    for piece, separator in pieces:
+        piece_tokens = estimate_tokens(f"{separator}{piece}", provider, model)
+        over_tokens = current_tokens + piece_tokens > max_chunk_tokens
+        over_chars = (
+            max_chunk_chars is not None
+            and len(current) + len(separator) + len(piece) > max_chunk_chars
+        )
+        if current and (over_tokens or over_chars):
+            chunks.append(current)
+            current, current_tokens = "", 0
+            piece_tokens = estimate_tokens(piece, provider, model)
+        current = f"{current}{separator}{piece}" if current else piece
+        current_tokens += piece_tokens
+
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,146 @@
+"""Score items with a cheap model so only worthwhile ones get a full summary."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List
+
+from .llm_client import LLMClient
+from .packing import _extract_json_array, _split_usage
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TRIAGE_CONFIG: Dict[str, Any] = {
+    "enabled": False,
+    "provider": None,
+    "model": None,
+    "threshold": 6.0,
+    "batch_size": 20,
+    "lead_chars": 600,
+    "topic": "AI, large language models, machine learning and their engineering practice",
+}
+
+TRIAGE_PROMPT_TEMPLATE = """
+You are screening articles for a reader interested in: {topic}.
+For each article listed at the end, judge from its title and opening text only.
+
+Return strict JSON only, with exactly one object per article in input order:
+{
+  "items": [
+    {"id": 1, "score": 7, "brief": "one-line Chinese brief"}
+  ]
+}
+
+score: integer 0-10 combining relevance to the topic and how worth reading it is
+(0 = off-topic or empty, 10 = must read).
+brief: one Chinese sentence within 60 characters describing the article.
+
+Articles ({count}):
+{articles}
+""".strip()
+
+TRIAGE_RESPONSE_SCHEMA: Dict[str, Any] = {
+    "name": "triage_scores",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "items": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "integer"},
+                        "score": {"type": "number"},
+                        "brief": {"type": "string"},
+                    },
+                    "required": ["id", "score", "brief"],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["items"],
+        "additionalProperties": False,
+    },
+}
+
+# A triage entry: {"id": int, "url": str, "title": str, "content": str | None}, where
+# `content` is plain text (see `compaction.extract_text`), not feed HTML.
+TriageEntry = Dict[str, Any]
+
+
+def _render_entry(entry: TriageEntry, lead_chars: int) -> str:
+    lines = [f"[{entry['id']}] URL: {entry['url']}"]
+    if entry.get("title"):
+        lines.append(f"Title: {entry['title']}")
+    lead = " ".join(str(entry.get("content") or "")[: lead_chars * 2].split())[:lead_chars]
+    if lead:
+        lines.append(f"Lead: {lead}")
+    return "\n".join(lines)
+
+
+def render_triage_prompt(
+    entries: List[TriageEntry],
+    topic: str = DEFAULT_TRIAGE_CONFIG["topic"],
+    lead_chars: int = DEFAULT_TRIAGE_CONFIG["lead_chars"],
+) -> str:
+    """Render the triage prompt (explicit replacement keeps JSON braces intact)."""
+    articles = "\n\n".join(_render_entry(entry, lead_chars) for entry in entries)
+    return (
+        TRIAGE_PROMPT_TEMPLATE.replace("{topic}", topic)
+        .replace("{count}", str(len(entries)))
+        .replace("{articles}", articles)
+    )
+
+
+def triage_entries(
+    client: LLMClient,
+    entries: List[TriageEntry],
+    topic: str = DEFAULT_TRIAGE_CONFIG["topic"],
+    lead_chars: int = DEFAULT_TRIAGE_CONFIG["lead_chars"],
+) -> Dict[int, Dict[str, Any]]:
+    """Score one batch of entries in a single call; returns results by entry id.
+
+    Each result holds `score` (0-10), a one-line `brief`, `model_used` and the
+    entry's share of `token_usage`. Entries missing from the reply are left out
+    so the caller can send them down the full summary path.
+    """
+    prompt = render_triage_prompt(entries, topic, lead_chars)
+    estimated_tokens = client.estimate_prompt_tokens(prompt)
+    share = 1 / max(1, len(entries))
+    label = f"triage of {len(entries)} ({entries[0]['url']} ...)"
+
+    def _build(raw_text: str, usage: Dict[str, int]) -> Dict[str, Any]:
+        records = _extract_json_array(client.provider, raw_text)
+        by_id = {entry["id"]: entry for entry in entries}
+        results: Dict[int, Dict[str, Any]] = {}
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            try:
+                entry_id = int(record.get("id"))
+                score = min(10.0, max(0.0, float(record.get("score"))))
+            except (TypeError, ValueError):
+                continue
+            if entry_id not in by_id or entry_id in results:
+                continue
+            token_usage = _split_usage(usage, share)
+            token_usage["estimated_prompt_tokens"] = int(round(estimated_tokens * share))
+            results[entry_id] = {
+                "score": score,
+                "brief": client._truncate(
+                    str(record.get("brief", "")).strip(), 100, "brief", by_id[entry_id]["url"]
+                ),
+                "model_used": client._effective_model(),
+                "token_usage": token_usage,
+            }
+        if not results:
+            raise ValueError("Triage response contained no valid item.")
+        return {"success": True, "items": results}
+
+    outcome = client._request_with_retries(
+        label, prompt, estimated_tokens, _build, response_schema=TRIAGE_RESPONSE_SCHEMA
+    )
+    if not outcome.get("success"):
+        LOGGER.warning("Triage call failed, %s, error=%s", label, outcome.get("error"))
+        return {}
+    return outcome["items"]
@@ -0,0 +1,153 @@
+"""Per-run artifact directory so an interrupted pipeline run can be resumed."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_RUNS_DIR = ".cache/move37/runs"
+
+STAGES = ("collection", "summarize", "write_docx", "notify")
+STAGE_ARTIFACTS = {
+    "collection": "collection_result.json",
+    "summarize": "summary_result.json",
+    "write_docx": "write_result.json",
+    "notify": "notify_result.json",
+}
+STATE_FILE = "state.json"
+ITEMS_FILE = "summaries.jsonl"
+
+
+def new_run_id() -> str:
+    # The random suffix keeps runs started within the same second apart.
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+
+
+def latest_run_id(runs_dir: str | Path = DEFAULT_RUNS_DIR) -> str | None:
+    """Return the most recent run id under `runs_dir`, or None when there is none."""
+    root = Path(runs_dir)
+    if not root.is_dir():
+        return None
+    run_ids = sorted(path.name for path in root.iterdir() if (path / STATE_FILE).is_file())
+    return run_ids[-1] if run_ids else None
+
+
+def _write_json_atomic(path: Path, data: Any) -> None:
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _item_key(key: Any) -> str:
+    return "|".join(str(part) for part in key) if isinstance(key, (list, tuple)) else str(key)
+
+
+class RunCheckpoint:
+    """Stage results and per-item summaries of one pipeline run, stored on disk.
+
+    Layout of `<runs_dir>/<run_id>/`:
+    - `state.json`: run parameters and the list of completed stages.
+    - `<stage>_result.json`: the output of each completed stage.
+    - `summaries.jsonl`: one line per successfully summarized item, appended
+      as soon as the item finishes so a crash mid-summarize loses nothing.
+
+    `get`/`put` follow the `SummaryCache` interface so `summarize_all` can skip
+    items already summarized by an earlier attempt of the same run.
+    """
+
+    def __init__(
+        self,
+        run_id: str | None = None,
+        runs_dir: str | Path = DEFAULT_RUNS_DIR,
+        params: Dict[str, Any] | None = None,
+    ) -> None:
+        self.run_id = run_id or new_run_id()
+        self.run_dir = Path(runs_dir) / self.run_id
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        state_path = self.run_dir / STATE_FILE
+        if state_path.is_file():
+            self.state: Dict[str, Any] = json.loads(state_path.read_text(encoding="utf-8"))
+        else:
+            self.state = {
+                "run_id": self.run_id,
+                "created_at": time.time(),
+                "params": dict(params or {}),
+                "completed": [],
+            }
+            _write_json_atomic(state_path, self.state)
+        self._items = self._load_items()
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return dict(self.state.get("params") or {})
+
+    @property
+    def completed(self) -> List[str]:
+        return list(self.state.get("completed") or [])
+
+    def is_done(self, stage: str) -> bool:
+        return stage in self.completed and (self.run_dir / STAGE_ARTIFACTS[stage]).is_file()
+
+    def load(self, stage: str) -> Dict[str, Any]:
+        path = self.run_dir / STAGE_ARTIFACTS[stage]
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def save(self, stage: str, data: Dict[str, Any]) -> None:
+        """Store a stage result and mark the stage completed."""
+        with self._lock:
+            _write_json_atomic(self.run_dir / STAGE_ARTIFACTS[stage], data)
+            if stage not in self.state["completed"]:
+                self.state["completed"].append(stage)
+            _write_json_atomic(self.run_dir / STATE_FILE, self.state)
+
+    def note(self, key: str, value: Any) -> None:
+        """Store run metadata that is not a stage result (e.g. a partially written doc)."""
+        with self._lock:
+            self.state[key] = value
+            _write_json_atomic(self.run_dir / STATE_FILE, self.state)
+
+    def get(self, key: Any) -> Dict[str, Any] | None:
+        with self._lock:
+            summary = self._items.get(_item_key(key))
+        return dict(summary) if summary is not None else None
+
+    def put(self, key: Any, summary: Dict[str, Any]) -> None:
+        """Append one finished item summary; flushed immediately."""
+        record = {"key": _item_key(key), "summary": summary}
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            with (self.run_dir / ITEMS_FILE).open("a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+                handle.flush()
+            self._items[record["key"]] = dict(summary)
+
+    def _load_items(self) -> Dict[str, Dict[str, Any]]:
+        items: Dict[str, Dict[str, Any]] = {}
+        path = self.run_dir / ITEMS_FILE
+        if not path.is_file():
+            return items
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-write leaves at most one truncated trailing line.
+                LOGGER.warning("Skip corrupt checkpoint line in %s", path)
+                continue
+            if isinstance(record, dict) and isinstance(record.get("summary"), dict):
+                items[str(record.get("key"))] = record["summary"]
+        if items:
+            LOGGER.info("Loaded %s checkpointed summaries from %s", len(items), path)
+        return items
+
+    def __len__(self) -> int:
+        return len(self._items)
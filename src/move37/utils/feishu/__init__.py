@@ -1,14 +1,17 @@
 """Feishu utility package."""
 
+from .client_pool import clear_feishu_clients, get_feishu_client
 from .feishuclient import (
     FeishuAuthError,
     FeishuClient,
     FeishuClientError,
     FeishuDocxContentError,
     FeishuDocxError,
+    FeishuImportError,
     FeishuMessageError,
     FeishuVerificationError,
 )
+from .token_cache import TenantTokenCache, reset_shared_token_cache, shared_token_cache
 
 __all__ = [
     "FeishuClient",
@@ -17,5 +20,11 @@ __all__ = [
     "FeishuVerificationError",
     "FeishuDocxError",
     "FeishuDocxContentError",
+    "FeishuImportError",
     "FeishuMessageError",
+    "get_feishu_client",
+    "clear_feishu_clients",
+    "TenantTokenCache",
+    "shared_token_cache",
+    "reset_shared_token_cache",
 ]
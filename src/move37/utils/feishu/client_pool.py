@@ -0,0 +1,42 @@
+"""Process-level FeishuClient registry so pipeline stages reuse one warm SDK client."""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Tuple
+
+from .feishuclient import FeishuClient
+
+_POOL_LOCK = threading.Lock()
+_CLIENTS: Dict[Tuple[str, str, float], FeishuClient] = {}
+
+
+def get_feishu_client(
+    app_id: str,
+    app_secret: str,
+    timeout: float = 30.0,
+    base_url: str = FeishuClient.DEFAULT_BASE_URL,
+) -> FeishuClient:
+    """Return the shared client for `(app_id, base_url, timeout)`, creating it on first use.
+
+    The writer, the notifier and scheduled runs in the same process then share
+    one lark SDK client (and its HTTP connections) instead of building their
+    own. A different `app_secret` for the same key replaces the pooled client.
+    """
+    # Build first so invalid arguments raise the usual ValueError; the key
+    # uses the client's normalized fields.
+    candidate = FeishuClient(
+        app_id=app_id, app_secret=app_secret, timeout=timeout, base_url=base_url
+    )
+    key = (candidate.app_id, candidate.base_url, candidate.timeout)
+    with _POOL_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None or client.app_secret != candidate.app_secret:
+            _CLIENTS[key] = client = candidate
+        return client
+
+
+def clear_feishu_clients() -> None:
+    """Drop every pooled client (e.g. after rotating credentials)."""
+    with _POOL_LOCK:
+        _CLIENTS.clear()
@@ -4,7 +4,16 @@ from __future__ import annotations
 
 import importlib
 import json
-from typing import Any, Dict
+import logging
+import threading
+import uuid
+from typing import Any, Callable, Dict, Tuple
+
+from move37.utils.retry import RetryPolicy, rate_limited_only
+
+from .token_cache import TenantTokenCache, shared_token_cache
+
+LOGGER = logging.getLogger(__name__)
 
 
 class FeishuClientError(RuntimeError):
@@ -31,6 +40,21 @@ class FeishuMessageError(FeishuClientError):
     """Raised when Feishu IM message API returns an error response."""
 
 
+class FeishuImportError(FeishuClientError):
+    """Raised when Feishu drive upload/import or wiki move API returns an error response."""
+
+
+class _RetryableResponse(FeishuClientError):
+    """Internal: an SDK response worth retrying (rate limited or server error)."""
+
+    def __init__(self, sdk_response: Any, status_code: int) -> None:
+        super().__init__(f"Feishu request failed with retryable status {status_code}")
+        self.sdk_response = sdk_response
+        self.status_code = status_code
+        # Exposes raw headers to `retry_after_seconds`.
+        self.response = getattr(sdk_response, "raw", None)
+
+
 class FeishuClient:
     """Minimal Feishu SDK client for tenant access token retrieval."""
 
@@ -40,8 +64,19 @@ class FeishuClient:
     DOCX_CHILDREN_CREATE_URI_TEMPLATE = (
         "/open-apis/docx/v1/documents/{document_id}/blocks/{block_id}/children"
     )
+    DOCX_DESCENDANT_CREATE_URI_TEMPLATE = (
+        "/open-apis/docx/v1/documents/{document_id}/blocks/{block_id}/descendant"
+    )
     IM_MESSAGES_URI = "/open-apis/im/v1/messages"
+    DRIVE_MEDIA_UPLOAD_URI = "/open-apis/drive/v1/medias/upload_all"
+    DRIVE_IMPORT_TASKS_URI = "/open-apis/drive/v1/import_tasks"
+    WIKI_MOVE_DOCS_URI_TEMPLATE = "/open-apis/wiki/v2/spaces/{space_id}/nodes/move_docs_to_wiki"
+    WIKI_TASK_URI_TEMPLATE = "/open-apis/wiki/v2/tasks/{task_id}?task_type=move"
     DEFAULT_BASE_URL = "https://open.feishu.cn"
+    # Business codes Feishu returns for request frequency limits.
+    RATE_LIMIT_CODES = {"99991400"}
+    # Business codes for an invalid or expired tenant_access_token.
+    TOKEN_ERROR_CODES = {"99991663", "99991668"}
 
     def __init__(
         self,
@@ -49,6 +84,8 @@ class FeishuClient:
         app_secret: str,
         timeout: float = 30.0,
         base_url: str = DEFAULT_BASE_URL,
+        retry_policy: RetryPolicy | None = None,
+        token_cache: TenantTokenCache | None = None,
     ) -> None:
         self.app_id = str(app_id or "").strip()
         self.app_secret = str(app_secret or "").strip()
@@ -69,9 +106,14 @@ class FeishuClient:
         if not self.base_url:
             self.base_url = self.DEFAULT_BASE_URL
 
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=3, base_delay=0.5, max_delay=10.0
+        )
+        self.token_cache = token_cache if token_cache is not None else shared_token_cache()
         self.tenant_access_token = ""
         self._sdk_module: Any | None = None
         self._sdk_client: Any | None = None
+        self._sdk_lock = threading.Lock()
 
     def _load_sdk(self) -> Any:
         if self._sdk_module is not None:
@@ -100,8 +142,11 @@ class FeishuClient:
         return self._sdk_client
 
     def _get_sdk_client(self) -> Any:
+        # Pooled clients are shared across threads; build the SDK client once.
         if self._sdk_client is None:
-            return self._build_sdk_client()
+            with self._sdk_lock:
+                if self._sdk_client is None:
+                    return self._build_sdk_client()
         return self._sdk_client
 
     def _build_tenant_token_request(self, lark: Any) -> Any:
@@ -154,12 +199,13 @@ class FeishuClient:
         document_id: str,
         block_id: str,
         body: Dict[str, Any],
+        uri_template: str | None = None,
     ) -> Any:
         request_builder = (
             lark.BaseRequest.builder()
             .http_method(lark.HttpMethod.POST)
             .uri(
-                self.DOCX_CHILDREN_CREATE_URI_TEMPLATE.format(
+                (uri_template or self.DOCX_CHILDREN_CREATE_URI_TEMPLATE).format(
                     document_id=document_id,
                     block_id=block_id,
                 )
@@ -197,6 +243,143 @@ class FeishuClient:
             )
         return request_builder.build()
 
+    def _build_api_request(
+        self,
+        lark: Any,
+        tenant_access_token: str,
+        http_method: str,
+        uri: str,
+        body: Dict[str, Any] | None = None,
+        files: Dict[str, Any] | None = None,
+    ) -> Any:
+        request_builder = (
+            lark.BaseRequest.builder()
+            .http_method(getattr(lark.HttpMethod, http_method))
+            .uri(uri)
+        )
+        if body is not None:
+            request_builder = request_builder.body(body)
+        if files:
+            if not hasattr(request_builder, "files"):
+                raise FeishuClientError("Installed lark-oapi does not support file uploads.")
+            request_builder = request_builder.files(files)
+        if hasattr(request_builder, "headers"):
+            headers = {"Authorization": f"Bearer {tenant_access_token}"}
+            if not files:
+                headers["Content-Type"] = "application/json; charset=utf-8"
+            request_builder = request_builder.headers(headers)
+        return request_builder.build()
+
+    def _call_api(
+        self,
+        action: str,
+        http_method: str,
+        uri: str,
+        body: Dict[str, Any] | None = None,
+        files: Dict[str, Any] | None = None,
+        tenant_access_token: str | None = None,
+        idempotent: bool = True,
+    ) -> Dict[str, Any]:
+        """Send one open-api request and return its `data`; errors raise FeishuImportError."""
+        token = str(tenant_access_token or "").strip() or self.get_tenant_access_token()
+
+        lark = self._load_sdk()
+        sdk_client = self._get_sdk_client()
+        try:
+            response = self._send_authorized(
+                sdk_client,
+                lambda auth: self._build_api_request(lark, auth, http_method, uri, body, files),
+                token,
+                refreshable=not tenant_access_token,
+                idempotent=idempotent,
+            )
+        except Exception as exc:  # noqa: BLE001
+            raise FeishuClientError(f"Feishu SDK request failed: {type(exc).__name__}: {exc}") from exc
+
+        if not callable(getattr(response, "success", None)):
+            raise FeishuClientError("Feishu SDK response object is invalid: missing success().")
+        if not response.success():
+            code, msg, log_id, status_code = self._extract_error_details(response)
+            message = f"Feishu {action} request failed: code={code}, msg={msg or 'unknown'}"
+            if status_code:
+                message = f"{message}, http_status={status_code}"
+            if log_id:
+                message = f"{message}, log_id={log_id}"
+            raise FeishuImportError(message)
+
+        response_payload = self._parse_payload(response)
+        try:
+            code = int(response_payload.get("code", -1))
+        except (TypeError, ValueError):
+            code = -1
+        if code != 0:
+            msg = str(response_payload.get("msg", "")).strip()
+            raise FeishuImportError(f"Feishu {action} failed: code={code}, msg={msg or 'unknown'}")
+
+        data = response_payload.get("data")
+        if not isinstance(data, dict):
+            raise FeishuImportError(f"Feishu {action} response missing data object.")
+        return data
+
+    def _retryable_status(self, response: Any) -> int | None:
+        """Return 429/5xx for a failed response worth retrying, else None."""
+        success = getattr(response, "success", None)
+        if not callable(success) or success():
+            return None
+        code, _, _, status_code = self._extract_error_details(response)
+        if code in self.RATE_LIMIT_CODES or status_code == "429":
+            return 429
+        if status_code.startswith("5"):
+            return int(status_code)
+        return None
+
+    def _send(self, sdk_client: Any, request: Any, idempotent: bool = True) -> Any:
+        """Send `request` with the shared retry policy.
+
+        Rate-limited responses are always retried. Transport errors and 5xx
+        responses are retried only for `idempotent` requests, since a retried
+        create could apply twice. Once retries run out, the last response is
+        returned so callers report it as usual.
+        """
+
+        def _attempt() -> Any:
+            response = sdk_client.request(request)
+            status_code = self._retryable_status(response)
+            if status_code is not None:
+                raise _RetryableResponse(response, status_code)
+            return response
+
+        try:
+            return self.retry_policy.call(
+                _attempt,
+                label="Feishu request",
+                classify=None if idempotent else rate_limited_only,
+            )
+        except _RetryableResponse as exc:
+            return exc.sdk_response
+
+    def _send_authorized(
+        self,
+        sdk_client: Any,
+        build_request: Callable[[str], Any],
+        token: str,
+        refreshable: bool,
+        idempotent: bool = True,
+    ) -> Any:
+        """Send `build_request(token)`; a rejected cached token is refreshed and sent once more.
+
+        `refreshable` is False for caller-supplied tokens, which are theirs to
+        manage. A request rejected at auth was not applied, so the resend is
+        safe even when the request is not idempotent.
+        """
+        response = self._send(sdk_client, build_request(token), idempotent=idempotent)
+        if not refreshable or self._extract_error_details(response)[0] not in self.TOKEN_ERROR_CODES:
+            return response
+        LOGGER.warning("Feishu rejected the cached tenant_access_token; refreshing it once.")
+        self.token_cache.invalidate(self.token_cache_key(), token)
+        fresh_token = self.get_tenant_access_token()
+        return self._send(sdk_client, build_request(fresh_token), idempotent=idempotent)
+
     @staticmethod
     def _parse_payload(response: Any) -> Dict[str, Any]:
         raw = getattr(response, "raw", None)
@@ -249,15 +432,27 @@ class FeishuClient:
                         msg = str(payload.get("msg", "") or "").strip()
         return code, msg, log_id, status_code
 
-    def get_tenant_access_token(self) -> str:
-        """Call auth/v3 API and return tenant_access_token."""
+    def token_cache_key(self) -> str:
+        """Key of this app's token in `token_cache`; tokens are only valid on their own host."""
+        return f"{self.base_url}|{self.app_id}"
+
+    def get_tenant_access_token(self, force_refresh: bool = False) -> str:
+        """Return tenant_access_token, calling auth/v3 only when the cached one nears expiry."""
+        token = self.token_cache.get_or_fetch(
+            self.token_cache_key(), self._fetch_tenant_access_token, force_refresh=force_refresh
+        )
+        self.tenant_access_token = token
+        return token
+
+    def _fetch_tenant_access_token(self) -> Tuple[str, float]:
+        """Call auth/v3 API and return `(tenant_access_token, expire_seconds)`."""
 
         lark = self._load_sdk()
         sdk_client = self._get_sdk_client()
         request = self._build_tenant_token_request(lark)
 
         try:
-            response = sdk_client.request(request)
+            response = self._send(sdk_client, request)
         except Exception as exc:  # noqa: BLE001
             raise FeishuClientError(f"Feishu SDK request failed: {type(exc).__name__}: {exc}") from exc
 
@@ -284,22 +479,27 @@ class FeishuClient:
         token = str(payload.get("tenant_access_token") or "").strip()
         if not token:
             raise FeishuAuthError("Feishu auth response missing tenant_access_token.")
-        self.tenant_access_token = token
-        return token
+        try:
+            expire = float(payload.get("expire") or 0)
+        except (TypeError, ValueError):
+            expire = 0.0
+        return token, expire
 
     def get_tenant_verification_info(self, tenant_access_token: str | None = None) -> Dict[str, Any]:
         """Call verification/v1 API and return structured tenant verification info."""
 
-        token = str(tenant_access_token or self.tenant_access_token).strip()
-        if not token:
-            token = self.get_tenant_access_token()
+        token = str(tenant_access_token or "").strip() or self.get_tenant_access_token()
 
         lark = self._load_sdk()
         sdk_client = self._get_sdk_client()
-        request = self._build_tenant_verification_request(lark, token)
 
         try:
-            response = sdk_client.request(request)
+            response = self._send_authorized(
+                sdk_client,
+                lambda auth: self._build_tenant_verification_request(lark, auth),
+                token,
+                refreshable=not tenant_access_token,
+            )
         except Exception as exc:  # noqa: BLE001
             raise FeishuClientError(f"Feishu SDK request failed: {type(exc).__name__}: {exc}") from exc
 
@@ -352,9 +552,7 @@ class FeishuClient:
         if len(normalized_title) > 500:
             raise ValueError("`title` must be 500 characters or fewer.")
 
-        token = str(tenant_access_token or self.tenant_access_token).strip()
-        if not token:
-            token = self.get_tenant_access_token()
+        token = str(tenant_access_token or "").strip() or self.get_tenant_access_token()
 
         payload: Dict[str, Any] = {
             "obj_type": str(obj_type or "docx").strip() or "docx",
@@ -368,15 +566,20 @@ class FeishuClient:
 
         lark = self._load_sdk()
         sdk_client = self._get_sdk_client()
-        request = self._build_docx_create_request(
-            lark,
-            token,
-            normalized_space_id,
-            payload,
-        )
 
         try:
-            response = sdk_client.request(request)
+            response = self._send_authorized(
+                sdk_client,
+                lambda auth: self._build_docx_create_request(
+                    lark,
+                    auth,
+                    normalized_space_id,
+                    payload,
+                ),
+                token,
+                refreshable=not tenant_access_token,
+                idempotent=False,
+            )
         except Exception as exc:  # noqa: BLE001
             raise FeishuClientError(f"Feishu SDK request failed: {type(exc).__name__}: {exc}") from exc
 
@@ -412,7 +615,7 @@ class FeishuClient:
         children: list[Dict[str, Any]],
         tenant_access_token: str | None = None,
     ) -> Dict[str, Any]:
-        """Create descendant blocks in a docx block."""
+        """Append flat child blocks to a docx block."""
 
         normalized_document_id = str(document_id or "").strip()
         if not normalized_document_id:
@@ -423,24 +626,83 @@ class FeishuClient:
         if not isinstance(children, list) or not children:
             raise ValueError("`children` must be a non-empty list.")
 
-        token = str(tenant_access_token or self.tenant_access_token).strip()
-        if not token:
-            token = self.get_tenant_access_token()
-
         payload: Dict[str, Any] = {"children": children}
+        return self._post_docx_blocks(
+            normalized_document_id,
+            normalized_block_id,
+            payload,
+            tenant_access_token,
+            self.DOCX_CHILDREN_CREATE_URI_TEMPLATE,
+        )
 
-        lark = self._load_sdk()
-        sdk_client = self._get_sdk_client()
-        request = self._build_docx_descendant_create_request(
-            lark,
-            token,
+    def create_docx_descendants(
+        self,
+        document_id: str,
+        block_id: str,
+        children_id: list[str],
+        descendants: list[Dict[str, Any]],
+        index: int = -1,
+        tenant_access_token: str | None = None,
+    ) -> Dict[str, Any]:
+        """Create a nested block tree under `block_id` in one request.
+
+        `descendants` lists every block with a temporary `block_id` and the
+        temporary ids of its `children`; `children_id` names the top-level
+        ones. The returned data maps temporary to real ids in
+        `block_id_relations`.
+        """
+        normalized_document_id = str(document_id or "").strip()
+        if not normalized_document_id:
+            raise ValueError("`document_id` is required.")
+        normalized_block_id = str(block_id or "").strip()
+        if not normalized_block_id:
+            raise ValueError("`block_id` is required.")
+        if not isinstance(children_id, list) or not children_id:
+            raise ValueError("`children_id` must be a non-empty list.")
+        if not isinstance(descendants, list) or not descendants:
+            raise ValueError("`descendants` must be a non-empty list.")
+
+        payload: Dict[str, Any] = {
+            "index": index,
+            "children_id": children_id,
+            "descendants": descendants,
+        }
+        return self._post_docx_blocks(
             normalized_document_id,
             normalized_block_id,
             payload,
+            tenant_access_token,
+            self.DOCX_DESCENDANT_CREATE_URI_TEMPLATE,
         )
 
+    def _post_docx_blocks(
+        self,
+        document_id: str,
+        block_id: str,
+        payload: Dict[str, Any],
+        tenant_access_token: str | None,
+        uri_template: str,
+    ) -> Dict[str, Any]:
+        token = str(tenant_access_token or "").strip() or self.get_tenant_access_token()
+
+        lark = self._load_sdk()
+        sdk_client = self._get_sdk_client()
+
         try:
-            response = sdk_client.request(request)
+            response = self._send_authorized(
+                sdk_client,
+                lambda auth: self._build_docx_descendant_create_request(
+                    lark,
+                    auth,
+                    document_id,
+                    block_id,
+                    payload,
+                    uri_template,
+                ),
+                token,
+                refreshable=not tenant_access_token,
+                idempotent=False,
+            )
         except Exception as exc:  # noqa: BLE001
             raise FeishuClientError(f"Feishu SDK request failed: {type(exc).__name__}: {exc}") from exc
 
@@ -471,6 +733,146 @@ class FeishuClient:
             raise FeishuDocxContentError("Feishu docx content update response missing data object.")
         return data
 
+    def upload_import_file(
+        self,
+        file_name: str,
+        content: bytes,
+        file_extension: str = "md",
+        obj_type: str = "docx",
+        tenant_access_token: str | None = None,
+    ) -> str:
+        """Upload a local file as the source of an import task; returns its file_token."""
+        normalized_name = str(file_name or "").strip()
+        if not normalized_name:
+            raise ValueError("`file_name` is required.")
+        if not isinstance(content, bytes) or not content:
+            raise ValueError("`content` must be non-empty bytes.")
+
+        form = {
+            "file_name": normalized_name,
+            "parent_type": "ccm_import_open",
+            "size": str(len(content)),
+            "extra": json.dumps({"obj_type": obj_type, "file_extension": file_extension}),
+        }
+        data = self._call_api(
+            "drive media upload",
+            "POST",
+            self.DRIVE_MEDIA_UPLOAD_URI,
+            body=form,
+            files={"file": (normalized_name, content)},
+            tenant_access_token=tenant_access_token,
+        )
+        file_token = str(data.get("file_token") or "").strip()
+        if not file_token:
+            raise FeishuImportError("Feishu drive media upload response missing file_token.")
+        return file_token
+
+    def create_import_task(
+        self,
+        file_token: str,
+        file_name: str,
+        file_extension: str = "md",
+        obj_type: str = "docx",
+        mount_key: str = "",
+        tenant_access_token: str | None = None,
+    ) -> str:
+        """Start converting an uploaded file into a cloud doc; returns the task ticket.
+
+        `mount_key` is the drive folder token the doc is created in (empty: root).
+        """
+        normalized_token = str(file_token or "").strip()
+        if not normalized_token:
+            raise ValueError("`file_token` is required.")
+
+        payload = {
+            "file_extension": file_extension,
+            "file_token": normalized_token,
+            "type": obj_type,
+            "file_name": str(file_name or "").strip(),
+            "point": {"mount_type": 1, "mount_key": str(mount_key or "").strip()},
+        }
+        data = self._call_api(
+            "drive import task create",
+            "POST",
+            self.DRIVE_IMPORT_TASKS_URI,
+            body=payload,
+            tenant_access_token=tenant_access_token,
+            idempotent=False,
+        )
+        ticket = str(data.get("ticket") or "").strip()
+        if not ticket:
+            raise FeishuImportError("Feishu drive import task response missing ticket.")
+        return ticket
+
+    def get_import_task(
+        self, ticket: str, tenant_access_token: str | None = None
+    ) -> Dict[str, Any]:
+        """Return the import task `result` (`job_status` 0 = done, 1/2 = running)."""
+        normalized_ticket = str(ticket or "").strip()
+        if not normalized_ticket:
+            raise ValueError("`ticket` is required.")
+        data = self._call_api(
+            "drive import task query",
+            "GET",
+            f"{self.DRIVE_IMPORT_TASKS_URI}/{normalized_ticket}",
+            tenant_access_token=tenant_access_token,
+        )
+        result = data.get("result")
+        if not isinstance(result, dict):
+            raise FeishuImportError("Feishu drive import task query response missing result.")
+        return result
+
+    def move_docs_to_wiki(
+        self,
+        space_id: str,
+        obj_token: str,
+        parent_wiki_token: str | None = None,
+        obj_type: str = "docx",
+        tenant_access_token: str | None = None,
+    ) -> Dict[str, Any]:
+        """Move a drive doc into a wiki space.
+
+        Returns `wiki_token` when the move finished at once, else a `task_id`
+        to poll with `get_wiki_move_task`.
+        """
+        normalized_space_id = str(space_id or "").strip()
+        if not normalized_space_id:
+            raise ValueError("`space_id` is required.")
+        normalized_obj_token = str(obj_token or "").strip()
+        if not normalized_obj_token:
+            raise ValueError("`obj_token` is required.")
+
+        payload: Dict[str, Any] = {"obj_type": obj_type, "obj_token": normalized_obj_token}
+        normalized_parent = str(parent_wiki_token or "").strip()
+        if normalized_parent:
+            payload["parent_wiki_token"] = normalized_parent
+        return self._call_api(
+            "wiki move docs",
+            "POST",
+            self.WIKI_MOVE_DOCS_URI_TEMPLATE.format(space_id=normalized_space_id),
+            body=payload,
+            tenant_access_token=tenant_access_token,
+            idempotent=False,
+        )
+
+    def get_wiki_move_task(
+        self, task_id: str, tenant_access_token: str | None = None
+    ) -> Dict[str, Any]:
+        """Return the wiki move task (`move_result` lists the moved nodes)."""
+        normalized_task_id = str(task_id or "").strip()
+        if not normalized_task_id:
+            raise ValueError("`task_id` is required.")
+        data = self._call_api(
+            "wiki move task query",
+            "GET",
+            self.WIKI_TASK_URI_TEMPLATE.format(task_id=normalized_task_id),
+            tenant_access_token=tenant_access_token,
+        )
+        task = data.get("task")
+        if not isinstance(task, dict):
+            raise FeishuImportError("Feishu wiki move task response missing task.")
+        return task
+
     def send_group_notify(
         self,
         content: str,
@@ -494,9 +896,7 @@ class FeishuClient:
         if normalized_msg_type not in {"text", "post", "interactive"}:
             raise ValueError("`msg_type` must be one of: text, post, interactive.")
 
-        token = str(tenant_access_token or self.tenant_access_token).strip()
-        if not token:
-            token = self.get_tenant_access_token()
+        token = str(tenant_access_token or "").strip() or self.get_tenant_access_token()
 
         payload_content = normalized_content
         if normalized_msg_type == "text":
@@ -506,19 +906,25 @@ class FeishuClient:
             "receive_id": normalized_receive_id,
             "msg_type": normalized_msg_type,
             "content": payload_content,
+            # Feishu drops repeats of the same uuid, so retries cannot double-post.
+            "uuid": uuid.uuid4().hex,
         }
 
         lark = self._load_sdk()
         sdk_client = self._get_sdk_client()
-        request = self._build_group_notify_request(
-            lark,
-            token,
-            normalized_receive_id_type,
-            body,
-        )
 
         try:
-            response = sdk_client.request(request)
+            response = self._send_authorized(
+                sdk_client,
+                lambda auth: self._build_group_notify_request(
+                    lark,
+                    auth,
+                    normalized_receive_id_type,
+                    body,
+                ),
+                token,
+                refreshable=not tenant_access_token,
+            )
         except Exception as exc:  # noqa: BLE001
             raise FeishuClientError(f"Feishu SDK request failed: {type(exc).__name__}: {exc}") from exc
 
@@ -0,0 +1,206 @@
+"""Process-wide tenant_access_token cache, optionally shared across processes via a file."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+try:  # POSIX only; elsewhere the file is still replaced atomically, just not locked.
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+LOGGER = logging.getLogger(__name__)
+
+TOKEN_CACHE_FILE_ENV = "FEISHU_TOKEN_CACHE_FILE"
+# Feishu issues a new token once the current one has < 30 min left; refreshing
+# a few minutes early keeps in-flight requests from racing the expiry.
+DEFAULT_REFRESH_MARGIN = 300.0
+
+TokenFetcher = Callable[[], Tuple[str, float]]
+
+
+def _write_json_atomic(path: Path, data: Any) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    # Created 0600 up front so the token is never readable under a looser umask.
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        handle.write(json.dumps(data, indent=2))
+    os.chmod(tmp_path, 0o600)
+    os.replace(tmp_path, path)
+
+
+class TenantTokenCache:
+    """tenant_access_token per app key, refreshed `refresh_margin` seconds before expiry.
+
+    The key is chosen by the caller; FeishuClient uses `token_cache_key()`,
+    which includes the base_url, so feishu.cn and larksuite apps never share
+    a token.
+
+    A per-app lock makes concurrent callers in one process share a single
+    fetch. With `path`, entries are also stored in a JSON file guarded by an
+    exclusive `flock` on `<path>.lock`, so parallel processes (e.g. cron runs
+    and samples) reuse one token instead of each fetching their own.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path) if path else None
+        self.refresh_margin = max(0.0, float(refresh_margin))
+        self._clock = clock
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._app_locks: Dict[str, threading.Lock] = {}
+
+    def _fresh(self, entry: Dict[str, Any] | None) -> bool:
+        if not entry or not entry.get("token"):
+            return False
+        try:
+            expires_at = float(entry.get("expires_at") or 0)
+        except (TypeError, ValueError):
+            return False
+        return expires_at - self.refresh_margin > self._clock()
+
+    def get(self, app_id: str) -> str | None:
+        """Return the cached token for `app_id` if it is not about to expire."""
+        with self._lock:
+            entry = self._entries.get(app_id)
+        if self._fresh(entry):
+            return str(entry["token"])  # type: ignore[index]
+        if self.path is not None:
+            with self._file_lock():
+                entry = self._read_file().get(app_id)
+            if self._fresh(entry):
+                with self._lock:
+                    self._entries[app_id] = dict(entry)  # type: ignore[arg-type]
+                return str(entry["token"])  # type: ignore[index]
+        return None
+
+    def get_or_fetch(
+        self, app_id: str, fetch: TokenFetcher, force_refresh: bool = False
+    ) -> str:
+        """Return a fresh token for `app_id`, calling `fetch()` only when needed.
+
+        `fetch` returns `(token, expire_seconds)`. A token without a positive
+        `expire` is returned but not cached.
+        """
+        if not force_refresh:
+            token = self.get(app_id)
+            if token:
+                return token
+        with self._app_lock(app_id):
+            with self._file_lock():
+                if not force_refresh:
+                    # Another thread or process may have refreshed while we waited.
+                    entry = self._entries.get(app_id)
+                    if self.path is not None and not self._fresh(entry):
+                        entry = self._read_file().get(app_id)
+                    if self._fresh(entry):
+                        with self._lock:
+                            self._entries[app_id] = dict(entry)  # type: ignore[arg-type]
+                        return str(entry["token"])  # type: ignore[index]
+                requested_at = self._clock()
+                token, expire = fetch()
+                if float(expire or 0) > 0:
+                    self._store(app_id, {"token": token, "expires_at": requested_at + expire})
+                return token
+
+    def invalidate(self, app_id: str, token: str) -> None:
+        """Drop the entry for `app_id` if it still holds the rejected `token`.
+
+        A token another caller already replaced is kept, so a burst of
+        rejections triggers a single refetch.
+        """
+        with self._app_lock(app_id):
+            with self._file_lock():
+                with self._lock:
+                    if (self._entries.get(app_id) or {}).get("token") == token:
+                        del self._entries[app_id]
+                if self.path is None:
+                    return
+                entries = self._read_file()
+                if (entries.get(app_id) or {}).get("token") != token:
+                    return
+                del entries[app_id]
+                try:
+                    _write_json_atomic(self.path, entries)
+                except OSError as exc:
+                    LOGGER.warning("Failed to persist Feishu token cache %s: %s", self.path, exc)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, app_id: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[app_id] = entry
+        if self.path is None:
+            return
+        try:
+            entries = self._read_file()
+            entries[app_id] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            _write_json_atomic(self.path, entries)
+        except OSError as exc:
+            LOGGER.warning("Failed to persist Feishu token cache %s: %s", self.path, exc)
+
+    def _read_file(self) -> Dict[str, Dict[str, Any]]:
+        if self.path is None or not self.path.is_file():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            LOGGER.warning("Ignore unreadable Feishu token cache %s: %s", self.path, exc)
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {key: value for key, value in data.items() if isinstance(value, dict)}
+
+    def _app_lock(self, app_id: str) -> threading.Lock:
+        with self._lock:
+            return self._app_locks.setdefault(app_id, threading.Lock())
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if self.path is None or fcntl is None:
+            yield
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(f"{self.path}.lock", "a", encoding="utf-8") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+_SHARED_LOCK = threading.Lock()
+_SHARED_CACHE: TenantTokenCache | None = None
+
+
+def shared_token_cache() -> TenantTokenCache:
+    """Return the process-wide cache; file-backed when `FEISHU_TOKEN_CACHE_FILE` is set."""
+    global _SHARED_CACHE
+    with _SHARED_LOCK:
+        if _SHARED_CACHE is None:
+            path = os.getenv(TOKEN_CACHE_FILE_ENV, "").strip()
+            _SHARED_CACHE = TenantTokenCache(path=path or None)
+        return _SHARED_CACHE
+
+
+def reset_shared_token_cache(cache: TenantTokenCache | None = None) -> TenantTokenCache | None:
+    """Replace the process-wide cache (None re-reads the env on next use)."""
+    global _SHARED_CACHE
+    with _SHARED_LOCK:
+        _SHARED_CACHE = cache
+        return cache
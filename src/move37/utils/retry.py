@@ -0,0 +1,285 @@
+"""Shared retry policy: error classification, decorrelated jitter and a run-wide budget."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE = "retryable"
+NON_RETRYABLE = "non_retryable"
+RATE_LIMITED = "rate_limited"
+
+RETRYABLE_HTTP_STATUS = {408, 425, 500, 502, 503, 504}
+NON_RETRYABLE_HTTP_STATUS = {400, 401, 403, 404, 405, 409, 410, 413, 422}
+
+# SDK exception names that map to a non-retryable status without exposing it.
+_NON_RETRYABLE_ERROR_NAMES = {
+    "AuthenticationError",
+    "BadRequestError",
+    "InvalidArgument",
+    "NotFound",
+    "NotFoundError",
+    "PermissionDenied",
+    "PermissionDeniedError",
+    "Unauthenticated",
+    "UnprocessableEntityError",
+}
+_RATE_LIMIT_ERROR_NAMES = {"RateLimitError", "ResourceExhausted", "TooManyRequests"}
+# A standalone 429 in an error message ("Error code: 429", "HTTP 429."), not
+# part of a number, version, id or URL path ("14290 tokens", ".../429").
+_STATUS_429_PATTERN = re.compile(r"(?<![\w/.-])429(?![\w/-]|\.\w)")
+# Programming errors never succeed on a second try.
+_PROGRAMMING_ERRORS = (AttributeError, ImportError, NameError, NotImplementedError, TypeError)
+
+DEFAULT_RETRY_BUDGET = 200
+
+_BUDGET_LOCK = threading.Lock()
+
+
+def error_status(exc: BaseException | None) -> int | None:
+    """Return the HTTP status carried by an SDK/requests error, if any."""
+    if exc is None:
+        return None
+    for candidate in (
+        getattr(exc, "status_code", None),
+        getattr(exc, "code", None),
+        getattr(getattr(exc, "response", None), "status_code", None),
+    ):
+        if isinstance(candidate, int) and 100 <= candidate <= 599:
+            return candidate
+    return None
+
+
+def is_rate_limit_error(exc: BaseException | None) -> bool:
+    """Detect HTTP 429 / quota errors across provider SDKs."""
+    if exc is None:
+        return False
+    if error_status(exc) == 429:
+        return True
+    if type(exc).__name__ in _RATE_LIMIT_ERROR_NAMES:
+        return True
+    text = str(exc)
+    return (
+        _STATUS_429_PATTERN.search(text) is not None
+        or "RESOURCE_EXHAUSTED" in text
+        or "rate limit" in text.lower()
+    )
+
+
+def retry_after_seconds(exc: BaseException | None) -> float | None:
+    """Read a `Retry-After` hint (seconds or HTTP date) from an SDK error."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def classify_error(exc: BaseException | None) -> str:
+    """Return RATE_LIMITED, NON_RETRYABLE or RETRYABLE for an exception.
+
+    An explicit boolean `retryable` attribute on the exception wins. Unknown
+    errors (timeouts, connection resets, unparsable replies) are retryable.
+    """
+    if exc is None:
+        return RETRYABLE
+    if is_rate_limit_error(exc):
+        return RATE_LIMITED
+    explicit = getattr(exc, "retryable", None)
+    if isinstance(explicit, bool):
+        return RETRYABLE if explicit else NON_RETRYABLE
+    if isinstance(exc, _PROGRAMMING_ERRORS):
+        return NON_RETRYABLE
+    status = error_status(exc)
+    if status in NON_RETRYABLE_HTTP_STATUS:
+        return NON_RETRYABLE
+    if status in RETRYABLE_HTTP_STATUS:
+        return RETRYABLE
+    if type(exc).__name__ in _NON_RETRYABLE_ERROR_NAMES:
+        return NON_RETRYABLE
+    return RETRYABLE
+
+
+class RetryBudget:
+    """Cap on the number of retries spent across one pipeline run.
+
+    Once exhausted, failures are returned immediately instead of piling more
+    load onto a provider that is already failing.
+    """
+
+    def __init__(self, limit: int = DEFAULT_RETRY_BUDGET) -> None:
+        self.limit = max(0, int(limit))
+        self._lock = threading.Lock()
+        self._spent = 0
+        self._denied = 0
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._spent >= self.limit:
+                self._denied += 1
+                return False
+            self._spent += 1
+            return True
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {"limit": self.limit, "spent": self._spent, "denied": self._denied}
+
+
+_RETRY_BUDGET = RetryBudget()
+
+
+def retry_budget() -> RetryBudget:
+    """Return the run-wide budget shared by every `RetryPolicy` without its own."""
+    with _BUDGET_LOCK:
+        return _RETRY_BUDGET
+
+
+def reset_retry_budget(limit: int | None = None) -> RetryBudget:
+    """Start a fresh run-wide budget (call once at the start of each run)."""
+    global _RETRY_BUDGET
+    with _BUDGET_LOCK:
+        _RETRY_BUDGET = RetryBudget(DEFAULT_RETRY_BUDGET if limit is None else limit)
+        return _RETRY_BUDGET
+
+
+def retry_budget_state() -> Dict[str, int]:
+    return retry_budget().snapshot()
+
+
+class RetryPolicy:
+    """Decide whether and how long to wait before retrying a failed call.
+
+    Delays follow decorrelated jitter (`uniform(base, previous * 3)`, capped at
+    `max_delay`). Rate-limited errors wait at least their `Retry-After` hint,
+    up to `max_retry_after`. Every retry spends one unit of the run budget.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        max_retry_after: float = 120.0,
+        classify: Callable[[BaseException | None], str] = classify_error,
+        budget: RetryBudget | None = None,
+        rng: random.Random | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if max_attempts <= 0:
+            raise ValueError("`max_attempts` must be greater than 0.")
+        self.max_attempts = int(max_attempts)
+        self.base_delay = float(base_delay)
+        self.max_delay = float(max_delay)
+        self.max_retry_after = float(max_retry_after)
+        self.classify = classify
+        self.budget = budget
+        self._rng = rng or random.Random()
+        self._sleep = sleep
+
+    def backoff(self, previous: float | None = None) -> float:
+        """Next decorrelated-jitter delay given the previous one."""
+        upper = max(self.base_delay, (previous or self.base_delay) * 3)
+        return min(self.max_delay, self._rng.uniform(self.base_delay, upper))
+
+    def next_delay(
+        self,
+        error: BaseException | None,
+        attempt: int,
+        previous: float | None = None,
+        classify: Callable[[BaseException | None], str] | None = None,
+    ) -> float | None:
+        """Return the wait before retrying after `attempt` (0-based), or None to give up."""
+        category = (classify or self.classify)(error)
+        if category == NON_RETRYABLE or attempt + 1 >= self.max_attempts:
+            return None
+        if not (self.budget or retry_budget()).try_spend():
+            LOGGER.warning("Run-wide retry budget exhausted; not retrying: %s", error)
+            return None
+        delay = self.backoff(previous)
+        if category == RATE_LIMITED:
+            retry_after = retry_after_seconds(error)
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.max_retry_after))
+        return delay
+
+    def call(
+        self,
+        func: Callable[[], T],
+        label: str = "",
+        classify: Callable[[BaseException | None], str] | None = None,
+    ) -> T:
+        """Run `func` until it succeeds or the policy gives up; re-raises the last error."""
+        delay: float | None = None
+        for attempt in range(self.max_attempts):
+            try:
+                return func()
+            except Exception as exc:  # noqa: BLE001
+                delay = self.next_delay(exc, attempt, delay, classify)
+                if delay is None:
+                    raise
+                self._log_retry(label, attempt, delay, exc)
+                self._sleep(delay)
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    async def acall(
+        self,
+        func: Callable[[], Awaitable[T]],
+        label: str = "",
+        classify: Callable[[BaseException | None], str] | None = None,
+    ) -> T:
+        """Async counterpart of `call`; sleeps with `asyncio.sleep`."""
+        delay: float | None = None
+        for attempt in range(self.max_attempts):
+            try:
+                return await func()
+            except Exception as exc:  # noqa: BLE001
+                delay = self.next_delay(exc, attempt, delay, classify)
+                if delay is None:
+                    raise
+                self._log_retry(label, attempt, delay, exc)
+                await asyncio.sleep(delay)
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    def _log_retry(self, label: str, attempt: int, delay: float, exc: BaseException) -> None:
+        LOGGER.warning(
+            "%s failed (attempt %s/%s), retry in %.1fs: %s: %s",
+            label or "Call",
+            attempt + 1,
+            self.max_attempts,
+            delay,
+            type(exc).__name__,
+            exc,
+        )
+
+
+def rate_limited_only(exc: BaseException | None) -> str:
+    """Classifier for non-idempotent writes: only retry requests rejected by rate limiting."""
+    return RATE_LIMITED if is_rate_limit_error(exc) else NON_RETRYABLE
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import logging
-import time
 from datetime import datetime, timezone
 from typing import Dict, List
 
@@ -11,6 +10,8 @@ import feedparser
 import requests
 from dateutil import parser as date_parser
 
+from move37.utils.retry import RetryPolicy
+
 LOGGER = logging.getLogger(__name__)
 DEFAULT_HEADERS = {
     "User-Agent": (
@@ -21,7 +22,6 @@ DEFAULT_HEADERS = {
     "Accept": "application/atom+xml,application/xml,text/xml;q=0.9,*/*;q=0.8",
     "Accept-Language": "en-US,en;q=0.9",
 }
-RETRYABLE_HTTP_STATUS = {429, 500, 502, 503, 504}
 
 
 def _to_utc(dt: datetime) -> datetime:
@@ -55,6 +55,18 @@ def _parse_entry_datetime(entry: feedparser.FeedParserDict) -> datetime | None:
     return None
 
 
+def _extract_entry_content(entry: feedparser.FeedParserDict) -> str:
+    """Return the richest text body the feed provides for an entry."""
+    best = ""
+    for content in entry.get("content") or []:
+        value = str(content.get("value") or "").strip()
+        if len(value) > len(best):
+            best = value
+    if not best:
+        best = str(entry.get("summary") or "").strip()
+    return best
+
+
 def _build_headers(feed_url: str) -> Dict[str, str]:
     headers = dict(DEFAULT_HEADERS)
     if "youtube.com" in feed_url:
@@ -63,24 +75,17 @@ def _build_headers(feed_url: str) -> Dict[str, str]:
 
 
 def _fetch_feed_content(feed_url: str, retries: int, timeout: int) -> bytes:
-    last_error: Exception | None = None
-    for attempt in range(1, retries + 1):
-        try:
-            response = requests.get(feed_url, headers=_build_headers(feed_url), timeout=timeout)
-            if response.status_code in RETRYABLE_HTTP_STATUS:
-                raise requests.HTTPError(
-                    f"Retryable HTTP status {response.status_code}",
-                    response=response,
-                )
-            response.raise_for_status()
-            return response.content
-        except requests.RequestException as exc:
-            last_error = exc
-            if attempt < retries:
-                time.sleep(min(8, 0.5 * (2 ** (attempt - 1))))
-                continue
-            break
-    raise RuntimeError(f"Failed to fetch feed: {feed_url}. last_error={last_error}") from last_error
+    def _fetch() -> bytes:
+        response = requests.get(feed_url, headers=_build_headers(feed_url), timeout=timeout)
+        response.raise_for_status()
+        return response.content
+
+    # 404/410 and other client errors fail at once; 429 honours Retry-After.
+    policy = RetryPolicy(max_attempts=max(1, retries), base_delay=0.5, max_delay=8.0)
+    try:
+        return policy.call(_fetch, label=f"Feed fetch {feed_url}")
+    except requests.RequestException as exc:
+        raise RuntimeError(f"Failed to fetch feed: {feed_url}. last_error={exc}") from exc
 
 
 def collect_rss(
@@ -134,6 +139,7 @@ def collect_rss(
                 "title": entry.get("title", link),
                 "url": link,
                 "published": published_dt.isoformat().replace("+00:00", "Z"),
+                "content": _extract_entry_content(entry),
             }
         )
 
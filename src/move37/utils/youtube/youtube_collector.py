@@ -11,6 +11,7 @@ import requests
 
 from move37.utils.rss.rss_collector import DEFAULT_HEADERS
 from move37.utils.rss.rss_collector import collect_rss
+from move37.utils.retry import RetryPolicy
 
 LOGGER = logging.getLogger(__name__)
 CHANNEL_ID_RE = re.compile(r'"channelId":"(UC[a-zA-Z0-9_-]{22})"')
@@ -30,9 +31,15 @@ def _channel_url_to_feed_url(channel_url: str, timeout: int = 15) -> str:
         return f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
 
     # For handle/user style URLs, fetch page and extract channelId.
-    response = requests.get(channel_url, headers=DEFAULT_HEADERS, timeout=timeout)
-    response.raise_for_status()
-    match = CHANNEL_ID_RE.search(response.text)
+    def _fetch() -> str:
+        response = requests.get(channel_url, headers=DEFAULT_HEADERS, timeout=timeout)
+        response.raise_for_status()
+        return response.text
+
+    page = RetryPolicy(base_delay=0.5, max_delay=8.0).call(
+        _fetch, label=f"YouTube channel page {channel_url}"
+    )
+    match = CHANNEL_ID_RE.search(page)
     if not match:
         raise RuntimeError(f"Cannot resolve YouTube channel id from URL: {channel_url}")
     channel_id = match.group(1)
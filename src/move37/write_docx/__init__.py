@@ -1,5 +1,17 @@
 """Write summary results to Feishu wiki/docx."""
 
-from .writer import FeishuWikiWriter, write_to_feishu_docx
+from .writer import (
+    DocxWriteSession,
+    FeishuWikiWriter,
+    ImportWriteSession,
+    open_feishu_docx_session,
+    write_to_feishu_docx,
+)
 
-__all__ = ["FeishuWikiWriter", "write_to_feishu_docx"]
+__all__ = [
+    "DocxWriteSession",
+    "FeishuWikiWriter",
+    "ImportWriteSession",
+    "open_feishu_docx_session",
+    "write_to_feishu_docx",
+]
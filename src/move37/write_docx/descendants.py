@@ -0,0 +1,123 @@
+"""Nested block trees and size-aware request packing for the docx write APIs."""
+
+from __future__ import annotations
+
+import itertools
+import json
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Feishu "create descendant" accepts at most 1000 blocks per call; the body
+# cap is our own conservative bound, well under the gateway request limit.
+DESCENDANT_MAX_BLOCKS = 1000
+MAX_REQUEST_BYTES = 512 * 1024
+# `{"index": -1, "children_id": [], "descendants": []}` plus headroom.
+_REQUEST_OVERHEAD_BYTES = 64
+
+SourceTree = Tuple[Dict[str, Any], List[List[Dict[str, Any]]]]
+
+
+def payload_bytes(value: Any) -> int:
+    """UTF-8 size of `value` serialized the way the SDK sends request bodies."""
+    return len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+
+def temporary_ids(prefix: str = "tmp") -> Iterator[str]:
+    return (f"{prefix}_{index}" for index in itertools.count())
+
+
+def pack_children(
+    blocks: List[Dict[str, Any]],
+    max_blocks: int,
+    max_bytes: int = MAX_REQUEST_BYTES,
+) -> List[List[Dict[str, Any]]]:
+    """Split flat blocks into consecutive batches bounded by count and body size."""
+    batches: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    current_bytes = _REQUEST_OVERHEAD_BYTES
+    for block in blocks:
+        cost = payload_bytes(block) + 2
+        if current and (len(current) >= max_blocks or current_bytes + cost > max_bytes):
+            batches.append(current)
+            current, current_bytes = [], _REQUEST_OVERHEAD_BYTES
+        if current_bytes + cost > max_bytes:
+            raise ValueError(f"A single docx block is larger than {max_bytes} bytes.")
+        current.append(block)
+        current_bytes += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _new_request(parent: str | None) -> Dict[str, Any]:
+    return {
+        "parent": parent,
+        "children_id": [],
+        "descendants": [],
+        "blocks": 0,
+        "bytes": _REQUEST_OVERHEAD_BYTES,
+    }
+
+
+def _with_id(block: Dict[str, Any], block_id: str) -> Dict[str, Any]:
+    return {**block, "block_id": block_id, "children": []}
+
+
+def pack_descendant_requests(
+    trees: List[SourceTree],
+    ids: Iterator[str],
+    max_blocks: int = DESCENDANT_MAX_BLOCKS,
+    max_bytes: int = MAX_REQUEST_BYTES,
+) -> List[Dict[str, Any]]:
+    """Pack source trees (heading + item block groups) into descendant requests.
+
+    Whole sources share a request while they fit. A source too large for one
+    request is split between items: the first request creates the heading,
+    and follow-up requests have `parent` set to the heading's temporary id so
+    the sender can append the remaining items under its real block id. Each
+    request dict has `parent`, `children_id`, `descendants`, `blocks` and
+    `bytes`; `blocks`/`bytes` are the packing estimates.
+    """
+    requests: List[Dict[str, Any]] = []
+    current = _new_request(None)
+
+    def _fits(blocks: int, cost: int) -> bool:
+        return (
+            current["blocks"] + blocks <= max_blocks and current["bytes"] + cost <= max_bytes
+        )
+
+    def _flush(parent: str | None) -> None:
+        nonlocal current
+        if current["blocks"]:
+            requests.append(current)
+        current = _new_request(parent)
+
+    for heading, groups in trees:
+        heading_id = next(ids)
+        heading_entry = _with_id(heading, heading_id)
+        heading_cost = payload_bytes(heading_entry) + len(heading_id) + 6
+        if current["parent"] is not None or not _fits(1, heading_cost):
+            _flush(None)
+        if not _fits(1, heading_cost):
+            raise ValueError(f"A docx heading block is larger than {max_bytes} bytes.")
+        current["children_id"].append(heading_id)
+        current["descendants"].append(heading_entry)
+        current["blocks"] += 1
+        current["bytes"] += heading_cost
+        siblings: List[str] = heading_entry["children"]
+
+        for group in groups:
+            entries = [_with_id(block, next(ids)) for block in group]
+            cost = sum(payload_bytes(entry) + len(entry["block_id"]) + 6 for entry in entries)
+            if not _fits(len(entries), cost):
+                _flush(heading_id)
+                siblings = current["children_id"]
+                if not _fits(len(entries), cost):
+                    raise ValueError("A single docx item does not fit into one request.")
+            for entry in entries:
+                siblings.append(entry["block_id"])
+                current["descendants"].append(entry)
+            current["blocks"] += len(entries)
+            current["bytes"] += cost
+
+    _flush(None)
+    return requests
@@ -0,0 +1,56 @@
+"""Render docx blocks as Markdown for the Feishu import-task path."""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List
+
+# Docx block types the writer emits, mapped to a Markdown heading prefix.
+_HEADING_PREFIXES = {3: "# ", 4: "## "}
+_BLOCK_KEYS = {2: "text", 3: "heading1", 4: "heading2"}
+# Characters with Markdown meaning anywhere in a line (emphasis, code, links,
+# HTML, tables, entities, closing heading hashes).
+_INLINE_SPECIALS = re.compile(r"([\\`*_\[\]<>|~&#])")
+# Block markers that only count at the start of a line: ordered list items,
+# bullets and setext underlines.
+_LINE_START_MARKER = re.compile(r"^(\d+)([.)])|^([-+=])")
+
+
+def _block_text(block: Dict[str, Any]) -> str:
+    body = block.get(_BLOCK_KEYS.get(block.get("block_type"), ""), {})
+    elements = body.get("elements", []) if isinstance(body, dict) else []
+    return "".join(
+        str((element.get("text_run") or {}).get("content") or "")
+        for element in elements
+        if isinstance(element, dict)
+    )
+
+
+def _escape_line(line: str) -> str:
+    """Backslash-escape `line` so the importer shows it as literal text."""
+    escaped = _INLINE_SPECIALS.sub(r"\\\1", line.strip())
+    return _LINE_START_MARKER.sub(
+        lambda match: f"{match.group(1)}\\{match.group(2)}"
+        if match.group(1)
+        else f"\\{match.group(3)}",
+        escaped,
+    )
+
+
+def blocks_to_markdown(blocks: List[Dict[str, Any]]) -> str:
+    """Headings become `#`/`##` lines; text blocks become paragraphs.
+
+    Text is escaped, so LLM output such as `- `, `1. `, `**`, links or HTML
+    tags stays literal. Line breaks inside a text block are kept as Markdown
+    hard breaks, so the imported doc shows the same lines as the block-append
+    path; only leading indentation is dropped, as it would start a code block.
+    """
+    parts: List[str] = []
+    for block in blocks:
+        text = _block_text(block)
+        prefix = _HEADING_PREFIXES.get(block.get("block_type"))
+        if prefix is not None:
+            parts.append(prefix + _escape_line(" ".join(text.split())))
+        elif text.strip():
+            parts.append("  \n".join(_escape_line(line) for line in text.strip().split("\n")))
+    return "\n\n".join(parts) + "\n" if parts else ""
@@ -3,11 +3,32 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, List, Optional
-
-from move37.utils.feishu import FeishuClient
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from move37.utils.feishu import FeishuClient, get_feishu_client
+
+from .descendants import (
+    DESCENDANT_MAX_BLOCKS,
+    MAX_REQUEST_BYTES,
+    SourceTree,
+    pack_children,
+    pack_descendant_requests,
+    payload_bytes,
+    temporary_ids,
+)
+from .markdown import blocks_to_markdown
 
 MAX_CHILDREN_PER_REQUEST = 50
+# "children" appends flat blocks; "descendant" sends each source as a nested tree.
+BLOCK_APIS = ("children", "descendant")
+# "blocks" builds the doc through the block APIs; "import" uploads one Markdown file.
+WRITE_MODES = ("blocks", "import")
+DEFAULT_IMPORT_POLL_INTERVAL = 1.0
+DEFAULT_IMPORT_TIMEOUT = 120.0
+# Import task `job_status` values that mean "still converting".
+_IMPORT_RUNNING_STATUSES = {1, 2}
 
 
 def _validate_summary_result(summary_result: Dict[str, Any]) -> None:
@@ -64,141 +85,170 @@ def _resolve_wiki_url(
     return ""
 
 
-def _chunk_children(children: List[Dict[str, Any]], chunk_size: int) -> List[List[Dict[str, Any]]]:
-    if chunk_size <= 0:
-        raise ValueError("`chunk_size` must be greater than 0.")
-    if not children:
-        return []
-    return [children[i : i + chunk_size] for i in range(0, len(children), chunk_size)]
+def _build_source_tree(source: Dict[str, Any]) -> SourceTree | None:
+    """One source as (heading block, one block group per item)."""
+    if not isinstance(source, dict):
+        return None
 
+    source_title = str(source.get("source_title") or "Unknown").strip()
+    source_type = str(source.get("source_type") or "Unknown").strip()
+    source_heading = f"{source_title} ({source_type})"
 
-def _build_children_blocks(summary_result: Dict[str, Any]) -> List[Dict[str, Any]]:
-    children: List[Dict[str, Any]] = []
-    for source in summary_result.get("results", []):
-        if not isinstance(source, dict):
-            continue
+    heading = {
+        "block_type": 3,
+        "heading1": {"elements": [{"text_run": {"content": source_heading}}]},
+    }
+    groups: List[List[Dict[str, Any]]] = []
+
+    items = source.get("items", [])
+    if not isinstance(items, list):
+        return heading, groups
 
-        source_title = str(source.get("source_title") or "Unknown").strip()
-        source_type = str(source.get("source_type") or "Unknown").strip()
-        source_heading = f"{source_title} ({source_type})"
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        children: List[Dict[str, Any]] = []
+        groups.append(children)
+
+        title = str(item.get("title") or "未命名内容").strip()
+        url = str(item.get("url") or "").strip() or "N/A"
+        published = str(item.get("published") or "").strip() or "N/A"
+        model_used = str(item.get("model_used") or "").strip() or "N/A"
+        processing_time = str(item.get("processing_time") or "").strip() or "N/A"
+        tokens = str(item.get("tokens_consumed") or "0").strip()
+        brief = str(item.get("brief") or "").strip()
+        summary = str(item.get("summary") or "").strip()
+        success = bool(item.get("success"))
+        error = str(item.get("error") or "").strip()
 
         children.append(
             {
-                "block_type": 3,
-                "heading1": {"elements": [{"text_run": {"content": source_heading}}]},
+                "block_type": 4,
+                "heading2": {"elements": [{"text_run": {"content": title}}]},
             }
         )
-
-        items = source.get("items", [])
-        if not isinstance(items, list):
-            continue
-
-        for item in items:
-            if not isinstance(item, dict):
-                continue
-
-            title = str(item.get("title") or "未命名内容").strip()
-            url = str(item.get("url") or "").strip() or "N/A"
-            published = str(item.get("published") or "").strip() or "N/A"
-            model_used = str(item.get("model_used") or "").strip() or "N/A"
-            processing_time = str(item.get("processing_time") or "").strip() or "N/A"
-            tokens = str(item.get("tokens_consumed") or "0").strip()
-            brief = str(item.get("brief") or "").strip()
-            summary = str(item.get("summary") or "").strip()
-            success = bool(item.get("success"))
-            error = str(item.get("error") or "").strip()
-
+        children.append(
+            {
+                "block_type": 2,
+                "text": {
+                    "elements": [
+                        {
+                            "text_run": {
+                                "content": (
+                                    f"链接: {url}\n发布时间: {published}\n模型: {model_used}\n"
+                                    f"耗时: {processing_time}\nToken: {tokens}"
+                                )
+                            }
+                        }
+                    ]
+                },
+            }
+        )
+        if brief:
             children.append(
                 {
-                    "block_type": 4,
-                    "heading2": {"elements": [{"text_run": {"content": title}}]},
+                    "block_type": 2,
+                    "text": {"elements": [{"text_run": {"content": f"摘要: {brief}"}}]},
                 }
             )
+        if summary:
             children.append(
                 {
                     "block_type": 2,
-                    "text": {
-                        "elements": [
-                            {
-                                "text_run": {
-                                    "content": (
-                                        f"链接: {url}\n发布时间: {published}\n模型: {model_used}\n"
-                                        f"耗时: {processing_time}\nToken: {tokens}"
-                                    )
-                                }
-                            }
-                        ]
-                    },
+                    "text": {"elements": [{"text_run": {"content": summary}}]},
+                }
+            )
+        if (not success) and error:
+            children.append(
+                {
+                    "block_type": 2,
+                    "text": {"elements": [{"text_run": {"content": f"失败原因: {error}"}}]},
                 }
             )
-            if brief:
-                children.append(
-                    {
-                        "block_type": 2,
-                        "text": {"elements": [{"text_run": {"content": f"摘要: {brief}"}}]},
-                    }
-                )
-            if summary:
-                children.append(
-                    {
-                        "block_type": 2,
-                        "text": {"elements": [{"text_run": {"content": summary}}]},
-                    }
-                )
-            if (not success) and error:
-                children.append(
-                    {
-                        "block_type": 2,
-                        "text": {"elements": [{"text_run": {"content": f"失败原因: {error}"}}]},
-                    }
-                )
+    return heading, groups
+
+
+def _build_source_blocks(source: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Blocks for one source: its heading followed by every item."""
+    tree = _build_source_tree(source)
+    if tree is None:
+        return []
+    heading, groups = tree
+    return [heading] + [block for group in groups for block in group]
+
+
+def _build_children_blocks(summary_result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    children: List[Dict[str, Any]] = []
+    for source in summary_result.get("results", []):
+        children.extend(_build_source_blocks(source))
     return children
 
 
-class FeishuWikiWriter:
-    """Write summary_result into Feishu wiki/docx."""
+class DocxWriteSession:
+    """Incremental writer for one wiki doc, fed one source at a time.
 
-    def __init__(self, client: FeishuClient) -> None:
-        self.client = client
+    The doc is created when the session opens; `append_source` adds a source's
+    heading and items to the end of the doc, and `close` flushes the rest.
+    By default the request sequence and the returned dict are the same as
+    writing the finished `summary_result` in one go. With `flush_each_source`
+    (the streaming path), each append also sends everything pending, so a
+    source shows up in the doc as soon as it is summarized; the content is the
+    same, split into more requests. Appends are serialized; callers must
+    append sources in document order.
 
-    def write_summary_to_wiki(
+    With `block_api="children"`, flat blocks are sent in batches of up to
+    `MAX_CHILDREN_PER_REQUEST` blocks and `max_request_bytes`, each as soon as
+    it fills. With `block_api="descendant"`, each source is a heading with its
+    items nested under it, packed into as few create-descendant calls as the
+    per-request block and byte limits allow; with `flush_each_source`, each
+    source tree is sent on append and the limits only split oversized trees.
+    """
+
+    def __init__(
         self,
-        summary_result: Dict[str, Any],
+        client: FeishuClient,
+        title: str,
         space_id: str,
         parent_node_token: str,
-        title: Optional[str] = None,
         dry_run: bool = False,
         workspace_base_url: str = "",
-    ) -> Dict[str, Any]:
-        _validate_summary_result(summary_result)
-
-        resolved_space_id = str(space_id or "").strip()
-        resolved_parent_token = str(parent_node_token or "").strip()
-        if not resolved_space_id:
-            raise ValueError("`space_id` is required.")
-        if not resolved_parent_token:
-            raise ValueError("`parent_node_token` is required.")
-
-        doc_title = str(title or _build_doc_title(summary_result)).strip()
-        if not doc_title:
-            doc_title = "每日咨询摘要"
-
-        children = _build_children_blocks(summary_result)
+        block_api: str = "children",
+        max_request_bytes: int = MAX_REQUEST_BYTES,
+        flush_each_source: bool = False,
+    ) -> None:
+        if block_api not in BLOCK_APIS:
+            raise ValueError(f"`block_api` must be one of {', '.join(BLOCK_APIS)}.")
+        self.client = client
+        self.title = title
+        self.dry_run = dry_run
+        self.block_api = block_api
+        self.max_request_bytes = int(max_request_bytes)
+        self.flush_each_source = bool(flush_each_source)
+        self._lock = threading.Lock()
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_trees: List[SourceTree] = []
+        self._pending_tree_blocks = 0
+        self._pending_tree_bytes = 0
+        self._ids = temporary_ids()
+        self._block_ids: Dict[str, str] = {}
+        self._write_results: List[Dict[str, Any]] = []
+        self._children_count = 0
+        self._closed = False
+        self.created: Dict[str, Any] = {}
+        self.document_id = ""
+        self.node_token = ""
+        self.wiki_url = ""
         if dry_run:
-            return {
-                "success": True,
-                "dry_run": True,
-                "title": doc_title,
-                "children_count": len(children),
-            }
+            return
 
-        created = self.client.create_docx(
-            space_id=resolved_space_id,
-            parent_node_token=resolved_parent_token,
+        created = client.create_docx(
+            space_id=space_id,
+            parent_node_token=parent_node_token,
             node_name="origin",
-            title=doc_title,
+            title=title,
         )
-        node = created.get("node") if isinstance(created, dict) else None
+        created_fields = created if isinstance(created, dict) else {}
+        node = created_fields.get("node")
         node_token = ""
         if isinstance(node, dict):
             node_token = str(node.get("node_token") or "").strip()
@@ -206,54 +256,362 @@ class FeishuWikiWriter:
         if isinstance(node, dict):
             document_id = str(node.get("obj_token") or "").strip()
         if not document_id:
-            document_id = str(created.get("obj_token") or "").strip() if isinstance(created, dict) else ""
+            document_id = str(created_fields.get("obj_token") or "").strip()
         if not node_token:
-            node_token = str(created.get("node_token") or "").strip() if isinstance(created, dict) else ""
+            node_token = str(created_fields.get("node_token") or "").strip()
         if not document_id:
             raise RuntimeError("create_docx response missing obj_token(document_id).")
 
-        wiki_url = _resolve_wiki_url(
+        self.created = created
+        self.document_id = document_id
+        self.node_token = node_token
+        self.wiki_url = _resolve_wiki_url(
             created=created,
             node_token=node_token,
             document_id=document_id,
             workspace_base_url=workspace_base_url,
         )
 
+    def append_source(self, source: Dict[str, Any]) -> None:
+        """Queue one source's blocks and send every request that is now full.
+
+        With `flush_each_source`, the partial last request is sent as well.
+        """
+        tree = _build_source_tree(source)
+        if tree is None:
+            return
+        heading, groups = tree
+        blocks = [heading] + [block for group in groups for block in group]
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot append to a closed docx write session.")
+            self._children_count += len(blocks)
+            if self.block_api == "descendant":
+                self._pending_trees.append(tree)
+                self._pending_tree_blocks += len(blocks)
+                self._pending_tree_bytes += sum(payload_bytes(block) for block in blocks)
+                if (
+                    self.flush_each_source
+                    or self._pending_tree_blocks >= DESCENDANT_MAX_BLOCKS
+                    or self._pending_tree_bytes >= self.max_request_bytes
+                ):
+                    self._flush_trees()
+                return
+            self._pending.extend(blocks)
+            batches = pack_children(
+                self._pending, MAX_CHILDREN_PER_REQUEST, self.max_request_bytes
+            )
+            if (
+                not self.flush_each_source
+                and batches
+                and len(batches[-1]) < MAX_CHILDREN_PER_REQUEST
+            ):
+                self._pending = batches.pop()
+            else:
+                self._pending = []
+            for batch in batches:
+                self._write_batch(batch)
+
+    def close(self) -> Dict[str, Any]:
+        """Flush remaining blocks and return the same dict as `write_summary_to_wiki`."""
+        with self._lock:
+            if not self._closed and self._pending:
+                self._write_batch(self._pending)
+                self._pending = []
+            if not self._closed and self._pending_trees:
+                self._flush_trees()
+            self._closed = True
+        if self.dry_run:
+            return {
+                "success": True,
+                "dry_run": True,
+                "title": self.title,
+                "children_count": self._children_count,
+            }
+
+        write_result = self._write_results[-1] if self._write_results else {}
+        return {
+            "success": True,
+            "title": self.title,
+            "document_id": self.document_id,
+            "node_token": self.node_token,
+            "wiki_url": self.wiki_url,
+            "create_response": self.created,
+            "write_response": write_result,
+            "write_responses": list(self._write_results),
+            "write_batches": len(self._write_results),
+            "children_count": self._children_count,
+        }
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        if self.dry_run:
+            return
         # NOTE:
         # docx descendant API requires a docx block id.
         # `node_token` is a wiki node identifier and may fail validation here.
         # For a newly created doc, using document_id as root block_id is valid.
-        write_batches = _chunk_children(children, MAX_CHILDREN_PER_REQUEST)
-        write_results: List[Dict[str, Any]] = []
-        for batch in write_batches:
-            write_results.append(
-                self.client.write_docx_content(
-                    document_id=document_id,
-                    block_id=document_id,
-                    children=batch,
-                )
+        self._write_results.append(
+            self.client.write_docx_content(
+                document_id=self.document_id,
+                block_id=self.document_id,
+                children=list(batch),
             )
+        )
+
+    def _flush_trees(self) -> None:
+        requests = pack_descendant_requests(
+            self._pending_trees, self._ids, DESCENDANT_MAX_BLOCKS, self.max_request_bytes
+        )
+        self._pending_trees = []
+        self._pending_tree_blocks = 0
+        self._pending_tree_bytes = 0
+        if self.dry_run:
+            return
+        for request in requests:
+            parent = request["parent"]
+            block_id = self.document_id if parent is None else self._block_ids.get(parent)
+            if not block_id:
+                raise RuntimeError(f"create descendant response missing block id for {parent}.")
+            result = self.client.create_docx_descendants(
+                document_id=self.document_id,
+                block_id=block_id,
+                children_id=request["children_id"],
+                descendants=request["descendants"],
+            )
+            for relation in result.get("block_id_relations") or []:
+                if isinstance(relation, dict):
+                    self._block_ids[str(relation.get("temporary_block_id"))] = str(
+                        relation.get("block_id")
+                    )
+            self._write_results.append(result)
+
+
+class ImportWriteSession:
+    """Write the doc as one Markdown file through the Feishu import-task API.
+
+    Sources are rendered as they are appended; `close` uploads the file,
+    polls the import task until the doc exists, then moves it under the wiki
+    parent node. That is a fixed handful of calls however large the day is,
+    instead of one `create_docx` plus a block write per batch.
+    """
+
+    def __init__(
+        self,
+        client: FeishuClient,
+        title: str,
+        space_id: str,
+        parent_node_token: str,
+        dry_run: bool = False,
+        workspace_base_url: str = "",
+        folder_token: str = "",
+        poll_interval: float = DEFAULT_IMPORT_POLL_INTERVAL,
+        timeout: float = DEFAULT_IMPORT_TIMEOUT,
+        sleep: Any = time.sleep,
+    ) -> None:
+        self.client = client
+        self.title = title
+        self.space_id = space_id
+        self.parent_node_token = parent_node_token
+        self.dry_run = dry_run
+        self.workspace_base_url = workspace_base_url
+        self.folder_token = folder_token
+        self.poll_interval = float(poll_interval)
+        self.timeout = float(timeout)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._parts: List[str] = []
+        self._children_count = 0
+        self._closed = False
+
+    def append_source(self, source: Dict[str, Any]) -> None:
+        blocks = _build_source_blocks(source)
+        markdown = blocks_to_markdown(blocks)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot append to a closed docx write session.")
+            self._children_count += len(blocks)
+            self._parts.append(markdown)
+
+    def close(self) -> Dict[str, Any]:
+        """Upload, import and move the doc; returns the writer result dict."""
+        with self._lock:
+            self._closed = True
+            content = "\n".join(self._parts).encode("utf-8")
+        if self.dry_run:
+            return {
+                "success": True,
+                "dry_run": True,
+                "title": self.title,
+                "children_count": self._children_count,
+                "markdown_bytes": len(content),
+            }
+        if not content:
+            content = f"# {self.title}\n".encode("utf-8")
+
+        file_token = self.client.upload_import_file(f"{self.title}.md", content, "md")
+        ticket = self.client.create_import_task(
+            file_token, file_name=self.title, file_extension="md", mount_key=self.folder_token
+        )
+        import_result = self._poll(lambda: self._import_done(ticket), "import task")
+        document_id = str(import_result.get("token") or "").strip()
+
+        move_response = self.client.move_docs_to_wiki(
+            space_id=self.space_id,
+            obj_token=document_id,
+            parent_wiki_token=self.parent_node_token,
+        )
+        node_token = str(move_response.get("wiki_token") or "").strip()
+        task_id = str(move_response.get("task_id") or "").strip()
+        if not node_token and task_id:
+            node_token = self._poll(lambda: self._moved_node_token(task_id), "wiki move")
+        if not node_token:
+            raise RuntimeError("move_docs_to_wiki response missing wiki_token and task_id.")
 
-        write_result = write_results[-1] if write_results else {}
         return {
             "success": True,
-            "title": doc_title,
+            "write_mode": "import",
+            "title": self.title,
             "document_id": document_id,
             "node_token": node_token,
-            "wiki_url": wiki_url,
-            "create_response": created,
-            "write_response": write_result,
-            "write_responses": write_results,
-            "write_batches": len(write_batches),
-            "children_count": len(children),
+            "wiki_url": _resolve_wiki_url(
+                created={},
+                node_token=node_token,
+                document_id=document_id,
+                workspace_base_url=self.workspace_base_url,
+            ),
+            "import_ticket": ticket,
+            "import_result": import_result,
+            "move_response": move_response,
+            "write_batches": 0,
+            "children_count": self._children_count,
+            "markdown_bytes": len(content),
         }
 
+    def _import_done(self, ticket: str) -> Dict[str, Any] | None:
+        result = self.client.get_import_task(ticket)
+        status = result.get("job_status")
+        if status in _IMPORT_RUNNING_STATUSES:
+            return None
+        if status != 0 or not result.get("token"):
+            raise RuntimeError(
+                f"Feishu import task failed: job_status={status}, "
+                f"msg={result.get('job_error_msg') or 'unknown'}"
+            )
+        return result
+
+    def _moved_node_token(self, task_id: str) -> str | None:
+        task = self.client.get_wiki_move_task(task_id)
+        for moved in task.get("move_result") or []:
+            node = moved.get("node") if isinstance(moved, dict) else None
+            if isinstance(node, dict) and node.get("node_token"):
+                return str(node["node_token"])
+        return None
+
+    def _poll(self, check: Any, what: str) -> Any:
+        deadline = time.monotonic() + self.timeout
+        while True:
+            result = check()
+            if result:
+                return result
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"Feishu {what} did not finish within {self.timeout:.0f}s.")
+            self._sleep(self.poll_interval)
 
-def write_to_feishu_docx(
-    summary_result: Dict[str, Any],
-    config: Optional[Dict[str, Any]] = None,
-) -> Dict[str, Any]:
-    """Public API for all-in-one workflow step 4."""
+
+class FeishuWikiWriter:
+    """Write summary_result into Feishu wiki/docx."""
+
+    def __init__(self, client: FeishuClient) -> None:
+        self.client = client
+
+    def open_session(
+        self,
+        summary_header: Dict[str, Any],
+        space_id: str,
+        parent_node_token: str,
+        title: Optional[str] = None,
+        dry_run: bool = False,
+        workspace_base_url: str = "",
+        block_api: str = "children",
+        write_mode: str = "blocks",
+        import_options: Optional[Dict[str, Any]] = None,
+        flush_each_source: bool = False,
+    ) -> DocxWriteSession | ImportWriteSession:
+        """Create the doc now and return a session to append sources to.
+
+        `summary_header` only needs `target_date` (used for the default title),
+        so the doc can be created before anything is summarized. With
+        `write_mode="import"` the doc is created from Markdown on `close`
+        instead; `import_options` are passed to `ImportWriteSession`.
+        `flush_each_source` is passed to `DocxWriteSession`.
+        """
+        if write_mode not in WRITE_MODES:
+            raise ValueError(f"`write_mode` must be one of {', '.join(WRITE_MODES)}.")
+        resolved_space_id = str(space_id or "").strip()
+        resolved_parent_token = str(parent_node_token or "").strip()
+        if not resolved_space_id:
+            raise ValueError("`space_id` is required.")
+        if not resolved_parent_token:
+            raise ValueError("`parent_node_token` is required.")
+
+        doc_title = str(title or _build_doc_title(summary_header)).strip()
+        if not doc_title:
+            doc_title = "每日咨询摘要"
+
+        if write_mode == "import":
+            return ImportWriteSession(
+                client=self.client,
+                title=doc_title,
+                space_id=resolved_space_id,
+                parent_node_token=resolved_parent_token,
+                dry_run=dry_run,
+                workspace_base_url=workspace_base_url,
+                **dict(import_options or {}),
+            )
+        return DocxWriteSession(
+            client=self.client,
+            title=doc_title,
+            space_id=resolved_space_id,
+            parent_node_token=resolved_parent_token,
+            dry_run=dry_run,
+            workspace_base_url=workspace_base_url,
+            block_api=block_api,
+            flush_each_source=flush_each_source,
+        )
+
+    def write_summary_to_wiki(
+        self,
+        summary_result: Dict[str, Any],
+        space_id: str,
+        parent_node_token: str,
+        title: Optional[str] = None,
+        dry_run: bool = False,
+        workspace_base_url: str = "",
+        block_api: str = "children",
+        write_mode: str = "blocks",
+        import_options: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        _validate_summary_result(summary_result)
+        session = self.open_session(
+            summary_header=summary_result,
+            space_id=space_id,
+            parent_node_token=parent_node_token,
+            title=title,
+            dry_run=dry_run,
+            workspace_base_url=workspace_base_url,
+            block_api=block_api,
+            write_mode=write_mode,
+            import_options=import_options,
+        )
+        for source in summary_result.get("results", []):
+            session.append_source(source)
+        return session.close()
+
+
+def _writer_from_config(
+    config: Optional[Dict[str, Any]],
+) -> Tuple[FeishuWikiWriter, Dict[str, Any]]:
+    """Build a writer from overrides/env; returns it with the session kwargs."""
     overrides = dict(config or {})
     app_id = str(overrides.get("app_id") or os.getenv("FEISHU_APP_ID", "")).strip()
     app_secret = str(overrides.get("app_secret") or os.getenv("FEISHU_APP_SECRET", "")).strip()
@@ -268,6 +626,21 @@ def write_to_feishu_docx(
     workspace_base_url = str(
         overrides.get("workspace_base_url") or os.getenv("FEISHU_WORKSPACE_BASE_URL", "")
     ).strip()
+    block_api = str(
+        overrides.get("block_api") or os.getenv("FEISHU_DOCX_BLOCK_API", "") or "children"
+    ).strip().lower()
+    write_mode = str(
+        overrides.get("write_mode") or os.getenv("FEISHU_DOCX_WRITE_MODE", "") or "blocks"
+    ).strip().lower()
+    import_options = {
+        "folder_token": str(
+            overrides.get("import_folder_token") or os.getenv("FEISHU_IMPORT_FOLDER_TOKEN", "")
+        ).strip(),
+        "poll_interval": float(
+            overrides.get("import_poll_interval", DEFAULT_IMPORT_POLL_INTERVAL)
+        ),
+        "timeout": float(overrides.get("import_timeout", DEFAULT_IMPORT_TIMEOUT)),
+    }
 
     if not app_id:
         raise ValueError("Missing required config: FEISHU_APP_ID")
@@ -278,18 +651,42 @@ def write_to_feishu_docx(
     if not parent_node_token:
         raise ValueError("Missing required config: FEISHU_WIKI_PARENT_NODE_TOKEN")
 
-    client = FeishuClient(
+    client = get_feishu_client(
         app_id=app_id,
         app_secret=app_secret,
         timeout=timeout,
         base_url=base_url,
     )
-    writer = FeishuWikiWriter(client)
-    return writer.write_summary_to_wiki(
-        summary_result=summary_result,
-        space_id=space_id,
-        parent_node_token=parent_node_token,
-        title=str(title).strip() if title is not None else None,
-        dry_run=dry_run,
-        workspace_base_url=workspace_base_url,
-    )
+    return FeishuWikiWriter(client), {
+        "space_id": space_id,
+        "parent_node_token": parent_node_token,
+        "title": str(title).strip() if title is not None else None,
+        "dry_run": dry_run,
+        "workspace_base_url": workspace_base_url,
+        "block_api": block_api,
+        "write_mode": write_mode,
+        "import_options": import_options,
+    }
+
+
+def write_to_feishu_docx(
+    summary_result: Dict[str, Any],
+    config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Public API for all-in-one workflow step 4."""
+    writer, options = _writer_from_config(config)
+    return writer.write_summary_to_wiki(summary_result=summary_result, **options)
+
+
+def open_feishu_docx_session(
+    summary_header: Dict[str, Any],
+    config: Optional[Dict[str, Any]] = None,
+) -> DocxWriteSession | ImportWriteSession:
+    """Create the daily doc up front and return a session to append sources to.
+
+    Same config as `write_to_feishu_docx`; `session.close()` returns its result.
+    Each appended source is written right away rather than batched with the
+    next ones.
+    """
+    writer, options = _writer_from_config(config)
+    return writer.open_session(summary_header=summary_header, flush_each_source=True, **options)
@@ -15,7 +15,7 @@ SRC_ROOT = PROJECT_ROOT / "src"
 if str(SRC_ROOT) not in sys.path:
     sys.path.insert(0, str(SRC_ROOT))
 
-from move37.utils.feishu import FeishuClient
+from move37.utils.feishu import get_feishu_client
 
 
 def main() -> None:
@@ -40,7 +40,7 @@ def main() -> None:
     app_id = str(os.getenv("FEISHU_APP_ID", "")).strip()
     app_secret = str(os.getenv("FEISHU_APP_SECRET", "")).strip()
 
-    client = FeishuClient(app_id=app_id, app_secret=app_secret)
+    client = get_feishu_client(app_id=app_id, app_secret=app_secret)
     created = client.create_docx(
         space_id=args.space_id,
         node_name=args.node_name,
@@ -0,0 +1,212 @@
+"""Benchmark the Markdown import path against block appends on a Feishu stand-in.
+
+The stand-in answers the auth, wiki, docx block, drive upload/import and wiki
+move endpoints in memory and charges every call a simulated round trip (plus
+upload time per KB) on a virtual clock, so the run is instant and repeatable.
+Set `--rtt` / `--import-seconds` from measurements against the real tenant.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.utils.feishu import FeishuClient, TenantTokenCache  # noqa: E402
+from move37.write_docx.writer import FeishuWikiWriter  # noqa: E402
+
+
+class _VirtualClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FeishuStandIn:
+    """In-memory Feishu endpoints with simulated latency."""
+
+    def __init__(self, rtt: float, upload_seconds_per_kb: float, import_seconds: float) -> None:
+        self.clock = _VirtualClock()
+        self.rtt = rtt
+        self.upload_seconds_per_kb = upload_seconds_per_kb
+        self.import_seconds = import_seconds
+        self.calls = 0
+        self.bytes_sent = 0
+        self._import_ready_at = 0.0
+        self._next_id = 0
+
+    def _id(self, prefix: str) -> str:
+        self._next_id += 1
+        return f"{prefix}_{self._next_id}"
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        body = json.dumps(request.get("body") or {}, ensure_ascii=False).encode("utf-8")
+        upload = sum(len(content) for _, content in (request.get("files") or {}).values())
+        self.calls += 1
+        self.bytes_sent += len(body) + upload
+        self.clock.sleep(self.rtt + (len(body) + upload) / 1024 * self.upload_seconds_per_kb)
+
+        method, uri = request["http_method"], request["uri"]
+        if uri.endswith("/tenant_access_token/internal"):
+            return {"code": 0, "tenant_access_token": "t-standin", "expire": 7200}
+        if uri.endswith("/nodes") and method == "POST":
+            node = {"node_token": self._id("wik"), "obj_token": self._id("doc")}
+            return {"code": 0, "data": {"node": node}}
+        if uri.endswith("/children"):
+            return {"code": 0, "data": {"children": []}}
+        if uri.endswith("/descendant"):
+            relations = [
+                {"temporary_block_id": entry["block_id"], "block_id": self._id("blk")}
+                for entry in request["body"]["descendants"]
+            ]
+            return {"code": 0, "data": {"block_id_relations": relations}}
+        if uri.endswith("/medias/upload_all"):
+            return {"code": 0, "data": {"file_token": self._id("box")}}
+        if uri.endswith("/import_tasks") and method == "POST":
+            self._import_ready_at = self.clock.now + self.import_seconds
+            return {"code": 0, "data": {"ticket": self._id("ticket")}}
+        if "/import_tasks/" in uri:
+            if self.clock.now < self._import_ready_at:
+                return {"code": 0, "data": {"result": {"job_status": 2}}}
+            return {"code": 0, "data": {"result": {"job_status": 0, "token": self._id("doc")}}}
+        if uri.endswith("/move_docs_to_wiki"):
+            return {"code": 0, "data": {"wiki_token": self._id("wik")}}
+        return {"code": 404, "msg": f"no stand-in route for {method} {uri}"}
+
+    def install(self) -> None:
+        """Register a fake `lark_oapi` module that sends every request to `handle`."""
+        standin = self
+
+        class _Builder:
+            def __init__(self) -> None:
+                self.request: Dict[str, Any] = {}
+
+            def __getattr__(self, name: str) -> Any:
+                def _set(value: Any) -> "_Builder":
+                    self.request[name] = value
+                    return self
+
+                return _set
+
+            def build(self) -> Any:
+                return dict(self.request)
+
+        class _Client:
+            def request(self, request: Dict[str, Any]) -> Any:
+                payload = standin.handle(request)
+                raw = SimpleNamespace(
+                    content=json.dumps(payload).encode("utf-8"), status_code=200
+                )
+                return SimpleNamespace(
+                    raw=raw, code=payload.get("code"), msg=payload.get("msg"), success=lambda: True
+                )
+
+        class _ClientBuilder(_Builder):
+            def build(self) -> Any:
+                return _Client()
+
+        sys.modules["lark_oapi"] = SimpleNamespace(
+            Client=SimpleNamespace(builder=_ClientBuilder),
+            BaseRequest=SimpleNamespace(builder=_Builder),
+            HttpMethod=SimpleNamespace(POST="POST", GET="GET", PATCH="PATCH"),
+            LogLevel=SimpleNamespace(WARNING="WARNING"),
+        )
+
+
+def _daily_summary(sources: int, items: int, summary_chars: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    words = ["模型", "推理", "agent", "训练", "数据", "GPU", "开源", "评测", "上下文", "部署"]
+
+    def _text(chars: int) -> str:
+        text = ""
+        while len(text) < chars:
+            text += rng.choice(words) + " "
+        return text[:chars]
+
+    return {
+        "target_date": "2026-01-01",
+        "results": [
+            {
+                "source_title": f"Source {source}",
+                "source_type": "Blogs",
+                "items": [
+                    {
+                        "title": _text(40),
+                        "url": f"https://example.com/{source}/{item}",
+                        "published": "2026-01-01T08:00:00Z",
+                        "model_used": "gpt-4o-mini",
+                        "processing_time": "12.3s",
+                        "tokens_consumed": 2400,
+                        "brief": _text(80),
+                        "summary": _text(summary_chars),
+                        "success": True,
+                    }
+                    for item in range(items)
+                ],
+            }
+            for source in range(sources)
+        ],
+    }
+
+
+def _run(mode: str, summary_result: Dict[str, Any], args: argparse.Namespace) -> Dict[str, Any]:
+    standin = FeishuStandIn(args.rtt, args.upload_seconds_per_kb, args.import_seconds)
+    standin.install()
+    # A private token cache so every mode pays for its own auth request.
+    client = FeishuClient(
+        app_id="cli_bench", app_secret="secret_bench", token_cache=TenantTokenCache()
+    )
+    options: Dict[str, Any] = {"space_id": "space", "parent_node_token": "parent"}
+    if mode == "import":
+        options.update(
+            write_mode="import",
+            import_options={"poll_interval": args.poll_interval, "sleep": standin.clock.sleep},
+        )
+    else:
+        options["block_api"] = mode
+    result = FeishuWikiWriter(client).write_summary_to_wiki(summary_result, **options)
+    return {
+        "mode": mode,
+        "requests": standin.calls,
+        "simulated_seconds": round(standin.clock.now, 2),
+        "kb_sent": round(standin.bytes_sent / 1024, 1),
+        "children_count": result["children_count"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import path vs block-append benchmark.")
+    parser.add_argument("--sources", type=int, default=25, help="Sources in the daily doc.")
+    parser.add_argument("--items", type=int, default=4, help="Items per source.")
+    parser.add_argument("--summary-chars", type=int, default=1200, help="Summary length.")
+    parser.add_argument("--rtt", type=float, default=0.25, help="Seconds per API round trip.")
+    parser.add_argument(
+        "--upload-seconds-per-kb", type=float, default=0.002, help="Transfer cost per KB."
+    )
+    parser.add_argument(
+        "--import-seconds", type=float, default=3.0, help="Server-side import conversion time."
+    )
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Import poll interval.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    summary_result = _daily_summary(args.sources, args.items, args.summary_chars, args.seed)
+    rows: List[Dict[str, Any]] = [
+        _run(mode, summary_result, args) for mode in ("children", "descendant", "import")
+    ]
+    print(json.dumps(rows, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
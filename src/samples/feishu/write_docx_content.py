@@ -15,7 +15,7 @@ SRC_ROOT = PROJECT_ROOT / "src"
 if str(SRC_ROOT) not in sys.path:
     sys.path.insert(0, str(SRC_ROOT))
 
-from move37.utils.feishu import FeishuClient
+from move37.utils.feishu import get_feishu_client
 
 
 def build_simple_children(content: str) -> list[dict]:
@@ -81,7 +81,7 @@ def main() -> None:
     app_id = str(os.getenv("FEISHU_APP_ID", "")).strip()
     app_secret = str(os.getenv("FEISHU_APP_SECRET", "")).strip()
 
-    client = FeishuClient(app_id=app_id, app_secret=app_secret)
+    client = get_feishu_client(app_id=app_id, app_secret=app_secret)
     children_payload = build_simple_children(args.content)
     result = client.write_docx_content(
         document_id=args.document_id,
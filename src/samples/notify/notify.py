@@ -135,7 +135,7 @@ def main() -> None:
         }
         mock_config.update(override_config)
         with patch(
-            "move37.notify.notifier.FeishuClient.send_group_notify",
+            "move37.utils.feishu.FeishuClient.send_group_notify",
             side_effect=_mock_send_group_notify,
         ):
             result = notify_feishu(sample_payload, config=mock_config)
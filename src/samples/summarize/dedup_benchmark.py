@@ -0,0 +1,89 @@
+"""Benchmark near-duplicate detection on synthetic articles."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize.dedup import find_duplicate_clusters  # noqa: E402
+
+
+def _build_corpus(
+    items: int,
+    duplicate_ratio: float,
+    chars: int,
+    seed: int,
+) -> Tuple[List[str], int]:
+    """Return (texts, planted duplicate count); duplicates are lightly edited copies."""
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = ["".join(rng.choices(letters, k=rng.randint(3, 9))) for _ in range(20000)]
+    originals = int(items * (1 - duplicate_ratio))
+    texts: List[str] = []
+    for _ in range(originals):
+        words: List[str] = []
+        length = 0
+        while length < chars:
+            words.append(rng.choice(vocabulary))
+            length += len(words[-1]) + 1
+        texts.append(" ".join(words))
+    for _ in range(items - originals):
+        words = rng.choice(texts[:originals]).split()
+        for _ in range(3):
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+        texts.append(" ".join(words) + " (reposted)")
+    rng.shuffle(texts)
+    return texts, items - originals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MinHash/LSH near-duplicate detection.")
+    parser.add_argument("--items", type=int, default=5000, help="Number of articles.")
+    parser.add_argument(
+        "--duplicate-ratio",
+        type=float,
+        default=0.1,
+        help="Share of articles that are edited copies of another one.",
+    )
+    parser.add_argument("--chars", type=int, default=2000, help="Characters per article.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs; the best is reported.")
+    parser.add_argument("--seed", type=int, default=37)
+    args = parser.parse_args()
+
+    texts, planted = _build_corpus(args.items, args.duplicate_ratio, args.chars, args.seed)
+    timings: List[float] = []
+    clusters: List[List[int]] = []
+    for _ in range(max(1, args.repeat)):
+        started_at = time.perf_counter()
+        clusters = find_duplicate_clusters(texts)
+        timings.append(time.perf_counter() - started_at)
+
+    best = min(timings)
+    print(
+        json.dumps(
+            {
+                "items": len(texts),
+                "chars_per_item": args.chars,
+                "planted_duplicates": planted,
+                "detected_duplicates": sum(len(cluster) - 1 for cluster in clusters),
+                "clusters": len(clusters),
+                "best_seconds": round(best, 3),
+                "items_per_second": round(len(texts) / best),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
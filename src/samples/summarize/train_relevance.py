@@ -0,0 +1,86 @@
+"""Train the local relevance filter from past summarize runs."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize.relevance import (  # noqa: E402
+    DEFAULT_RELEVANCE_CONFIG,
+    RelevanceModel,
+    load_history,
+    training_examples,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train the TF-IDF relevance filter.")
+    parser.add_argument(
+        "--history",
+        type=str,
+        default=DEFAULT_RELEVANCE_CONFIG["history_path"],
+        help="JSONL history appended by summarize_all (ignored when missing).",
+    )
+    parser.add_argument(
+        "--summary-result",
+        type=str,
+        nargs="*",
+        default=[],
+        help="Extra summary_result JSON files to learn from.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=DEFAULT_RELEVANCE_CONFIG["model_path"],
+        help="Where to write the trained model (.npz).",
+    )
+    parser.add_argument("--min-df", type=int, default=2, help="Minimum document frequency.")
+    args = parser.parse_args()
+
+    texts: List[str] = []
+    labels: List[int] = []
+    if Path(args.history).exists():
+        texts, labels = load_history(args.history)
+    summary_results = [
+        json.loads(Path(path).read_text(encoding="utf-8")) for path in args.summary_result
+    ]
+    extra_texts, extra_labels = training_examples(summary_results)
+    texts += extra_texts
+    labels += extra_labels
+
+    started_at = time.perf_counter()
+    model = RelevanceModel.fit(texts, labels, min_df=args.min_df)
+    train_seconds = time.perf_counter() - started_at
+    model.save(args.output)
+
+    started_at = time.perf_counter()
+    probabilities = model.predict_proba(texts)
+    score_seconds = time.perf_counter() - started_at
+    accuracy = float(((probabilities >= 0.5).astype(int) == labels).mean())
+    print(
+        json.dumps(
+            {
+                "examples": len(texts),
+                "relevant": int(sum(labels)),
+                "features_used": int((model.idf > 0).sum()),
+                "train_accuracy": round(accuracy, 4),
+                "train_seconds": round(train_seconds, 3),
+                "score_ms": round(score_seconds * 1000, 2),
+                "output": args.output,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Tests for move37.notify statistics and message building."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.notify.message_builder import build_message
+from move37.notify.statistics import calculate_statistics
+
+
+def test_message_reports_input_billed_at_cached_rates() -> None:
+    summary_result = {
+        "results": [
+            {
+                "source_title": "Blog",
+                "items": [
+                    {
+                        "title": "Post",
+                        "url": "https://blog.example.com/1",
+                        "success": True,
+                        "processing_time": "1.0s",
+                        "tokens_consumed": 1300,
+                        "token_usage": {"prompt_tokens": 1200, "cached_tokens": 900},
+                    },
+                    {
+                        "title": "Cached",
+                        "url": "https://blog.example.com/2",
+                        "success": True,
+                        "tokens_consumed": 0,
+                        "token_usage": {"prompt_tokens": 800, "cached_tokens": 100},
+                    },
+                ],
+            }
+        ]
+    }
+
+    statistics = calculate_statistics(summary_result)
+    message = build_message(summary_result, statistics)
+
+    assert (statistics["prompt_tokens"], statistics["cached_tokens"]) == (2000, 1000)
+    assert "输入Token：2000个，其中按缓存价计费1000个（50.0%）" in message
@@ -0,0 +1,186 @@
+"""Tests for move37.summarize.batch."""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize.batch import BatchSummarizer
+from move37.summarize.llm_client import LLMClient
+
+
+class _BatchBackend:
+    """Stand-in for a provider's Files + Batches endpoints."""
+
+    def __init__(self, polls_until_done: int = 1, failing_ids: tuple = ("1",)) -> None:
+        self.polls_until_done = polls_until_done
+        self.failing_ids = failing_ids
+        self.requests: List[Dict[str, Any]] = []
+        self.polls = 0
+        self.cancelled = False
+
+    def upload(self, raw: bytes) -> Dict[str, Any]:
+        for line in raw.decode("utf-8", errors="ignore").splitlines():
+            if line.startswith('{"custom_id"'):
+                self.requests.append(json.loads(line))
+        return {
+            "id": "file-in",
+            "object": "file",
+            "bytes": len(raw),
+            "created_at": 0,
+            "filename": "input.jsonl",
+            "purpose": "batch",
+            "status": "processed",
+        }
+
+    def batch(self) -> Dict[str, Any]:
+        done = self.polls >= self.polls_until_done
+        status = "cancelled" if self.cancelled else ("completed" if done else "in_progress")
+        return {
+            "id": "batch-1",
+            "object": "batch",
+            "endpoint": "/v1/chat/completions",
+            "input_file_id": "file-in",
+            "completion_window": "24h",
+            "created_at": 0,
+            "status": status,
+            "output_file_id": "file-out" if done else None,
+        }
+
+    def retrieve(self) -> Dict[str, Any]:
+        self.polls += 1
+        return self.batch()
+
+    def cancel(self) -> Dict[str, Any]:
+        self.cancelled = True
+        return self.batch()
+
+    def output(self) -> str:
+        lines = []
+        for request in self.requests:
+            custom_id = request["custom_id"]
+            if custom_id in self.failing_ids:
+                error = {"code": "server_error", "message": "boom"}
+                lines.append({"custom_id": custom_id, "response": None, "error": error})
+                continue
+            content = json.dumps({"brief": f"brief {custom_id}", "summary": "summary"})
+            body = {
+                "choices": [{"message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": 20, "completion_tokens": 10, "total_tokens": 30},
+            }
+            response = {"status_code": 200, "body": body}
+            lines.append({"custom_id": custom_id, "response": response, "error": None})
+        return "\n".join(json.dumps(line) for line in lines)
+
+
+class _FakeApi:
+    def __init__(self, backend: _BatchBackend) -> None:
+        self.files = SimpleNamespace(
+            create=lambda file, purpose: SimpleNamespace(**backend.upload(file[1])),
+            content=lambda file_id: SimpleNamespace(text=backend.output()),
+        )
+        self.batches = SimpleNamespace(
+            create=lambda **_: SimpleNamespace(**backend.batch()),
+            retrieve=lambda batch_id: SimpleNamespace(**backend.retrieve()),
+            cancel=lambda batch_id: SimpleNamespace(**backend.cancel()),
+        )
+
+
+def _requests() -> list:
+    return [(str(i), f"https://example.com/{i}", "Summarize {url}", None) for i in range(3)]
+
+
+def _client(base_url: str | None = None) -> LLMClient:
+    return LLMClient(provider="openai", api_key="sk-test", model="gpt-test", base_url=base_url)
+
+
+def test_batch_results_map_back_and_failures_become_stragglers(monkeypatch) -> None:
+    backend = _BatchBackend(polls_until_done=2)
+    summarizer = BatchSummarizer(_client(), poll_interval=1, sleep=lambda _: None)
+    monkeypatch.setattr(summarizer, "_openai", lambda: _FakeApi(backend))
+
+    results, stragglers = summarizer.run(_requests())
+
+    assert sorted(results) == ["0", "2"]
+    assert results["2"]["brief"] == "brief 2"
+    assert results["2"]["tokens_consumed"] == 30
+    assert stragglers == ["1"]
+    assert backend.requests[0]["body"]["messages"][1]["content"] == "Summarize https://example.com/0"
+
+
+def test_unfinished_batch_is_cancelled_at_deadline(monkeypatch) -> None:
+    now = [0.0]
+    backend = _BatchBackend(polls_until_done=100)
+    summarizer = BatchSummarizer(
+        _client(),
+        poll_interval=10,
+        deadline=60,
+        sync_reserve=30,
+        clock=lambda: now[0],
+        sleep=lambda seconds: now.__setitem__(0, now[0] + seconds),
+    )
+    monkeypatch.setattr(summarizer, "_openai", lambda: _FakeApi(backend))
+
+    results, stragglers = summarizer.run(_requests())
+
+    assert results == {}
+    assert sorted(stragglers) == ["0", "1", "2"]
+    assert backend.cancelled is True
+    assert backend.polls == 3
+
+
+def test_batch_against_local_stand_in_server() -> None:
+    pytest.importorskip("openai")
+    backend = _BatchBackend(polls_until_done=1)
+
+    class _Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args: Any) -> None:
+            return
+
+        def _reply(self, payload: Any, raw: bool = False) -> None:
+            body = payload.encode("utf-8") if raw else json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self) -> None:  # noqa: N802
+            raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if self.path.endswith("/files"):
+                self._reply(backend.upload(raw))
+            elif self.path.endswith("/cancel"):
+                self._reply(backend.cancel())
+            else:
+                self._reply(backend.batch())
+
+        def do_GET(self) -> None:  # noqa: N802
+            if self.path.endswith("/content"):
+                self._reply(backend.output(), raw=True)
+            else:
+                self._reply(backend.retrieve())
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+        summarizer = BatchSummarizer(_client(base_url), poll_interval=0.01)
+        results, stragglers = summarizer.run(_requests())
+    finally:
+        server.shutdown()
+
+    assert sorted(results) == ["0", "2"]
+    assert stragglers == ["1"]
@@ -0,0 +1,66 @@
+"""Tests for move37.summarize.cache."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize.cache import SummaryCache, build_cache_key, canonicalize_url, main
+
+
+def _result(brief: str) -> dict:
+    return {"brief": brief, "summary": "s", "model_used": "gpt-test", "success": True}
+
+
+def _key(
+    url: str = "https://example.com/a",
+    content: str = "body",
+    model: str = "gpt-test",
+    prompt: str = "P {url}",
+) -> tuple:
+    return build_cache_key(url, content, "openai", model, prompt)
+
+
+def test_canonicalize_url_drops_tracking_and_fragment() -> None:
+    assert canonicalize_url("HTTPS://Example.com/post/?utm_source=x&b=2&a=1#top") == (
+        "https://example.com/post?a=1&b=2"
+    )
+
+
+def test_cache_misses_when_content_model_or_prompt_changes(tmp_path: Path) -> None:
+    cache = SummaryCache(tmp_path / "cache.sqlite3")
+    cache.put(_key(), _result("hello"))
+    cache.put(_key(url="https://example.com/b"), {"brief": "failed", "success": False})
+
+    assert cache.get(_key())["brief"] == "hello"
+    assert cache.get(_key(url="https://example.com/a/?utm_medium=rss"))["brief"] == "hello"
+    assert cache.get(_key(content="new")) is None
+    assert cache.get(_key(model="gpt-other")) is None
+    assert cache.get(_key(prompt="Q {url}")) is None
+    options_key = build_cache_key(
+        "https://example.com/a", "body", "openai", "gpt-test", "P {url}", {"max_tokens": 10}
+    )
+    assert cache.get(options_key) is None
+    assert cache.get(_key(url="https://example.com/b")) is None
+    assert cache.stats()["entries"] == 1
+    cache.close()
+
+
+def test_cli_evicts_by_url(tmp_path: Path, capsys) -> None:
+    path = tmp_path / "cache.sqlite3"
+    cache = SummaryCache(path)
+    cache.put(build_cache_key("https://example.com/a", "", "openai", "m", "P"), _result("a"))
+    cache.put(build_cache_key("https://example.com/b", "", "openai", "m", "P"), _result("b"))
+    cache.close()
+
+    assert main(["--path", str(path), "evict", "--url", "https://example.com/a#x"]) == 0
+    assert '"evicted": 1' in capsys.readouterr().out
+
+    cache = SummaryCache(path)
+    assert [entry["url"] for entry in cache.entries()] == ["https://example.com/b"]
+    cache.close()
@@ -0,0 +1,78 @@
+"""Tests for move37.summarize.compaction."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize.compaction import compact_content
+
+HTML_ARTICLE = """
+<html>
+<nav><a href="/">Home</a> <a href="/about">About</a></nav>
+<article>
+  <h1>Release notes</h1>
+  <p>We shipped a faster inference engine &amp; a new API.</p>
+  <p>We shipped a faster inference engine &amp; a new API.</p>
+  <pre><code>pip install engine
+engine serve
+</code></pre>
+  <ul>
+    <li><a href="/1">Related post one</a></li>
+    <li><a href="/2">Related post two</a></li>
+    <li><a href="/3">Related post three</a></li>
+  </ul>
+  <h2>Benchmarks</h2>
+  <p>Throughput doubled on our reference workload.</p>
+</article>
+<script>trackPageView();</script>
+</html>
+"""
+
+
+def test_compact_content_strips_markup_navigation_and_duplicates() -> None:
+    result = compact_content(HTML_ARTICLE, "openai", "gpt-4o")
+
+    content = result["content"]
+    assert content.startswith("# Release notes")
+    assert content.count("faster inference engine & a new API.") == 1
+    assert "Home" not in content
+    assert "Related post" not in content
+    assert "trackPageView" not in content
+    assert "```\npip install engine\nengine serve\n```" in content
+    assert "## Benchmarks" in content
+    assert result["tokens_saved"] == result["original_tokens"] - result["compacted_tokens"]
+    assert result["tokens_saved"] > 0
+
+
+def test_compact_content_can_elide_code_blocks() -> None:
+    result = compact_content(HTML_ARTICLE, "openai", "gpt-4o", {"elide_code_blocks": True})
+
+    assert "pip install" not in result["content"]
+    assert "[代码块已省略，共2行]" in result["content"]
+
+
+def test_compact_content_hard_cap_keeps_lead_and_section_heads() -> None:
+    body = "\n\n".join(f"Paragraph {index} " + "word " * 60 for index in range(20))
+    text = f"# Title\n\n{body}\n\n## Section A\n\nSection A text.\n\n## Section B\n\nTail."
+
+    result = compact_content(text, "openai", "gpt-4o", {"max_tokens": 200})
+
+    content = result["content"]
+    assert content.startswith("# Title\n\nParagraph 0")
+    assert "Paragraph 19" not in content
+    assert "## Section A\n\nSection A text." in content
+    assert "## Section B" in content
+    assert "……" in content
+    assert result["compacted_tokens"] <= 210
+
+
+def test_compact_content_disabled_returns_original() -> None:
+    result = compact_content("<p>raw</p>", "openai", "gpt-4o", {"enabled": False})
+    assert result["content"] == "<p>raw</p>"
+    assert result["tokens_saved"] == 0
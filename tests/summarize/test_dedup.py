@@ -0,0 +1,111 @@
+"""Tests for move37.summarize.dedup."""
+
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+pytest.importorskip("numpy")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize import summarizer
+from move37.summarize.dedup import find_duplicate_clusters
+
+
+def _article(rng: random.Random, words: int = 300) -> str:
+    vocabulary = [f"w{index}" for index in range(3000)]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def test_near_duplicates_cluster_and_distinct_texts_do_not() -> None:
+    rng = random.Random(7)
+    base = _article(rng)
+    edited = base.replace(base.split()[10], "changed", 1) + " Reposted from the vendor blog."
+    half_shared = " ".join(base.split()[:150]) + " " + _article(rng, 150)
+
+    clusters = find_duplicate_clusters([base, _article(rng), edited, half_shared, ""])
+
+    assert clusters == [[0, 2]]
+
+
+class _CountingClient:
+    provider = "openai"
+    model = "gpt-test"
+
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def generate_summary(self, url: str, **_: Any) -> Dict[str, Any]:
+        self.calls.append(url)
+        return {"brief": f"brief {url}", "summary": "s", "tokens_consumed": 10, "success": True}
+
+
+def test_summarize_all_summarizes_one_item_per_cluster(monkeypatch: pytest.MonkeyPatch) -> None:
+    rng = random.Random(11)
+    story = _article(rng)
+    client = _CountingClient()
+    monkeypatch.setattr(summarizer, "_create_llm_client", lambda _config: client)
+    monkeypatch.setattr(
+        summarizer,
+        "load_config",
+        lambda config=None: {
+            "provider": "openai",
+            "model": "gpt-test",
+            "prompt_template": "Summarize {url}",
+            "concurrency": 1,
+            "gemini_concurrency": 1,
+            "dedup": {"enabled": True, "threshold": 0.8},
+        },
+    )
+    collection = {
+        "results": [
+            {
+                "source_title": "Blogs",
+                "success": True,
+                "items": [
+                    {"title": "A", "url": "https://a.example.com/1", "content": story},
+                    {"title": "B", "url": "https://b.example.com/1", "content": story + " (via A)"},
+                    {"title": "C", "url": "https://c.example.com/1", "content": _article(rng)},
+                ],
+            }
+        ]
+    }
+
+    result = summarizer.summarize_all(collection)
+
+    items = result["results"][0]["items"]
+    assert client.calls == ["https://b.example.com/1", "https://c.example.com/1"]
+    assert items[0]["duplicate_of"] == "https://b.example.com/1"
+    assert items[0]["brief"] == "brief https://b.example.com/1" and items[0]["tokens_consumed"] == 0
+    assert items[1]["duplicates"] == ["https://a.example.com/1"]
+    assert result["dedup"]["items_skipped"] == 1
+
+
+def test_shared_feed_markup_does_not_make_unrelated_posts_duplicates() -> None:
+    rng = random.Random(5)
+    widget = (
+        '<div class="subscribe"><form><input type="email"/>'
+        + "".join(f'<a href="https://example.com/tag/{n}">tag {n}</a> ' for n in range(60))
+        + "</form><p>Subscribe to the newsletter for weekly updates.</p></div>"
+    )
+    jobs = [
+        {"pool": "default", "url": f"https://example.com/{index}", "content": content}
+        for index, content in enumerate(
+            [widget + f"<p>{_article(rng)}</p>", widget + f"<p>{_article(rng)}</p>"]
+        )
+    ]
+    assert find_duplicate_clusters([job["content"] for job in jobs]) == [[0, 1]]
+
+    for job in jobs:
+        job["text"] = summarizer.extract_text(job["content"])
+    kept, duplicates = summarizer._dedup_jobs(jobs, {"threshold": 0.8})
+
+    assert kept == jobs and duplicates == []
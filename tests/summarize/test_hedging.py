@@ -0,0 +1,114 @@
+"""Tests for move37.summarize.hedging."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize.hedging import HedgedLLMClient, LatencyWindow
+
+
+class _FakeClient:
+    def __init__(self, provider: str, delay: float, tokens: int = 50) -> None:
+        self.provider = provider
+        self.model = f"{provider}-model"
+        self.delay = delay
+        self.tokens = tokens
+        self.cancelled = False
+
+    def _result(self) -> Dict[str, Any]:
+        return {
+            "brief": self.provider,
+            "summary": "s",
+            "tokens_consumed": self.tokens,
+            "success": True,
+        }
+
+    def generate_summary(self, **_: Any) -> Dict[str, Any]:
+        time.sleep(self.delay)
+        return self._result()
+
+    async def agenerate_summary(self, **_: Any) -> Dict[str, Any]:
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self._result()
+
+
+def test_slow_primary_is_hedged_and_loser_tokens_are_wasted() -> None:
+    client = HedgedLLMClient(
+        _FakeClient("openai", delay=0.3),
+        _FakeClient("deepseek", delay=0.01),
+        delay=0.05,
+        max_ratio=1,
+    )
+
+    result = client.generate_summary(url="https://example.com", prompt_template="{url}")
+    time.sleep(0.4)
+    client.close()
+
+    assert result["brief"] == "deepseek"
+    assert result["hedged"] is True and result["hedge_winner"] == "deepseek"
+    stats = client.stats()
+    assert stats["secondary_wins"] == 1
+    assert stats["tokens_wasted"] == 50
+
+
+def test_hedge_ratio_caps_extra_requests() -> None:
+    client = HedgedLLMClient(
+        _FakeClient("openai", delay=0.05),
+        _FakeClient("deepseek", delay=0.0),
+        delay=0.01,
+        max_ratio=0,
+    )
+
+    result = client.generate_summary(url="https://example.com", prompt_template="{url}")
+    client.close()
+
+    assert result["hedge_winner"] == "openai"
+    assert result["hedged"] is False
+    assert client.stats()["hedged"] == 0
+
+
+def test_async_hedge_cancels_the_losing_request() -> None:
+    primary = _FakeClient("openai", delay=1.0)
+    client = HedgedLLMClient(primary, _FakeClient("glm", delay=0.01), delay=0.02, max_ratio=1)
+
+    async def _run() -> Dict[str, Any]:
+        result = await client.agenerate_summary(url="https://example.com", prompt_template="{url}")
+        await asyncio.sleep(0)
+        return result
+
+    result = asyncio.run(_run())
+    client.close()
+
+    assert result["hedge_winner"] == "glm"
+    assert primary.cancelled is True
+
+
+def test_clients_sharing_a_latency_window_keep_the_p90_history() -> None:
+    window = LatencyWindow()
+    first = HedgedLLMClient(
+        _FakeClient("openai", delay=0.0), _FakeClient("glm", delay=0.0), delay=10, latencies=window
+    )
+    for _ in range(5):
+        first.generate_summary(url="https://example.com", prompt_template="{url}")
+    first.close()
+
+    second = HedgedLLMClient(
+        _FakeClient("openai", delay=0.0), _FakeClient("glm", delay=0.0), delay=10, latencies=window
+    )
+    second.close()
+
+    assert second.hedge_delay() < 1
+    assert second.stats()["requests"] == 0
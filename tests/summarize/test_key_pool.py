@@ -0,0 +1,128 @@
+"""Tests for move37.summarize.key_pool."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize import key_pool
+from move37.summarize.config import load_config
+from move37.summarize.key_pool import ApiKeyPool
+from move37.summarize.llm_client import LLMClient, bind_gemini_api_key
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _AuthError(Exception):
+    status_code = 401
+
+
+def test_pool_prefers_least_loaded_key() -> None:
+    pool = ApiKeyPool("openai", ["key-a", "key-b"], clock=_Clock())
+
+    first = pool.acquire()
+    second = pool.acquire()
+    assert {first, second} == {"key-a", "key-b"}
+
+    pool.release("key-a", tokens=500)
+    pool.release("key-b", tokens=10)
+    assert pool.acquire() == "key-b"
+
+
+def test_pool_quarantines_rate_limited_and_revoked_keys() -> None:
+    clock = _Clock()
+    pool = ApiKeyPool("openai", ["key-a", "key-b", "key-c"], clock=clock)
+
+    pool.release(pool.acquire(), rate_limited=True, retry_after=30)
+    pool.release(pool.acquire(), auth_failed=True)
+    assert pool.acquire() == "key-c"
+    pool.release("key-c")
+
+    clock.now = 31
+    assert pool.acquire() == "key-a"
+    snapshot = pool.snapshot()
+    assert [item["rate_limited"] for item in snapshot] == [1, 0, 0]
+    assert [item["auth_errors"] for item in snapshot] == [0, 1, 0]
+    assert snapshot[1]["quarantined_for"] > 0
+
+
+def test_reset_stats_keeps_quarantine() -> None:
+    clock = _Clock()
+    pool = ApiKeyPool("openai", ["key-a", "key-b"], clock=clock)
+    pool.release(pool.acquire(), auth_failed=True)
+
+    pool.reset_stats()
+
+    snapshot = pool.snapshot()
+    assert [item["requests"] for item in snapshot] == [0, 0]
+    assert [item["auth_errors"] for item in snapshot] == [0, 0]
+    assert snapshot[0]["quarantined_for"] > 0
+    assert pool.acquire() == "key-b"
+
+
+def test_client_rotates_keys_and_skips_revoked_key() -> None:
+    key_pool.reset_key_pools()
+    used: List[str] = []
+
+    class _Client(LLMClient):
+        def _request_summary(self, prompt: str) -> Tuple[str, Dict[str, int]]:
+            used.append(self._current_api_key())
+            if self._current_api_key() == "sk-bad":
+                raise _AuthError("invalid key")
+            return '{"brief": "b", "summary": "s"}', {"total_tokens": 5}
+
+    config = load_config(
+        {"provider": "openai", "api_keys": "sk-bad, sk-good"}, env_path="/nonexistent/.env"
+    )
+    assert config["api_key"] == "sk-bad"
+    assert config["api_keys"] == ["sk-bad", "sk-good"]
+
+    client = _Client(
+        provider="openai",
+        api_key=config["api_key"],
+        model="gpt-test",
+        api_keys=config["api_keys"],
+    )
+    client._retry_delay = lambda *args: 0  # type: ignore[method-assign]
+    for _ in range(3):
+        assert client.generate_summary(url="https://example.com", prompt_template="{url}")[
+            "success"
+        ]
+
+    assert used.count("sk-bad") == 1
+    assert used[-2:] == ["sk-good", "sk-good"]
+    assert client._current_api_key() == "sk-bad"
+    key_pool.reset_key_pools()
+
+
+def test_gemini_sdk_keeps_the_per_model_client_slots() -> None:
+    genai = pytest.importorskip("google.generativeai")
+    model = genai.GenerativeModel("gemini-1.5-flash")
+
+    # bind_gemini_api_key writes these SDK-private slots; see the pin in requirements.txt.
+    assert hasattr(model, "_client")
+    assert hasattr(model, "_async_client")
+
+
+def test_bind_gemini_api_key_leaves_models_without_the_slot_alone() -> None:
+    class _Model:
+        pass
+
+    model = _Model()
+
+    assert bind_gemini_api_key(model, "key-not-configured") is model
+    assert not hasattr(model, "_client")
@@ -0,0 +1,77 @@
+"""Tests for move37.summarize.model_cache."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize.llm_client import LLMClient
+from move37.summarize.model_cache import GeminiModelCache
+
+
+def test_entries_expire_after_ttl_and_are_scoped_per_key(tmp_path: Path) -> None:
+    now = [1000.0]
+    cache = GeminiModelCache(tmp_path / "models.json", ttl=60, clock=lambda: now[0])
+
+    cache.set_models("key-a", ["gemini-2.5-flash"])
+    cache.set_resolved("key-a", "gemini-old", "gemini-2.5-flash")
+
+    assert cache.get_models("key-a") == ["gemini-2.5-flash"]
+    assert cache.get_resolved("key-a", "gemini-old") == "gemini-2.5-flash"
+    assert cache.get_models("key-b") is None
+    assert "key-a" not in (tmp_path / "models.json").read_text(encoding="utf-8")
+    now[0] += 61
+    assert cache.get_models("key-a") is None
+    assert cache.get_resolved("key-a", "gemini-old") is None
+
+
+class _FakeGenai:
+    def __init__(self) -> None:
+        self.list_calls = 0
+
+    def list_models(self) -> List[Any]:
+        self.list_calls += 1
+        return [
+            SimpleNamespace(
+                name="models/gemini-2.5-flash", supported_generation_methods=["generateContent"]
+            )
+        ]
+
+
+class _FallbackClient(LLMClient):
+    def __init__(self, cache_path: Path) -> None:
+        super().__init__(
+            provider="gemini",
+            api_key="g-test",
+            model="gemini-retired",
+            model_cache={"enabled": True, "path": str(cache_path), "ttl": 3600},
+        )
+        self.generated: List[str] = []
+
+    def _gemini_generate(self, genai: Any, model_name: str, prompt: str) -> Any:
+        self.generated.append(model_name)
+        if model_name == "gemini-retired":
+            raise RuntimeError("404 model not found")
+        return SimpleNamespace(text='{"brief": "b", "summary": "s"}')
+
+
+def test_resolved_fallback_model_is_shared_with_new_clients(tmp_path: Path) -> None:
+    genai = _FakeGenai()
+    first = _FallbackClient(tmp_path / "models.json")
+    first._generate_with_gemini_fallback(
+        genai, "gemini-retired", "prompt", RuntimeError("404 model not found")
+    )
+
+    second = _FallbackClient(tmp_path / "models.json")
+
+    assert first.generated == ["gemini-2.5-flash"]
+    assert second._effective_model() == "gemini-2.5-flash"
+    assert second._list_gemini_generate_models(genai) == ["gemini-2.5-flash"]
+    assert genai.list_calls == 1
@@ -0,0 +1,97 @@
+"""Tests for move37.summarize.packing."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize import summarizer
+from move37.summarize.llm_client import LLMClient
+from move37.summarize.packing import plan_packs, summarize_pack
+
+
+class _ScriptedClient(LLMClient):
+    def __init__(self, reply: str, **kwargs) -> None:
+        super().__init__(provider="openai", api_key="sk-test", model="gpt-test", **kwargs)
+        self.reply = reply
+        self.prompts: List[str] = []
+
+    def _request_summary(self, prompt: str) -> Tuple[str, Dict[str, int]]:
+        self.prompts.append(prompt)
+        return self.reply, {"prompt_tokens": 300, "completion_tokens": 100, "total_tokens": 400}
+
+
+def _entries(*contents: str) -> List[Dict[str, object]]:
+    return [
+        {"id": index, "url": f"https://example.com/{index}", "title": "", "content": content}
+        for index, content in enumerate(contents, start=1)
+    ]
+
+
+def test_plan_packs_groups_short_items_and_keeps_long_ones_alone() -> None:
+    client = _ScriptedClient("", max_tokens=1200)
+    entries = _entries("short one", "word " * 2000, "short two", "short three", "short four")
+
+    packs, singles = plan_packs(entries, client, max_items=8, short_item_tokens=400)
+
+    # max_tokens=1200 answers three items at 400 output tokens each.
+    assert [[entry["id"] for entry in pack] for pack in packs] == [[1, 3, 4]]
+    assert sorted(entry["id"] for entry in singles) == [2, 5]
+
+
+def test_summarize_pack_maps_results_and_drops_invalid_items() -> None:
+    reply = json.dumps(
+        [
+            {"id": 2, "url": "https://example.com/2", "brief": "b2", "summary": "s2"},
+            {"id": 1, "url": "https://example.com/1", "brief": "b1", "summary": "s1"},
+            {"id": 3, "url": "https://example.com/3", "brief": "", "summary": "s3"},
+        ]
+    )
+    client = _ScriptedClient(f"```json\n{reply}\n```", max_retries=0)
+
+    results = summarize_pack(client, _entries("alpha", "beta", "gamma"))
+
+    assert len(client.prompts) == 1
+    assert sorted(results) == [1, 2]
+    assert results[1]["brief"] == "b1" and results[2]["summary"] == "s2"
+    assert sum(result["tokens_consumed"] for result in results.values()) <= 400
+
+
+def test_packed_items_are_compacted_before_planning_and_prompting() -> None:
+    chrome = "".join(f'<a href="https://example.com/t/{n}">tag {n}</a><br/>' for n in range(80))
+    reply = json.dumps(
+        [
+            {"id": 1, "url": "https://example.com/1", "brief": "b1", "summary": "s1"},
+            {"id": 2, "url": "https://example.com/2", "brief": "b2", "summary": "s2"},
+        ]
+    )
+    client = _ScriptedClient(reply, max_retries=0, compaction={"enabled": True})
+    jobs = [
+        {
+            "item": {},
+            "url": f"https://example.com/{index}",
+            "title": "",
+            "client": client,
+            "content": f"<nav>{chrome}</nav><p>Article {index} body.</p>",
+            "pool": "default",
+            "extra_fields": {},
+        }
+        for index in (1, 2)
+    ]
+    assert client.estimate_tokens(jobs[0]["content"]) > 400
+
+    remaining = summarizer._run_packed_jobs(
+        jobs, {"max_items": 8, "short_item_tokens": 400, "item_output_tokens": 400}, 1
+    )
+
+    assert remaining == [] and len(client.prompts) == 1
+    assert "<a href" not in client.prompts[0] and "Article 2 body." in client.prompts[0]
+    assert all(job["item"]["summary_mode"] == "packed" for job in jobs)
+    assert all(job["item"]["tokens_saved"] > 0 for job in jobs)
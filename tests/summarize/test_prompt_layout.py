@@ -0,0 +1,45 @@
+"""Tests for prompt-prefix layout and cached-token accounting in LLMClient."""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize.config import DEFAULT_PROMPT_TEMPLATE
+from move37.summarize.llm_client import LLMClient
+
+
+def test_item_data_follows_a_shared_instruction_prefix() -> None:
+    template = "Summarize this URL: {url}\nReturn JSON with `brief` and `summary`."
+    first = LLMClient._render_prompt("https://a.example.com/1", DEFAULT_PROMPT_TEMPLATE, "甲" * 50)
+    second = LLMClient._render_prompt("https://b.example.com/2", DEFAULT_PROMPT_TEMPLATE, "乙" * 50)
+
+    shared = os.path.commonprefix([first, second])
+    assert "Return strict JSON only" in shared and "文末附有" in shared
+    assert first.index("URL: https://a.example.com/1") < first.index("甲")
+    assert LLMClient._render_prompt("u", template) == template.replace("{url}", "u")
+
+
+def test_cached_tokens_are_read_from_each_provider_shape() -> None:
+    openai_usage = SimpleNamespace(
+        prompt_tokens=1200,
+        completion_tokens=100,
+        total_tokens=1300,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+    )
+    deepseek_usage = {"prompt_tokens": 900, "completion_tokens": 50, "prompt_cache_hit_tokens": 640}
+    gemini_usage = SimpleNamespace(
+        prompt_token_count=800, candidates_token_count=40, cached_content_token_count=512
+    )
+
+    assert LLMClient._openai_usage(openai_usage)["cached_tokens"] == 1024
+    assert LLMClient._openai_usage(deepseek_usage)["cached_tokens"] == 640
+    assert LLMClient._openai_usage(deepseek_usage)["total_tokens"] == 950
+    assert LLMClient._gemini_usage(gemini_usage)["cached_tokens"] == 512
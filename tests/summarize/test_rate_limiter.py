@@ -0,0 +1,106 @@
+"""Tests for move37.summarize.rate_limiter."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize import rate_limiter
+from move37.summarize.llm_client import LLMClient
+from move37.summarize.rate_limiter import RateLimiter, rate_limiter_states
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after: str) -> None:
+        super().__init__("Error code: 429 - rate limited")
+        self.response = type("Response", (), {"headers": {"retry-after": retry_after}})()
+
+
+def test_token_bucket_waits_and_refunds_actual_usage() -> None:
+    clock = _Clock()
+    limiter = RateLimiter("openai", rpm=60, tpm=600, max_concurrency=4, clock=clock)
+
+    assert limiter._try_acquire(500) == 0
+    # 100 tokens left; a 300-token request needs 200 more at 10 tokens/s.
+    assert limiter._try_acquire(300) == 20
+    limiter.release(500, used_tokens=100)
+    assert limiter._try_acquire(300) == 0
+    assert limiter.snapshot()["available_tokens"] == 200
+
+
+def test_aimd_halves_on_429_and_grows_after_successes() -> None:
+    clock = _Clock()
+    limiter = RateLimiter("openai", max_concurrency=8, clock=clock)
+
+    limiter._try_acquire(1)
+    limiter.release(1, succeeded=False, rate_limited=True, retry_after=5)
+    assert limiter.snapshot()["concurrency_limit"] == 4
+    assert limiter._try_acquire(1) == 5
+
+    clock.now += 5
+    for _ in range(4):
+        assert limiter._try_acquire(1) == 0
+        limiter.release(1)
+    assert limiter.snapshot()["concurrency_limit"] == 5
+    assert limiter.snapshot()["rate_limited"] == 1
+
+
+def test_reset_stats_keeps_the_learned_concurrency_limit() -> None:
+    limiter = RateLimiter("openai", max_concurrency=8, clock=_Clock())
+    limiter._try_acquire(1)
+    limiter.release(1, succeeded=False, rate_limited=True, retry_after=5)
+
+    limiter.reset_stats()
+
+    snapshot = limiter.snapshot()
+    assert (snapshot["requests"], snapshot["rate_limited"]) == (0, 0)
+    assert snapshot["concurrency_limit"] == 4
+
+
+def test_client_honours_retry_after_and_reports_state(monkeypatch) -> None:
+    rate_limiter.reset_rate_limiters()
+    sleeps: List[float] = []
+    monkeypatch.setattr("move37.summarize.llm_client.time.sleep", sleeps.append)
+
+    class _Client(LLMClient):
+        calls = 0
+
+        def _request_summary(self, prompt: str) -> Tuple[str, Dict[str, int]]:
+            self.calls += 1
+            if self.calls == 1:
+                raise _RateLimitError("0")
+            return '{"brief": "b", "summary": "s"}', {"total_tokens": 12}
+
+    client = _Client(
+        provider="deepseek",
+        api_key="sk-test",
+        model="deepseek-chat",
+        rate_limit={"rpm": 100, "tpm": 0, "max_concurrency": 2},
+    )
+    result = client.generate_summary(url="https://example.com", prompt_template="{url}")
+
+    assert result["success"] is True
+    # Decorrelated jitter: first delay is drawn from [base, 3 * base].
+    assert len(sleeps) == 1 and 1.0 <= sleeps[0] <= 3.0
+    state = rate_limiter_states()["deepseek"]
+    assert state["rate_limited"] == 1
+    assert state["requests"] == 2
+    # Halved to 1 by the 429, then grown back by the successful retry.
+    assert state["concurrency_limit"] == 2
+    rate_limiter.reset_rate_limiters()
@@ -0,0 +1,115 @@
+"""Tests for move37.summarize.relevance."""
+
+from __future__ import annotations
+
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+pytest.importorskip("numpy")
+
+from move37.summarize import summarizer
+from move37.summarize.relevance import RelevanceModel, load_history
+
+_ON_TOPIC = ["llm", "agent", "transformer", "inference", "大模型", "推理", "gpu", "embedding"]
+_OFF_TOPIC = ["garden", "recipe", "football", "travel", "园艺", "旅行", "furniture", "wine"]
+_FILLER = ["the", "new", "update", "notes", "week", "release", "post", "今天"]
+
+
+def _corpus(count: int, seed: int = 7) -> Tuple[List[str], List[int]]:
+    rng = random.Random(seed)
+    texts: List[str] = []
+    labels: List[int] = []
+    for index in range(count):
+        label = index % 2
+        topic = _ON_TOPIC if label else _OFF_TOPIC
+        words = rng.choices(topic, k=4) + rng.choices(_FILLER, k=8)
+        rng.shuffle(words)
+        texts.append(" ".join(words))
+        labels.append(label)
+    return texts, labels
+
+
+def test_model_separates_topics_scores_fast_and_round_trips(tmp_path: Path) -> None:
+    texts, labels = _corpus(200)
+    model = RelevanceModel.fit(texts, labels)
+
+    unseen, unseen_labels = _corpus(3000, seed=11)
+    started_at = time.perf_counter()
+    probabilities = model.predict_proba(unseen)
+    elapsed = time.perf_counter() - started_at
+
+    accuracy = ((probabilities >= 0.5).astype(int) == unseen_labels).mean()
+    assert accuracy > 0.95
+    assert elapsed < 0.5
+    model.save(tmp_path / "relevance.npz")
+    loaded = RelevanceModel.load(tmp_path / "relevance.npz")
+    assert list(loaded.predict_proba(unseen[:5])) == pytest.approx(list(probabilities[:5]))
+
+
+class _RecordingClient:
+    provider = "openai"
+    model = "gpt-test"
+
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def generate_summary(self, url: str, **_: Any) -> Dict[str, Any]:
+        self.calls.append(url)
+        return {"brief": "b", "summary": "s", "success": True}
+
+
+def test_summarize_all_drops_off_topic_items_and_records_history(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    RelevanceModel.fit(*_corpus(200)).save(tmp_path / "relevance.npz")
+    client = _RecordingClient()
+    monkeypatch.setattr(
+        summarizer,
+        "load_config",
+        lambda config=None: {
+            "provider": "openai",
+            "model": "gpt-test",
+            "prompt_template": "Summarize {url}",
+            "concurrency": 1,
+            "gemini_concurrency": 1,
+            "relevance": {
+                "enabled": True,
+                "model_path": str(tmp_path / "relevance.npz"),
+                "history_path": str(tmp_path / "history.jsonl"),
+                "drop_threshold": 0.2,
+            },
+        },
+    )
+    monkeypatch.setattr(summarizer, "_create_llm_client", lambda _config: client)
+    items = [
+        {"title": "garden travel recipe wine", "url": "https://blog.example.com/garden"},
+        {
+            "title": "llm agent inference gpu",
+            "url": "https://blog.example.com/llm",
+            "content": '<p><img src="https://cdn.example.com/a.png"/>embedding</p>',
+        },
+    ]
+
+    result = summarizer.summarize_all({"results": [{"success": True, "items": items}]})
+
+    [llm] = result["results"][0]["items"]
+    assert client.calls == ["https://blog.example.com/llm"]
+    assert llm["summary"] == "s" and llm["relevance_score"] > 0.5
+    assert result["relevance"]["scored"] == 2 and result["relevance"]["dropped"] == 1
+    [garden] = result["relevance"]["dropped_items"]
+    assert garden["url"] == "https://blog.example.com/garden" and garden["relevance_score"] < 0.2
+    texts, labels = load_history(tmp_path / "history.jsonl")
+    assert texts == ["llm agent inference gpu\nembedding"] and labels == [1]
+    assert json.loads((tmp_path / "history.jsonl").read_text(encoding="utf-8"))["label"] == 1
@@ -0,0 +1,63 @@
+"""Tests for move37.summarize.streaming."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize.llm_client import LLMClient
+from move37.summarize.streaming import (
+    IncrementalSummaryParser,
+    reset_streaming_stats,
+    streaming_stats,
+)
+
+
+def _deltas(text: str, size: int = 7) -> List[str]:
+    return [text[index : index + size] for index in range(0, len(text), size)]
+
+
+def test_parser_decodes_fields_split_across_deltas() -> None:
+    parser = IncrementalSummaryParser()
+    raw = '```json\n{"brief": "引号\\"与\\u4e2d文", "summary": "第一行\\n第二行"}\n```'
+
+    stops = [parser.feed(delta) for delta in _deltas(raw, 3)]
+
+    assert parser.fields == {"brief": '引号"与中文', "summary": "第一行\n第二行"}
+    assert any(stops)
+    assert json.loads(parser.payload_text()) == parser.fields
+
+
+def test_stream_stops_once_summary_exceeds_its_limit() -> None:
+    reset_streaming_stats()
+    reply = json.dumps({"brief": "简介", "summary": "长" * 3000, "extra": "x"}, ensure_ascii=False)
+    consumed: List[str] = []
+
+    def _events() -> Iterable[Tuple[str, Dict[str, int] | None]]:
+        for delta in _deltas(reply, 50):
+            consumed.append(delta)
+            yield delta, None
+
+    class _StreamingClient(LLMClient):
+        def _request_summary(self, prompt: str) -> Tuple[str, Dict[str, int]]:
+            return self._consume_stream(prompt, _events())
+
+    client = _StreamingClient(
+        provider="openai", api_key="sk-test", model="gpt-test", max_tokens=4000, streaming=True
+    )
+    result = client.generate_summary(url="https://example.com/a", prompt_template="{url}")
+
+    assert result["success"] is True
+    assert len(result["summary"]) == 1000
+    assert len(consumed) < len(_deltas(reply, 50)) / 2
+    assert result["streaming"]["stopped_early"] is True
+    assert result["token_usage"]["output_tokens_saved"] > 0
+    stats = streaming_stats()["openai"]
+    assert stats["requests"] == 1 and stats["stopped_early"] == 1
@@ -0,0 +1,67 @@
+"""Tests for move37.summarize.structured_output."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize.llm_client import LLMClient
+from move37.summarize.structured_output import (
+    SUMMARY_RESPONSE_SCHEMA,
+    gemini_response_schema,
+    load_json_payload,
+    parse_stats,
+    reset_parse_stats,
+)
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        'Here you go:\n```json\n{"brief": "简介", "summary": "要点",}\n```',
+        '{"brief": "他说"你好"", "summary": "第一行\n第二行"}',
+        '{"brief": "简介", "summary": "被截断的要点',
+    ],
+)
+def test_load_json_payload_repairs_common_defects(raw: str) -> None:
+    data, repaired = load_json_payload(raw)
+
+    assert repaired is True
+    assert data["brief"] in {"简介", '他说"你好"'}
+    assert data["summary"]
+
+
+def test_request_kwargs_ask_for_json_per_provider() -> None:
+    openai = LLMClient(provider="openai", api_key="sk-test", model="gpt-test")
+    deepseek = LLMClient(provider="deepseek", api_key="sk-test", model="deepseek-chat")
+    gemini = LLMClient(provider="gemini", api_key="g-test", model="gemini-2.5-flash")
+    plain = LLMClient(provider="openai", api_key="sk", model="gpt", structured_output=False)
+
+    assert openai._openai_request_kwargs("p")["response_format"]["type"] == "json_schema"
+    assert deepseek._openai_request_kwargs("p")["response_format"] == {"type": "json_object"}
+    generation_config = gemini._gemini_request_kwargs()["generation_config"]
+    assert generation_config["response_mime_type"] == "application/json"
+    assert generation_config["response_schema"] == gemini_response_schema(SUMMARY_RESPONSE_SCHEMA)
+    assert "additionalProperties" not in generation_config["response_schema"]
+    assert "response_format" not in plain._openai_request_kwargs("p")
+
+
+def test_parse_outcomes_are_counted_per_provider() -> None:
+    reset_parse_stats()
+    client = LLMClient(provider="glm", api_key="k", model="glm-test")
+
+    client._parse_summary_payload('{"brief": "b", "summary": "s"}')
+    client._parse_summary_payload('{"brief": "b", "summary": "s",}')
+    with pytest.raises(ValueError):
+        client._parse_summary_payload("no json here")
+
+    stats = parse_stats()["glm"]
+    assert (stats["parsed"], stats["repaired"], stats["failed"]) == (1, 1, 1)
+    assert stats["failure_rate"] == pytest.approx(1 / 3, abs=1e-4)
@@ -0,0 +1,437 @@
+"""Tests for move37.summarize.summarizer."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize import summarizer
+from move37.summarize.async_llm_client import AsyncLLMClient
+from move37.summarize.cache import SummaryCache
+from move37.summarize.config import load_config
+from move37.summarize.hedging import HedgedLLMClient
+from move37.summarize.llm_client import LLMClient
+from move37.utils.checkpoint import RunCheckpoint
+
+
+class _FakeClient:
+    def __init__(self, provider: str, model: str, delay: float = 0.05) -> None:
+        self.provider = provider
+        self.model = model
+        self.delay = delay
+        self.calls: List[str] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def generate_summary(self, url: str, **_: Any) -> Dict[str, Any]:
+        with self._lock:
+            self.calls.append(url)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return {
+            "brief": f"brief {url}",
+            "summary": f"summary {url}",
+            "model_used": self.model,
+            "tokens_consumed": 10,
+            "success": True,
+            "error": None,
+        }
+
+
+def _collection(item_count: int) -> Dict[str, Any]:
+    return {
+        "collection_date": "2026-02-20",
+        "target_date": "2026-02-19",
+        "results": [
+            {
+                "source_type": "Blogs",
+                "source_title": "Blog",
+                "success": True,
+                "items": [
+                    {"title": f"Post {index}", "url": f"https://blog.example.com/{index}"}
+                    for index in range(item_count)
+                ],
+            },
+            {
+                "source_type": "YouTube Channels",
+                "source_title": "Channel",
+                "success": True,
+                "items": [
+                    {"title": "Video", "url": "https://www.youtube.com/watch?v=abc123"},
+                ],
+            },
+        ],
+    }
+
+
+def _install_fakes(
+    monkeypatch: pytest.MonkeyPatch,
+    concurrency: int,
+) -> Dict[str, _FakeClient]:
+    base_config = {
+        "provider": "openai",
+        "model": "gpt-test",
+        "prompt_template": "Summarize {url}",
+        "concurrency": concurrency,
+        "gemini_concurrency": 1,
+    }
+    clients = {
+        "default": _FakeClient("openai", "gpt-test"),
+        "gemini": _FakeClient("gemini", "gemini-test"),
+    }
+    monkeypatch.setattr(summarizer, "load_config", lambda config=None: dict(base_config))
+    monkeypatch.setattr(summarizer, "_create_llm_client", lambda _config: clients["default"])
+    monkeypatch.setattr(
+        summarizer, "_create_gemini_youtube_client", lambda _config: clients["gemini"]
+    )
+    return clients
+
+
+def test_summarize_all_runs_default_pool_concurrently_and_keeps_order(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    clients = _install_fakes(monkeypatch, concurrency=4)
+
+    result = summarizer.summarize_all(_collection(8))
+
+    items = result["results"][0]["items"]
+    assert [item["url"] for item in items] == [f"https://blog.example.com/{i}" for i in range(8)]
+    assert all(item["brief"] == f"brief {item['url']}" for item in items)
+    assert clients["default"].max_active > 1
+    assert clients["default"].max_active <= 4
+
+    video = result["results"][1]["items"][0]
+    assert video["model_used"] == "gemini-test"
+    assert video["summary_basis"] == "gemini_url"
+    assert video["youtube_video_id"] == "abc123"
+
+
+def test_summarize_all_is_sequential_by_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    clients = _install_fakes(monkeypatch, concurrency=1)
+
+    summarizer.summarize_all(_collection(3))
+
+    assert clients["default"].max_active == 1
+    assert clients["default"].calls == [f"https://blog.example.com/{i}" for i in range(3)]
+
+
+class _FakeAsyncClient(AsyncLLMClient):
+    def __init__(self, delay: float = 0.02, max_connections: int | None = None) -> None:
+        super().__init__(
+            provider="openai",
+            api_key="sk-test",
+            model="gpt-test",
+            max_connections=max_connections,
+        )
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.requests = 0
+        self.closed = False
+
+    async def _arequest_summary(self, prompt: str) -> Tuple[str, Dict[str, int]]:
+        self.requests += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return '{"brief": "async brief", "summary": "async summary"}', {"total_tokens": 7}
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+def test_summarize_all_async_bounds_pools_and_closes_clients(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    base_config = {
+        "provider": "openai",
+        "model": "gpt-test",
+        "prompt_template": "Summarize {url}",
+        "concurrency": 3,
+        "gemini_concurrency": 1,
+    }
+    clients = [_FakeAsyncClient(), _FakeAsyncClient()]
+    monkeypatch.setattr(summarizer, "load_config", lambda config=None: dict(base_config))
+    monkeypatch.setattr(summarizer, "_create_async_llm_client", lambda _config: clients[0])
+    monkeypatch.setattr(
+        summarizer, "_create_gemini_youtube_client", lambda _config, _factory: clients[1]
+    )
+
+    result = asyncio.run(summarizer.summarize_all_async(_collection(6)))
+
+    items = result["results"][0]["items"]
+    assert [item["url"] for item in items] == [f"https://blog.example.com/{i}" for i in range(6)]
+    assert all(item["brief"] == "async brief" and item["success"] for item in items)
+    assert 1 < clients[0].max_active <= 3
+    assert result["results"][1]["items"][0]["summary_basis"] == "gemini_url"
+    assert all(client.closed for client in clients)
+
+
+def test_async_chunk_fan_out_stays_within_max_connections() -> None:
+    client = _FakeAsyncClient(delay=0.01, max_connections=2)
+    content = "\n\n".join(f"Paragraph {index}. " + "word " * 40 for index in range(8))
+
+    result = asyncio.run(
+        client.agenerate_summary(
+            "https://blog.example.com/long", "Summarize {url}", content=content, chunk_size=300
+        )
+    )
+
+    assert result["success"] is True
+    # Several chunk requests plus the final merge, never more than two at once.
+    assert client.requests > 3
+    assert client.max_active == 2
+
+
+def test_items_resumed_from_a_checkpoint_report_no_tokens(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    clients = _install_fakes(monkeypatch, concurrency=1)
+    summarizer.summarize_all(_collection(2), checkpoint=RunCheckpoint("run", runs_dir=tmp_path))
+    clients["default"].calls.clear()
+
+    resumed = summarizer.summarize_all(
+        _collection(2), checkpoint=RunCheckpoint("run", runs_dir=tmp_path)
+    )
+
+    items = resumed["results"][0]["items"]
+    assert clients["default"].calls == []
+    assert all(item["resumed"] and item["tokens_consumed"] == 0 for item in items)
+    assert items[0]["brief"] == "brief https://blog.example.com/0"
+
+
+def test_summarize_all_reuses_cached_summaries(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    clients = _install_fakes(monkeypatch, concurrency=1)
+    cache_config = {"cache_enabled": True, "cache_path": str(tmp_path / "cache.sqlite3")}
+    monkeypatch.setattr(
+        summarizer,
+        "load_config",
+        lambda config=None: {
+            "provider": "openai",
+            "model": "gpt-test",
+            "prompt_template": "Summarize {url}",
+            "concurrency": 1,
+            "gemini_concurrency": 1,
+            **cache_config,
+        },
+    )
+
+    first = summarizer.summarize_all(_collection(2))
+    second = summarizer.summarize_all(_collection(2))
+
+    assert len(clients["default"].calls) == 2
+    assert not any(item["cache_hit"] for item in first["results"][0]["items"])
+    cached = second["results"][0]["items"]
+    assert all(item["cache_hit"] and item["tokens_consumed"] == 0 for item in cached)
+    assert cached[0]["brief"] == "brief https://blog.example.com/0"
+    assert second["results"][1]["items"][0]["summary_basis"] == "gemini_url"
+
+
+def test_summarize_all_records_the_hedge_winner_on_items(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _install_fakes(monkeypatch, concurrency=1)
+    secondary = _FakeClient("deepseek", "deepseek-chat", delay=0.0)
+    monkeypatch.setattr(
+        summarizer,
+        "_create_hedged_client",
+        lambda primary, *_: HedgedLLMClient(primary, secondary, delay=0.01, max_ratio=1),
+    )
+
+    result = summarizer.summarize_all(_collection(2))
+
+    items = result["results"][0]["items"]
+    assert all(item["hedged"] is True for item in items)
+    assert all(item["hedge_winner"] == "deepseek" for item in items)
+    assert all(item["model_used"] == "deepseek-chat" for item in items)
+    assert result["hedging"]["secondary_wins"] == 2
+
+
+def test_hedge_turns_on_from_a_real_env_file(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    pytest.importorskip("dotenv")
+    (tmp_path / ".env").write_text(
+        "LLM_PROVIDER=openai\n"
+        "LLM_OPENAI_API_KEY=sk-openai\n"
+        "LLM_HEDGE_PROVIDER=deepseek\n"
+        "LLM_DEEPSEEK_API_KEY=sk-deepseek\n",
+        encoding="utf-8",
+    )
+    monkeypatch.chdir(tmp_path)
+    base_config = load_config()
+
+    client = summarizer._create_hedged_client(
+        summarizer._create_llm_client(base_config), base_config
+    )
+
+    assert isinstance(client, HedgedLLMClient)
+    assert (client.primary.provider, client.secondary.provider) == ("openai", "deepseek")
+    client.close()
+
+
+def test_gemini_helpers_load_with_batch_and_gemini_hedge_in_env(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    pytest.importorskip("dotenv")
+    (tmp_path / ".env").write_text(
+        "LLM_PROVIDER=openai\n"
+        "LLM_OPENAI_API_KEY=sk-openai\n"
+        "LLM_GEMINI_API_KEY=gm-key\n"
+        "LLM_BATCH_ENABLED=true\n"
+        "LLM_HEDGE_PROVIDER=gemini\n"
+        "LLM_TRIAGE_PROVIDER=gemini\n",
+        encoding="utf-8",
+    )
+    monkeypatch.chdir(tmp_path)
+    base_config = load_config()
+    assert base_config["batch"]["enabled"] is True
+
+    youtube_client = summarizer._create_gemini_youtube_client(base_config)
+    triage_client = summarizer._create_triage_client(base_config)
+
+    assert youtube_client.provider == "gemini"
+    assert triage_client is not None and triage_client.provider == "gemini"
+
+
+def test_hedged_summary_is_cached_under_the_winning_client(tmp_path: Path) -> None:
+    primary = LLMClient(provider="openai", api_key="sk-test", model="gpt-test")
+    secondary = LLMClient(provider="deepseek", api_key="sk-test", model="deepseek-chat")
+    hedged = HedgedLLMClient(primary, secondary)
+    cache = SummaryCache(tmp_path / "cache.sqlite3")
+    job = {
+        "url": "https://blog.example.com/a",
+        "title": "A",
+        "content": "body",
+        "prompt_template": "Summarize {url}",
+        "client": hedged,
+    }
+    summarizer._attach_summary_cache([job], cache)
+
+    summary = {"brief": "b", "summary": "s", "success": True, "model_used": "deepseek-chat"}
+    summarizer._store_summary(job, {**summary, "hedge_winner": "deepseek"})
+    hedged.close()
+
+    primary_key, secondary_key = (key for _, key in job["cache_keys"])
+    assert cache.get(primary_key) is None
+    assert cache.get(secondary_key)["model_used"] == "deepseek-chat"
+    assert summarizer._lookup_cached_summary(job)["model_used"] == "deepseek-chat"
+
+    # A different max_tokens is a different cache entry.
+    primary.max_tokens += 1
+    secondary.max_tokens += 1
+    summarizer._attach_summary_cache([job], cache)
+    assert summarizer._lookup_cached_summary(job) is None
+    cache.close()
+
+
+def test_summarize_all_packs_short_items_into_one_call(monkeypatch: pytest.MonkeyPatch) -> None:
+    clients = _install_fakes(monkeypatch, concurrency=2)
+    prompts: List[str] = []
+
+    class _PackingClient(LLMClient):
+        def _request_summary(self, prompt: str) -> Tuple[str, Dict[str, int]]:
+            prompts.append(prompt)
+            ids = re.findall(r"^\[(\d+)\] URL: (\S+)$", prompt, flags=re.MULTILINE)
+            reply = [
+                {"id": int(entry_id), "url": url, "brief": f"b {url}", "summary": f"s {url}"}
+                for entry_id, url in ids
+            ]
+            return json.dumps(reply), {"prompt_tokens": 90, "total_tokens": 120}
+
+    packing_client = _PackingClient(provider="openai", api_key="sk-test", model="gpt-test")
+    monkeypatch.setattr(summarizer, "_create_llm_client", lambda _config: packing_client)
+    monkeypatch.setattr(
+        summarizer,
+        "load_config",
+        lambda config=None: {
+            "provider": "openai",
+            "model": "gpt-test",
+            "prompt_template": "Summarize {url}",
+            "concurrency": 2,
+            "gemini_concurrency": 1,
+            "packing": {
+                "enabled": True,
+                "max_items": 8,
+                "short_item_tokens": 400,
+                "item_output_tokens": 400,
+            },
+        },
+    )
+
+    result = summarizer.summarize_all(_collection(3))
+
+    assert len(prompts) == 1
+    items = result["results"][0]["items"]
+    assert [item["summary_mode"] for item in items] == ["packed"] * 3
+    assert items[2]["brief"] == "b https://blog.example.com/2"
+    assert clients["gemini"].calls == ["https://www.youtube.com/watch?v=abc123"]
+
+
+def test_summarize_all_async_packs_short_items_too(monkeypatch: pytest.MonkeyPatch) -> None:
+    prompts: List[str] = []
+
+    class _PackingClient(_FakeAsyncClient):
+        def _request_summary(self, prompt: str) -> Tuple[str, Dict[str, int]]:
+            prompts.append(prompt)
+            ids = re.findall(r"^\[(\d+)\] URL: (\S+)$", prompt, flags=re.MULTILINE)
+            reply = [
+                {"id": int(entry_id), "url": url, "brief": f"b {url}", "summary": f"s {url}"}
+                for entry_id, url in ids
+            ]
+            return json.dumps(reply), {"prompt_tokens": 90, "total_tokens": 120}
+
+    clients = [_PackingClient(), _FakeAsyncClient()]
+    monkeypatch.setattr(summarizer, "_create_async_llm_client", lambda _config: clients[0])
+    monkeypatch.setattr(
+        summarizer, "_create_gemini_youtube_client", lambda _config, _factory: clients[1]
+    )
+    monkeypatch.setattr(
+        summarizer,
+        "load_config",
+        lambda config=None: {
+            "provider": "openai",
+            "model": "gpt-test",
+            "prompt_template": "Summarize {url}",
+            "concurrency": 2,
+            "gemini_concurrency": 1,
+            "packing": {
+                "enabled": True,
+                "max_items": 8,
+                "short_item_tokens": 400,
+                "item_output_tokens": 400,
+            },
+        },
+    )
+
+    result = asyncio.run(summarizer.summarize_all_async(_collection(3)))
+
+    assert len(prompts) == 1 and clients[0].requests == 0
+    items = result["results"][0]["items"]
+    assert [item["summary_mode"] for item in items] == ["packed"] * 3
+    assert clients[1].requests == 1
+    assert all(client.closed for client in clients)
@@ -0,0 +1,91 @@
+"""Tests for move37.summarize.token_budget and LLMClient prompt budgeting."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize.llm_client import LLMClient
+from move37.summarize.token_budget import (
+    estimate_tokens,
+    get_context_window,
+    plan_chunks,
+    prompt_token_budget,
+)
+
+
+class _RecordingClient(LLMClient):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(provider="deepseek", api_key="sk-test", model="deepseek-chat", **kwargs)
+        self.prompts: List[str] = []
+
+    def _request_summary(self, prompt: str) -> Tuple[str, Dict[str, int]]:
+        self.prompts.append(prompt)
+        payload = {"brief": "简介", "summary": "摘要内容"}
+        return json.dumps(payload, ensure_ascii=False), {
+            "prompt_tokens": 10,
+            "completion_tokens": 5,
+            "total_tokens": 15,
+        }
+
+
+def test_estimate_tokens_weights_cjk_and_latin_differently() -> None:
+    chinese = estimate_tokens("人工智能" * 100, "deepseek", "deepseek-chat")
+    english = estimate_tokens("abcd" * 100, "deepseek", "deepseek-chat")
+    assert chinese == 240
+    assert english == 120
+    assert estimate_tokens("", "openai", "gpt-4o") == 0
+
+
+def test_get_context_window_prefers_longest_model_prefix() -> None:
+    assert get_context_window("openai", "gpt-4-turbo-2024-04-09") == 128000
+    assert get_context_window("openai", "gpt-4") == 8192
+    assert get_context_window("gemini", "models/gemini-2.5-flash") == 1048576
+    assert get_context_window("glm", "unknown-model") == 128000
+
+
+def test_prompt_token_budget_reserves_output_and_margin() -> None:
+    assert prompt_token_budget(10000, 2000) == 7000
+    assert prompt_token_budget(1000, 2000) == 0
+
+
+def test_plan_chunks_respects_token_budget() -> None:
+    content = "\n\n".join(["这是一个测试段落。" * 40 for _ in range(10)])
+    chunks = plan_chunks(content, 300, "deepseek", "deepseek-chat")
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk, "deepseek", "deepseek-chat") <= 300 for chunk in chunks)
+    assert "".join(chunks).replace("\n", "").replace(" ", "") == content.replace("\n", "")
+
+
+def test_generate_summary_chunks_when_prompt_exceeds_budget() -> None:
+    client = _RecordingClient(max_tokens=500, context_window=2000)
+    content = "\n\n".join(["大模型推理优化。" * 50 for _ in range(6)])
+
+    result = client.generate_summary(
+        url="https://example.com/post",
+        prompt_template="Summarize {url}",
+        content=content,
+    )
+
+    assert result["success"] is True
+    assert len(client.prompts) > 2
+    assert result["token_usage"]["total_tokens"] == 15 * len(client.prompts)
+    assert result["tokens_consumed"] == result["token_usage"]["total_tokens"]
+    assert result["tokens_estimated"] > 0
+
+
+def test_generate_summary_reports_estimated_and_actual_tokens() -> None:
+    client = _RecordingClient()
+    result = client.generate_summary(url="https://example.com", prompt_template="Summarize {url}")
+
+    assert len(client.prompts) == 1
+    assert result["tokens_consumed"] == 15
+    assert result["token_usage"]["prompt_tokens"] == 10
+    assert result["tokens_estimated"] == client.estimate_prompt_tokens(client.prompts[0])
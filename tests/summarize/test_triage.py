@@ -0,0 +1,130 @@
+"""Tests for move37.summarize.triage."""
+
+from __future__ import annotations
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize import summarizer
+from move37.summarize.llm_client import LLMClient
+from move37.summarize.triage import triage_entries
+
+
+class _TriageClient(LLMClient):
+    """Scores items whose title mentions "AI" as 9, everything else as 2."""
+
+    def __init__(self) -> None:
+        super().__init__(provider="openai", api_key="sk-test", model="gpt-mini", max_retries=1)
+        self.prompts: List[str] = []
+
+    def _request_summary(self, prompt: str) -> Tuple[str, Dict[str, int]]:
+        self.prompts.append(prompt)
+        titles = re.findall(r"^\[(\d+)\] URL: \S+\nTitle: (.*)$", prompt, flags=re.MULTILINE)
+        reply = {
+            "items": [
+                {"id": int(entry_id), "score": 9 if "AI" in title else 2, "brief": f"一句话 {title}"}
+                for entry_id, title in titles
+            ]
+        }
+        return json.dumps(reply, ensure_ascii=False), {"prompt_tokens": 200, "total_tokens": 240}
+
+
+def test_triage_entries_scores_a_batch_in_one_call_with_lead_text_only() -> None:
+    client = _TriageClient()
+    entries = [
+        {"id": 1, "url": "https://a.example.com", "title": "AI agents", "content": "x" * 5000},
+        {"id": 2, "url": "https://b.example.com", "title": "Gardening", "content": "soil"},
+    ]
+
+    results = triage_entries(client, entries, topic="AI", lead_chars=100)
+
+    assert len(client.prompts) == 1
+    assert "x" * 101 not in client.prompts[0]
+    assert results[1]["score"] == 9 and results[2]["score"] == 2
+    assert results[2]["brief"] == "一句话 Gardening"
+    assert results[1]["token_usage"]["total_tokens"] == 120
+
+
+class _FullClient:
+    provider = "openai"
+    model = "gpt-full"
+
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def generate_summary(self, url: str, **_: Any) -> Dict[str, Any]:
+        self.calls.append(url)
+        return {"brief": "full brief", "summary": "full summary", "success": True}
+
+
+def test_summarize_all_only_fully_summarizes_items_above_threshold(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    full_client = _FullClient()
+    triage_client = _TriageClient()
+    monkeypatch.setattr(
+        summarizer,
+        "load_config",
+        lambda config=None: {
+            "provider": "openai",
+            "model": "gpt-full",
+            "prompt_template": "Summarize {url}",
+            "concurrency": 2,
+            "gemini_concurrency": 1,
+            "triage": {
+                "enabled": True,
+                "threshold": 6.0,
+                "batch_size": 20,
+                "lead_chars": 200,
+                "topic": "AI",
+            },
+        },
+    )
+    monkeypatch.setattr(summarizer, "_create_llm_client", lambda _config: full_client)
+    monkeypatch.setattr(summarizer, "_create_triage_client", lambda _config: triage_client)
+    collection = {
+        "results": [
+            {
+                "success": True,
+                "items": [
+                    {
+                        "title": "New AI model",
+                        "url": "https://blog.example.com/ai",
+                        "content": (
+                            '<div class="share"><img src="https://cdn.example.com/s.png"/>'
+                            '<a href="https://x.com/share">Share</a></div>'
+                            "<p>The model plans <b>tool calls</b> ahead.</p>"
+                        ),
+                    },
+                    {"title": "Office chairs", "url": "https://blog.example.com/chairs"},
+                ],
+            }
+        ]
+    }
+
+    result = summarizer.summarize_all(collection)
+
+    ai_item, chair_item = result["results"][0]["items"]
+    assert full_client.calls == ["https://blog.example.com/ai"]
+    assert len(triage_client.prompts) == 1
+    assert "Lead: Share The model plans tool calls ahead." in triage_client.prompts[0]
+    assert "<" not in triage_client.prompts[0].split("Articles (2):")[1]
+    assert ai_item["summary"] == "full summary" and ai_item["triage_score"] == 9
+    assert chair_item["summary_mode"] == "triaged"
+    assert chair_item["brief"] == "一句话 Office chairs" and chair_item["summary"] == ""
+    assert result["triage"] == {
+        "scored": 2,
+        "summarized": 1,
+        "briefed": 1,
+        "tokens_consumed": 240,
+    }
@@ -0,0 +1,227 @@
+"""Tests for move37.main checkpointed runs."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.summarize import summarizer
+
+# The entrypoint imports every stage, including the collectors' optional parsers.
+main = pytest.importorskip("move37.main")
+
+_COLLECTION = {
+    "collection_date": "2026-01-02",
+    "target_date": "2026-01-01",
+    "results": [
+        {
+            "success": True,
+            "items": [
+                {"title": "A", "url": "https://blog.example.com/a"},
+                {"title": "B", "url": "https://blog.example.com/b"},
+            ],
+        }
+    ],
+}
+
+
+class _Killed(BaseException):
+    """Stands in for the process dying; not caught by the pipeline's error handling."""
+
+
+class _CrashingClient:
+    """Summarizes successfully until `crash_on` is requested, then dies."""
+
+    provider = "openai"
+    model = "gpt-test"
+
+    def __init__(self, crash_on: str | None = None) -> None:
+        self.crash_on = crash_on
+        self.calls: List[str] = []
+
+    def generate_summary(self, url: str, **_: Any) -> Dict[str, Any]:
+        if url == self.crash_on:
+            raise _Killed()
+        self.calls.append(url)
+        return {"brief": f"brief {url}", "summary": "s", "success": True}
+
+
+class _FakeSession:
+    def __init__(self, counts: Dict[str, Any]) -> None:
+        self.counts = counts
+        counts["sessions"] = counts.get("sessions", 0) + 1
+        counts["appended"] = []
+        self.document_id = "doc-partial"
+        self.node_token = "wik-partial"
+        self.wiki_url = "https://wiki.example.com/wik-partial"
+
+    def append_source(self, source: Dict[str, Any]) -> None:
+        self.counts["appended"].append([item["brief"] for item in source["items"]])
+
+    def close(self) -> Dict[str, Any]:
+        return {"success": True, "document_id": "doc-streamed"}
+
+
+def _install_pipeline(monkeypatch: pytest.MonkeyPatch, client: _CrashingClient) -> Dict[str, Any]:
+    counts: Dict[str, Any] = {"collect": 0, "write": 0, "notify": 0}
+
+    def _collect(**_: Any) -> Dict[str, Any]:
+        counts["collect"] += 1
+        return _COLLECTION
+
+    def _write(summary_result: Dict[str, Any]) -> Dict[str, Any]:
+        counts["write"] += 1
+        return {"success": True, "document_id": f"doc-{counts['write']}"}
+
+    def _notify(payload: Dict[str, Any]) -> Dict[str, Any]:
+        counts["notify"] += 1
+        return {"success": True, "message": "sent"}
+
+    monkeypatch.setattr(main, "collect_all", _collect)
+    monkeypatch.setattr(main, "write_to_feishu_docx", _write)
+    monkeypatch.setattr(main, "notify_feishu", _notify)
+    monkeypatch.setattr(main, "open_feishu_docx_session", lambda header: _FakeSession(counts))
+    monkeypatch.setattr(
+        summarizer,
+        "load_config",
+        lambda config=None: {
+            "provider": "openai",
+            "model": "gpt-test",
+            "prompt_template": "Summarize {url}",
+            "concurrency": 1,
+            "gemini_concurrency": 1,
+        },
+    )
+    monkeypatch.setattr(summarizer, "_create_llm_client", lambda _config: client)
+    return counts
+
+
+def test_resume_skips_finished_stages_and_items(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    crashing = _CrashingClient(crash_on="https://blog.example.com/b")
+    counts = _install_pipeline(monkeypatch, crashing)
+
+    with pytest.raises(_Killed):
+        main._run_once(run_id="run-1", runs_dir=tmp_path)
+    assert crashing.calls == ["https://blog.example.com/a"]
+
+    resumed = _CrashingClient()
+    counts = _install_pipeline(monkeypatch, resumed)
+    report = main._run_once(run_id="run-1", runs_dir=tmp_path)
+
+    assert report["success"] is True
+    assert counts["collect"] == 0 and report["steps"][0]["resumed"] is True
+    assert resumed.calls == ["https://blog.example.com/b"]
+    assert (tmp_path / "run-1" / "summary_result.json").is_file()
+
+
+def test_from_stage_reuses_stored_summary_result(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    client = _CrashingClient()
+    _install_pipeline(monkeypatch, client)
+    main._run_once(run_id="run-2", runs_dir=tmp_path)
+
+    client = _CrashingClient()
+    counts = _install_pipeline(monkeypatch, client)
+    report = main._run_once(run_id="run-2", from_stage="write_docx", runs_dir=tmp_path)
+
+    assert [step.get("resumed", False) for step in report["steps"]] == [
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert client.calls == []
+    assert (counts["collect"], counts["write"], counts["notify"]) == (0, 1, 1)
+
+
+def test_streaming_run_matches_staged_run(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    counts = _install_pipeline(monkeypatch, _CrashingClient())
+    monkeypatch.setattr(
+        "move37.pipeline.iter_collect",
+        lambda **_: (
+            {"collection_date": "2026-01-02", "target_date": "2026-01-01"},
+            iter(_COLLECTION["results"]),
+        ),
+    )
+
+    staged = main._run_once(run_id="staged", runs_dir=tmp_path)
+    streamed = main._run_once(run_id="streamed", runs_dir=tmp_path, stream=True)
+
+    assert [step["step"] for step in streamed["steps"]] == [
+        step["step"] for step in staged["steps"]
+    ]
+    assert streamed["success"] is staged["success"] is True
+    staged_summary = (tmp_path / "staged" / "summary_result.json").read_text(encoding="utf-8")
+    streamed_summary = (tmp_path / "streamed" / "summary_result.json").read_text(encoding="utf-8")
+    assert streamed_summary == staged_summary
+    assert counts["sessions"] == 1 and counts["write"] == 1
+    assert counts["appended"] == [
+        ["brief https://blog.example.com/a", "brief https://blog.example.com/b"]
+    ]
+    assert streamed["steps"][2]["document_id"] == "doc-streamed"
+
+
+def test_streaming_failure_flags_the_partial_doc(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    counts = _install_pipeline(monkeypatch, _CrashingClient())
+
+    def _failing_stream(on_source: Any = None, **_: Any) -> Any:
+        header = {"collection_date": "2026-01-02", "target_date": "2026-01-01"}
+        on_source(header, {"items": [{"brief": "brief a"}]})
+        raise main.PipelineStageError("summarize", RuntimeError("llm down"), {"collection": 1.0})
+
+    monkeypatch.setattr(main, "run_streaming", _failing_stream)
+    report = main._run_once(run_id="run-3", runs_dir=tmp_path, stream=True)
+
+    partial = {
+        "document_id": "doc-partial",
+        "node_token": "wik-partial",
+        "wiki_url": "https://wiki.example.com/wik-partial",
+    }
+    assert report["success"] is False
+    assert report["steps"][-1]["partial_document"] == partial
+    assert any("doc-partial" in error for error in report["errors"])
+    assert counts["appended"] == [["brief a"]]
+
+    # The resumed run writes a new doc and keeps reporting the partial one.
+    def _offline_stream(**_: Any) -> Any:
+        raise main.PipelineStageError("collection", RuntimeError("offline"), {})
+
+    monkeypatch.setattr(main, "run_streaming", _offline_stream)
+    resumed = main._run_once(run_id="run-3", runs_dir=tmp_path, stream=True)
+    assert resumed["partial_documents"] == [partial]
+
+
+def test_each_run_reports_only_its_own_summarize_stats(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    from move37.summarize.streaming import record_stream
+    from move37.summarize.structured_output import record_parse_outcome
+
+    _install_pipeline(monkeypatch, _CrashingClient())
+    record_parse_outcome("openai", "failed")
+    record_stream("openai", 0.5, True, 10)
+
+    report = main._run_once(run_id="run-4", runs_dir=tmp_path)
+
+    assert report["steps"][1]["parse_stats"] == {}
+    assert report["steps"][1]["streaming"] == {}
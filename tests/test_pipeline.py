@@ -0,0 +1,128 @@
+"""Tests for move37.pipeline."""
+
+from __future__ import annotations
+
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+# The pipeline imports the collectors, which need their optional parsers.
+pipeline = pytest.importorskip("move37.pipeline")
+
+
+def _sources(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "source_title": f"source-{index}",
+            "success": True,
+            "items": [{"url": f"https://example.com/{index}"}] if index % 3 else [],
+        }
+        for index in range(count)
+    ]
+
+
+def _fake_summarize(events: List[Tuple[str, str]], lock: threading.Lock) -> Any:
+    rng = random.Random(5)
+
+    def _summarize(collection: Dict[str, Any], checkpoint: Any = None) -> Dict[str, Any]:
+        source = dict(collection["results"][0])
+        with lock:
+            events.append(("summarize", source["source_title"]))
+            delay = rng.uniform(0.0, 0.03)
+        time.sleep(delay)
+        source["items"] = [dict(item, summary="s") for item in source["items"]]
+        return {**collection, "results": [source], "triage": {"scored": 1, "summarized": 1}}
+
+    return _summarize
+
+
+def test_streaming_overlaps_stages_and_keeps_source_order(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    events: List[Tuple[str, str]] = []
+    lock = threading.Lock()
+
+    def _iter_collect(**_: Any) -> Tuple[Dict[str, str], Iterator[Dict[str, Any]]]:
+        def _generate() -> Iterator[Dict[str, Any]]:
+            for source in _sources(12):
+                time.sleep(0.01)
+                with lock:
+                    events.append(("collect", source["source_title"]))
+                yield source
+
+        return {"collection_date": "2026-01-02", "target_date": "2026-01-01"}, _generate()
+
+    monkeypatch.setattr(pipeline, "iter_collect", _iter_collect)
+    seen: List[str] = []
+
+    collection, summary, timings = pipeline.run_streaming(
+        summarize_workers=3,
+        queue_size=2,
+        on_source=lambda header, source: seen.append(source["source_title"]),
+        summarize=_fake_summarize(events, lock),
+    )
+
+    expected = [s["source_title"] for s in _sources(12) if s["items"]]
+    assert [s["source_title"] for s in collection["results"]] == expected
+    assert [s["source_title"] for s in summary["results"]] == expected
+    assert seen == expected
+    assert all(item["summary"] == "s" for s in summary["results"] for item in s["items"])
+    assert summary["triage"] == {"scored": len(expected), "summarized": len(expected)}
+    assert events.index(("summarize", "source-1")) < events.index(("collect", "source-11"))
+    assert timings["collection"] <= timings["summarize"]
+
+
+def test_streaming_reports_the_failed_stage() -> None:
+    def _broken(collection: Dict[str, Any], checkpoint: Any = None) -> Dict[str, Any]:
+        raise RuntimeError("provider down")
+
+    with pytest.raises(pipeline.PipelineStageError) as excinfo:
+        pipeline.run_streaming(
+            collection_result={
+                "collection_date": "2026-01-02",
+                "target_date": "2026-01-01",
+                "results": _sources(6),
+            },
+            summarize=_broken,
+        )
+
+    assert excinfo.value.stage == "summarize"
+    assert "provider down" in str(excinfo.value)
+
+
+def test_merge_stats_adds_counters_and_keeps_gauges() -> None:
+    first = {"primary": "openai", "hedge_delay": 10.0, "requests": 3, "hedged": 1}
+    second = {"primary": "openai", "hedge_delay": 8.5, "requests": 2, "hedged": 0}
+
+    merged = pipeline.merge_stats("hedging", first, second)
+
+    assert merged == {"primary": "openai", "hedge_delay": 8.5, "requests": 5, "hedged": 1}
+    dedup = pipeline.merge_stats(
+        "dedup",
+        {"clusters": [{"representative": "a"}], "items_skipped": 1},
+        {"clusters": [{"representative": "b"}], "items_skipped": 2},
+    )
+    assert dedup["clusters"] == [{"representative": "a"}, {"representative": "b"}]
+    assert dedup["items_skipped"] == 3
+
+
+def test_streaming_refuses_cross_source_dedup(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        pipeline, "load_config", lambda config=None: {"dedup": {"enabled": True}}
+    )
+    monkeypatch.setattr(
+        pipeline, "iter_collect", lambda **_: pytest.fail("collection must not start")
+    )
+
+    with pytest.raises(ValueError, match="LLM_DEDUP_ENABLED"):
+        pipeline.run_streaming()
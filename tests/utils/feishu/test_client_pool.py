@@ -0,0 +1,45 @@
+"""Tests for move37.utils.feishu.client_pool."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.utils.feishu import client_pool
+from move37.utils.feishu.client_pool import get_feishu_client
+
+
+@pytest.fixture(autouse=True)
+def _empty_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(client_pool, "_CLIENTS", {})
+
+
+def test_same_app_base_url_and_timeout_reuse_one_client() -> None:
+    base_url = "https://open.feishu.cn"
+    first = get_feishu_client("cli_test", "secret", timeout=30, base_url=base_url + "/")
+    second = get_feishu_client("cli_test", "secret", timeout=30.0, base_url=base_url)
+
+    assert first is second
+    assert get_feishu_client("cli_test", "secret", timeout=10) is not first
+    assert get_feishu_client("cli_other", "secret") is not first
+
+
+def test_rotated_secret_replaces_pooled_client() -> None:
+    old = get_feishu_client("cli_test", "secret_old")
+    new = get_feishu_client("cli_test", "secret_new")
+
+    assert new is not old
+    assert new.app_secret == "secret_new"
+    assert get_feishu_client("cli_test", "secret_new") is new
+
+
+def test_invalid_arguments_still_raise() -> None:
+    with pytest.raises(ValueError):
+        get_feishu_client("", "secret")
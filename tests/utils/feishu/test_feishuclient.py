@@ -25,6 +25,13 @@ from move37.utils.feishu.feishuclient import (
     FeishuMessageError,
     FeishuVerificationError,
 )
+from move37.utils.feishu import token_cache
+from move37.utils.retry import RetryBudget, RetryPolicy
+
+
+@pytest.fixture(autouse=True)
+def _isolated_token_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(token_cache, "_SHARED_CACHE", token_cache.TenantTokenCache())
 
 
 class _FakeRaw:
@@ -196,6 +203,52 @@ def test_get_tenant_access_token_success(monkeypatch: pytest.MonkeyPatch) -> Non
     assert client.tenant_access_token == "t-test-token"
 
 
+def test_clients_share_cached_token_until_it_nears_expiry(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(
+        token_cache,
+        "_SHARED_CACHE",
+        token_cache.TenantTokenCache(refresh_margin=300, clock=lambda: now[0]),
+    )
+    state = _install_fake_sdk(
+        monkeypatch,
+        [
+            _FakeResponse({"code": 0, "tenant_access_token": "t-first", "expire": 7200}),
+            _FakeResponse({"code": 0, "tenant_access_token": "t-second", "expire": 7200}),
+        ],
+    )
+
+    writer = FeishuClient(app_id="cli_test", app_secret="secret_test")
+    notifier = FeishuClient(app_id="cli_test", app_secret="secret_test")
+    assert writer.get_tenant_access_token() == "t-first"
+    now[0] += 6800
+    assert notifier.get_tenant_access_token() == "t-first"
+    now[0] += 200
+    assert writer.get_tenant_access_token() == "t-second"
+    assert len(state["requests"]) == 2
+
+
+def test_token_cache_is_keyed_by_base_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    state = _install_fake_sdk(
+        monkeypatch,
+        [
+            _FakeResponse({"code": 0, "tenant_access_token": "t-feishu", "expire": 7200}),
+            _FakeResponse({"code": 0, "tenant_access_token": "t-lark", "expire": 7200}),
+        ],
+    )
+
+    feishu = FeishuClient(app_id="cli_test", app_secret="secret_test")
+    lark = FeishuClient(
+        app_id="cli_test", app_secret="secret_test", base_url="https://open.larksuite.com"
+    )
+    assert feishu.get_tenant_access_token() == "t-feishu"
+    assert lark.get_tenant_access_token() == "t-lark"
+    assert feishu.get_tenant_access_token() == "t-feishu"
+    assert len(state["requests"]) == 2
+
+
 def test_get_tenant_access_token_raises_when_sdk_response_failed(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -511,7 +564,7 @@ def test_write_docx_content_success(monkeypatch: pytest.MonkeyPatch) -> None:
     assert state["request"]["http_method"] == "POST"
     assert (
         state["request"]["uri"]
-        == FeishuClient.DOCX_DESCENDANT_CREATE_URI_TEMPLATE.format(
+        == FeishuClient.DOCX_CHILDREN_CREATE_URI_TEMPLATE.format(
             document_id="PDlqd7vFloeAzIxlaQUc3Zdrnfb",
             block_id="doxcn_root_block",
         )
@@ -560,7 +613,7 @@ def test_write_docx_content_uses_auto_token_when_missing(monkeypatch: pytest.Mon
     assert state["requests"][0]["uri"] == FeishuClient.TENANT_ACCESS_TOKEN_URI
     assert (
         state["requests"][1]["uri"]
-        == FeishuClient.DOCX_DESCENDANT_CREATE_URI_TEMPLATE.format(
+        == FeishuClient.DOCX_CHILDREN_CREATE_URI_TEMPLATE.format(
             document_id="PDlqd7vFloeAzIxlaQUc3Zdrnfb"
             ,
             block_id="doxcn_root_block",
@@ -624,6 +677,38 @@ def test_write_docx_content_raises_when_data_missing(monkeypatch: pytest.MonkeyP
         )
 
 
+def test_create_docx_descendants_posts_nested_tree(monkeypatch: pytest.MonkeyPatch) -> None:
+    relations = [{"temporary_block_id": "tmp_0", "block_id": "doxcn_heading"}]
+    state = _install_fake_sdk(
+        monkeypatch,
+        _FakeResponse({"code": 0, "msg": "ok", "data": {"block_id_relations": relations}}),
+    )
+    client = FeishuClient(app_id="cli_test", app_secret="secret_test")
+    descendants = [
+        {"block_id": "tmp_0", "block_type": 3, "heading1": {}, "children": ["tmp_1"]},
+        {"block_id": "tmp_1", "block_type": 2, "text": {}, "children": []},
+    ]
+
+    result = client.create_docx_descendants(
+        document_id="PDlqd7vFloeAzIxlaQUc3Zdrnfb",
+        block_id="PDlqd7vFloeAzIxlaQUc3Zdrnfb",
+        children_id=["tmp_0"],
+        descendants=descendants,
+        tenant_access_token="t-test-token",
+    )
+
+    assert result["block_id_relations"] == relations
+    assert state["request"]["uri"] == FeishuClient.DOCX_DESCENDANT_CREATE_URI_TEMPLATE.format(
+        document_id="PDlqd7vFloeAzIxlaQUc3Zdrnfb",
+        block_id="PDlqd7vFloeAzIxlaQUc3Zdrnfb",
+    )
+    assert state["request"]["body"] == {
+        "index": -1,
+        "children_id": ["tmp_0"],
+        "descendants": descendants,
+    }
+
+
 def test_send_group_notify_text_success(monkeypatch: pytest.MonkeyPatch) -> None:
     state = _install_fake_sdk(
         monkeypatch,
@@ -676,3 +761,78 @@ def test_send_group_notify_raises_when_api_code_not_zero(
             receive_id_type="chat_id",
             tenant_access_token="t-test-token",
         )
+
+
+def test_token_request_retries_server_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    state = _install_fake_sdk(
+        monkeypatch,
+        [
+            _FakeResponse({}, ok=False, code=None, msg="busy", status_code=503),
+            _FakeResponse({"code": 0, "tenant_access_token": "t-retried", "expire": 7200}),
+        ],
+    )
+
+    client = FeishuClient(
+        app_id="cli_test",
+        app_secret="secret_test",
+        retry_policy=RetryPolicy(budget=RetryBudget(5), sleep=lambda _: None),
+    )
+
+    assert client.get_tenant_access_token() == "t-retried"
+    assert len(state["requests"]) == 2
+
+
+def test_create_docx_does_not_retry_server_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    state = _install_fake_sdk(
+        monkeypatch,
+        [
+            _FakeResponse({}, ok=False, code=None, msg="busy", status_code=500),
+            _FakeResponse({"code": 0, "data": {"document": {"document_id": "doc"}}}),
+        ],
+    )
+
+    client = FeishuClient(
+        app_id="cli_test",
+        app_secret="secret_test",
+        retry_policy=RetryPolicy(budget=RetryBudget(5), sleep=lambda _: None),
+    )
+
+    with pytest.raises(FeishuDocxError):
+        client.create_docx(space_id="space_test", title="Daily", tenant_access_token="t-token")
+    assert len(state["requests"]) == 1
+
+
+def test_rejected_cached_token_is_refreshed_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    rejected = {"code": 99991663, "msg": "Invalid access token for authorization."}
+    state = _install_fake_sdk(
+        monkeypatch,
+        [
+            _FakeResponse({"code": 0, "tenant_access_token": "t-stale", "expire": 7200}),
+            _FakeResponse(rejected, ok=False, code=99991663, status_code=400),
+            _FakeResponse({"code": 0, "tenant_access_token": "t-fresh", "expire": 7200}),
+            _FakeResponse({"code": 0, "data": {"node": {"obj_token": "doc_1"}}}),
+        ],
+    )
+
+    client = FeishuClient(app_id="cli_test", app_secret="secret_test")
+    client.create_docx(space_id="space_test", title="Daily")
+
+    auth_headers = [
+        request["headers"]["Authorization"]
+        for request in state["requests"]
+        if "headers" in request
+    ]
+    assert auth_headers == ["Bearer t-stale", "Bearer t-fresh"]
+    assert client.token_cache.get(client.token_cache_key()) == "t-fresh"
+
+
+def test_rejected_explicit_token_is_not_retried(monkeypatch: pytest.MonkeyPatch) -> None:
+    rejected = {"code": 99991668, "msg": "Invalid access token."}
+    state = _install_fake_sdk(
+        monkeypatch, _FakeResponse(rejected, ok=False, code=99991668, status_code=400)
+    )
+
+    client = FeishuClient(app_id="cli_test", app_secret="secret_test")
+    with pytest.raises(FeishuDocxError, match="99991668"):
+        client.create_docx(space_id="space_test", title="Daily", tenant_access_token="t-mine")
+    assert len(state["requests"]) == 1
@@ -0,0 +1,103 @@
+"""Tests for move37.utils.feishu.token_cache."""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.utils.feishu.token_cache import TenantTokenCache
+
+
+def _fetcher(
+    tokens: List[str], expire: float = 7200
+) -> Tuple[List[str], Callable[[], Tuple[str, float]]]:
+    calls: List[str] = []
+
+    def _fetch() -> Tuple[str, float]:
+        token = tokens[len(calls)]
+        calls.append(token)
+        return token, expire
+
+    return calls, _fetch
+
+
+def test_file_backed_cache_is_shared_between_instances(tmp_path: Path) -> None:
+    path = tmp_path / "tokens.json"
+    calls, fetch = _fetcher(["t-1", "t-2"])
+
+    assert TenantTokenCache(path=path).get_or_fetch("cli_a", fetch) == "t-1"
+    # A second instance stands in for another process reading the same file.
+    assert TenantTokenCache(path=path).get_or_fetch("cli_a", fetch) == "t-1"
+    assert TenantTokenCache(path=path).get_or_fetch("cli_a", fetch, force_refresh=True) == "t-2"
+    assert TenantTokenCache(path=path).get("cli_a") == "t-2"
+    assert calls == ["t-1", "t-2"]
+    assert path.stat().st_mode & 0o777 == 0o600
+
+
+def test_tokens_without_expire_are_not_cached() -> None:
+    cache = TenantTokenCache()
+    calls, fetch = _fetcher(["t-1", "t-2"], expire=0)
+
+    assert cache.get_or_fetch("cli_a", fetch) == "t-1"
+    assert cache.get_or_fetch("cli_a", fetch) == "t-2"
+    assert cache.get("cli_a") is None
+
+
+def test_concurrent_callers_share_one_fetch(tmp_path: Path) -> None:
+    cache = TenantTokenCache(path=tmp_path / "tokens.json")
+    calls: List[str] = []
+
+    def _slow_fetch() -> Tuple[str, float]:
+        calls.append("fetch")
+        time.sleep(0.05)
+        return "t-1", 7200
+
+    results: List[str] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_fetch("cli_a", _slow_fetch)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["t-1"] * 8
+    assert calls == ["fetch"]
+
+
+def test_invalidate_drops_only_the_rejected_token(tmp_path: Path) -> None:
+    path = tmp_path / "tokens.json"
+    cache = TenantTokenCache(path=path)
+    calls, fetch = _fetcher(["t-1", "t-2"])
+    cache.get_or_fetch("cli_a", fetch)
+
+    # A token someone else already replaced is left alone.
+    cache.invalidate("cli_a", "t-0")
+    assert TenantTokenCache(path=path).get("cli_a") == "t-1"
+
+    cache.invalidate("cli_a", "t-1")
+    assert TenantTokenCache(path=path).get("cli_a") is None
+    assert cache.get_or_fetch("cli_a", fetch) == "t-2"
+    assert calls == ["t-1", "t-2"]
+
+
+def test_cache_file_is_private_under_a_loose_umask(tmp_path: Path) -> None:
+    path = tmp_path / "tokens.json"
+    _, fetch = _fetcher(["t-1"])
+    previous = os.umask(0o022)
+    try:
+        TenantTokenCache(path=path).get_or_fetch("cli_a", fetch)
+    finally:
+        os.umask(previous)
+
+    assert path.stat().st_mode & 0o777 == 0o600
@@ -0,0 +1,23 @@
+"""Tests for move37.utils.checkpoint."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.utils.checkpoint import RunCheckpoint, latest_run_id, new_run_id
+
+
+def test_runs_started_in_the_same_second_get_distinct_ids(tmp_path: Path) -> None:
+    first = RunCheckpoint(runs_dir=tmp_path)
+    second = RunCheckpoint(runs_dir=tmp_path)
+
+    assert first.run_id != second.run_id
+    assert first.run_dir != second.run_dir
+    assert latest_run_id(tmp_path) in {first.run_id, second.run_id}
+    assert len({new_run_id() for _ in range(50)}) == 50
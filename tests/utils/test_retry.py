@@ -0,0 +1,92 @@
+"""Tests for move37.utils.retry."""
+
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.utils.retry import (
+    NON_RETRYABLE,
+    RATE_LIMITED,
+    RETRYABLE,
+    RetryBudget,
+    RetryPolicy,
+    classify_error,
+    is_rate_limit_error,
+    rate_limited_only,
+)
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code: int, headers: dict | None = None) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+def test_classify_error_separates_rate_limits_client_errors_and_transient_failures() -> None:
+    assert classify_error(_HTTPError(429)) == RATE_LIMITED
+    assert classify_error(_HTTPError(400)) == NON_RETRYABLE
+    assert classify_error(_HTTPError(401)) == NON_RETRYABLE
+    assert classify_error(_HTTPError(503)) == RETRYABLE
+    assert classify_error(TimeoutError("read timed out")) == RETRYABLE
+    assert classify_error(TypeError("bad argument")) == NON_RETRYABLE
+    assert rate_limited_only(_HTTPError(503)) == NON_RETRYABLE
+
+
+def test_rate_limit_detection_needs_a_standalone_429_in_messages() -> None:
+    assert is_rate_limit_error(RuntimeError("Error code: 429 - {'error': 'slow down'}"))
+    assert is_rate_limit_error(RuntimeError("upstream returned HTTP 429."))
+    assert not is_rate_limit_error(RuntimeError("prompt has 14290 tokens, limit is 8192"))
+    assert not is_rate_limit_error(RuntimeError("404 for https://api.example.com/v1/jobs/429"))
+
+
+def test_backoff_uses_bounded_decorrelated_jitter() -> None:
+    policy = RetryPolicy(base_delay=1.0, max_delay=10.0, rng=random.Random(3))
+    previous = None
+    for _ in range(50):
+        delay = policy.backoff(previous)
+        assert 1.0 <= delay <= min(10.0, (previous or 1.0) * 3)
+        previous = delay
+
+
+def test_rate_limited_retry_waits_for_retry_after_hint() -> None:
+    policy = RetryPolicy(base_delay=0.1, max_delay=1.0, budget=RetryBudget(5))
+
+    delay = policy.next_delay(_HTTPError(429, {"retry-after": "7"}), attempt=0)
+
+    assert delay == 7.0
+
+
+def test_call_stops_on_non_retryable_error_and_when_budget_is_spent() -> None:
+    sleeps: List[float] = []
+    budget = RetryBudget(1)
+    policy = RetryPolicy(max_attempts=5, budget=budget, sleep=sleeps.append)
+    calls: List[int] = []
+
+    def _bad_request() -> None:
+        calls.append(1)
+        raise _HTTPError(400)
+
+    with pytest.raises(_HTTPError):
+        policy.call(_bad_request)
+    assert len(calls) == 1 and sleeps == []
+
+    def _unavailable() -> None:
+        calls.append(1)
+        raise _HTTPError(503)
+
+    with pytest.raises(_HTTPError):
+        policy.call(_unavailable)
+    assert len(calls) == 3 and len(sleeps) == 1
+    assert budget.snapshot() == {"limit": 1, "spent": 1, "denied": 1}
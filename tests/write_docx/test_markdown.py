@@ -0,0 +1,41 @@
+"""Tests for move37.write_docx.markdown."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.write_docx.markdown import blocks_to_markdown
+
+
+def _block(block_type: int, key: str, content: str) -> Dict[str, Any]:
+    return {"block_type": block_type, key: {"elements": [{"text_run": {"content": content}}]}}
+
+
+def test_llm_markdown_stays_literal() -> None:
+    markdown = blocks_to_markdown(
+        [
+            _block(4, "heading2", "**GPT-5** #1 <b>launch</b>"),
+            _block(2, "text", "摘要: - not a list\n1. step one\n  # not a heading\n[a](b) x_y"),
+        ]
+    )
+
+    assert markdown == (
+        "## \\*\\*GPT-5\\*\\* \\#1 \\<b\\>launch\\</b\\>\n\n"
+        "摘要: - not a list  \n"
+        "1\\. step one  \n"
+        "\\# not a heading  \n"
+        "\\[a\\](b) x\\_y\n"
+    )
+
+
+def test_line_start_bullets_and_underlines_are_escaped() -> None:
+    markdown = blocks_to_markdown([_block(2, "text", "- item\n+ item\n===\n2) two")])
+
+    assert markdown == "\\- item  \n\\+ item  \n\\===  \n2\\) two\n"
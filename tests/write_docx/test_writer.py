@@ -0,0 +1,314 @@
+"""Tests for move37.write_docx.writer."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = PROJECT_ROOT / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from move37.utils.feishu import client_pool, token_cache
+from move37.write_docx.writer import (
+    MAX_CHILDREN_PER_REQUEST,
+    FeishuWikiWriter,
+    write_to_feishu_docx,
+)
+
+
+class _RecordingClient:
+    def __init__(self) -> None:
+        self.calls: List[Any] = []
+
+    def create_docx(self, **kwargs: Any) -> Dict[str, Any]:
+        self.calls.append(("create", kwargs["title"]))
+        return {"node": {"node_token": "wik_1", "obj_token": "doc_1"}}
+
+    def write_docx_content(
+        self, document_id: str, block_id: str, children: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        self.calls.append(("write", len(children)))
+        return {"children": children[-1:]}
+
+
+def _summary_result(sources: int, items: int) -> Dict[str, Any]:
+    return {
+        "target_date": "2026-01-01",
+        "results": [
+            {
+                "source_title": f"source-{index}",
+                "source_type": "Blogs",
+                "items": [
+                    {"title": f"item-{index}-{item}", "brief": "b", "summary": "s"}
+                    for item in range(items)
+                ],
+            }
+            for index in range(sources)
+        ],
+    }
+
+
+def test_session_writes_full_batches_early_and_matches_one_shot_write() -> None:
+    summary_result = _summary_result(sources=7, items=5)
+    one_shot_client = _RecordingClient()
+    expected = FeishuWikiWriter(one_shot_client).write_summary_to_wiki(
+        summary_result, space_id="space", parent_node_token="parent"
+    )
+
+    client = _RecordingClient()
+    session = FeishuWikiWriter(client).open_session(
+        {"target_date": "2026-01-01"}, space_id="space", parent_node_token="parent"
+    )
+    assert client.calls == [("create", "2026-01-01咨询摘要")]
+    for source in summary_result["results"][:4]:
+        session.append_source(source)
+    # 4 sources x (1 heading + 5 x 4 item blocks) = 84 blocks: one full batch sent.
+    assert client.calls[1:] == [("write", MAX_CHILDREN_PER_REQUEST)]
+    for source in summary_result["results"][4:]:
+        session.append_source(source)
+
+    assert session.close() == expected
+    assert client.calls == one_shot_client.calls
+    assert expected["children_count"] == 147 and expected["write_batches"] == 3
+
+
+def test_streaming_session_writes_each_source_before_close() -> None:
+    summary_result = _summary_result(sources=3, items=1)
+    client = _RecordingClient()
+    session = FeishuWikiWriter(client).open_session(
+        {"target_date": "2026-01-01"},
+        space_id="space",
+        parent_node_token="parent",
+        flush_each_source=True,
+    )
+
+    session.append_source(summary_result["results"][0])
+    # 1 heading + 4 item blocks, far below a full batch, are already in the doc.
+    assert client.calls[1:] == [("write", 5)]
+    for source in summary_result["results"][1:]:
+        session.append_source(source)
+    assert client.calls[1:] == [("write", 5)] * 3
+
+    assert session.close()["write_batches"] == 3
+    assert client.calls[1:] == [("write", 5)] * 3
+
+
+class _DescendantClient(_RecordingClient):
+    def create_docx_descendants(
+        self,
+        document_id: str,
+        block_id: str,
+        children_id: List[str],
+        descendants: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        self.calls.append(("descendant", block_id, children_id, descendants))
+        return {
+            "block_id_relations": [
+                {"temporary_block_id": entry["block_id"], "block_id": f"real_{entry['block_id']}"}
+                for entry in descendants
+            ]
+        }
+
+
+def _flatten(calls: List[Any]) -> List[str]:
+    """Rebuild the document outline (heading, then its items) from descendant calls."""
+    outline: List[str] = []
+    for _, _, children_id, descendants in calls:
+        by_id = {entry["block_id"]: entry for entry in descendants}
+
+        def _walk(block_id: str) -> None:
+            entry = by_id[block_id]
+            if entry["block_type"] in (3, 4):
+                key = "heading1" if entry["block_type"] == 3 else "heading2"
+                outline.append(entry[key]["elements"][0]["text_run"]["content"])
+            for child in entry["children"]:
+                _walk(child)
+
+        for block_id in children_id:
+            _walk(block_id)
+    return outline
+
+
+def test_descendant_mode_nests_items_and_packs_by_payload_size() -> None:
+    summary_result = _summary_result(sources=3, items=4)
+    summary_result["results"][1]["items"] *= 10  # one source too large for a request
+
+    client = _DescendantClient()
+    session = FeishuWikiWriter(client).open_session(
+        summary_result, space_id="space", parent_node_token="parent", block_api="descendant"
+    )
+    session.max_request_bytes = 6000
+    for source in summary_result["results"]:
+        session.append_source(source)
+    written = session.close()
+
+    calls = [call for call in client.calls if call[0] == "descendant"]
+    assert len(calls) == written["write_batches"] > 1
+    assert all(len(json.dumps(call[3], ensure_ascii=False).encode()) < 6000 for call in calls)
+    # Follow-up requests for the large source append under its heading's real block id.
+    assert {call[1] for call in calls} == {"doc_1", "real_tmp_17"}
+    expected = []
+    for source in summary_result["results"]:
+        expected.append(f"{source['source_title']} (Blogs)")
+        expected += [item["title"] for item in source["items"]]
+    assert _flatten(calls) == expected
+    assert written["children_count"] == 3 + 4 * (4 + 40 + 4)
+
+
+def test_streaming_descendant_session_sends_each_tree_on_append() -> None:
+    summary_result = _summary_result(sources=3, items=4)
+    summary_result["results"][1]["items"] *= 10  # still split by the byte limit
+
+    client = _DescendantClient()
+    session = FeishuWikiWriter(client).open_session(
+        summary_result,
+        space_id="space",
+        parent_node_token="parent",
+        block_api="descendant",
+        flush_each_source=True,
+    )
+    session.max_request_bytes = 6000
+
+    sent_after_append = []
+    for source in summary_result["results"]:
+        session.append_source(source)
+        sent_after_append.append(_flatten([c for c in client.calls if c[0] == "descendant"]))
+    session.close()
+
+    titles = [
+        [f"{source['source_title']} (Blogs)"] + [item["title"] for item in source["items"]]
+        for source in summary_result["results"]
+    ]
+    assert sent_after_append == [
+        titles[0],
+        titles[0] + titles[1],
+        titles[0] + titles[1] + titles[2],
+    ]
+    calls = [call for call in client.calls if call[0] == "descendant"]
+    assert all(len(json.dumps(call[3], ensure_ascii=False).encode()) < 6000 for call in calls)
+
+
+class _FeishuStandIn:
+    """Routes SDK requests to in-memory handlers for the auth, drive and wiki endpoints."""
+
+    def __init__(self, import_polls: int = 2) -> None:
+        self.requests: List[Dict[str, Any]] = []
+        self.uploads: Dict[str, bytes] = {}
+        self.import_polls = import_polls
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self.requests.append(request)
+        method, uri = request["http_method"], request["uri"]
+        if uri == "/open-apis/auth/v3/tenant_access_token/internal":
+            return {"code": 0, "tenant_access_token": "t-standin", "expire": 7200}
+        if uri == "/open-apis/drive/v1/medias/upload_all":
+            name, content = request["files"]["file"]
+            self.uploads[name] = content
+            assert request["body"]["parent_type"] == "ccm_import_open"
+            return {"code": 0, "data": {"file_token": "box_file"}}
+        if method == "POST" and uri == "/open-apis/drive/v1/import_tasks":
+            assert request["body"]["file_token"] == "box_file"
+            return {"code": 0, "data": {"ticket": "ticket_1"}}
+        if method == "GET" and uri == "/open-apis/drive/v1/import_tasks/ticket_1":
+            self.import_polls -= 1
+            if self.import_polls > 0:
+                return {"code": 0, "data": {"result": {"job_status": 2}}}
+            return {"code": 0, "data": {"result": {"job_status": 0, "token": "doc_imported"}}}
+        if uri.endswith("/nodes/move_docs_to_wiki"):
+            assert request["body"]["obj_token"] == "doc_imported"
+            return {"code": 0, "data": {"task_id": "move_1"}}
+        if uri.startswith("/open-apis/wiki/v2/tasks/move_1"):
+            node = {"node_token": "wik_imported", "obj_token": "doc_imported"}
+            return {"code": 0, "data": {"task": {"move_result": [{"node": node, "status": 0}]}}}
+        return {"code": 404, "msg": f"no stand-in route for {method} {uri}"}
+
+    def install(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        standin = self
+
+        class _Builder:
+            def __init__(self) -> None:
+                self.request: Dict[str, Any] = {}
+
+            def __getattr__(self, name: str) -> Any:
+                def _set(value: Any) -> "_Builder":
+                    self.request[name] = value
+                    return self
+
+                return _set
+
+            def build(self) -> Dict[str, Any]:
+                return dict(self.request)
+
+        class _Response:
+            def __init__(self, payload: Dict[str, Any]) -> None:
+                self.raw = SimpleNamespace(content=json.dumps(payload).encode(), status_code=200)
+                self.code = payload.get("code")
+                self.msg = payload.get("msg")
+
+            def success(self) -> bool:
+                return True
+
+        class _Client:
+            def request(self, request: Dict[str, Any]) -> _Response:
+                return _Response(standin.handle(request))
+
+        class _ClientBuilder(_Builder):
+            def build(self) -> _Client:  # type: ignore[override]
+                return _Client()
+
+        monkeypatch.setattr(token_cache, "_SHARED_CACHE", token_cache.TenantTokenCache())
+        monkeypatch.setattr(client_pool, "_CLIENTS", {})
+        monkeypatch.setitem(
+            sys.modules,
+            "lark_oapi",
+            SimpleNamespace(
+                Client=SimpleNamespace(builder=_ClientBuilder),
+                BaseRequest=SimpleNamespace(builder=_Builder),
+                HttpMethod=SimpleNamespace(POST="POST", GET="GET"),
+                LogLevel=SimpleNamespace(WARNING="WARNING"),
+            ),
+        )
+
+
+def test_import_mode_uploads_markdown_once_and_moves_it_into_the_wiki(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    standin = _FeishuStandIn(import_polls=3)
+    standin.install(monkeypatch)
+    summary_result = _summary_result(sources=2, items=2)
+
+    result = write_to_feishu_docx(
+        summary_result,
+        config={
+            "app_id": "cli_test",
+            "app_secret": "secret_test",
+            "space_id": "space",
+            "parent_node_token": "parent",
+            "write_mode": "import",
+            "import_poll_interval": 0,
+        },
+    )
+
+    paths = [request["uri"].split("?")[0].rsplit("/", 1)[-1] for request in standin.requests]
+    assert paths == [
+        "internal",
+        "upload_all",
+        "import_tasks",
+        "ticket_1",
+        "ticket_1",
+        "ticket_1",
+        "move_docs_to_wiki",
+        "move_1",
+    ]
+    assert result["document_id"] == "doc_imported" and result["node_token"] == "wik_imported"
+    assert result["wiki_url"] == "https://feishu.cn/wiki/wik_imported"
+    markdown = standin.uploads["2026-01-01咨询摘要.md"].decode("utf-8")
+    assert markdown.startswith("# source-0 (Blogs)\n\n## item-0-0\n\n链接: N/A  \n发布时间: N/A")
+    assert "## item-1-1" in markdown and "摘要: b" in markdown